@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 from data.fornecedor.fornecedor_model import Fornecedor
 
 @dataclass
@@ -8,4 +9,5 @@ class Anuncio:
     id_fornecedor: int   
     data_criacao: str
     descricao: str
-    preco: float
\ No newline at end of file
+    preco: float
+    nome_fornecedor: Optional[str] = None
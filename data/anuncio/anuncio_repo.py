@@ -1,14 +1,21 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from data.anuncio.anuncio_model import Anuncio
 from data.fornecedor.fornecedor_model import Fornecedor
 from data.anuncio.anuncio_sql import *
+from util.busca_textual import montar_consulta_fts
 from util.db import open_connection
+from util.paginacao import Pagina, paginar
 
 
 def criar_tabela_anuncio() -> bool:
     with open_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(CRIAR_TABELA_ANUNCIO)
+        # Índice de busca textual, mantido pelos gatilhos
+        cursor.execute(CRIAR_TABELA_ANUNCIO_FTS)
+        cursor.execute(CRIAR_GATILHO_ANUNCIO_FTS_INSERT)
+        cursor.execute(CRIAR_GATILHO_ANUNCIO_FTS_DELETE)
+        cursor.execute(CRIAR_GATILHO_ANUNCIO_FTS_UPDATE)
         conn.commit()
         return True
 
@@ -80,6 +87,7 @@ def obter_anuncio_por_id(anuncio_id: int) -> Optional[Anuncio]:
                 data_criacao=row["data_criacao"],
                 descricao=row["descricao"],
                 preco=row["preco"],
+                nome_fornecedor=row["nome_fornecedor"],
             )
         return None
 
@@ -99,35 +107,100 @@ def obter_anuncio_paginado(limite: int, offset: int) -> List[Anuncio]:
                     data_criacao=row["data_criacao"],
                     descricao=row["descricao"],
                     preco=row["preco"],
+                    nome_fornecedor=row["nome_fornecedor"],
                 )
             )
         return anuncios
 
 
-def obter_anuncio_por_termo_paginado(
-    termo: str, limite: int, offset: int
-) -> List[Anuncio]:
-    termo_wildcard = f"%{termo}%"
+def listar_anuncios(limite: int, cursor: Optional[str] = None) -> Pagina[Anuncio]:
+    """Todos os anúncios em ordem de id, paginados por cursor."""
     with open_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            OBTER_ANUNCIO_POR_TERMO_PAGINADO,
-            (termo_wildcard, termo_wildcard, termo_wildcard, limite, offset),
+        pagina = paginar(conn, LISTAR_ANUNCIOS, (), ["a.id_anuncio"], limite, cursor)
+        return pagina.mapear(
+            lambda row: Anuncio(
+                id_anuncio=row["id_anuncio"],
+                nome_anuncio=row["nome_anuncio"],
+                id_fornecedor=row["id_fornecedor"],
+                data_criacao=row["data_criacao"],
+                descricao=row["descricao"],
+                preco=row["preco"],
+                nome_fornecedor=row["nome_fornecedor"],
+            )
         )
+
+
+def contar_anuncios() -> int:
+    with open_connection() as conn:
+        return conn.execute(CONTAR_ANUNCIOS).fetchone()["total"]
+
+
+def buscar_anuncios(termo: str, limite: int, offset: int) -> Tuple[List[Anuncio], int]:
+    """
+    Busca de anúncios para a moderação.
+
+    - termo vazio: todos os anúncios, em ordem de id;
+    - termo numérico que é o id de um anúncio: só esse anúncio;
+    - demais casos: busca textual (FTS5) em nome, descrição e razão social
+      do fornecedor, ignorando acentos, ordenada por relevância.
+
+    Returns:
+        (anúncios da página, total de anúncios encontrados)
+    """
+    termo = (termo or "").strip()
+    if not termo:
+        return obter_anuncio_paginado(limite, offset), contar_anuncios()
+
+    if termo.isdigit():
+        anuncio = obter_anuncio_por_id(int(termo))
+        if anuncio:
+            return ([anuncio] if offset == 0 else []), 1
+
+    consulta = montar_consulta_fts(termo)
+    if consulta is None:
+        return [], 0
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_ANUNCIO_POR_TERMO_PAGINADO, (consulta, limite, offset))
         rows = cursor.fetchall()
-        anuncios = []
-        for row in rows:
-            anuncios.append(
-                Anuncio(
-                    id_anuncio=row["id_anuncio"],
-                    nome_anuncio=row["nome_anuncio"],
-                    id_fornecedor=row["id_fornecedor"],
-                    data_criacao=row["data_criacao"],
-                    descricao=row["descricao"],
-                    preco=row["preco"],
-                )
+        anuncios = [
+            Anuncio(
+                id_anuncio=row["id_anuncio"],
+                nome_anuncio=row["nome_anuncio"],
+                id_fornecedor=row["id_fornecedor"],
+                data_criacao=row["data_criacao"],
+                descricao=row["descricao"],
+                preco=row["preco"],
+                nome_fornecedor=row["nome_fornecedor"],
             )
-        return anuncios
+            for row in rows
+        ]
+        # Página além do fim não traz linhas (nem o total): conta à parte
+        if rows:
+            total = rows[0]["total"]
+        elif offset:
+            total = buscar_anuncios(termo, 1, 0)[1]
+        else:
+            total = 0
+        return anuncios, total
+
+
+def obter_anuncio_por_termo_paginado(
+    termo: str, limite: int, offset: int
+) -> List[Anuncio]:
+    return buscar_anuncios(termo, limite, offset)[0]
+
+
+def reconstruir_indice_busca_anuncios(conn=None) -> None:
+    """Repopula anuncio_fts a partir de anuncio e fornecedor."""
+    if conn is not None:
+        conn.execute(LIMPAR_ANUNCIO_FTS)
+        conn.execute(POPULAR_ANUNCIO_FTS)
+        return
+    with open_connection() as conn:
+        conn.execute("BEGIN")
+        reconstruir_indice_busca_anuncios(conn)
+        conn.commit()
 
 
 def atualizar_anuncio_por_nome(anuncio: Anuncio, nome_antigo: str) -> bool:
@@ -59,7 +59,8 @@ ORDER BY a.id_anuncio
 LIMIT ? OFFSET ?
 """
 
-OBTER_ANUNCIO_POR_TERMO_PAGINADO = """
+# Base da listagem paginada por cursor (util.paginacao), chave: a.id_anuncio
+LISTAR_ANUNCIOS = """
 SELECT
     a.id_anuncio,
     a.nome_anuncio,
@@ -70,11 +71,35 @@ SELECT
     f.razao_social AS nome_fornecedor
 FROM anuncio a
 JOIN fornecedor f ON a.id_fornecedor = f.id
-WHERE a.nome_anuncio LIKE ? OR CAST(a.id_anuncio AS TEXT) LIKE ? OR f.razao_social LIKE ?
-ORDER BY a.id_anuncio
+"""
+
+# Busca textual (FTS5) em nome, descrição e razão social do fornecedor.
+# "total" conta todos os resultados do MATCH (antes do LIMIT), evitando
+# uma segunda consulta só para a paginação.
+OBTER_ANUNCIO_POR_TERMO_PAGINADO = """
+SELECT
+    a.id_anuncio,
+    a.nome_anuncio,
+    a.id_fornecedor,
+    a.data_criacao,
+    a.descricao,
+    a.preco,
+    f.razao_social AS nome_fornecedor,
+    COUNT(*) OVER () AS total
+FROM anuncio_fts
+JOIN anuncio a ON a.id_anuncio = anuncio_fts.rowid
+JOIN fornecedor f ON a.id_fornecedor = f.id
+WHERE anuncio_fts MATCH ?
+ORDER BY anuncio_fts.rank, a.id_anuncio
 LIMIT ? OFFSET ?
 """
 
+CONTAR_ANUNCIOS = """
+SELECT COUNT(*) AS total
+FROM anuncio a
+JOIN fornecedor f ON a.id_fornecedor = f.id
+"""
+
 ATUALIZAR_ANUNCIO_POR_NOME = """
 UPDATE anuncio
 SET nome_anuncio = ?,
@@ -89,3 +114,72 @@ DELETAR_ANUNCIO = """
 DELETE FROM anuncio
 WHERE id_anuncio = ?
 """
+
+
+# Índices (aplicados pela migração versionada em util/migracoes.py)
+CRIAR_INDICE_ANUNCIO_FORNECEDOR = """
+CREATE INDEX IF NOT EXISTS idx_anuncio_fornecedor ON anuncio (id_fornecedor);
+"""
+
+CRIAR_INDICE_ANUNCIO_NOME = """
+CREATE INDEX IF NOT EXISTS idx_anuncio_nome ON anuncio (nome_anuncio);
+"""
+
+
+# Índice textual de anúncio. Guarda o próprio conteúdo porque inclui a
+# razão social do fornecedor, que não está na tabela anuncio.
+CRIAR_TABELA_ANUNCIO_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS anuncio_fts USING fts5(
+    nome_anuncio,
+    descricao,
+    nome_fornecedor,
+    tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+CRIAR_GATILHO_ANUNCIO_FTS_INSERT = """
+CREATE TRIGGER IF NOT EXISTS anuncio_fts_insert AFTER INSERT ON anuncio BEGIN
+    INSERT INTO anuncio_fts (rowid, nome_anuncio, descricao, nome_fornecedor)
+    VALUES (
+        new.id_anuncio, new.nome_anuncio, new.descricao,
+        (SELECT razao_social FROM fornecedor WHERE id = new.id_fornecedor)
+    );
+END;
+"""
+
+CRIAR_GATILHO_ANUNCIO_FTS_DELETE = """
+CREATE TRIGGER IF NOT EXISTS anuncio_fts_delete AFTER DELETE ON anuncio BEGIN
+    DELETE FROM anuncio_fts WHERE rowid = old.id_anuncio;
+END;
+"""
+
+CRIAR_GATILHO_ANUNCIO_FTS_UPDATE = """
+CREATE TRIGGER IF NOT EXISTS anuncio_fts_update AFTER UPDATE ON anuncio BEGIN
+    DELETE FROM anuncio_fts WHERE rowid = old.id_anuncio;
+    INSERT INTO anuncio_fts (rowid, nome_anuncio, descricao, nome_fornecedor)
+    VALUES (
+        new.id_anuncio, new.nome_anuncio, new.descricao,
+        (SELECT razao_social FROM fornecedor WHERE id = new.id_fornecedor)
+    );
+END;
+"""
+
+# Criado pela migração (depende de fornecedor e anuncio_fts já existirem)
+CRIAR_GATILHO_FORNECEDOR_ANUNCIO_FTS = """
+CREATE TRIGGER IF NOT EXISTS fornecedor_anuncio_fts_update
+AFTER UPDATE OF razao_social ON fornecedor BEGIN
+    UPDATE anuncio_fts SET nome_fornecedor = new.razao_social
+    WHERE rowid IN (SELECT id_anuncio FROM anuncio WHERE id_fornecedor = new.id);
+END;
+"""
+
+LIMPAR_ANUNCIO_FTS = """
+DELETE FROM anuncio_fts
+"""
+
+POPULAR_ANUNCIO_FTS = """
+INSERT INTO anuncio_fts (rowid, nome_anuncio, descricao, nome_fornecedor)
+SELECT a.id_anuncio, a.nome_anuncio, a.descricao, f.razao_social
+FROM anuncio a
+LEFT JOIN fornecedor f ON f.id = a.id_fornecedor
+"""
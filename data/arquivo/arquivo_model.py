@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+@dataclass
+class Arquivo:
+    hash: str  # sha256 do conteúdo
+    url: str  # /static/uploads/arquivos/<2 primeiros>/<hash>.<ext>
+    tamanho: int
+    referencias: int  # linhas de produto/usuario que usam a URL
+    criado_em: str
+    atualizado_em: str
@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import List, Optional
+from data.arquivo.arquivo_model import Arquivo
+from data.arquivo.arquivo_sql import *
+from util.db import open_connection
+
+
+def _montar_arquivo(row) -> Arquivo:
+    return Arquivo(
+        hash=row["hash"],
+        url=row["url"],
+        tamanho=row["tamanho"],
+        referencias=row["referencias"],
+        criado_em=row["criado_em"],
+        atualizado_em=row["atualizado_em"],
+    )
+
+
+def criar_tabela_arquivo() -> bool:
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(CRIAR_TABELA_ARQUIVO)
+        conn.commit()
+        return True
+
+
+def registrar_arquivo(hash: str, url: str, tamanho: int) -> None:
+    """Registra o conteúdo (ou renova o registro se ele já existe)."""
+    agora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(REGISTRAR_ARQUIVO, (hash, url, tamanho, agora, agora))
+        conn.commit()
+
+
+def obter_arquivo_por_hash(hash: str) -> Optional[Arquivo]:
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_ARQUIVO_POR_HASH, (hash,))
+        row = cursor.fetchone()
+        return _montar_arquivo(row) if row else None
+
+
+def obter_arquivo_por_url(url: str) -> Optional[Arquivo]:
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_ARQUIVO_POR_URL, (url,))
+        row = cursor.fetchone()
+        return _montar_arquivo(row) if row else None
+
+
+def obter_arquivos_orfaos(antes_de: str) -> List[Arquivo]:
+    """Arquivos sem referências e sem atividade desde ``antes_de``."""
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_ARQUIVOS_ORFAOS, (antes_de,))
+        return [_montar_arquivo(row) for row in cursor.fetchall()]
+
+
+def excluir_arquivo_orfao(hash: str, antes_de: str) -> bool:
+    """Apaga o registro se ele ainda estiver órfão; True se apagou."""
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(EXCLUIR_ARQUIVO_ORFAO, (hash, antes_de))
+        conn.commit()
+        return cursor.rowcount > 0
+
+
+def recontar_referencias() -> None:
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(RECONTAR_REFERENCIAS)
+        conn.commit()
@@ -0,0 +1,104 @@
+CRIAR_TABELA_ARQUIVO = """
+CREATE TABLE IF NOT EXISTS arquivo (
+    hash TEXT PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    tamanho INTEGER NOT NULL,
+    referencias INTEGER NOT NULL DEFAULT 0,
+    criado_em TEXT NOT NULL,
+    atualizado_em TEXT NOT NULL
+);
+"""
+
+
+# Conteúdo novo entra sem referências: quem passa a usar a URL (produto.foto,
+# usuario.foto) é contado pelos gatilhos abaixo. Reenviar o mesmo conteúdo
+# só renova atualizado_em, o que o protege da limpeza de órfãos.
+REGISTRAR_ARQUIVO = """
+INSERT INTO arquivo (hash, url, tamanho, referencias, criado_em, atualizado_em)
+VALUES (?, ?, ?, 0, ?, ?)
+ON CONFLICT(hash) DO UPDATE SET atualizado_em = excluded.atualizado_em;
+"""
+
+
+OBTER_ARQUIVO_POR_HASH = """
+SELECT * FROM arquivo
+WHERE hash = ?;
+"""
+
+
+OBTER_ARQUIVO_POR_URL = """
+SELECT * FROM arquivo
+WHERE url = ?;
+"""
+
+
+OBTER_ARQUIVOS_ORFAOS = """
+SELECT * FROM arquivo
+WHERE referencias = 0 AND atualizado_em < ?
+ORDER BY atualizado_em;
+"""
+
+
+# Só apaga se continuar órfão (outra requisição pode ter reenviado o conteúdo)
+EXCLUIR_ARQUIVO_ORFAO = """
+DELETE FROM arquivo
+WHERE hash = ? AND referencias = 0 AND atualizado_em < ?;
+"""
+
+
+# Reparo: recalcula as referências a partir das tabelas que guardam URLs
+RECONTAR_REFERENCIAS = """
+UPDATE arquivo
+SET referencias = (SELECT COUNT(*) FROM produto WHERE foto = arquivo.url)
+                + (SELECT COUNT(*) FROM usuario WHERE foto = arquivo.url);
+"""
+
+
+# Índices e gatilhos (aplicados pela migração versionada em util/migracoes.py)
+CRIAR_INDICE_ARQUIVO_ORFAO = """
+CREATE INDEX IF NOT EXISTS idx_arquivo_orfao ON arquivo (atualizado_em) WHERE referencias = 0;
+"""
+
+CRIAR_GATILHO_ARQUIVO_PRODUTO_INSERT = """
+CREATE TRIGGER IF NOT EXISTS arquivo_ref_produto_insert AFTER INSERT ON produto
+WHEN new.foto IS NOT NULL BEGIN
+    UPDATE arquivo SET referencias = referencias + 1 WHERE url = new.foto;
+END;
+"""
+
+CRIAR_GATILHO_ARQUIVO_PRODUTO_UPDATE = """
+CREATE TRIGGER IF NOT EXISTS arquivo_ref_produto_update AFTER UPDATE OF foto ON produto
+WHEN old.foto IS NOT new.foto BEGIN
+    UPDATE arquivo SET referencias = referencias - 1 WHERE url = old.foto;
+    UPDATE arquivo SET referencias = referencias + 1 WHERE url = new.foto;
+END;
+"""
+
+CRIAR_GATILHO_ARQUIVO_PRODUTO_DELETE = """
+CREATE TRIGGER IF NOT EXISTS arquivo_ref_produto_delete AFTER DELETE ON produto
+WHEN old.foto IS NOT NULL BEGIN
+    UPDATE arquivo SET referencias = referencias - 1 WHERE url = old.foto;
+END;
+"""
+
+CRIAR_GATILHO_ARQUIVO_USUARIO_INSERT = """
+CREATE TRIGGER IF NOT EXISTS arquivo_ref_usuario_insert AFTER INSERT ON usuario
+WHEN new.foto IS NOT NULL BEGIN
+    UPDATE arquivo SET referencias = referencias + 1 WHERE url = new.foto;
+END;
+"""
+
+CRIAR_GATILHO_ARQUIVO_USUARIO_UPDATE = """
+CREATE TRIGGER IF NOT EXISTS arquivo_ref_usuario_update AFTER UPDATE OF foto ON usuario
+WHEN old.foto IS NOT new.foto BEGIN
+    UPDATE arquivo SET referencias = referencias - 1 WHERE url = old.foto;
+    UPDATE arquivo SET referencias = referencias + 1 WHERE url = new.foto;
+END;
+"""
+
+CRIAR_GATILHO_ARQUIVO_USUARIO_DELETE = """
+CREATE TRIGGER IF NOT EXISTS arquivo_ref_usuario_delete AFTER DELETE ON usuario
+WHEN old.foto IS NOT NULL BEGIN
+    UPDATE arquivo SET referencias = referencias - 1 WHERE url = old.foto;
+END;
+"""
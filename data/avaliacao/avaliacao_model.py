@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 @dataclass
 class Avaliacao:
@@ -11,4 +11,26 @@ class Avaliacao:
     data_avaliacao: datetime
     descricao: str
     nome_avaliador: Optional[str] = None
-    nome_avaliado: Optional[str] = None
\ No newline at end of file
+    nome_avaliado: Optional[str] = None
+
+
+@dataclass
+class EstatisticasAvaliacao:
+    total: int = 0
+    media: float = 0.0
+    nota_minima: float = 0.0
+    nota_maxima: float = 0.0
+    # estrelas (1 a 5) -> quantidade de avaliações
+    histograma: Dict[int, int] = field(default_factory=lambda: {i: 0 for i in range(1, 6)})
+
+
+@dataclass
+class ResumoAvaliacao:
+    id_avaliado: int
+    quantidade: int = 0
+    soma_notas: float = 0.0
+    histograma: Dict[int, int] = field(default_factory=lambda: {i: 0 for i in range(1, 6)})
+
+    @property
+    def media(self) -> float:
+        return self.soma_notas / self.quantidade if self.quantidade else 0.0
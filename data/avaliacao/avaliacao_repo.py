@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, List
-from data.avaliacao.avaliacao_model import Avaliacao
+from data.avaliacao.avaliacao_model import Avaliacao, EstatisticasAvaliacao, ResumoAvaliacao
 from data.avaliacao.avaliacao_sql import *
 from util.db import open_connection
 
@@ -8,12 +8,43 @@ from util.db import open_connection
 def criar_tabela_avaliacao() -> bool:
     with open_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(f"DROP TABLE IF EXISTS avaliacao")
         cursor.execute(CRIAR_TABELA_AVALIACAO)
+        cursor.execute(CRIAR_TABELA_RESUMO_AVALIACAO)
         conn.commit()
         return True
 
 
+def _estrelas(nota: float) -> int:
+    """Faixa de 1 a 5 estrelas da nota (mesmas faixas usadas no SQL)."""
+    return min(5, max(1, int(nota + 0.5)))
+
+
+def _acumular_resumo(cursor, id_avaliado: int, nota: float, sinal: int) -> None:
+    """
+    Soma (sinal=1) ou subtrai (sinal=-1) uma avaliação do resumo do avaliado.
+    Deve ser chamada com o mesmo cursor da alteração em avaliacao, antes do
+    commit, para que resumo e avaliações nunca fiquem divergentes.
+    """
+    estrelas = [sinal if _estrelas(nota) == i else 0 for i in range(1, 6)]
+    cursor.execute(ACUMULAR_RESUMO_AVALIACAO, (id_avaliado, sinal, sinal * nota, *estrelas))
+    if sinal < 0:
+        cursor.execute(REMOVER_RESUMO_VAZIO, (id_avaliado,))
+
+
+def _iniciar_escrita(conn) -> None:
+    """
+    Abre a transação já com a trava de escrita (BEGIN IMMEDIATE), para que a
+    nota anterior lida em seguida não mude antes do UPDATE/DELETE.
+
+    Se a conexão já estiver em transação (conn.in_transaction: dentro de
+    unit_of_work(), depois de alguma escrita anterior da unidade), ela já
+    detém a trava de escrita e nada é feito; caso contrário, inclusive no
+    início de uma unidade, o BEGIN IMMEDIATE é emitido aqui.
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+
 def inserir_avaliacao(avaliacao: Avaliacao) -> Optional[int]:
     with open_connection() as conn:
         cursor = conn.cursor()
@@ -27,8 +58,10 @@ def inserir_avaliacao(avaliacao: Avaliacao) -> Optional[int]:
                 avaliacao.descricao,
             ),
         )
+        id_avaliacao = cursor.lastrowid
+        _acumular_resumo(cursor, avaliacao.id_avaliado, avaliacao.nota, 1)
         conn.commit()
-        return cursor.lastrowid
+        return id_avaliacao
 
 
 def obter_todos() -> List[Avaliacao]:
@@ -53,6 +86,60 @@ def obter_todos() -> List[Avaliacao]:
         return avaliacoes
 
 
+ORDENACOES_AVALIACOES = {
+    "recente": OBTER_AVALIACOES_RECEBIDAS_RECENTES,
+    "antiga": OBTER_AVALIACOES_RECEBIDAS_ANTIGAS,
+    "nota_alta": OBTER_AVALIACOES_RECEBIDAS_NOTA_ALTA,
+    "nota_baixa": OBTER_AVALIACOES_RECEBIDAS_NOTA_BAIXA,
+}
+
+
+def obter_avaliacoes_recebidas(
+    id_avaliado: int, ordenar: str = "recente", limit: int = 10, offset: int = 0
+) -> List[Avaliacao]:
+    """
+    Avaliações recebidas por um usuário, ordenadas (recente, antiga,
+    nota_alta, nota_baixa) e paginadas no banco.
+    """
+    sql = ORDENACOES_AVALIACOES.get(ordenar, OBTER_AVALIACOES_RECEBIDAS_RECENTES)
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, (id_avaliado, limit, offset))
+        return [
+            Avaliacao(
+                id_avaliacao=row["id_avaliacao"],
+                id_avaliador=row["id_avaliador"],
+                id_avaliado=row["id_avaliado"],
+                nota=row["nota"],
+                data_avaliacao=row["data_avaliacao"],
+                descricao=row["descricao"],
+                nome_avaliador=row["nome_avaliador"],
+                nome_avaliado=row["nome_avaliado"],
+            )
+            for row in cursor.fetchall()
+        ]
+
+
+def obter_estatisticas_avaliacoes(id_avaliado: int) -> EstatisticasAvaliacao:
+    """
+    Total, média, mínimo, máximo e histograma de estrelas em uma consulta,
+    lidos de resumo_avaliacao (sem agregar as avaliações do avaliado).
+    """
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_ESTATISTICAS_AVALIACOES, (id_avaliado,))
+        row = cursor.fetchone()
+        if not row or not row["total"]:
+            return EstatisticasAvaliacao()
+        return EstatisticasAvaliacao(
+            total=row["total"],
+            media=row["soma_notas"] / row["total"],
+            nota_minima=row["nota_minima"],
+            nota_maxima=row["nota_maxima"],
+            histograma={i: row[f"estrelas_{i}"] for i in range(1, 6)},
+        )
+
+
 def obter_avaliacao_por_id(id_avaliacao: int) -> Optional[Avaliacao]:
     with open_connection() as conn:
         cursor = conn.cursor()
@@ -93,6 +180,8 @@ def atualizar_avaliacao(avaliacao: Avaliacao) -> bool:
     """
     with open_connection() as conn:
         cursor = conn.cursor()
+        _iniciar_escrita(conn)
+        anterior = cursor.execute(OBTER_NOTA_AVALIACAO, (avaliacao.id_avaliacao,)).fetchone()
         cursor.execute(
             ATUALIZAR_AVALIACAO,
             (
@@ -104,13 +193,58 @@ def atualizar_avaliacao(avaliacao: Avaliacao) -> bool:
                 avaliacao.id_avaliacao,
             ),
         )
+        atualizado = cursor.rowcount > 0
+        if atualizado and anterior:
+            _acumular_resumo(cursor, anterior["id_avaliado"], anterior["nota"], -1)
+            _acumular_resumo(cursor, avaliacao.id_avaliado, avaliacao.nota, 1)
         conn.commit()
-        return cursor.rowcount > 0
+        return atualizado
 
 
 def deletar_avaliacao(id_avaliacao: int) -> bool:
     with open_connection() as conn:
         cursor = conn.cursor()
+        _iniciar_escrita(conn)
+        anterior = cursor.execute(OBTER_NOTA_AVALIACAO, (id_avaliacao,)).fetchone()
         cursor.execute(DELETAR_AVALIACAO, (id_avaliacao,))
+        deletado = cursor.rowcount > 0
+        if deletado and anterior:
+            _acumular_resumo(cursor, anterior["id_avaliado"], anterior["nota"], -1)
+        conn.commit()
+        return deletado
+
+
+def obter_resumo_avaliacao(id_avaliado: int) -> ResumoAvaliacao:
+    """Quantidade, soma e histograma de notas do avaliado, lidos do resumo."""
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_RESUMO_AVALIACAO, (id_avaliado,))
+        row = cursor.fetchone()
+        if not row:
+            return ResumoAvaliacao(id_avaliado=id_avaliado)
+        return ResumoAvaliacao(
+            id_avaliado=row["id_avaliado"],
+            quantidade=row["quantidade"],
+            soma_notas=row["soma_notas"],
+            histograma={i: row[f"estrelas_{i}"] for i in range(1, 6)},
+        )
+
+
+def reconstruir_resumo_avaliacoes(conn=None) -> int:
+    """
+    Recalcula resumo_avaliacao a partir da tabela avaliacao (em uma única
+    transação). Usada pela migração que cria o resumo e pelo script
+    scripts/reconstruir_resumo_avaliacoes.py.
+
+    Returns:
+        Quantidade de avaliados no resumo.
+    """
+    if conn is not None:
+        conn.execute(CRIAR_TABELA_RESUMO_AVALIACAO)
+        conn.execute(LIMPAR_RESUMO_AVALIACAO)
+        return conn.execute(RECONSTRUIR_RESUMO_AVALIACAO).rowcount
+    with open_connection() as conn:
+        conn.execute("BEGIN")
+        total = reconstruir_resumo_avaliacoes(conn)
         conn.commit()
-        return cursor.rowcount > 0
+        return total
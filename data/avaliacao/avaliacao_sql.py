@@ -63,4 +63,136 @@ WHERE id_avaliacao = ?;
 DELETAR_AVALIACAO= """
 DELETE FROM avaliacao
 WHERE id_avaliacao = ?;
-"""
\ No newline at end of file
+"""
+
+
+# Índices (aplicados pela migração versionada em util/migracoes.py)
+CRIAR_INDICE_AVALIACAO_AVALIADO = """
+CREATE INDEX IF NOT EXISTS idx_avaliacao_avaliado ON avaliacao (id_avaliado, data_avaliacao);
+"""
+
+CRIAR_INDICE_AVALIACAO_AVALIADOR = """
+CREATE INDEX IF NOT EXISTS idx_avaliacao_avaliador ON avaliacao (id_avaliador);
+"""
+
+
+# Avaliações recebidas por um usuário, ordenadas e paginadas no banco.
+# As ordenações por data e por nota usam os índices
+# idx_avaliacao_avaliado e idx_avaliacao_avaliado_nota.
+_OBTER_AVALIACOES_RECEBIDAS = """
+SELECT
+    a.id_avaliacao,
+    a.id_avaliador,
+    a.id_avaliado,
+    a.nota,
+    a.data_avaliacao,
+    a.descricao,
+    u1.nome AS nome_avaliador,
+    u2.nome AS nome_avaliado
+FROM avaliacao a
+LEFT JOIN usuario u1 ON a.id_avaliador = u1.id
+LEFT JOIN usuario u2 ON a.id_avaliado = u2.id
+WHERE a.id_avaliado = ?
+ORDER BY {ordem}
+LIMIT ? OFFSET ?;
+"""
+
+OBTER_AVALIACOES_RECEBIDAS_RECENTES = _OBTER_AVALIACOES_RECEBIDAS.format(
+    ordem="a.data_avaliacao DESC, a.id_avaliacao DESC"
+)
+OBTER_AVALIACOES_RECEBIDAS_ANTIGAS = _OBTER_AVALIACOES_RECEBIDAS.format(
+    ordem="a.data_avaliacao ASC, a.id_avaliacao ASC"
+)
+OBTER_AVALIACOES_RECEBIDAS_NOTA_ALTA = _OBTER_AVALIACOES_RECEBIDAS.format(
+    ordem="a.nota DESC, a.id_avaliacao DESC"
+)
+OBTER_AVALIACOES_RECEBIDAS_NOTA_BAIXA = _OBTER_AVALIACOES_RECEBIDAS.format(
+    ordem="a.nota ASC, a.id_avaliacao ASC"
+)
+
+# Total, soma e histograma vêm do resumo (uma linha); mínimo e máximo, que o
+# resumo não guarda, são uma busca em cada ponta de idx_avaliacao_avaliado_nota.
+OBTER_ESTATISTICAS_AVALIACOES = """
+SELECT
+    r.quantidade AS total,
+    r.soma_notas,
+    r.estrelas_1, r.estrelas_2, r.estrelas_3, r.estrelas_4, r.estrelas_5,
+    (SELECT MIN(nota) FROM avaliacao WHERE id_avaliado = r.id_avaliado) AS nota_minima,
+    (SELECT MAX(nota) FROM avaliacao WHERE id_avaliado = r.id_avaliado) AS nota_maxima
+FROM resumo_avaliacao r
+WHERE r.id_avaliado = ?;
+"""
+
+CRIAR_INDICE_AVALIACAO_AVALIADO_NOTA = """
+CREATE INDEX IF NOT EXISTS idx_avaliacao_avaliado_nota ON avaliacao (id_avaliado, nota);
+"""
+
+
+# Resumo materializado por avaliado (mantido pelo avaliacao_repo na mesma
+# transação de cada inserção/atualização/exclusão de avaliação)
+CRIAR_TABELA_RESUMO_AVALIACAO = """
+CREATE TABLE IF NOT EXISTS resumo_avaliacao (
+    id_avaliado INTEGER PRIMARY KEY,
+    quantidade INTEGER NOT NULL DEFAULT 0,
+    soma_notas REAL NOT NULL DEFAULT 0,
+    estrelas_1 INTEGER NOT NULL DEFAULT 0,
+    estrelas_2 INTEGER NOT NULL DEFAULT 0,
+    estrelas_3 INTEGER NOT NULL DEFAULT 0,
+    estrelas_4 INTEGER NOT NULL DEFAULT 0,
+    estrelas_5 INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Soma (ou subtrai, com valores negativos) uma avaliação ao resumo do avaliado
+ACUMULAR_RESUMO_AVALIACAO = """
+INSERT INTO resumo_avaliacao (
+    id_avaliado, quantidade, soma_notas,
+    estrelas_1, estrelas_2, estrelas_3, estrelas_4, estrelas_5
+)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id_avaliado) DO UPDATE SET
+    quantidade = quantidade + excluded.quantidade,
+    soma_notas = soma_notas + excluded.soma_notas,
+    estrelas_1 = estrelas_1 + excluded.estrelas_1,
+    estrelas_2 = estrelas_2 + excluded.estrelas_2,
+    estrelas_3 = estrelas_3 + excluded.estrelas_3,
+    estrelas_4 = estrelas_4 + excluded.estrelas_4,
+    estrelas_5 = estrelas_5 + excluded.estrelas_5;
+"""
+
+REMOVER_RESUMO_VAZIO = """
+DELETE FROM resumo_avaliacao WHERE id_avaliado = ? AND quantidade <= 0;
+"""
+
+OBTER_NOTA_AVALIACAO = """
+SELECT id_avaliado, nota FROM avaliacao WHERE id_avaliacao = ?;
+"""
+
+OBTER_RESUMO_AVALIACAO = """
+SELECT id_avaliado, quantidade, soma_notas,
+       estrelas_1, estrelas_2, estrelas_3, estrelas_4, estrelas_5
+FROM resumo_avaliacao
+WHERE id_avaliado = ?;
+"""
+
+LIMPAR_RESUMO_AVALIACAO = """
+DELETE FROM resumo_avaliacao;
+"""
+
+RECONSTRUIR_RESUMO_AVALIACAO = """
+INSERT INTO resumo_avaliacao (
+    id_avaliado, quantidade, soma_notas,
+    estrelas_1, estrelas_2, estrelas_3, estrelas_4, estrelas_5
+)
+SELECT
+    id_avaliado,
+    COUNT(*),
+    SUM(nota),
+    SUM(CASE WHEN nota < 1.5 THEN 1 ELSE 0 END),
+    SUM(CASE WHEN nota >= 1.5 AND nota < 2.5 THEN 1 ELSE 0 END),
+    SUM(CASE WHEN nota >= 2.5 AND nota < 3.5 THEN 1 ELSE 0 END),
+    SUM(CASE WHEN nota >= 3.5 AND nota < 4.5 THEN 1 ELSE 0 END),
+    SUM(CASE WHEN nota >= 4.5 THEN 1 ELSE 0 END)
+FROM avaliacao
+GROUP BY id_avaliado;
+"""
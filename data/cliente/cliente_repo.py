@@ -3,25 +3,28 @@ import sqlite3
 from typing import Optional, List
 from data.cliente.cliente_model import Cliente
 from data.cliente.cliente_sql import *
+from data.usuario.usuario_model import FiltroUsuarios
 from data.usuario.usuario_repo import (
     inserir_usuario,
     atualizar_usuario,
     deletar_usuario,
+    montar_filtro_usuarios,
 )
-from util.db import open_connection
+from util.db import open_connection, unit_of_work
+from util.paginacao import Pagina, paginar
 
 
 def criar_tabela_cliente() -> bool:
     with open_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("DROP TABLE IF EXISTS cliente")
         cursor.execute(CRIAR_TABELA_CLIENTE)
         conn.commit()
         return True
 
 
 def inserir_cliente(cliente: Cliente) -> Optional[int]:
-    with open_connection() as conn:
+    # usuario + cliente na mesma transação
+    with unit_of_work(), open_connection() as conn:
         try:
             cursor = conn.cursor()
             id_usuario_gerado = inserir_usuario(cliente)
@@ -52,39 +55,38 @@ def obter_cliente() -> List[Cliente]:
         cursor = conn.cursor()
         cursor.execute(OBTER_CLIENTE)
         rows = cursor.fetchall()
-        clientes = []
-        for row in rows:
-            clientes.append(
-                Cliente(
-                    id=row["id"],
-                    nome=row["nome"],
-                    email=row["email"],
-                    senha=row["senha"] if "senha" in row.keys() else "",
-                    cpf_cnpj=row["cpf_cnpj"],
-                    telefone=row["telefone"],
-                    cep=row["cep"] if "cep" in row.keys() else "",
-                    complemento=(
-                        row["complemento"] if "complemento" in row.keys() else ""
-                    ),
-                    estado=row["estado"],
-                    cidade=row["cidade"],
-                    rua=row["rua"],
-                    numero=row["numero"],
-                    bairro=row["bairro"],
-                    data_cadastro=row["data_cadastro"],
-                    tipo_usuario=row["tipo_usuario"],
-                    genero=row["genero"],
-                    data_nascimento=(
-                        date.fromisoformat(row["data_nascimento"])
-                        if "data_nascimento" in row.keys() and row["data_nascimento"]
-                        else None
-                    ),
-                    foto=row["foto"],
-                    token_redefinicao=row["token_redefinicao"],
-                    data_token=row["data_token"],
-                )
-            )
-        return clientes
+        return [_cliente_da_linha(row) for row in rows]
+
+
+def _cliente_da_linha(row) -> Cliente:
+    return Cliente(
+        id=row["id"],
+        nome=row["nome"],
+        email=row["email"],
+        senha=row["senha"] if "senha" in row.keys() else "",
+        cpf_cnpj=row["cpf_cnpj"],
+        telefone=row["telefone"],
+        cep=row["cep"] if "cep" in row.keys() else "",
+        complemento=(
+            row["complemento"] if "complemento" in row.keys() else ""
+        ),
+        estado=row["estado"],
+        cidade=row["cidade"],
+        rua=row["rua"],
+        numero=row["numero"],
+        bairro=row["bairro"],
+        data_cadastro=row["data_cadastro"],
+        tipo_usuario=row["tipo_usuario"],
+        genero=row["genero"],
+        data_nascimento=(
+            date.fromisoformat(row["data_nascimento"])
+            if "data_nascimento" in row.keys() and row["data_nascimento"]
+            else None
+        ),
+        foto=row["foto"],
+        token_redefinicao=row["token_redefinicao"],
+        data_token=row["data_token"],
+    )
 
 
 def obter_cliente_por_id(cliente_id: int) -> Optional[Cliente]:
@@ -196,3 +198,23 @@ def atualizar_foto(id: int, caminho_foto: str) -> bool:
         cursor = conn.cursor()
         cursor.execute("UPDATE cliente SET foto = ? WHERE id = ?", (caminho_foto, id))
         return cursor.rowcount > 0
+
+
+def listar_clientes(
+    filtro: Optional[FiltroUsuarios] = None, limite: int = 20, cursor: Optional[str] = None
+) -> Pagina[Cliente]:
+    """Listagem administrativa filtrada, dos cadastros mais recentes para os mais antigos."""
+    where, parametros = montar_filtro_usuarios(filtro)
+    with open_connection() as conn:
+        pagina = paginar(
+            conn, LISTAR_CLIENTES + where, parametros, ["c.id"], limite, cursor,
+            decrescente=True,
+        )
+        return pagina.mapear(_cliente_da_linha)
+
+
+def contar_clientes(filtro: Optional[FiltroUsuarios] = None) -> int:
+    where, parametros = montar_filtro_usuarios(filtro)
+    sql = CONTAR_CLIENTES_FILTRADOS if filtro and filtro.filtra_usuario else CONTAR_CLIENTES
+    with open_connection() as conn:
+        return conn.execute(sql + where, parametros).fetchone()["total"]
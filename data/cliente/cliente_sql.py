@@ -94,3 +94,43 @@ WHERE id = ?;
 ALTER_TABLE_CLIENTE = """ADD COLUMN foto TEXT;"""
 
 UPDATE_CLIENTE = """ SET foto = ? WHERE id = ?;"""
+
+
+# Listagem administrativa: base para util.paginacao (chave: c.id decrescente),
+# com o WHERE de usuario_repo.montar_filtro_usuarios
+LISTAR_CLIENTES = """
+SELECT
+    u.id,
+    u.nome,
+    u.email,
+    u.senha,
+    u.cpf_cnpj,
+    u.telefone,
+    u.cep,
+    u.complemento,
+    u.estado,
+    u.cidade,
+    u.rua,
+    u.numero,
+    u.bairro,
+    u.data_cadastro,
+    u.tipo_usuario,
+    c.genero,
+    c.data_nascimento,
+    u.foto,
+    u.token_redefinicao,
+    u.data_token
+FROM cliente c
+JOIN usuario u ON c.id = u.id
+"""
+
+# Sem filtros de usuário a contagem nem precisa do JOIN
+CONTAR_CLIENTES = """
+SELECT COUNT(*) AS total FROM cliente c
+"""
+
+CONTAR_CLIENTES_FILTRADOS = """
+SELECT COUNT(*) AS total
+FROM cliente c
+JOIN usuario u ON c.id = u.id
+"""
@@ -3,21 +3,23 @@ import sqlite3
 from typing import Optional, List
 from data.fornecedor.fornecedor_model import Fornecedor
 from data.fornecedor.fornecedor_sql import *
-from data.usuario.usuario_repo import inserir_usuario
-from util.db import open_connection
+from data.usuario.usuario_model import FiltroUsuarios
+from data.usuario.usuario_repo import inserir_usuario, montar_filtro_usuarios
+from util.db import open_connection, unit_of_work
+from util.paginacao import Pagina, paginar
 
 
 def criar_tabela_fornecedor() -> bool:
     with open_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("DROP TABLE IF EXISTS fornecedor")
         cursor.execute(CRIAR_TABELA_FORNECEDOR)
         conn.commit()
         return True
 
 
 def inserir_fornecedor(fornecedor: Fornecedor) -> Optional[int]:
-    with open_connection() as conn:
+    # usuario + fornecedor na mesma transação
+    with unit_of_work(), open_connection() as conn:
         cursor = conn.cursor()
         id_usuario_gerado = inserir_usuario(fornecedor)
 
@@ -40,39 +42,38 @@ def obter_fornecedor() -> List[Fornecedor]:
         cursor = conn.cursor()
         cursor.execute(OBTER_FORNECEDOR)
         rows = cursor.fetchall()
-        fornecedores = []
-        for row in rows:
-            fornecedores.append(
-                Fornecedor(
-                    id=row["id"],
-                    nome=row["nome"],
-                    email=row["email"],
-                    senha=row["senha"] if "senha" in row.keys() else "",
-                    cpf_cnpj=row["cpf_cnpj"] if "cpf_cnpj" in row.keys() else "",
-                    telefone=row["telefone"] if "telefone" in row.keys() else "",
-                    cep=row["cep"] if "cep" in row.keys() else "",
-                    estado=row["estado"],
-                    cidade=row["cidade"],
-                    rua=row["rua"],
-                    numero=row["numero"],
-                    complemento=(
-                        row["complemento"] if "complemento" in row.keys() else ""
-                    ),
-                    bairro=row["bairro"],
-                    data_cadastro=(
-                        row["data_cadastro"] if "data_cadastro" in row.keys() else None
-                    ),
-                    razao_social=row["razao_social"],
-                    selo_confianca=(
-                        bool(row["selo_confianca"])
-                        if "selo_confianca" in row.keys()
-                        else False
-                    ),
-                    tipo_usuario=row["tipo_usuario"],
-                    foto=row["foto"] if "foto" in row.keys() else None,
-                )
-            )
-        return fornecedores
+        return [_fornecedor_da_linha(row) for row in rows]
+
+
+def _fornecedor_da_linha(row) -> Fornecedor:
+    return Fornecedor(
+        id=row["id"],
+        nome=row["nome"],
+        email=row["email"],
+        senha=row["senha"] if "senha" in row.keys() else "",
+        cpf_cnpj=row["cpf_cnpj"] if "cpf_cnpj" in row.keys() else "",
+        telefone=row["telefone"] if "telefone" in row.keys() else "",
+        cep=row["cep"] if "cep" in row.keys() else "",
+        estado=row["estado"],
+        cidade=row["cidade"],
+        rua=row["rua"],
+        numero=row["numero"],
+        complemento=(
+            row["complemento"] if "complemento" in row.keys() else ""
+        ),
+        bairro=row["bairro"],
+        data_cadastro=(
+            row["data_cadastro"] if "data_cadastro" in row.keys() else None
+        ),
+        razao_social=row["razao_social"],
+        selo_confianca=(
+            bool(row["selo_confianca"])
+            if "selo_confianca" in row.keys()
+            else False
+        ),
+        tipo_usuario=row["tipo_usuario"],
+        foto=row["foto"] if "foto" in row.keys() else None,
+    )
 
 
 def obter_fornecedor_por_id(fornecedor_id: int) -> Optional[Fornecedor]:
@@ -243,3 +244,23 @@ def deletar_fornecedor(fornecedor_id: int) -> bool:
         cursor.execute(DELETAR_FORNECEDOR, (fornecedor_id,))
         conn.commit()
         return cursor.rowcount > 0
+
+
+def listar_fornecedores(
+    filtro: Optional[FiltroUsuarios] = None, limite: int = 20, cursor: Optional[str] = None
+) -> Pagina[Fornecedor]:
+    """Listagem administrativa filtrada, dos cadastros mais recentes para os mais antigos."""
+    where, parametros = montar_filtro_usuarios(filtro, "f.selo_confianca")
+    with open_connection() as conn:
+        pagina = paginar(
+            conn, LISTAR_FORNECEDORES + where, parametros, ["f.id"], limite, cursor,
+            decrescente=True,
+        )
+        return pagina.mapear(_fornecedor_da_linha)
+
+
+def contar_fornecedores(filtro: Optional[FiltroUsuarios] = None) -> int:
+    where, parametros = montar_filtro_usuarios(filtro, "f.selo_confianca")
+    sql = CONTAR_FORNECEDORES_FILTRADOS if filtro and filtro.filtra_usuario else CONTAR_FORNECEDORES
+    with open_connection() as conn:
+        return conn.execute(sql + where, parametros).fetchone()["total"]
@@ -112,4 +112,48 @@ WHERE id = ?;
 DELETAR_FORNECEDOR = """
 DELETE FROM fornecedor
 WHERE id = ?;
-"""
\ No newline at end of file
+"""
+
+
+# Listagem administrativa: base para util.paginacao (chave: f.id decrescente),
+# com o WHERE de usuario_repo.montar_filtro_usuarios
+LISTAR_FORNECEDORES = """
+SELECT
+    f.id,
+    u.nome,
+    u.email,
+    u.senha,
+    u.cpf_cnpj,
+    u.telefone,
+    u.cep,
+    u.complemento,
+    u.estado,
+    u.cidade,
+    u.rua,
+    u.numero,
+    u.bairro,
+    u.data_cadastro,
+    f.razao_social,
+    f.selo_confianca,
+    u.tipo_usuario,
+    u.foto
+FROM fornecedor f
+JOIN usuario u ON f.id = u.id
+"""
+
+# Sem filtros de usuário a contagem nem precisa do JOIN
+CONTAR_FORNECEDORES = """
+SELECT COUNT(*) AS total FROM fornecedor f
+"""
+
+CONTAR_FORNECEDORES_FILTRADOS = """
+SELECT COUNT(*) AS total
+FROM fornecedor f
+JOIN usuario u ON f.id = u.id
+"""
+
+
+# Índices (aplicados pela migração versionada em util/migracoes.py)
+CRIAR_INDICE_FORNECEDOR_SELO = """
+CREATE INDEX IF NOT EXISTS idx_fornecedor_selo ON fornecedor (selo_confianca);
+"""
@@ -53,3 +53,17 @@ DELETAR_INSCRICAO_PLANO = """
 DELETE FROM inscricao_plano 
 WHERE id_inscricao_plano = ?;
 """
+
+
+# Índices (aplicados pela migração versionada em util/migracoes.py)
+CRIAR_INDICE_INSCRICAO_PLANO_FORNECEDOR = """
+CREATE INDEX IF NOT EXISTS idx_inscricao_plano_fornecedor ON inscricao_plano (id_fornecedor);
+"""
+
+CRIAR_INDICE_INSCRICAO_PLANO_PRESTADOR = """
+CREATE INDEX IF NOT EXISTS idx_inscricao_plano_prestador ON inscricao_plano (id_prestador);
+"""
+
+CRIAR_INDICE_INSCRICAO_PLANO_PLANO = """
+CREATE INDEX IF NOT EXISTS idx_inscricao_plano_plano ON inscricao_plano (id_plano);
+"""
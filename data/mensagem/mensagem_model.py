@@ -9,4 +9,5 @@ class Mensagem:
     conteudo: str
     data_hora: datetime
     nome_remetente: str
-    nome_destinatario: str
\ No newline at end of file
+    nome_destinatario: str
+    lida: bool = False
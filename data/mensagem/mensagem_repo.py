@@ -57,6 +57,102 @@ def obter_mensagem(usuario_id) -> List[Mensagem]:
         return mensagens
 
 
+def _mensagem_da_linha(row) -> Mensagem:
+    return Mensagem(
+        id_mensagem=row["id_mensagem"],
+        id_remetente=row["id_remetente"],
+        id_destinatario=row["id_destinatario"],
+        conteudo=row["conteudo"],
+        data_hora=datetime.fromisoformat(row["data_hora"]),
+        nome_remetente=row["nome_remetente"],
+        nome_destinatario=row["nome_destinatario"],
+        lida=bool(row["lida"]),
+    )
+
+
+def obter_conversa(
+    id_usuario: int,
+    id_contato: int,
+    limite: int = 50,
+    antes_de: Optional[int] = None,
+) -> List[Mensagem]:
+    """
+    Retorna uma página da conversa entre dois usuários, em ordem cronológica.
+
+    Traz as ``limite`` mensagens mais recentes; para carregar as anteriores,
+    passe em ``antes_de`` o id da mensagem mais antiga já exibida.
+    """
+    parametros = {"usuario": id_usuario, "contato": id_contato, "limite": limite}
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        if antes_de is None:
+            cursor.execute(OBTER_CONVERSA, parametros)
+        else:
+            cursor.execute(OBTER_DATA_HORA_MENSAGEM, (antes_de,))
+            referencia = cursor.fetchone()
+            if referencia is None:
+                return []
+            parametros["cursor_data_hora"] = referencia["data_hora"]
+            parametros["cursor_id"] = antes_de
+            cursor.execute(OBTER_CONVERSA_ANTES_DE, parametros)
+        rows = cursor.fetchall()
+        return [_mensagem_da_linha(row) for row in reversed(rows)]
+
+
+def _obter_caixa(sql_primeira, sql_antes_de, id_usuario, limite, antes_de) -> List[Mensagem]:
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        if antes_de is None:
+            cursor.execute(sql_primeira, (id_usuario, limite))
+        else:
+            cursor.execute(OBTER_DATA_HORA_MENSAGEM, (antes_de,))
+            referencia = cursor.fetchone()
+            if referencia is None:
+                return []
+            cursor.execute(
+                sql_antes_de, (id_usuario, referencia["data_hora"], antes_de, limite)
+            )
+        return [_mensagem_da_linha(row) for row in cursor.fetchall()]
+
+
+def obter_caixa_entrada(
+    id_usuario: int, limite: int = 20, antes_de: Optional[int] = None
+) -> List[Mensagem]:
+    """
+    Mensagens recebidas pelo usuário, das mais recentes para as mais antigas.
+
+    Para a próxima página, passe em ``antes_de`` o id da última mensagem
+    da página atual.
+    """
+    return _obter_caixa(
+        OBTER_CAIXA_ENTRADA, OBTER_CAIXA_ENTRADA_ANTES_DE, id_usuario, limite, antes_de
+    )
+
+
+def obter_caixa_saida(
+    id_usuario: int, limite: int = 20, antes_de: Optional[int] = None
+) -> List[Mensagem]:
+    """Mensagens enviadas pelo usuário, paginadas como obter_caixa_entrada."""
+    return _obter_caixa(
+        OBTER_CAIXA_SAIDA, OBTER_CAIXA_SAIDA_ANTES_DE, id_usuario, limite, antes_de
+    )
+
+
+def contar_nao_lidas(id_usuario: int) -> int:
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(CONTAR_NAO_LIDAS, (id_usuario,))
+        return cursor.fetchone()[0]
+
+
+def marcar_mensagem_como_lida(id_mensagem: int) -> bool:
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(MARCAR_MENSAGEM_COMO_LIDA, (id_mensagem,))
+        conn.commit()
+        return cursor.rowcount > 0
+
+
 def obter_mensagem_por_id(id_mensagem):
     with open_connection() as conn:
         cursor = conn.cursor()
@@ -72,6 +168,7 @@ def obter_mensagem_por_id(id_mensagem):
                 data_hora=datetime.fromisoformat(row[4]),
                 nome_remetente=row[5],
                 nome_destinatario=row[6],
+                lida=bool(row["lida"]),
             )
         return None
 
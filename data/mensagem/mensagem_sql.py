@@ -6,7 +6,8 @@ CREATE TABLE IF NOT EXISTS mensagem (
     conteudo TEXT,
     data_hora TEXT,
     nome_remetente TEXT,
-    nome_destinatario TEXT     
+    nome_destinatario TEXT,
+    lida INTEGER NOT NULL DEFAULT 0
 );
 """
 
@@ -68,4 +69,185 @@ WHERE id_mensagem = ?;
 DELETAR_MENSAGEM = """
 DELETE FROM mensagem
 WHERE id_mensagem = ?;
-"""
\ No newline at end of file
+"""
+
+
+# Índices (aplicados pela migração versionada em util/migracoes.py)
+CRIAR_INDICE_MENSAGEM_REMETENTE = """
+CREATE INDEX IF NOT EXISTS idx_mensagem_remetente ON mensagem (id_remetente, id_destinatario, data_hora);
+"""
+
+CRIAR_INDICE_MENSAGEM_DESTINATARIO = """
+CREATE INDEX IF NOT EXISTS idx_mensagem_destinatario ON mensagem (id_destinatario, data_hora);
+"""
+
+
+# Conversa entre dois usuários, da mais recente para a mais antiga.
+# Cada lado da conversa é uma faixa do índice idx_mensagem_remetente
+# (id_remetente, id_destinatario, data_hora, rowid), então o custo depende
+# só do tamanho da página, não do total de mensagens da plataforma.
+OBTER_CONVERSA = """
+SELECT
+    m.id_mensagem,
+    m.id_remetente,
+    m.id_destinatario,
+    m.conteudo,
+    m.data_hora,
+    COALESCE(remetente.nome, m.nome_remetente) AS nome_remetente,
+    COALESCE(destinatario.nome, m.nome_destinatario) AS nome_destinatario,
+    m.lida
+FROM (
+    SELECT * FROM (
+        SELECT * FROM mensagem
+        WHERE id_remetente = :usuario AND id_destinatario = :contato
+        ORDER BY data_hora DESC, id_mensagem DESC
+        LIMIT :limite
+    )
+    UNION ALL
+    SELECT * FROM (
+        SELECT * FROM mensagem
+        WHERE id_remetente = :contato AND id_destinatario = :usuario
+        ORDER BY data_hora DESC, id_mensagem DESC
+        LIMIT :limite
+    )
+) m
+LEFT JOIN usuario remetente ON m.id_remetente = remetente.id
+LEFT JOIN usuario destinatario ON m.id_destinatario = destinatario.id
+ORDER BY m.data_hora DESC, m.id_mensagem DESC
+LIMIT :limite;
+"""
+
+OBTER_DATA_HORA_MENSAGEM = """
+SELECT data_hora FROM mensagem WHERE id_mensagem = ?;
+"""
+
+# Mesma consulta, continuando a partir de uma mensagem já exibida
+# (keyset em (data_hora, id_mensagem), estável a inserções).
+OBTER_CONVERSA_ANTES_DE = """
+SELECT
+    m.id_mensagem,
+    m.id_remetente,
+    m.id_destinatario,
+    m.conteudo,
+    m.data_hora,
+    COALESCE(remetente.nome, m.nome_remetente) AS nome_remetente,
+    COALESCE(destinatario.nome, m.nome_destinatario) AS nome_destinatario,
+    m.lida
+FROM (
+    SELECT * FROM (
+        SELECT * FROM mensagem
+        WHERE id_remetente = :usuario AND id_destinatario = :contato
+          AND (data_hora, id_mensagem) < (:cursor_data_hora, :cursor_id)
+        ORDER BY data_hora DESC, id_mensagem DESC
+        LIMIT :limite
+    )
+    UNION ALL
+    SELECT * FROM (
+        SELECT * FROM mensagem
+        WHERE id_remetente = :contato AND id_destinatario = :usuario
+          AND (data_hora, id_mensagem) < (:cursor_data_hora, :cursor_id)
+        ORDER BY data_hora DESC, id_mensagem DESC
+        LIMIT :limite
+    )
+) m
+LEFT JOIN usuario remetente ON m.id_remetente = remetente.id
+LEFT JOIN usuario destinatario ON m.id_destinatario = destinatario.id
+ORDER BY m.data_hora DESC, m.id_mensagem DESC
+LIMIT :limite;
+"""
+
+
+# Caixa de entrada / saída: faixa do índice por destinatário ou remetente,
+# da mais recente para a mais antiga, em páginas keyset (data_hora, id).
+OBTER_CAIXA_ENTRADA = """
+SELECT
+    m.id_mensagem,
+    m.id_remetente,
+    m.id_destinatario,
+    m.conteudo,
+    m.data_hora,
+    COALESCE(remetente.nome, m.nome_remetente) AS nome_remetente,
+    m.nome_destinatario,
+    m.lida
+FROM mensagem m
+LEFT JOIN usuario remetente ON m.id_remetente = remetente.id
+WHERE m.id_destinatario = ?
+ORDER BY m.data_hora DESC, m.id_mensagem DESC
+LIMIT ?;
+"""
+
+OBTER_CAIXA_ENTRADA_ANTES_DE = """
+SELECT
+    m.id_mensagem,
+    m.id_remetente,
+    m.id_destinatario,
+    m.conteudo,
+    m.data_hora,
+    COALESCE(remetente.nome, m.nome_remetente) AS nome_remetente,
+    m.nome_destinatario,
+    m.lida
+FROM mensagem m
+LEFT JOIN usuario remetente ON m.id_remetente = remetente.id
+WHERE m.id_destinatario = ?
+  AND (m.data_hora, m.id_mensagem) < (?, ?)
+ORDER BY m.data_hora DESC, m.id_mensagem DESC
+LIMIT ?;
+"""
+
+OBTER_CAIXA_SAIDA = """
+SELECT
+    m.id_mensagem,
+    m.id_remetente,
+    m.id_destinatario,
+    m.conteudo,
+    m.data_hora,
+    m.nome_remetente,
+    COALESCE(destinatario.nome, m.nome_destinatario) AS nome_destinatario,
+    m.lida
+FROM mensagem m
+LEFT JOIN usuario destinatario ON m.id_destinatario = destinatario.id
+WHERE m.id_remetente = ?
+ORDER BY m.data_hora DESC, m.id_mensagem DESC
+LIMIT ?;
+"""
+
+OBTER_CAIXA_SAIDA_ANTES_DE = """
+SELECT
+    m.id_mensagem,
+    m.id_remetente,
+    m.id_destinatario,
+    m.conteudo,
+    m.data_hora,
+    m.nome_remetente,
+    COALESCE(destinatario.nome, m.nome_destinatario) AS nome_destinatario,
+    m.lida
+FROM mensagem m
+LEFT JOIN usuario destinatario ON m.id_destinatario = destinatario.id
+WHERE m.id_remetente = ?
+  AND (m.data_hora, m.id_mensagem) < (?, ?)
+ORDER BY m.data_hora DESC, m.id_mensagem DESC
+LIMIT ?;
+"""
+
+CONTAR_NAO_LIDAS = """
+SELECT COUNT(*) FROM mensagem
+WHERE id_destinatario = ? AND lida = 0;
+"""
+
+MARCAR_MENSAGEM_COMO_LIDA = """
+UPDATE mensagem SET lida = 1
+WHERE id_mensagem = ? AND lida = 0;
+"""
+
+ADICIONAR_COLUNA_LIDA = """
+ALTER TABLE mensagem ADD COLUMN lida INTEGER NOT NULL DEFAULT 0;
+"""
+
+CRIAR_INDICE_MENSAGEM_ENVIADAS = """
+CREATE INDEX IF NOT EXISTS idx_mensagem_enviadas ON mensagem (id_remetente, data_hora);
+"""
+
+# Índice parcial: contar não lidas lê só as entradas ainda não lidas
+CRIAR_INDICE_MENSAGEM_NAO_LIDAS = """
+CREATE INDEX IF NOT EXISTS idx_mensagem_nao_lidas ON mensagem (id_destinatario) WHERE lida = 0;
+"""
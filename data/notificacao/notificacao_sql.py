@@ -63,3 +63,9 @@ DELETAR_NOTIFICACAO = """
 DELETE FROM notificacao
 WHERE id_notificacao = ?;
 """
+
+
+# Índices (aplicados pela migração versionada em util/migracoes.py)
+CRIAR_INDICE_NOTIFICACAO_USUARIO = """
+CREATE INDEX IF NOT EXISTS idx_notificacao_usuario ON notificacao (id_usuario, data_hora);
+"""
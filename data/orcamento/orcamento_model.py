@@ -12,3 +12,5 @@ class Orcamento:
     status: str
     descricao: str
     id: int
+    nome_cliente: Optional[str] = None
+    foto_cliente: Optional[str] = None
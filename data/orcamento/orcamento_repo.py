@@ -1,7 +1,8 @@
-from typing import Optional, List
+from typing import Dict, Optional, List
 from data.orcamento.orcamento_model import Orcamento
 from data.orcamento.orcamento_sql import *
 from util.db import open_connection
+from util.paginacao import Pagina, paginar
 import datetime
 
 
@@ -98,6 +99,53 @@ def obter_orcamentos_por_pagina(pagina: int, tamanho_pagina: int) -> List[Orcame
         ]
 
 
+def _orcamento_com_cliente(row) -> Orcamento:
+    return Orcamento(
+        id=row["id"],
+        id_fornecedor=row["id_fornecedor"],
+        id_cliente=row["id_cliente"],
+        valor_estimado=row["valor_estimado"],
+        data_solicitacao=datetime.datetime.fromisoformat(row["data_solicitacao"]),
+        prazo_entrega=datetime.datetime.fromisoformat(row["prazo_entrega"]),
+        status=row["status"],
+        descricao=row["descricao"],
+        nome_cliente=row["nome_cliente"],
+        foto_cliente=row["foto_cliente"],
+    )
+
+
+def listar_orcamentos_por_fornecedor(
+    id_fornecedor: int,
+    status: Optional[str] = None,
+    limite: int = 20,
+    cursor: Optional[str] = None,
+) -> Pagina[Orcamento]:
+    """
+    Solicitações de orçamento recebidas pelo fornecedor, mais recentes
+    primeiro, com nome e foto do cliente resolvidos no mesmo SELECT.
+    Paginada por cursor (util.paginacao).
+    """
+    with open_connection() as conn:
+        pagina = paginar(
+            conn,
+            LISTAR_ORCAMENTOS_FORNECEDOR,
+            (id_fornecedor, status, status),
+            ["o.data_solicitacao", "o.id"],
+            limite,
+            cursor,
+            decrescente=True,
+        )
+        return pagina.mapear(_orcamento_com_cliente)
+
+
+def contar_orcamentos_por_status(id_fornecedor: int) -> Dict[str, int]:
+    """Quantidade de solicitações do fornecedor em cada status."""
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(CONTAR_ORCAMENTOS_FORNECEDOR_POR_STATUS, (id_fornecedor,))
+        return {row["status"]: row["total"] for row in cursor.fetchall()}
+
+
 def atualizar_orcamento_por_id(orcamento: Orcamento) -> bool:
     with open_connection() as conn:
         cursor = conn.cursor()
@@ -86,3 +86,43 @@ DELETAR_ORCAMENTO = """
 DELETE FROM orcamento
 WHERE id = ?;
 """
+
+# Solicitações recebidas por um fornecedor, já com nome e foto do cliente.
+# Base da listagem paginada por cursor (util.paginacao), chave:
+# (data_solicitacao, id) decrescente. Parâmetros: id_fornecedor, status, status
+# (status NULL desativa o filtro)
+LISTAR_ORCAMENTOS_FORNECEDOR = """
+SELECT
+    o.id,
+    o.id_fornecedor,
+    o.id_cliente,
+    o.valor_estimado,
+    o.data_solicitacao,
+    o.prazo_entrega,
+    o.status,
+    o.descricao,
+    u.nome AS nome_cliente,
+    u.foto AS foto_cliente
+FROM orcamento o
+LEFT JOIN usuario u ON u.id = o.id_cliente
+WHERE o.id_fornecedor = ?
+  AND (? IS NULL OR o.status = ?)
+"""
+
+CONTAR_ORCAMENTOS_FORNECEDOR_POR_STATUS = """
+SELECT status, COUNT(*) AS total
+FROM orcamento
+WHERE id_fornecedor = ?
+GROUP BY status
+ORDER BY status;
+"""
+
+
+# Índices (aplicados pela migração versionada em util/migracoes.py)
+CRIAR_INDICE_ORCAMENTO_FORNECEDOR = """
+CREATE INDEX IF NOT EXISTS idx_orcamento_fornecedor ON orcamento (id_fornecedor, data_solicitacao);
+"""
+
+CRIAR_INDICE_ORCAMENTO_CLIENTE = """
+CREATE INDEX IF NOT EXISTS idx_orcamento_cliente ON orcamento (id_cliente);
+"""
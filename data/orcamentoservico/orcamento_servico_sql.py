@@ -98,3 +98,21 @@ DELETAR_ORCAMENTO_SERVICO = """
 DELETE FROM orcamento_servico
 WHERE id_orcamento = ?;
 """
+
+
+# Índices (aplicados pela migração versionada em util/migracoes.py)
+CRIAR_INDICE_ORCAMENTO_SERVICO_PRESTADOR = """
+CREATE INDEX IF NOT EXISTS idx_orcamento_servico_prestador ON orcamento_servico (id_prestador, data_solicitacao);
+"""
+
+CRIAR_INDICE_ORCAMENTO_SERVICO_CLIENTE = """
+CREATE INDEX IF NOT EXISTS idx_orcamento_servico_cliente ON orcamento_servico (id_cliente);
+"""
+
+CRIAR_INDICE_ORCAMENTO_SERVICO_SERVICO = """
+CREATE INDEX IF NOT EXISTS idx_orcamento_servico_servico ON orcamento_servico (id_servico);
+"""
+
+CRIAR_INDICE_ORCAMENTO_SERVICO_DATA = """
+CREATE INDEX IF NOT EXISTS idx_orcamento_servico_data ON orcamento_servico (data_solicitacao);
+"""
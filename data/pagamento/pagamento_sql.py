@@ -83,4 +83,22 @@ ATUALIZAR_PAGAMENTO = """
         data_aprovacao = ?,
         external_reference = ?
     WHERE id_pagamento = ?
-"""
\ No newline at end of file
+"""
+
+
+# Índices (aplicados pela migração versionada em util/migracoes.py)
+CRIAR_INDICE_PAGAMENTO_MP_ID = """
+CREATE INDEX IF NOT EXISTS idx_pagamento_mp_payment_id ON pagamento (mp_payment_id);
+"""
+
+CRIAR_INDICE_PAGAMENTO_PREFERENCE = """
+CREATE INDEX IF NOT EXISTS idx_pagamento_mp_preference_id ON pagamento (mp_preference_id);
+"""
+
+CRIAR_INDICE_PAGAMENTO_FORNECEDOR = """
+CREATE INDEX IF NOT EXISTS idx_pagamento_fornecedor ON pagamento (fornecedor_id, data_criacao);
+"""
+
+CRIAR_INDICE_PAGAMENTO_STATUS = """
+CREATE INDEX IF NOT EXISTS idx_pagamento_status ON pagamento (status, data_criacao);
+"""
@@ -71,3 +71,9 @@ DELETAR_PLANO = """
 DELETE FROM plano
 WHERE id_plano = ?
 """
+
+
+# Índices (aplicados pela migração versionada em util/migracoes.py)
+CRIAR_INDICE_PLANO_NOME = """
+CREATE INDEX IF NOT EXISTS idx_plano_nome ON plano (nome_plano);
+"""
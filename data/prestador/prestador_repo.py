@@ -11,13 +11,19 @@ from data.prestador.prestador_sql import (
     ATUALIZAR_PRESTADOR,
     DELETAR_PRESTADOR,
     OBTER_PRESTADOR_POR_PAGINA,
+    LISTAR_PRESTADORES,
+    CONTAR_PRESTADORES,
+    CONTAR_PRESTADORES_FILTRADOS,
 )
+from data.usuario.usuario_model import FiltroUsuarios
 from data.usuario.usuario_repo import (
     atualizar_usuario,
     deletar_usuario,
     inserir_usuario,
+    montar_filtro_usuarios,
 )
-from util.db import open_connection
+from util.db import open_connection, unit_of_work
+from util.paginacao import Pagina, paginar
 
 
 def criar_tabela_prestador():
@@ -28,7 +34,8 @@ def criar_tabela_prestador():
 
 
 def inserir_prestador(prestador: Prestador) -> Optional[int]:
-    with open_connection() as conn:
+    # usuario + prestador na mesma transação
+    with unit_of_work(), open_connection() as conn:
         cursor = conn.cursor()
         id_usuario_gerado = inserir_usuario(prestador)
         if id_usuario_gerado:
@@ -157,7 +164,7 @@ def atualizar_prestador(prestador: Prestador) -> bool:
 
 
 def deletar_prestador_repo(prestador_id: int) -> bool:
-    with open_connection() as conn:
+    with unit_of_work(), open_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(DELETAR_PRESTADOR, (prestador_id,))
         rows_affected = cursor.rowcount
@@ -166,3 +173,25 @@ def deletar_prestador_repo(prestador_id: int) -> bool:
             deletar_usuario(prestador_id)
 
         return rows_affected > 0
+
+
+def listar_prestadores(
+    filtro: Optional[FiltroUsuarios] = None, limite: int = 20, cursor: Optional[str] = None
+) -> Pagina[Prestador]:
+    """Listagem administrativa filtrada, dos cadastros mais recentes para os mais antigos."""
+    where, parametros = montar_filtro_usuarios(filtro, "p.selo_confianca")
+    with open_connection() as conn:
+        pagina = paginar(
+            conn, LISTAR_PRESTADORES + where, parametros, ["p.id"], limite, cursor,
+            decrescente=True,
+        )
+        return pagina.mapear(
+            lambda row: Prestador(**{**dict(row), "selo_confianca": bool(row["selo_confianca"])})
+        )
+
+
+def contar_prestadores(filtro: Optional[FiltroUsuarios] = None) -> int:
+    where, parametros = montar_filtro_usuarios(filtro, "p.selo_confianca")
+    sql = CONTAR_PRESTADORES_FILTRADOS if filtro and filtro.filtra_usuario else CONTAR_PRESTADORES
+    with open_connection() as conn:
+        return conn.execute(sql + where, parametros).fetchone()["total"]
@@ -116,4 +116,52 @@ WHERE id = ?;
 """
 DELETAR_PRESTADOR = """
 DELETE FROM prestador WHERE id = ?;
-"""
\ No newline at end of file
+"""
+
+
+# Listagem administrativa: base para util.paginacao (chave: p.id decrescente),
+# com o WHERE de usuario_repo.montar_filtro_usuarios
+LISTAR_PRESTADORES = """
+SELECT
+    p.id,
+    u.nome,
+    u.email,
+    u.senha,
+    u.cpf_cnpj,
+    u.telefone,
+    u.cep,
+    u.complemento,
+    u.estado,
+    u.cidade,
+    u.rua,
+    u.numero,
+    u.bairro,
+    u.data_cadastro,
+    p.area_atuacao,
+    u.tipo_usuario,
+    p.razao_social,
+    p.descricao_servicos,
+    p.selo_confianca,
+    u.foto,
+    u.token_redefinicao,
+    u.data_token
+FROM prestador p
+JOIN usuario u ON p.id = u.id
+"""
+
+# Sem filtros de usuário a contagem nem precisa do JOIN
+CONTAR_PRESTADORES = """
+SELECT COUNT(*) AS total FROM prestador p
+"""
+
+CONTAR_PRESTADORES_FILTRADOS = """
+SELECT COUNT(*) AS total
+FROM prestador p
+JOIN usuario u ON p.id = u.id
+"""
+
+
+# Índices (aplicados pela migração versionada em util/migracoes.py)
+CRIAR_INDICE_PRESTADOR_SELO = """
+CREATE INDEX IF NOT EXISTS idx_prestador_selo ON prestador (selo_confianca);
+"""
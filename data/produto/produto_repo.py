@@ -13,14 +13,33 @@ from data.produto.produto_sql import (
     ATUALIZAR_PRODUTO,
     DELETAR_PRODUTO,
     OBTER_PRODUTO_POR_PAGINA,
+    OBTER_PROMOCOES_POR_FORNECEDOR,
+    OBTER_PROMOCOES_ATIVAS,
+    OBTER_PROMOCOES_ATIVAS_APOS,
+    OBTER_DESCONTO_PRODUTO,
+    BUSCAR_PRODUTOS,
+    CONTAR_BUSCA_PRODUTOS,
+    CRIAR_TABELA_PRODUTO_FTS,
+    CRIAR_GATILHO_PRODUTO_FTS_INSERT,
+    CRIAR_GATILHO_PRODUTO_FTS_DELETE,
+    CRIAR_GATILHO_PRODUTO_FTS_UPDATE,
+    RECONSTRUIR_PRODUTO_FTS,
+    LISTAR_PRODUTOS_FORNECEDOR,
 )
+from util.busca_textual import montar_consulta_fts
 from util.db import open_connection
+from util.paginacao import Pagina, paginar
 
 
 def criar_tabela_produto():
     with open_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(CRIAR_TABELA_PRODUTO)
+        # Índice de busca textual, mantido pelos gatilhos
+        cursor.execute(CRIAR_TABELA_PRODUTO_FTS)
+        cursor.execute(CRIAR_GATILHO_PRODUTO_FTS_INSERT)
+        cursor.execute(CRIAR_GATILHO_PRODUTO_FTS_DELETE)
+        cursor.execute(CRIAR_GATILHO_PRODUTO_FTS_UPDATE)
         conn.commit()
 
 
@@ -85,11 +104,55 @@ def obter_produtos() -> List[Produto]:
 
 
 def obter_produto_por_nome(nome: str) -> List[Produto]:
+    """Produtos cujo nome contém palavras começando pelos termos de ``nome``."""
+    consulta = montar_consulta_fts(nome, coluna="nome")
+    if consulta is None:
+        return []
     with open_connection() as conn:
-        cursor = conn.execute(OBTER_PRODUTO_POR_NOME, (f"%{nome}%",))
+        cursor = conn.execute(OBTER_PRODUTO_POR_NOME, (consulta,))
         return [Produto.from_row(row) for row in cursor.fetchall()]
 
 
+def buscar_produtos(
+    termo: str, fornecedor_id: Optional[int] = None, limit: int = 20, offset: int = 0
+) -> List[Produto]:
+    """
+    Busca textual em nome e descrição, ignorando acentos e maiúsculas,
+    ordenada por relevância.
+
+    Args:
+        termo: Texto digitado pelo usuário
+        fornecedor_id: Restringe aos produtos de um fornecedor (None = catálogo todo)
+    """
+    consulta = montar_consulta_fts(termo)
+    if consulta is None:
+        return []
+    with open_connection() as conn:
+        cursor = conn.execute(
+            BUSCAR_PRODUTOS,
+            {"consulta": consulta, "fornecedor_id": fornecedor_id, "limite": limit, "offset": offset},
+        )
+        return [Produto.from_row(row) for row in cursor.fetchall()]
+
+
+def contar_busca_produtos(termo: str, fornecedor_id: Optional[int] = None) -> int:
+    consulta = montar_consulta_fts(termo)
+    if consulta is None:
+        return 0
+    with open_connection() as conn:
+        cursor = conn.execute(
+            CONTAR_BUSCA_PRODUTOS, {"consulta": consulta, "fornecedor_id": fornecedor_id}
+        )
+        return cursor.fetchone()["total"]
+
+
+def reconstruir_indice_busca_produtos() -> None:
+    """Reindexa produto_fts a partir da tabela produto."""
+    with open_connection() as conn:
+        conn.execute(RECONSTRUIR_PRODUTO_FTS)
+        conn.commit()
+
+
 def obter_produtos_por_fornecedor(
     fornecedor_id: int, limit: int = 10, offset: int = 0
 ) -> List[Produto]:
@@ -100,6 +163,45 @@ def obter_produtos_por_fornecedor(
         return [Produto.from_row(row) for row in cursor.fetchall()]
 
 
+def listar_produtos_por_fornecedor(
+    fornecedor_id: int, limite: int = 10, cursor: Optional[str] = None
+) -> Pagina[Produto]:
+    """Produtos do fornecedor em ordem de cadastro, paginados por cursor."""
+    with open_connection() as conn:
+        pagina = paginar(
+            conn, LISTAR_PRODUTOS_FORNECEDOR, (fornecedor_id,), ["id"], limite, cursor
+        )
+        return pagina.mapear(Produto.from_row)
+
+
+def obter_promocoes_por_fornecedor(fornecedor_id: int) -> List[Produto]:
+    """Produtos em promoção do fornecedor, mais recentes primeiro."""
+    with open_connection() as conn:
+        cursor = conn.execute(OBTER_PROMOCOES_POR_FORNECEDOR, (fornecedor_id,))
+        return [Produto.from_row(row) for row in cursor.fetchall()]
+
+
+def obter_promocoes_ativas(limit: int = 20, apos: Optional[int] = None) -> List[Produto]:
+    """
+    Promoções de todos os fornecedores, do maior para o menor desconto.
+
+    Args:
+        limit: Quantidade de produtos da página
+        apos: id do último produto da página anterior (None para a primeira)
+    """
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        if apos is None:
+            cursor.execute(OBTER_PROMOCOES_ATIVAS, (limit,))
+        else:
+            cursor.execute(OBTER_DESCONTO_PRODUTO, (apos,))
+            row = cursor.fetchone()
+            if not row:
+                return []
+            cursor.execute(OBTER_PROMOCOES_ATIVAS_APOS, (row["desconto"], apos, limit))
+        return [Produto.from_row(row) for row in cursor.fetchall()]
+
+
 def atualizar_produto(produto: Produto):
     with open_connection() as conn:
         conn.execute(
@@ -39,8 +39,11 @@ ORDER BY id
 LIMIT ? OFFSET ?;
 """
 OBTER_PRODUTO_POR_NOME = """
-SELECT * FROM produto
-WHERE nome LIKE ?;
+SELECT p.*
+FROM produto_fts
+JOIN produto p ON p.id = produto_fts.rowid
+WHERE produto_fts MATCH ?
+ORDER BY rank;
 """
 
 ATUALIZAR_PRODUTO = """
@@ -63,7 +66,126 @@ ORDER BY id
 LIMIT ? OFFSET ?;
 """
 
+# Base da listagem paginada por cursor (util.paginacao), chave: id
+LISTAR_PRODUTOS_FORNECEDOR = """
+SELECT id, nome, descricao, preco, quantidade, em_promocao, desconto, foto, fornecedor_id
+FROM produto
+WHERE fornecedor_id = ?
+"""
+
+# Promoções do fornecedor (índice parcial idx_produto_promocao_fornecedor)
+OBTER_PROMOCOES_POR_FORNECEDOR = """
+SELECT id, nome, descricao, preco, quantidade, em_promocao, desconto, foto, fornecedor_id
+FROM produto
+WHERE fornecedor_id = ? AND em_promocao = 1
+ORDER BY id DESC;
+"""
+
+# Vitrine pública de promoções: maior desconto primeiro, paginada por
+# (desconto, id) a partir do último produto exibido (índice parcial idx_produto_promocao)
+OBTER_PROMOCOES_ATIVAS = """
+SELECT id, nome, descricao, preco, quantidade, em_promocao, desconto, foto, fornecedor_id
+FROM produto
+WHERE em_promocao = 1
+ORDER BY desconto DESC, id DESC
+LIMIT ?;
+"""
+
+OBTER_PROMOCOES_ATIVAS_APOS = """
+SELECT id, nome, descricao, preco, quantidade, em_promocao, desconto, foto, fornecedor_id
+FROM produto
+WHERE em_promocao = 1
+  AND (desconto, id) < (?, ?)
+ORDER BY desconto DESC, id DESC
+LIMIT ?;
+"""
+
+OBTER_DESCONTO_PRODUTO = """
+SELECT desconto FROM produto WHERE id = ?;
+"""
+
+# Busca textual (FTS5) em nome e descrição, sem distinção de acentos.
+# O nome pesa 10x mais que a descrição no bm25; :fornecedor_id NULL busca
+# no catálogo inteiro.
+BUSCAR_PRODUTOS = """
+SELECT p.id, p.nome, p.descricao, p.preco, p.quantidade, p.em_promocao,
+       p.desconto, p.foto, p.fornecedor_id
+FROM produto_fts
+JOIN produto p ON p.id = produto_fts.rowid
+WHERE produto_fts MATCH :consulta
+  AND (:fornecedor_id IS NULL OR p.fornecedor_id = :fornecedor_id)
+ORDER BY bm25(produto_fts, 10.0, 1.0), p.id
+LIMIT :limite OFFSET :offset;
+"""
+
+CONTAR_BUSCA_PRODUTOS = """
+SELECT COUNT(*) AS total
+FROM produto_fts
+JOIN produto p ON p.id = produto_fts.rowid
+WHERE produto_fts MATCH :consulta
+  AND (:fornecedor_id IS NULL OR p.fornecedor_id = :fornecedor_id);
+"""
+
 DELETAR_PRODUTO = """
 DELETE FROM produto
 WHERE id = ?;
 """
+
+
+# Índices (aplicados pela migração versionada em util/migracoes.py)
+CRIAR_INDICE_PRODUTO_FORNECEDOR = """
+CREATE INDEX IF NOT EXISTS idx_produto_fornecedor ON produto (fornecedor_id);
+"""
+
+CRIAR_INDICE_PRODUTO_PROMOCAO_FORNECEDOR = """
+CREATE INDEX IF NOT EXISTS idx_produto_promocao_fornecedor ON produto (fornecedor_id, id) WHERE em_promocao = 1;
+"""
+
+CRIAR_INDICE_PRODUTO_PROMOCAO = """
+CREATE INDEX IF NOT EXISTS idx_produto_promocao ON produto (desconto, id) WHERE em_promocao = 1;
+"""
+
+# Referências às fotos do armazenamento por conteúdo (data/arquivo)
+CRIAR_INDICE_PRODUTO_FOTO = """
+CREATE INDEX IF NOT EXISTS idx_produto_foto ON produto (foto) WHERE foto IS NOT NULL;
+"""
+
+
+# Índice textual de produto (tabela FTS5 de conteúdo externo, sincronizada
+# pelos gatilhos abaixo). remove_diacritics faz "cimento" achar "ciménto".
+CRIAR_TABELA_PRODUTO_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS produto_fts USING fts5(
+    nome,
+    descricao,
+    content='produto',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+CRIAR_GATILHO_PRODUTO_FTS_INSERT = """
+CREATE TRIGGER IF NOT EXISTS produto_fts_insert AFTER INSERT ON produto BEGIN
+    INSERT INTO produto_fts (rowid, nome, descricao)
+    VALUES (new.id, new.nome, new.descricao);
+END;
+"""
+
+CRIAR_GATILHO_PRODUTO_FTS_DELETE = """
+CREATE TRIGGER IF NOT EXISTS produto_fts_delete AFTER DELETE ON produto BEGIN
+    INSERT INTO produto_fts (produto_fts, rowid, nome, descricao)
+    VALUES ('delete', old.id, old.nome, old.descricao);
+END;
+"""
+
+CRIAR_GATILHO_PRODUTO_FTS_UPDATE = """
+CREATE TRIGGER IF NOT EXISTS produto_fts_update AFTER UPDATE OF nome, descricao ON produto BEGIN
+    INSERT INTO produto_fts (produto_fts, rowid, nome, descricao)
+    VALUES ('delete', old.id, old.nome, old.descricao);
+    INSERT INTO produto_fts (rowid, nome, descricao)
+    VALUES (new.id, new.nome, new.descricao);
+END;
+"""
+
+RECONSTRUIR_PRODUTO_FTS = """
+INSERT INTO produto_fts (produto_fts) VALUES ('rebuild');
+"""
@@ -79,4 +79,10 @@ WHERE id_servico = ?;
 DELETAR_SERVICO = """
 DELETE FROM servico
 WHERE id_servico = ?;
-"""
\ No newline at end of file
+"""
+
+
+# Índices (aplicados pela migração versionada em util/migracoes.py)
+CRIAR_INDICE_SERVICO_PRESTADOR = """
+CREATE INDEX IF NOT EXISTS idx_servico_prestador ON servico (id_prestador);
+"""
@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class ServicoFoto:
+    id_foto: int
+    id_servico: int
+    posicao: int
+    chave: str  # caminho relativo a static/ (ex.: img/servico/000001/3f2a9c1b.jpg)
+    largura: Optional[int]
+    altura: Optional[int]
+    hash: Optional[str]
+    status: str  # processando | pronta
+    criada_em: str
+
+    @property
+    def url(self) -> str:
+        return f"/static/{self.chave}"
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import re
+from datetime import datetime
+from typing import List, Optional
+from PIL import Image
+from data.servicofoto.servico_foto_model import ServicoFoto
+from data.servicofoto.servico_foto_sql import *
+from util.db import open_connection
+from util.imagens_responsivas import RAIZ_STATIC
+
+
+def _montar_foto(row) -> ServicoFoto:
+    return ServicoFoto(
+        id_foto=row["id_foto"],
+        id_servico=row["id_servico"],
+        posicao=row["posicao"],
+        chave=row["chave"],
+        largura=row["largura"],
+        altura=row["altura"],
+        hash=row["hash"],
+        status=row["status"],
+        criada_em=row["criada_em"],
+    )
+
+
+def criar_tabela_servico_foto() -> bool:
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(CRIAR_TABELA_SERVICO_FOTO)
+        conn.commit()
+        return True
+
+
+def inserir_foto(id_servico: int, chave: str, como_principal: bool = False,
+                 status: str = "pronta", largura: Optional[int] = None,
+                 altura: Optional[int] = None, hash: Optional[str] = None) -> Optional[int]:
+    """
+    Registra uma foto no fim da galeria, ou no início se ``como_principal``
+    (sem mexer na posição das demais).
+    """
+    sql = INSERIR_SERVICO_FOTO_NO_INICIO if como_principal else INSERIR_SERVICO_FOTO_NO_FIM
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, (
+            id_servico, id_servico, chave, largura, altura, hash, status,
+            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        ))
+        conn.commit()
+        return cursor.lastrowid
+
+
+def obter_fotos_por_servico(id_servico: int) -> List[ServicoFoto]:
+    """Todas as fotos do serviço na ordem da galeria, inclusive as em processamento."""
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_FOTOS_POR_SERVICO, (id_servico,))
+        return [_montar_foto(row) for row in cursor.fetchall()]
+
+
+def obter_foto_principal(id_servico: int) -> Optional[ServicoFoto]:
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_FOTO_PRINCIPAL, (id_servico,))
+        row = cursor.fetchone()
+        return _montar_foto(row) if row else None
+
+
+def contar_fotos(id_servico: int) -> int:
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(CONTAR_FOTOS_POR_SERVICO, (id_servico,))
+        return cursor.fetchone()["total"]
+
+
+def reordenar_fotos(id_servico: int, ids_em_ordem: List[int]) -> bool:
+    """Grava a nova ordem (lista de id_foto) em uma única transação."""
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        for posicao, id_foto in enumerate(ids_em_ordem, start=1):
+            cursor.execute(ATUALIZAR_POSICAO_FOTO, (posicao, id_foto, id_servico))
+            if cursor.rowcount != 1:
+                conn.rollback()
+                return False
+        conn.commit()
+        return True
+
+
+def marcar_foto_pronta(chave: str, largura: Optional[int], altura: Optional[int],
+                       hash: Optional[str]) -> bool:
+    """Conclui uma foto enviada pela fila de imagens."""
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(MARCAR_FOTO_PRONTA, (largura, altura, hash, chave))
+        conn.commit()
+        return cursor.rowcount > 0
+
+
+def excluir_foto(id_foto: int) -> bool:
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(EXCLUIR_FOTO, (id_foto,))
+        conn.commit()
+        return cursor.rowcount > 0
+
+
+def excluir_foto_por_chave(chave: str) -> bool:
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(EXCLUIR_FOTO_POR_CHAVE, (chave,))
+        conn.commit()
+        return cursor.rowcount > 0
+
+
+# XXXXXX/XXXXXX-NNN.jpg — nomes usados antes do índice no banco
+_NOME_LEGADO = re.compile(r"^(?P<servico>\d{6})-(?P<numero>\d{3})\.jpg$")
+
+
+def importar_fotos_legadas(conn, raiz_static: Optional[str] = None) -> int:
+    """
+    Passo de migração: registra em servico_foto as fotos já gravadas em
+    static/img/servico/<servico>/<servico>-<NNN>.jpg, mantendo o arquivo e
+    a ordem pela numeração.
+
+    Returns:
+        Quantidade de fotos registradas
+    """
+    raiz_static = raiz_static or RAIZ_STATIC
+    base = os.path.join(raiz_static, "img", "servico")
+    if not os.path.isdir(base):
+        return 0
+
+    agora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    total = 0
+    for codigo in sorted(os.listdir(base)):
+        pasta = os.path.join(base, codigo)
+        if not os.path.isdir(pasta):
+            continue
+        for nome in sorted(os.listdir(pasta)):
+            encontrado = _NOME_LEGADO.match(nome)
+            if not encontrado or encontrado.group("servico") != codigo:
+                continue
+            caminho = os.path.join(pasta, nome)
+            with open(caminho, "rb") as arquivo:
+                digest = hashlib.sha256(arquivo.read()).hexdigest()
+            try:
+                with Image.open(caminho) as imagem:
+                    largura, altura = imagem.size
+            except Exception:
+                largura = altura = None
+            cursor = conn.execute(
+                IMPORTAR_FOTO_LEGADA,
+                (int(codigo), int(encontrado.group("numero")), f"img/servico/{codigo}/{nome}",
+                 largura, altura, digest, agora),
+            )
+            total += cursor.rowcount
+    return total
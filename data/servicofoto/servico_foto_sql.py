@@ -0,0 +1,88 @@
+CRIAR_TABELA_SERVICO_FOTO = """
+CREATE TABLE IF NOT EXISTS servico_foto (
+    id_foto INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_servico INTEGER NOT NULL,
+    posicao INTEGER NOT NULL,
+    chave TEXT NOT NULL UNIQUE,
+    largura INTEGER,
+    altura INTEGER,
+    hash TEXT,
+    status TEXT NOT NULL DEFAULT 'pronta',
+    criada_em TEXT NOT NULL,
+    FOREIGN KEY (id_servico) REFERENCES servico(id_servico)
+);
+"""
+
+
+# A posição é calculada no próprio INSERT: duas fotos enviadas ao mesmo
+# tempo nunca recebem o mesmo lugar. Posições só definem a ordem (podem
+# ter buracos ou ser negativas).
+INSERIR_SERVICO_FOTO_NO_FIM = """
+INSERT INTO servico_foto (id_servico, posicao, chave, largura, altura, hash, status, criada_em)
+VALUES (?, (SELECT COALESCE(MAX(posicao), 0) + 1 FROM servico_foto WHERE id_servico = ?), ?, ?, ?, ?, ?, ?);
+"""
+
+INSERIR_SERVICO_FOTO_NO_INICIO = """
+INSERT INTO servico_foto (id_servico, posicao, chave, largura, altura, hash, status, criada_em)
+VALUES (?, (SELECT COALESCE(MIN(posicao), 2) - 1 FROM servico_foto WHERE id_servico = ?), ?, ?, ?, ?, ?, ?);
+"""
+
+
+OBTER_FOTOS_POR_SERVICO = """
+SELECT * FROM servico_foto
+WHERE id_servico = ?
+ORDER BY posicao, id_foto;
+"""
+
+
+OBTER_FOTO_PRINCIPAL = """
+SELECT * FROM servico_foto
+WHERE id_servico = ? AND status = 'pronta'
+ORDER BY posicao, id_foto
+LIMIT 1;
+"""
+
+
+CONTAR_FOTOS_POR_SERVICO = """
+SELECT COUNT(*) AS total FROM servico_foto
+WHERE id_servico = ?;
+"""
+
+
+ATUALIZAR_POSICAO_FOTO = """
+UPDATE servico_foto
+SET posicao = ?
+WHERE id_foto = ? AND id_servico = ?;
+"""
+
+
+MARCAR_FOTO_PRONTA = """
+UPDATE servico_foto
+SET status = 'pronta', largura = ?, altura = ?, hash = ?
+WHERE chave = ?;
+"""
+
+
+EXCLUIR_FOTO = """
+DELETE FROM servico_foto
+WHERE id_foto = ?;
+"""
+
+
+EXCLUIR_FOTO_POR_CHAVE = """
+DELETE FROM servico_foto
+WHERE chave = ?;
+"""
+
+
+# Fotos gravadas antes do índice (nome XXXXXX-NNN.jpg); chave repetida é ignorada
+IMPORTAR_FOTO_LEGADA = """
+INSERT OR IGNORE INTO servico_foto (id_servico, posicao, chave, largura, altura, hash, status, criada_em)
+VALUES (?, ?, ?, ?, ?, ?, 'pronta', ?);
+"""
+
+
+# Índices (aplicados pela migração versionada em util/migracoes.py)
+CRIAR_INDICE_SERVICO_FOTO_POSICAO = """
+CREATE INDEX IF NOT EXISTS idx_servico_foto_posicao ON servico_foto (id_servico, posicao);
+"""
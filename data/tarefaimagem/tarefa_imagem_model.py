@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class TarefaImagem:
+    id_tarefa: int
+    origem: str
+    destino: str
+    id_servico: Optional[int]
+    status: str  # pendente | processando | pronta | erro
+    tentativas: int
+    erro: Optional[str]
+    criada_em: str
+    atualizada_em: str
+    tipo: str = "foto"  # foto | variantes
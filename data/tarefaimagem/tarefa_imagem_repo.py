@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from data.tarefaimagem.tarefa_imagem_model import TarefaImagem
+from data.tarefaimagem.tarefa_imagem_sql import *
+from util.db import open_connection
+
+
+def _agora() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _montar_tarefa(row) -> TarefaImagem:
+    return TarefaImagem(
+        id_tarefa=row["id_tarefa"],
+        origem=row["origem"],
+        destino=row["destino"],
+        id_servico=row["id_servico"],
+        status=row["status"],
+        tentativas=row["tentativas"],
+        erro=row["erro"],
+        criada_em=row["criada_em"],
+        atualizada_em=row["atualizada_em"],
+        tipo=row["tipo"],
+    )
+
+
+def criar_tabela_tarefa_imagem() -> bool:
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(CRIAR_TABELA_TAREFA_IMAGEM)
+        conn.commit()
+        return True
+
+
+def inserir_tarefa_imagem(origem: str, destino: str, id_servico: Optional[int] = None,
+                          tipo: str = "foto") -> Optional[int]:
+    """Registra uma imagem enviada para processamento (status "pendente")."""
+    agora = _agora()
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(INSERIR_TAREFA_IMAGEM, (origem, destino, id_servico, tipo, agora, agora))
+        conn.commit()
+        return cursor.lastrowid
+
+
+def obter_tarefa_imagem_por_id(id_tarefa: int) -> Optional[TarefaImagem]:
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(OBTER_TAREFA_IMAGEM_POR_ID, (id_tarefa,))
+        row = cursor.fetchone()
+        return _montar_tarefa(row) if row else None
+
+
+def reservar_proxima_tarefa_imagem() -> Optional[TarefaImagem]:
+    """
+    Marca a tarefa pendente mais antiga como "processando" e a retorna.
+
+    A reserva só vale se o UPDATE encontrar a tarefa ainda pendente, de
+    modo que vários processos podem consumir a mesma fila sem duplicar
+    trabalho.
+    """
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        while True:
+            cursor.execute(OBTER_PROXIMA_TAREFA_PENDENTE)
+            row = cursor.fetchone()
+            if not row:
+                return None
+            cursor.execute(RESERVAR_TAREFA_IMAGEM, (_agora(), row["id_tarefa"]))
+            conn.commit()
+            if cursor.rowcount == 1:
+                cursor.execute(OBTER_TAREFA_IMAGEM_POR_ID, (row["id_tarefa"],))
+                return _montar_tarefa(cursor.fetchone())
+
+
+def atualizar_status_tarefa_imagem(id_tarefa: int, status: str, erro: Optional[str] = None) -> bool:
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(ATUALIZAR_STATUS_TAREFA_IMAGEM, (status, erro, _agora(), id_tarefa))
+        conn.commit()
+        return cursor.rowcount > 0
+
+
+def recuperar_tarefas_interrompidas(segundos: int) -> int:
+    """
+    Devolve à fila as tarefas em "processando" há mais de ``segundos``
+    (processo encerrado no meio do trabalho).
+
+    Returns:
+        Quantidade de tarefas recuperadas
+    """
+    limite = (datetime.now() - timedelta(seconds=segundos)).strftime("%Y-%m-%d %H:%M:%S")
+    with open_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(RECUPERAR_TAREFAS_INTERROMPIDAS, (_agora(), limite))
+        conn.commit()
+        return cursor.rowcount
@@ -0,0 +1,74 @@
+CRIAR_TABELA_TAREFA_IMAGEM = """
+CREATE TABLE IF NOT EXISTS tarefa_imagem (
+    id_tarefa INTEGER PRIMARY KEY AUTOINCREMENT,
+    origem TEXT NOT NULL,
+    destino TEXT NOT NULL,
+    id_servico INTEGER,
+    tipo TEXT NOT NULL DEFAULT 'foto',
+    status TEXT NOT NULL DEFAULT 'pendente',
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    erro TEXT,
+    criada_em TEXT NOT NULL,
+    atualizada_em TEXT NOT NULL,
+    FOREIGN KEY (id_servico) REFERENCES servico(id_servico)
+);
+"""
+
+
+INSERIR_TAREFA_IMAGEM = """
+INSERT INTO tarefa_imagem (origem, destino, id_servico, tipo, status, criada_em, atualizada_em)
+VALUES (?, ?, ?, ?, 'pendente', ?, ?);
+"""
+
+
+OBTER_TAREFA_IMAGEM_POR_ID = """
+SELECT * FROM tarefa_imagem
+WHERE id_tarefa = ?;
+"""
+
+
+OBTER_PROXIMA_TAREFA_PENDENTE = """
+SELECT * FROM tarefa_imagem
+WHERE status = 'pendente'
+ORDER BY id_tarefa
+LIMIT 1;
+"""
+
+
+# Só reserva se ainda estiver pendente (outro worker pode ter pego antes)
+RESERVAR_TAREFA_IMAGEM = """
+UPDATE tarefa_imagem
+SET status = 'processando', tentativas = tentativas + 1, atualizada_em = ?
+WHERE id_tarefa = ? AND status = 'pendente';
+"""
+
+
+ATUALIZAR_STATUS_TAREFA_IMAGEM = """
+UPDATE tarefa_imagem
+SET status = ?, erro = ?, atualizada_em = ?
+WHERE id_tarefa = ?;
+"""
+
+
+# Tarefas que ficaram em "processando" por um processo que morreu
+RECUPERAR_TAREFAS_INTERROMPIDAS = """
+UPDATE tarefa_imagem
+SET status = 'pendente', atualizada_em = ?
+WHERE status = 'processando' AND atualizada_em < ?;
+"""
+
+
+# foto: processa origem -> destino; variantes: gera as versões responsivas de destino
+ADICIONAR_COLUNA_TIPO = """
+ALTER TABLE tarefa_imagem ADD COLUMN tipo TEXT NOT NULL DEFAULT 'foto';
+"""
+
+
+# Índices (aplicados pela migração versionada em util/migracoes.py)
+CRIAR_INDICE_TAREFA_IMAGEM_STATUS = """
+CREATE INDEX IF NOT EXISTS idx_tarefa_imagem_status ON tarefa_imagem (status, id_tarefa);
+"""
+
+CRIAR_INDICE_TAREFA_IMAGEM_SERVICO = """
+CREATE INDEX IF NOT EXISTS idx_tarefa_imagem_servico ON tarefa_imagem (id_servico, status);
+"""
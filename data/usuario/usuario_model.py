@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
 
@@ -58,4 +58,20 @@ class Usuario:
         )
 
 
+@dataclass
+class FiltroUsuarios:
+    """
+    Filtros das listagens administrativas de usuários. Campos vazios (None)
+    não filtram; selo_confianca só se aplica a prestadores e fornecedores.
+    """
+    busca: Optional[str] = None  # prefixo do nome ou do e-mail
+    cidade: Optional[str] = None
+    estado: Optional[str] = None
+    selo_confianca: Optional[bool] = None
+    cadastro_de: Optional[date] = None
+    cadastro_ate: Optional[date] = None  # inclusivo
 
+    @property
+    def filtra_usuario(self) -> bool:
+        """Se algum filtro depende das colunas da tabela usuario."""
+        return any((self.busca, self.cidade, self.estado, self.cadastro_de, self.cadastro_ate))
@@ -1,6 +1,6 @@
-from datetime import datetime
-from typing import Optional, List
-from data.usuario.usuario_model import Usuario
+from datetime import datetime, timedelta
+from typing import Optional, List, Tuple
+from data.usuario.usuario_model import FiltroUsuarios, Usuario
 from data.usuario.usuario_sql import *
 from util.db import open_connection
 import logging
@@ -168,3 +168,50 @@ def deletar_usuario(usuario_id: int) -> bool:
         cursor.execute(DELETAR_USUARIO, (usuario_id,))
         conn.commit()
         return cursor.rowcount > 0
+
+
+def _escapar_like(texto: str) -> str:
+    return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def montar_filtro_usuarios(
+    filtro: Optional[FiltroUsuarios], coluna_selo: Optional[str] = None
+) -> Tuple[str, list]:
+    """
+    Monta o WHERE das listagens administrativas de usuários (alias ``u``
+    para a tabela usuario).
+
+    Args:
+        filtro: Filtros informados (None = sem filtro)
+        coluna_selo: Coluna do selo de confiança (ex.: 'f.selo_confianca');
+            None ignora o filtro de selo
+
+    Returns:
+        Tupla (cláusula WHERE ou '', parâmetros)
+    """
+    if filtro is None:
+        return "", []
+    condicoes, parametros = [], []
+    if filtro.busca and filtro.busca.strip():
+        prefixo = _escapar_like(filtro.busca.strip()) + "%"
+        condicoes.append(FILTROS_USUARIO["busca"])
+        parametros += [prefixo, prefixo]
+    if filtro.cidade and filtro.cidade.strip():
+        condicoes.append(FILTROS_USUARIO["cidade"])
+        parametros.append(filtro.cidade.strip())
+    if filtro.estado and filtro.estado.strip():
+        condicoes.append(FILTROS_USUARIO["estado"])
+        parametros.append(filtro.estado.strip())
+    if filtro.cadastro_de:
+        condicoes.append(FILTROS_USUARIO["cadastro_de"])
+        parametros.append(filtro.cadastro_de.isoformat())
+    if filtro.cadastro_ate:
+        # data_cadastro guarda data e hora: compara com o início do dia seguinte
+        condicoes.append(FILTROS_USUARIO["cadastro_ate"])
+        parametros.append((filtro.cadastro_ate + timedelta(days=1)).isoformat())
+    if coluna_selo and filtro.selo_confianca is not None:
+        condicoes.append(f"{coluna_selo} = ?")
+        parametros.append(int(filtro.selo_confianca))
+    if not condicoes:
+        return "", []
+    return "WHERE " + "\n  AND ".join(condicoes), parametros
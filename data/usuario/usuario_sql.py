@@ -101,4 +101,49 @@ UPDATE usuario SET foto = ? WHERE id = ?
 DELETAR_USUARIO = """
 DELETE FROM usuario
 WHERE id = ?
-"""
\ No newline at end of file
+"""
+
+
+# Índices (aplicados pela migração versionada em util/migracoes.py)
+CRIAR_INDICE_USUARIO_TOKEN = """
+CREATE INDEX IF NOT EXISTS idx_usuario_token ON usuario (token_redefinicao);
+"""
+
+CRIAR_INDICE_USUARIO_TIPO = """
+CREATE INDEX IF NOT EXISTS idx_usuario_tipo ON usuario (tipo_usuario);
+"""
+
+# Filtros das listagens administrativas (data/usuario/usuario_repo.montar_filtro_usuarios).
+# Cada condição só entra no WHERE quando o filtro correspondente foi informado.
+FILTROS_USUARIO = {
+    "busca": "(u.nome LIKE ? ESCAPE '\\' OR u.email LIKE ? ESCAPE '\\')",
+    "cidade": "u.cidade = ? COLLATE NOCASE",
+    "estado": "u.estado = ? COLLATE NOCASE",
+    "cadastro_de": "u.data_cadastro >= ?",
+    "cadastro_ate": "u.data_cadastro < ?",
+}
+
+CRIAR_INDICE_USUARIO_NOME = """
+CREATE INDEX IF NOT EXISTS idx_usuario_nome ON usuario (nome COLLATE NOCASE);
+"""
+
+CRIAR_INDICE_USUARIO_EMAIL_NOCASE = """
+CREATE INDEX IF NOT EXISTS idx_usuario_email_nocase ON usuario (email COLLATE NOCASE);
+"""
+
+CRIAR_INDICE_USUARIO_LOCALIZACAO = """
+CREATE INDEX IF NOT EXISTS idx_usuario_localizacao ON usuario (estado COLLATE NOCASE, cidade COLLATE NOCASE);
+"""
+
+CRIAR_INDICE_USUARIO_CIDADE = """
+CREATE INDEX IF NOT EXISTS idx_usuario_cidade ON usuario (cidade COLLATE NOCASE);
+"""
+
+CRIAR_INDICE_USUARIO_DATA_CADASTRO = """
+CREATE INDEX IF NOT EXISTS idx_usuario_data_cadastro ON usuario (data_cadastro);
+"""
+
+# Referências às fotos do armazenamento por conteúdo (data/arquivo)
+CRIAR_INDICE_USUARIO_FOTO = """
+CREATE INDEX IF NOT EXISTS idx_usuario_foto ON usuario (foto) WHERE foto IS NOT NULL;
+"""
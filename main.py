@@ -1,28 +1,38 @@
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
 from starlette.middleware.sessions import SessionMiddleware
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 # --- APP / DB ---
-from util.seed import criar_tabelas
-from util.db import seed_usuarios_padrao
+from util.seed import inicializar_banco
+from util.db import fechar_pools, iniciar_manutencao_periodica, parar_manutencao_periodica
+from util.db_async import encerrar_executor
+from util.security import encerrar_pool_senhas
+from util.fila_imagens import encerrar_fila_imagens, iniciar_fila_imagens
+from util.template_util import precompilar_templates
+from util.cache_config import ArquivosEstaticos
+from util.compressao import CompressaoDinamicaMiddleware
+from util.upload import LimiteUploadMiddleware
 from util.exception_handlers import (
     http_exception_handler,
     validation_exception_handler,
+    sobrecarga_exception_handler,
     generic_exception_handler,
 )
+from util.exceptions import ServicoSobrecarregadoError
 
 # --- CONFIG / LOGGER ---
 try:
-    from util.config import SECRET_KEY, SESSION_MAX_AGE, APP_NAME, VERSION
+    from util.config import SECRET_KEY, SESSION_MAX_AGE, APP_NAME, VERSION, TEMPLATES_PRECOMPILAR
     from util.logger_config import logger
 except ImportError:
     SECRET_KEY = os.getenv("SECRET_KEY")
     if not SECRET_KEY:
         raise ValueError("SECRET_KEY não configurada!")
     SESSION_MAX_AGE = 3600
+    TEMPLATES_PRECOMPILAR = False
     import logging
     logger = logging.getLogger(__name__)
 
@@ -63,14 +73,32 @@ from routes.cliente import cliente_contratacoes
 
 
 # ----------------------------------------------------------
-# INICIALIZAÇÃO DO BANCO
+# CICLO DE VIDA (BANCO E POOLS)
 # ----------------------------------------------------------
-criar_tabelas()
-seed_usuarios_padrao()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # DDL e seed só rodam quando a versão registrada no banco mudou
+    inicializar_banco()
+
+    # Checkpoint do WAL e PRAGMA optimize em segundo plano
+    iniciar_manutencao_periodica()
+
+    # Processamento das fotos enviadas (retoma o que ficou pendente)
+    iniciar_fila_imagens()
+
+    # Primeira requisição após o deploy não paga a compilação dos templates
+    if TEMPLATES_PRECOMPILAR:
+        precompilar_templates("templates")
+
+    yield
+
+    parar_manutencao_periodica()
+    encerrar_fila_imagens()
+    encerrar_executor()
+    encerrar_pool_senhas()
+    fechar_pools()
+    logger.info(f"{APP_NAME} encerrado")
 
-# Garantir que o fornecedor de teste sempre exista
-from util.seed import garantir_fornecedor_teste
-garantir_fornecedor_teste()
 
 # ----------------------------------------------------------
 # CRIAÇÃO DO APP
@@ -79,9 +107,11 @@ app = FastAPI(
     title="Obratto",
     description="Plataforma para gerenciamento de fornecedores, prestadores e clientes.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Assets com hash no nome (scripts/build_assets.py) saem com cache imutável
+app.mount("/static", ArquivosEstaticos(directory="static"), name="static")
 
 logger.info(f"{APP_NAME} v{VERSION} iniciando...")
 logger.info("SessionMiddleware configurado")
@@ -97,6 +127,10 @@ app.add_middleware(
     same_site="lax",
     https_only=False,
 )
+# gzip das páginas HTML/JSON; estáticos já saem pré-comprimidos do build
+app.add_middleware(CompressaoDinamicaMiddleware)
+# Uploads grandes demais são recusados antes de o corpo ser lido
+app.add_middleware(LimiteUploadMiddleware)
 
 # ----------------------------------------------------------
 # EXCEPTION HANDLERS
@@ -109,6 +143,10 @@ async def _http_exception_handler(request: Request, exc: StarletteHTTPException)
 async def _validation_exception_handler(request: Request, exc: RequestValidationError):
     return await validation_exception_handler(request, exc)
 
+@app.exception_handler(ServicoSobrecarregadoError)
+async def _sobrecarga_exception_handler(request: Request, exc: ServicoSobrecarregadoError):
+    return await sobrecarga_exception_handler(request, exc)
+
 @app.exception_handler(Exception)
 async def _generic_exception_handler(request: Request, exc: Exception):
     return await generic_exception_handler(request, exc)
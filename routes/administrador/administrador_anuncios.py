@@ -1,18 +1,49 @@
 from typing import Optional
 from fastapi import APIRouter, Request
 from util.auth_decorator import requer_autenticacao
+from util.db_async import assincrono
 from util.template_util import criar_templates
+from data.anuncio import anuncio_repo
 
 router = APIRouter()
 templates = criar_templates("templates")
 
 
+ANUNCIOS_POR_PAGINA = 10
+
+
 @router.get("/moderar_anuncios")
 @requer_autenticacao(["administrador"])
-async def moderar_anuncios(request: Request, usuario_logado: Optional[dict] = None):
-    return templates.TemplateResponse(
-        "admin/moderacao/anuncios.html", {"request": request, "usuario_logado": usuario_logado}
-    )
+async def moderar_anuncios(
+    request: Request,
+    q: str = "",
+    pagina: int = 1,
+    cursor: Optional[str] = None,
+    usuario_logado: Optional[dict] = None,
+):
+    q = q.strip()
+    contexto = {"request": request, "usuario_logado": usuario_logado, "termo": q}
+    if q:
+        # Busca ordenada por relevância: paginação numerada
+        pagina = max(pagina, 1)
+        anuncios, total = await assincrono(anuncio_repo).buscar_anuncios(
+            q, ANUNCIOS_POR_PAGINA, (pagina - 1) * ANUNCIOS_POR_PAGINA
+        )
+        contexto.update(
+            anuncios=anuncios,
+            total=total,
+            pagina=pagina,
+            total_paginas=max(1, -(-total // ANUNCIOS_POR_PAGINA)),
+        )
+    else:
+        # Listagem completa: paginação por cursor
+        pagina_cursor = await assincrono(anuncio_repo).listar_anuncios(ANUNCIOS_POR_PAGINA, cursor)
+        contexto.update(
+            anuncios=pagina_cursor.itens,
+            total=await assincrono(anuncio_repo).contar_anuncios(),
+            pagina_cursor=pagina_cursor,
+        )
+    return templates.TemplateResponse("admin/moderacao/anuncios.html", contexto)
 
 
 @router.get("/relatorios_anuncios")
@@ -1,13 +1,15 @@
 from typing import Optional
 from fastapi import APIRouter, Form, Request, status, UploadFile, File
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 from data.servico import servico_repo
 from data.servico.servico_model import Servico
 from util.auth_decorator import requer_autenticacao
+from util.db_async import executar
 from util.template_util import criar_templates
 from util.foto_util import (
-    salvar_nova_foto,
+    enfileirar_nova_foto,
     obter_foto_principal,
+    obter_fotos_galeria,
     obter_todas_fotos,
     excluir_foto,
     reordenar_fotos,
@@ -26,13 +28,25 @@ async def get_galeria(request: Request, id: int, usuario_logado: Optional[dict]
     if not servico:
         return RedirectResponse("/admin/servico", status.HTTP_303_SEE_OTHER)
 
-    fotos = obter_todas_fotos(id)  # ← Obtém todas as fotos do produto
+    # Uma consulta indexada em servico_foto traz a galeria já na ordem
+    galeria = obter_fotos_galeria(id)
+    fotos = [foto.url for foto in galeria if foto.status == "pronta"]
+    # Fotos enviadas que ainda estão sendo processadas (exibidas como "processando")
+    pendentes = [foto for foto in galeria if foto.status == "processando"]
     return templates.TemplateResponse(
         "administrador/galeria.html",
-        {"request": request, "servico": servico, "fotos": fotos},
+        {"request": request, "servico": servico, "fotos": fotos, "pendentes": pendentes},
     )
 
 
+# Rota consultada pela galeria enquanto há fotos em processamento
+@router.get("/{id}/galeria/status")
+@requer_autenticacao(["admin"])
+async def get_galeria_status(request: Request, id: int, usuario_logado: Optional[dict] = None):
+    pendentes = [foto for foto in obter_fotos_galeria(id) if foto.status == "processando"]
+    return JSONResponse({"pendentes": len(pendentes)})
+
+
 # Rota para upload de múltiplas fotos
 @router.post("/{id}/galeria/upload")
 @requer_autenticacao(["admin"])
@@ -50,9 +64,10 @@ async def post_galeria_upload(
     for foto in fotos:
         if foto.filename:
             try:
-                # Salvar cada foto como não-principal (será adicionada no final)
-                salvar_nova_foto(id, foto.file, como_principal=False)
-                sucesso += 1
+                # Cada foto entra na fila como não-principal (será adicionada no
+                # final); o recorte/redimensionamento acontece fora da requisição
+                if await executar(enfileirar_nova_foto, id, foto.file):
+                    sucesso += 1
             except Exception as e:
                 print(f"Erro ao salvar foto {foto.filename}: {e}")
 
@@ -73,7 +88,7 @@ async def post_galeria_excluir(
         return RedirectResponse("/admin/servico", status.HTTP_303_SEE_OTHER)
 
     try:
-        excluir_foto(id, numero)  # ← Remove foto e reordena automaticamente
+        excluir_foto(id, numero)  # ← Remove foto; as demais mantêm a ordem
     except Exception as e:
         print(f"Erro ao excluir foto: {e}")
 
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Request, Form, Depends, File, UploadFile, status
 from fastapi.responses import RedirectResponse
 from pydantic import ValidationError
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
+from urllib.parse import urlencode
 import logging
 
 from data.administrador import administrador_repo
@@ -11,14 +12,18 @@ from data.fornecedor import fornecedor_repo
 from data.prestador import prestador_repo
 from data.cliente import cliente_repo
 from data.usuario import usuario_repo
-from data.usuario.usuario_model import Usuario
+from data.usuario.usuario_model import FiltroUsuarios, Usuario
 from dtos.Administrador.administrador_dto import (
     CriarAdministradorDTO,
     AtualizarAdministradorDTO,
 )
 from util.auth_decorator import requer_autenticacao
-from util.security import criar_hash_senha
+from util.db import unit_of_work
+from util.db_async import assincrono
+from util.security import criar_hash_senha_async, verificar_senha_async
 from util.template_util import criar_templates
+from util.exceptions import ServicoSobrecarregadoError, UploadRecusadoError
+from util.upload import salvar_upload_por_conteudo
 
 # Configurar logger
 logger = logging.getLogger(__name__)
@@ -27,6 +32,38 @@ router = APIRouter()
 templates = criar_templates("templates")
 administrador_usuarios = APIRouter()
 
+USUARIOS_POR_PAGINA = 20
+PARAMETROS_FILTRO = ("busca", "cidade", "estado", "selo", "cadastro_de", "cadastro_ate")
+
+
+def _data_ou_none(valor: Optional[str]) -> Optional[date]:
+    try:
+        return date.fromisoformat(valor) if valor else None
+    except ValueError:
+        return None
+
+
+def _filtro_da_requisicao(request: Request) -> FiltroUsuarios:
+    """Lê os filtros das listagens de usuários da query string (?busca=&cidade=...)."""
+    params = request.query_params
+    selo = params.get("selo")
+    return FiltroUsuarios(
+        busca=params.get("busca") or None,
+        cidade=params.get("cidade") or None,
+        estado=params.get("estado") or None,
+        selo_confianca={"sim": True, "nao": False}.get(selo),
+        cadastro_de=_data_ou_none(params.get("cadastro_de")),
+        cadastro_ate=_data_ou_none(params.get("cadastro_ate")),
+    )
+
+
+def _query_filtro(request: Request, *extras: str) -> str:
+    """Filtros (e parâmetros ``extras``) já informados, para os links de paginação."""
+    params = request.query_params
+    return urlencode(
+        [(nome, params[nome]) for nome in PARAMETROS_FILTRO + extras if params.get(nome)]
+    )
+
 
 @router.get("/home")
 @requer_autenticacao(["administrador"])
@@ -132,7 +169,7 @@ async def cadastrar_administrador(
             )
 
         # Criar hash da senha (usar senha validada)
-        senha_hash = criar_hash_senha(admin_dto.senha)
+        senha_hash = await criar_hash_senha_async(admin_dto.senha)
 
         # Criar objeto Usuario
         usuario = Usuario(
@@ -156,11 +193,18 @@ async def cadastrar_administrador(
             data_token=None,
         )
 
-        # Inserir usuário no banco
-        id_usuario = usuario_repo.inserir_usuario(usuario)
-        logger.info(
-            f"Usuário criado com ID: {id_usuario}, tipo_usuario: {usuario.tipo_usuario}"
-        )
+        # usuario + administrador em uma única transação (um commit)
+        admin_id = None
+        with unit_of_work() as uow:
+            id_usuario = usuario_repo.inserir_usuario(usuario)
+            logger.info(
+                f"Usuário criado com ID: {id_usuario}, tipo_usuario: {usuario.tipo_usuario}"
+            )
+            if id_usuario:
+                administrador = Administrador(id=None, id_usuario=id_usuario)
+                admin_id = administrador_repo.inserir_administrador(administrador)
+                if not admin_id:
+                    uow.rollback()
 
         if not id_usuario:
             return templates.TemplateResponse(
@@ -172,13 +216,7 @@ async def cadastrar_administrador(
                 },
             )
 
-        # Criar registro na tabela administrador
-        administrador = Administrador(id=None, id_usuario=id_usuario)
-        admin_id = administrador_repo.inserir_administrador(administrador)
-
         if not admin_id:
-            # Se falhar, remover usuário criado (rollback manual)
-            usuario_repo.deletar_usuario(id_usuario)
             return templates.TemplateResponse(
                 "admin/usuarios/administradores/cadastrar.html",
                 {
@@ -235,6 +273,9 @@ async def cadastrar_administrador(
             },
         )
 
+    except ServicoSobrecarregadoError:
+        raise  # 503 com Retry-After (handler da aplicação)
+
     except Exception as e:
         import traceback
 
@@ -276,9 +317,7 @@ async def post_editar_adm(
         usuario.nome = nome
         usuario.email = email
         if senha:
-            from util.security import criar_hash_senha
-
-            usuario.senha = criar_hash_senha(senha)
+            usuario.senha = await criar_hash_senha_async(senha)
         usuario_repo.atualizar_usuario(usuario)
     return templates.TemplateResponse(
         "admin/usuarios/administradores/editar.html", {"request": request}
@@ -309,11 +348,21 @@ async def get_administrador(request: Request, id: int, usuario_logado: Optional[
 # Moderar prestadores
 @router.get("/listar_prestador")
 @requer_autenticacao(["administrador"])
-async def get_listar_prestador(request: Request, usuario_logado: Optional[dict] = None):
-    prestadores = prestador_repo.obter_prestador()
+async def get_listar_prestador(
+    request: Request, cursor: Optional[str] = None, usuario_logado: Optional[dict] = None
+):
+    filtro = _filtro_da_requisicao(request)
+    pagina = await assincrono(prestador_repo).listar_prestadores(filtro, USUARIOS_POR_PAGINA, cursor)
     return templates.TemplateResponse(
         "admin/usuarios/prestadores/listar.html",
-        {"request": request, "prestadores": prestadores},
+        {
+            "request": request,
+            "prestadores": pagina.itens,
+            "pagina": pagina,
+            "total": await assincrono(prestador_repo).contar_prestadores(filtro),
+            "filtro": request.query_params,
+            "query": _query_filtro(request),
+        },
     )
 
 
@@ -365,12 +414,26 @@ async def get_prestador_por_id(
 @router.get("/listar_fornecedor")
 @requer_autenticacao(["administrador"])
 async def get_listar_fornecedor(
-    request: Request, usuario_logado: Optional[dict] = None
+    request: Request, cursor: Optional[str] = None, usuario_logado: Optional[dict] = None
 ):
-    fornecedores = fornecedor_repo.obter_fornecedor()
+    filtro = _filtro_da_requisicao(request)
+    pagina = await assincrono(fornecedor_repo).listar_fornecedores(filtro, USUARIOS_POR_PAGINA, cursor)
     return templates.TemplateResponse(
         "admin/usuarios/fornecedores/listar.html",
-        {"request": request, "fornecedores": fornecedores},
+        {
+            "request": request,
+            "fornecedores": pagina.itens,
+            "pagina": pagina,
+            "total": await assincrono(fornecedor_repo).contar_fornecedores(filtro),
+            "total_com_selo": await assincrono(fornecedor_repo).contar_fornecedores(
+                FiltroUsuarios(selo_confianca=True)
+            ),
+            "total_sem_selo": await assincrono(fornecedor_repo).contar_fornecedores(
+                FiltroUsuarios(selo_confianca=False)
+            ),
+            "filtro": request.query_params,
+            "query": _query_filtro(request),
+        },
     )
 
 
@@ -425,10 +488,21 @@ async def get_fornecedor_por_id(
 
 @router.get("/listar_cliente")
 @requer_autenticacao(["administrador"])
-async def get_listar_cliente(request: Request, usuario_logado: Optional[dict] = None):
-    clientes = cliente_repo.obter_cliente()
+async def get_listar_cliente(
+    request: Request, cursor: Optional[str] = None, usuario_logado: Optional[dict] = None
+):
+    filtro = _filtro_da_requisicao(request)
+    pagina = await assincrono(cliente_repo).listar_clientes(filtro, USUARIOS_POR_PAGINA, cursor)
     return templates.TemplateResponse(
-        "admin/usuarios/clientes/listar.html", {"request": request, "clientes": clientes}
+        "admin/usuarios/clientes/listar.html",
+        {
+            "request": request,
+            "clientes": pagina.itens,
+            "pagina": pagina,
+            "total": await assincrono(cliente_repo).contar_clientes(filtro),
+            "filtro": request.query_params,
+            "query": _query_filtro(request),
+        },
     )
 
 
@@ -479,26 +553,35 @@ async def get_cliente_por_id(
 @router.get("/verificacao_selo")
 @requer_autenticacao(["administrador"])
 async def listar_usuarios_aguardando_selo(
-    request: Request, usuario_logado: Optional[dict] = None
+    request: Request,
+    cursor_fornecedor: Optional[str] = None,
+    cursor_prestador: Optional[str] = None,
+    usuario_logado: Optional[dict] = None,
 ):
-    fornecedores = [
-        f
-        for f in fornecedor_repo.obter_fornecedor()
-        if not getattr(f, "selo_confianca", False)
-    ]
-    prestadores = []
-    try:
-        prestadores = [
-            p
-            for p in prestador_repo.obter_prestador()
-            if not getattr(p, "selo_confianca", False)
-        ]
-    except Exception:
-        pass
+    # O selo pendente é sempre filtrado no SQL; os demais filtros vêm da URL
+    filtro = _filtro_da_requisicao(request)
+    filtro.selo_confianca = False
+    pagina_fornecedores = await assincrono(fornecedor_repo).listar_fornecedores(
+        filtro, USUARIOS_POR_PAGINA, cursor_fornecedor
+    )
+    pagina_prestadores = await assincrono(prestador_repo).listar_prestadores(
+        filtro, USUARIOS_POR_PAGINA, cursor_prestador
+    )
 
     return templates.TemplateResponse(
         "admin/verificacao_usuario.html",
-        {"request": request, "fornecedores": fornecedores, "prestadores": prestadores},
+        {
+            "request": request,
+            "fornecedores": pagina_fornecedores.itens,
+            "prestadores": pagina_prestadores.itens,
+            "pagina_fornecedores": pagina_fornecedores,
+            "pagina_prestadores": pagina_prestadores,
+            "total_fornecedores": await assincrono(fornecedor_repo).contar_fornecedores(filtro),
+            "total_prestadores": await assincrono(prestador_repo).contar_prestadores(filtro),
+            "filtro": request.query_params,
+            "query_fornecedores": _query_filtro(request, "cursor_prestador"),
+            "query_prestadores": _query_filtro(request, "cursor_fornecedor"),
+        },
     )
 
 
@@ -553,7 +636,6 @@ async def post_editar_perfil_administrador(
 ):
     assert usuario_logado is not None
     adm = administrador_repo.obter_administrador_por_id(usuario_logado["id"])
-    from util.security import verificar_senha, criar_hash_senha
 
     # Verifica senha atual
     if adm is None:
@@ -562,7 +644,7 @@ async def post_editar_perfil_administrador(
             {"request": request, "erro": "Administrador não encontrado."},
         )
 
-    if not verificar_senha(senha_atual, adm.senha):
+    if not await verificar_senha_async(senha_atual, adm.senha):
         return templates.TemplateResponse(
             "admin/perfil_editar.html",
             {
@@ -578,7 +660,7 @@ async def post_editar_perfil_administrador(
 
     # Atualiza senha se fornecida
     if senha_nova and senha_nova.strip():
-        adm.senha = criar_hash_senha(senha_nova)
+        adm.senha = await criar_hash_senha_async(senha_nova)
 
     # Update user via usuario_repo
     usuario_repo.atualizar_usuario(adm)
@@ -618,30 +700,16 @@ async def upload_foto_perfil_administrador(
             "/administrador/perfil?erro=tipo_invalido", status_code=303
         )
 
-    # Criar diretório de upload se não existir
-    upload_dir = "static/uploads/administradores"
-    os.makedirs(upload_dir, exist_ok=True)
-
-    # Gerar nome único para o arquivo
-    import secrets
-
     if foto.filename is None:
         return RedirectResponse(
             "/administrador/perfil?erro=arquivo_invalido", status_code=303
         )
 
-    extensao = foto.filename.split(".")[-1]
-    nome_arquivo = f"{usuario_logado['id']}_{secrets.token_hex(8)}.{extensao}"
-    caminho_arquivo = os.path.join(upload_dir, nome_arquivo)
-
-    # Salvar arquivo
+    # Salvar arquivo (nome = hash do conteúdo, sem duplicatas)
     try:
-        conteudo = await foto.read()
-        with open(caminho_arquivo, "wb") as f:
-            f.write(conteudo)
+        caminho_relativo = await salvar_upload_por_conteudo(foto)
 
         # Atualizar caminho no banco (usar caminho relativo)
-        caminho_relativo = f"/static/uploads/administradores/{nome_arquivo}"
         if hasattr(administrador_repo, "atualizar_foto"):
             administrador_repo.atualizar_foto(usuario_logado["id"], caminho_relativo)
 
@@ -652,6 +720,10 @@ async def upload_foto_perfil_administrador(
 
             criar_sessao(request, usuario_logado)
 
+    except UploadRecusadoError as e:
+        return RedirectResponse(
+            f"/administrador/perfil?erro={e.motivo}", status_code=303
+        )
     except Exception as e:
         return RedirectResponse(
             "/administrador/perfil?erro=upload_falhou", status_code=303
@@ -113,8 +113,5 @@ def obter_avaliacoes_por_avaliado(id_avaliado: int, request: Request):
 
 @router.get("/media/{id_avaliado}")
 def media_avaliacoes(id_avaliado: int):
-    todas = avaliacao_repo.obter_todos()
-    notas = [a.nota for a in todas if a.id_avaliado == id_avaliado]
-    if not notas:
-        return {"media": 0.0}
-    return {"media": sum(notas) / len(notas)}
+    resumo = avaliacao_repo.obter_resumo_avaliacao(id_avaliado)
+    return {"media": resumo.media, "quantidade": resumo.quantidade}
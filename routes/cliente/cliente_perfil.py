@@ -7,6 +7,8 @@ from data.cliente import cliente_repo
 from data.cliente.cliente_model import Cliente
 from util.auth_decorator import requer_autenticacao
 from util.template_util import criar_templates
+from util.exceptions import UploadRecusadoError
+from util.upload import salvar_upload_por_conteudo
 from util.security import criar_hash_senha
 from fastapi import status
 
@@ -124,33 +126,22 @@ async def alterar_foto(
     if foto.content_type not in tipos_permitidos:
         return RedirectResponse("/perfil?erro=tipo_invalido", status.HTTP_303_SEE_OTHER)
 
-    # 2. Criar diretório se não existir
-    upload_dir = "static/uploads/cliente"
-    os.makedirs(upload_dir, exist_ok=True)
-
-    # 3. Gerar nome único para evitar conflitos
-    import secrets
-
-    extensao = foto.filename.split(".")[-1] if foto.filename else "jpg"
-    nome_arquivo = f"{usuario_logado['id']}_{secrets.token_hex(8)}.{extensao}"
-    caminho_arquivo = os.path.join(upload_dir, nome_arquivo)
-
-    # 4. Salvar arquivo no sistema
+    # 2. Salvar arquivo no sistema
     try:
-        conteudo = await foto.read()  # ← Lê conteúdo do arquivo
-        with open(caminho_arquivo, "wb") as f:
-            f.write(conteudo)
+        # ← Nome = hash do conteúdo; a mesma imagem não é gravada duas vezes
+        caminho_relativo = await salvar_upload_por_conteudo(foto)
 
-        # 5. Salvar caminho no banco de dados
-        caminho_relativo = f"/static/uploads/cliente/{nome_arquivo}"
+        # 3. Salvar caminho no banco de dados (a foto anterior perde a referência)
         cliente_repo.atualizar_foto(usuario_logado["id"], caminho_relativo)
 
-        # 6. Atualizar sessão do usuário
+        # 4. Atualizar sessão do usuário
         usuario_logado["foto"] = caminho_relativo
         from util.auth_decorator import criar_sessao
 
         criar_sessao(request, usuario_logado)
 
+    except UploadRecusadoError as e:
+        return RedirectResponse(f"/perfil?erro={e.motivo}", status.HTTP_303_SEE_OTHER)
     except Exception as e:
         return RedirectResponse("/perfil?erro=upload_falhou", status.HTTP_303_SEE_OTHER)
 
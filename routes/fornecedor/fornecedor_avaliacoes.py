@@ -11,12 +11,16 @@ router = APIRouter()
 templates = criar_templates("templates")
 
 
+AVALIACOES_POR_PAGINA = 10
+
+
 @router.get("/avaliacoes/recebidas")
 @requer_autenticacao(["fornecedor"])
 async def avaliacoes_recebidas(
     request: Request,
     usuario_logado: Optional[dict] = None,
     ordenar: str = "recente",
+    pagina: int = 1,
 ):
     """
     Página de avaliações recebidas pelo fornecedor
@@ -28,34 +32,18 @@ async def avaliacoes_recebidas(
     if not fornecedor:
         raise HTTPException(status_code=404, detail="Fornecedor não encontrado")
 
-    # Obter todas as avaliações para este fornecedor (id_avaliado = usuario_logado["id"])
-    todas_avaliacoes = avaliacao_repo.obter_todos()
-    
-    # Filtrar apenas avaliações recebidas por este fornecedor
-    avaliacoes = [
-        a for a in todas_avaliacoes 
-        if a.id_avaliado == usuario_logado["id"]
-    ]
-
-    # Ordenação
-    if ordenar == "recente":
-        avaliacoes.sort(key=lambda x: x.data_avaliacao, reverse=True)
-    elif ordenar == "antiga":
-        avaliacoes.sort(key=lambda x: x.data_avaliacao)
-    elif ordenar == "nota_alta":
-        avaliacoes.sort(key=lambda x: x.nota, reverse=True)
-    elif ordenar == "nota_baixa":
-        avaliacoes.sort(key=lambda x: x.nota)
+    # Estatísticas calculadas no banco, sobre todas as avaliações recebidas
+    estatisticas = avaliacao_repo.obter_estatisticas_avaliacoes(usuario_logado["id"])
+    total_paginas = max(1, -(-estatisticas.total // AVALIACOES_POR_PAGINA))
+    pagina = min(max(pagina, 1), total_paginas)
 
-    # Calcular estatísticas
-    media_nota = 0
-    nota_maxima = 0
-    nota_minima = 5
-    
-    if avaliacoes:
-        media_nota = sum(a.nota for a in avaliacoes) / len(avaliacoes)
-        nota_maxima = max(a.nota for a in avaliacoes)
-        nota_minima = min(a.nota for a in avaliacoes)
+    # Apenas a página atual, já ordenada
+    avaliacoes = avaliacao_repo.obter_avaliacoes_recebidas(
+        usuario_logado["id"],
+        ordenar=ordenar,
+        limit=AVALIACOES_POR_PAGINA,
+        offset=(pagina - 1) * AVALIACOES_POR_PAGINA,
+    )
 
     return templates.TemplateResponse(
         "fornecedor/avaliacoes/recebidas.html",
@@ -63,9 +51,14 @@ async def avaliacoes_recebidas(
             "request": request,
             "usuario_logado": usuario_logado,
             "avaliacoes": avaliacoes,
-            "media_nota": media_nota,
-            "nota_maxima": nota_maxima,
-            "nota_minima": nota_minima,
+            "total_avaliacoes": estatisticas.total,
+            "media_nota": estatisticas.media,
+            "nota_maxima": estatisticas.nota_maxima,
+            "nota_minima": estatisticas.nota_minima,
+            "histograma": estatisticas.histograma,
+            "ordenar": ordenar,
+            "pagina": pagina,
+            "total_paginas": total_paginas,
             "now": datetime.now(),
         }
     )
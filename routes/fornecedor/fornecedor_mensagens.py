@@ -9,17 +9,34 @@ router = APIRouter(prefix="/mensagens")
 templates = criar_templates("templates")
 
 
+MENSAGENS_POR_PAGINA = 20
+
+
+def _proxima_pagina(mensagens) -> Optional[int]:
+    """Cursor (id da última mensagem) se a página veio cheia."""
+    if len(mensagens) == MENSAGENS_POR_PAGINA:
+        return mensagens[-1].id_mensagem
+    return None
+
+
 # Listar mensagens recebidas pelo fornecedor
 @router.get("/recebidas")
 @requer_autenticacao(["fornecedor"])
 async def listar_mensagens_recebidas(
-    request: Request, usuario_logado: Optional[dict] = None
+    request: Request, antes_de: Optional[int] = None, usuario_logado: Optional[dict] = None
 ):
     assert usuario_logado is not None
-    mensagens = mensagem_repo.obter_mensagem(usuario_logado["id"])
+    mensagens = mensagem_repo.obter_caixa_entrada(
+        usuario_logado["id"], limite=MENSAGENS_POR_PAGINA, antes_de=antes_de
+    )
     return templates.TemplateResponse(
         "fornecedor/mensagens/recebidas.html",
-        {"request": request, "mensagens": mensagens},
+        {
+            "request": request,
+            "mensagens": mensagens,
+            "nao_lidas": mensagem_repo.contar_nao_lidas(usuario_logado["id"]),
+            "proxima_pagina": _proxima_pagina(mensagens),
+        },
     )
 
 
@@ -27,14 +44,19 @@ async def listar_mensagens_recebidas(
 @router.get("/enviadas")
 @requer_autenticacao(["fornecedor"])
 async def listar_mensagens_enviadas(
-    request: Request, usuario_logado: Optional[dict] = None
+    request: Request, antes_de: Optional[int] = None, usuario_logado: Optional[dict] = None
 ):
     assert usuario_logado is not None
-    # TODO: Implement obter_mensagens_enviadas or filter obter_mensagem results
-    mensagens = mensagem_repo.obter_mensagem(usuario_logado["id"])
+    mensagens = mensagem_repo.obter_caixa_saida(
+        usuario_logado["id"], limite=MENSAGENS_POR_PAGINA, antes_de=antes_de
+    )
     return templates.TemplateResponse(
         "fornecedor/mensagens_enviadas.html",
-        {"request": request, "mensagens": mensagens},
+        {
+            "request": request,
+            "mensagens": mensagens,
+            "proxima_pagina": _proxima_pagina(mensagens),
+        },
     )
 
 
@@ -48,6 +70,8 @@ async def visualizar_mensagem(
     mensagem = mensagem_repo.obter_mensagem_por_id(id_mensagem)
     if not mensagem or mensagem.id_destinatario != usuario_logado["id"]:
         raise HTTPException(status_code=404, detail="Mensagem não encontrada")
+    if not mensagem.lida:
+        mensagem_repo.marcar_mensagem_como_lida(id_mensagem)
     return templates.TemplateResponse(
         "fornecedor/mensagem_detalhe.html", {"request": request, "mensagem": mensagem}
     )
@@ -5,9 +5,11 @@ from fastapi import APIRouter, Request, Form, UploadFile, File, HTTPException
 from data.usuario.usuario_sql import ATUALIZAR_FOTO
 from util.auth_decorator import requer_autenticacao
 from util.template_util import criar_templates
+from util.exceptions import ServicoSobrecarregadoError, UploadRecusadoError
+from util.upload import salvar_upload_por_conteudo
 from data.fornecedor.fornecedor_model import Fornecedor
 from data.fornecedor import fornecedor_repo
-from util.security import criar_hash_senha
+from util.security import criar_hash_senha_async, verificar_senha_async
 from data.usuario import usuario_repo
 from data.usuario.usuario_repo import atualizar_foto
 from data.avaliacao import avaliacao_repo
@@ -177,14 +179,13 @@ async def processar_cadastro_fornecedor(
             )
         
         # Criar novo usuário
-        from util.security import criar_hash_senha
         from data.usuario.usuario_model import Usuario
         
         novo_usuario = Usuario(
             id=0,
             nome=nome,
             email=email,
-            senha_hash=criar_hash_senha(senha),
+            senha_hash=await criar_hash_senha_async(senha),
             tipo_usuario="fornecedor",
             ativo=True,
             data_criacao=datetime.now(),
@@ -225,6 +226,8 @@ async def processar_cadastro_fornecedor(
             }
         )
         
+    except ServicoSobrecarregadoError:
+        raise  # 503 com Retry-After (handler da aplicação)
     except Exception as e:
         logger.error(f"Erro ao cadastrar fornecedor: {e}")
         return templates.TemplateResponse(
@@ -323,9 +326,6 @@ async def editar_perfil_fornecedor(
 
 # 3. Alterar senha do fornecedor
 
-from util.security import verificar_senha, criar_hash_senha
-
-
 @router.post("/perfil/alterar-senha")
 @requer_autenticacao(["fornecedor"])
 async def alterar_senha_fornecedor(
@@ -342,7 +342,7 @@ async def alterar_senha_fornecedor(
     if not fornecedor:
         raise HTTPException(status_code=404, detail="Fornecedor não encontrado")
     # Verifica se a senha atual está correta (usando hash)
-    if not verificar_senha(senha_atual, fornecedor.senha):
+    if not await verificar_senha_async(senha_atual, fornecedor.senha):
         from fastapi import status
         from fastapi.responses import RedirectResponse
 
@@ -351,7 +351,7 @@ async def alterar_senha_fornecedor(
             status_code=status.HTTP_303_SEE_OTHER,
         )
     # Atualiza a senha com hash
-    nova_senha_hash = criar_hash_senha(nova_senha)
+    nova_senha_hash = await criar_hash_senha_async(nova_senha)
     usuario_repo.atualizar_senha_usuario(usuario_logado["id"], nova_senha_hash)
     from fastapi import status
     from fastapi.responses import RedirectResponse
@@ -402,25 +402,11 @@ async def upload_foto_perfil(
             "/fornecedor/perfil/?erro=tipo_invalido", status_code=303
         )
 
-    # Criar diretório de upload se não existir
-    upload_dir = "static/uploads/fornecedores"
-    os.makedirs(upload_dir, exist_ok=True)
-
-    # Gerar nome único para o arquivo
-    import secrets
-
-    extensao = foto.filename.split(".")[-1] if foto.filename else "jpg"
-    nome_arquivo = f"{usuario_logado['id']}_{secrets.token_hex(8)}.{extensao}"
-    caminho_arquivo = os.path.join(upload_dir, nome_arquivo)
-
-    # Salvar arquivo
+    # Salvar arquivo (nome = hash do conteúdo, sem duplicatas)
     try:
-        conteudo = await foto.read()
-        with open(caminho_arquivo, "wb") as f:
-            f.write(conteudo)
+        caminho_relativo = await salvar_upload_por_conteudo(foto)
 
         # Atualizar caminho no banco (usar caminho relativo)
-        caminho_relativo = f"/static/uploads/fornecedores/{nome_arquivo}"
         atualizar_foto(usuario_logado["id"], caminho_relativo)
 
         # Atualizar sessão (se aplicável)
@@ -429,6 +415,12 @@ async def upload_foto_perfil(
 
         criar_sessao(request, usuario_logado)
 
+    except UploadRecusadoError as e:
+        from fastapi.responses import RedirectResponse
+
+        return RedirectResponse(
+            f"/fornecedor/perfil/?erro={e.motivo}", status_code=303
+        )
     except Exception as e:
         from fastapi.responses import RedirectResponse
 
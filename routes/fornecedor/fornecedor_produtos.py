@@ -3,7 +3,12 @@ from fastapi import APIRouter, Request, Form, UploadFile, File, Query, status
 from fastapi.responses import RedirectResponse
 from pydantic import ValidationError
 from util.auth_decorator import requer_autenticacao
+from util.db_async import assincrono
 from util.template_util import criar_templates
+from util.exceptions import UploadRecusadoError
+from util.upload import salvar_upload_por_conteudo
+from util.armazenamento import eh_enderecado_por_conteudo
+from util.imagens_responsivas import remover_variantes
 from util.flash_messages import informar_sucesso, informar_erro
 import os
 
@@ -53,26 +58,31 @@ async def buscar_produto(
         if produto and produto.fornecedor_id == usuario_logado["id"]:
             produtos = [produto]
     elif nome and nome.strip():
-        # Buscar apenas produtos do fornecedor logado
-        todos_produtos = produto_repo.obter_produtos_por_fornecedor(
-            usuario_logado["id"], limit=100, offset=0
+        # Busca textual apenas nos produtos do fornecedor logado
+        produtos = await assincrono(produto_repo).buscar_produtos(
+            nome, fornecedor_id=usuario_logado["id"], limit=100, offset=0
         )
-        produtos = [p for p in todos_produtos if nome.lower() in p.nome.lower()]
 
     return templates.TemplateResponse(
         "fornecedor/produtos/produtos.html", {"request": request, "produtos": produtos}
     )
 
 
+PRODUTOS_POR_PAGINA = 10
+
+
 @router.get("/listar")
 @requer_autenticacao(["fornecedor"])
-async def listar_produtos(request: Request, usuario_logado: Optional[dict] = None):
+async def listar_produtos(
+    request: Request, cursor: Optional[str] = None, usuario_logado: Optional[dict] = None
+):
     assert usuario_logado is not None
-    produtos = produto_repo.obter_produtos_por_fornecedor(
-        usuario_logado["id"], limit=10, offset=0
+    pagina = await assincrono(produto_repo).listar_produtos_por_fornecedor(
+        usuario_logado["id"], limite=PRODUTOS_POR_PAGINA, cursor=cursor
     )
     response = templates.TemplateResponse(
-        "fornecedor/produtos/produtos.html", {"request": request, "produtos": produtos}
+        "fornecedor/produtos/produtos.html",
+        {"request": request, "produtos": pagina.itens, "pagina": pagina},
     )
     return response
 
@@ -106,8 +116,6 @@ async def cadastrar_produto(
         )
 
         # Upload de foto
-        import secrets
-
         tipos_permitidos = [
             "image/jpeg",
             "image/png",
@@ -115,8 +123,6 @@ async def cadastrar_produto(
             "image/webp",
             "image/avif",
         ]
-        pasta_fotos = "static/uploads/produtos_fornecedor"
-        os.makedirs(pasta_fotos, exist_ok=True)
         caminho_foto = None
 
         if foto and foto.filename:
@@ -132,15 +138,8 @@ async def cadastrar_produto(
                     },
                 )
 
-            extensao = foto.filename.split(".")[-1]
-            nome_arquivo = (
-                f"{dto.nome.replace(' ', '_')}_{secrets.token_hex(8)}.{extensao}"
-            )
-            caminho_arquivo = os.path.join(pasta_fotos, nome_arquivo)
-            conteudo = await foto.read()
-            with open(caminho_arquivo, "wb") as f:
-                f.write(conteudo)
-            caminho_foto = f"/static/uploads/produtos_fornecedor/{nome_arquivo}"
+            # Nome = hash do conteúdo; a referência é contada ao inserir o produto
+            caminho_foto = await salvar_upload_por_conteudo(foto)
 
         # Criar produto
         produto = Produto(
@@ -169,6 +168,12 @@ async def cadastrar_produto(
             "fornecedor/produtos/cadastrar.html",
             {"request": request, "dados": {"nome": nome, "descricao": descricao}},
         )
+    except UploadRecusadoError as e:
+        informar_erro(request, e.mensagem)
+        return templates.TemplateResponse(
+            "fornecedor/produtos/cadastrar.html",
+            {"request": request, "dados": {"nome": nome, "descricao": descricao}},
+        )
     except Exception as e:
         informar_erro(request, f"Erro ao cadastrar produto: {str(e)}")
         return templates.TemplateResponse(
@@ -234,21 +239,19 @@ async def atualizar_produto(
     import os
 
     if foto and foto.filename:
-        # Apaga a foto antiga se existir
-        if caminho_foto:
-            apagar_arquivo_imagem(caminho_foto)
+        try:
+            nova_foto = await salvar_upload_por_conteudo(foto)
+        except UploadRecusadoError as e:
+            informar_erro(request, e.mensagem)
+            return templates.TemplateResponse(
+                "fornecedor/produtos/alterar.html",
+                {"request": request, "produto": produto},
+            )
 
-        pasta_fotos = "static/uploads/produtos_fornecedor"
-        os.makedirs(pasta_fotos, exist_ok=True)
-        import secrets
-
-        extensao = foto.filename.split(".")[-1]
-        nome_arquivo = f"{nome.replace(' ', '_')}_{secrets.token_hex(8)}.{extensao}"
-        caminho_arquivo = os.path.join(pasta_fotos, nome_arquivo)
-        conteudo = await foto.read()
-        with open(caminho_arquivo, "wb") as f:
-            f.write(conteudo)
-        caminho_foto = f"/static/uploads/produtos_fornecedor/{nome_arquivo}"
+        # Apaga a foto antiga só depois que a nova foi gravada
+        if caminho_foto and caminho_foto != nova_foto:
+            apagar_arquivo_imagem(caminho_foto)
+        caminho_foto = nova_foto
     produto_atualizado = Produto(
         id=id,
         nome=nome,
@@ -355,7 +358,13 @@ async def confi_exclusao_produto(
 
 def apagar_arquivo_imagem(caminho_foto: str):
     """Remove o arquivo de imagem do sistema de arquivos se existir"""
+    if eh_enderecado_por_conteudo(caminho_foto):
+        # Pode ser compartilhado: os gatilhos da tabela arquivo descontam a
+        # referência e a limpeza de órfãos apaga quando ninguém mais usa
+        return
     if caminho_foto:
+        remover_variantes(caminho_foto)
+
         # Remover a barra inicial para construir o caminho correto
         if caminho_foto.startswith("/"):
             caminho_foto = caminho_foto[1:]
@@ -3,7 +3,12 @@ from typing import Optional
 from util.auth_decorator import requer_autenticacao
 from util.template_util import criar_templates
 from fastapi.responses import RedirectResponse
-from data.produto.produto_repo import obter_produto_por_id, atualizar_produto, obter_produtos
+from data.produto.produto_repo import (
+    obter_produto_por_id,
+    atualizar_produto,
+    obter_produtos,
+    obter_promocoes_por_fornecedor,
+)
 from data.produto.produto_model import Produto
 
 router = APIRouter(prefix="/promocoes")
@@ -29,11 +34,8 @@ async def debug_test(request: Request):
 async def listar_promocoes(request: Request, usuario_logado: Optional[dict] = None):
     assert usuario_logado is not None
     
-    # Obter todos os produtos
-    produtos = obter_produtos()
-    
-    # Filtrar produtos em promoção do fornecedor
-    promocoes = [p for p in produtos if p.em_promocao and p.fornecedor_id == usuario_logado.get("id")]
+    # Apenas os produtos em promoção do fornecedor logado
+    promocoes = obter_promocoes_por_fornecedor(usuario_logado["id"])
     
     return templates.TemplateResponse(
         "fornecedor/promocao/promocoes.html", 
@@ -1,45 +1,62 @@
 from typing import Optional
 from fastapi import APIRouter, Request
 from util.auth_decorator import requer_autenticacao
+from util.db_async import assincrono
 from util.template_util import criar_templates
 from data.orcamento import orcamento_repo
-from data.cliente import cliente_repo
-import datetime
 
 router = APIRouter()
 templates = criar_templates("templates")
 
 
+SOLICITACOES_POR_PAGINA = 12
+
+
 # Rota GET para exibir solicitações recebidas
 @router.get("/solicitacoes_recebidas")
 @requer_autenticacao(["fornecedor"])
 async def solicitacoes_recebidas(
-    request: Request, usuario_logado: Optional[dict] = None
+    request: Request,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    usuario_logado: Optional[dict] = None,
 ):
     assert usuario_logado is not None
-    # obter todos os orçamentos e filtrar pelo fornecedor logado
-    todos = orcamento_repo.obter_todos_orcamentos()
-    solicitacoes = []
-    for o in todos:
-        if getattr(o, 'id_fornecedor', None) == usuario_logado['id']:
-            # Buscar dados do cliente para exibir nome/avatar
-            cliente = cliente_repo.obter_cliente_por_id(o.id_cliente)
-            solicitacoes.append(
-                {
-                    'id': o.id,
-                    'cliente_id': o.id_cliente,
-                    'cliente_nome': cliente.nome if cliente else 'Cliente',
-                    'cliente_avatar': getattr(cliente, 'foto', None) if cliente else None,
-                    'produto_nome': getattr(o, 'descricao', '')[:50],
-                    'mensagem': getattr(o, 'descricao', ''),
-                    'data': o.data_solicitacao.strftime('%d/%m/%Y') if hasattr(o, 'data_solicitacao') else '',
-                    'conversa_id': None,
-                }
-            )
+    status = status or None
+    # Filtro, paginação (por cursor) e dados do cliente em uma única consulta
+    pagina = await assincrono(orcamento_repo).listar_orcamentos_por_fornecedor(
+        usuario_logado['id'],
+        status=status,
+        limite=SOLICITACOES_POR_PAGINA,
+        cursor=cursor,
+    )
+    solicitacoes = [
+        {
+            'id': o.id,
+            'cliente_id': o.id_cliente,
+            'cliente_nome': o.nome_cliente or 'Cliente',
+            'cliente_avatar': o.foto_cliente,
+            'produto_nome': (o.descricao or '')[:50],
+            'mensagem': o.descricao or '',
+            'status': o.status,
+            'data': o.data_solicitacao.strftime('%d/%m/%Y'),
+            'conversa_id': None,
+        }
+        for o in pagina.itens
+    ]
 
     return templates.TemplateResponse(
         "fornecedor/orcamentos/recebidas.html",
-        {"request": request, "solicitacoes": solicitacoes, "usuario_logado": usuario_logado},
+        {
+            "request": request,
+            "solicitacoes": solicitacoes,
+            "usuario_logado": usuario_logado,
+            "status": status,
+            "contagem_status": await assincrono(orcamento_repo).contar_orcamentos_por_status(
+                usuario_logado['id']
+            ),
+            "pagina": pagina,
+        },
     )
 
 
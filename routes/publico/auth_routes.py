@@ -10,7 +10,12 @@ from pydantic import ValidationError
 from data.usuario import usuario_repo
 from dtos.usuario.login_dto import LoginDTO
 from util.auth_decorator import obter_usuario_logado
-from util.security import criar_hash_senha, gerar_token_redefinicao, verificar_senha
+from util.exceptions import ServicoSobrecarregadoError
+from util.security import (
+    criar_hash_senha_async,
+    gerar_token_redefinicao,
+    verificar_senha_com_rehash_async,
+)
 from util.template_util import criar_templates
 
 logger = logging.getLogger(__name__)
@@ -51,7 +56,7 @@ async def processar_login(request: Request, email: str = Form(), senha: str = Fo
     Segurança:
         - Rate limiting: 5 tentativas por 5 minutos (por IP)
         - Validação de dados via LoginDTO
-        - Hash seguro de senha com bcrypt
+        - Hash seguro de senha com bcrypt (fora do event loop, com rehash se o custo mudou)
         - Proteção contra timing attacks
 
     Args:
@@ -93,13 +98,23 @@ async def processar_login(request: Request, email: str = Form(), senha: str = Fo
         usuario = usuario_repo.obter_usuario_por_email(login_dto.email)
         logger.debug(f"Tentativa de login para: {email}")
 
-        if not usuario or not verificar_senha(login_dto.senha, usuario.senha):
+        senha_ok, novo_hash = False, None
+        if usuario:
+            senha_ok, novo_hash = await verificar_senha_com_rehash_async(
+                login_dto.senha, usuario.senha
+            )
+        if not senha_ok:
             return templates.TemplateResponse(
                 "auth/login.html",
                 {"request": request, "erro": "Email ou senha inválidos"},
                 status_code=status.HTTP_401_UNAUTHORIZED,
             )
 
+        # Hash gerado com outro BCRYPT_ROUNDS: salva o refeito com o custo atual
+        if novo_hash:
+            usuario_repo.atualizar_senha_usuario(usuario.id, novo_hash)
+            logger.info(f"Hash de senha atualizado para o custo atual: usuário {usuario.id}")
+
         # Cria sessão completa
         perfil_usuario = getattr(
             usuario, "perfil", getattr(usuario, "tipo_usuario", "cliente")
@@ -154,6 +169,14 @@ async def processar_login(request: Request, email: str = Form(), senha: str = Fo
             },
         )
 
+    except ServicoSobrecarregadoError as e:
+        return templates.TemplateResponse(
+            "auth/login.html",
+            {"request": request, "erro": e.mensagem, "dados": dados_formulario},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(e.tentar_em_segundos)},
+        )
+
     except Exception as e:
         logger.error(f"Erro ao processar login: {e}", exc_info=True)
 
@@ -305,7 +328,7 @@ async def resetar_senha_post(
     """
     usuario = usuario_repo.obter_usuario_por_token(token)
     if usuario:
-        usuario.senha = criar_hash_senha(nova_senha)
+        usuario.senha = await criar_hash_senha_async(nova_senha)
         usuario.token_redefinicao = None
         usuario_repo.atualizar_usuario(usuario)
         return RedirectResponse("/login?mensagem=Senha redefinida com sucesso!", status_code=303)
@@ -24,8 +24,10 @@ from dtos.fornecedor.fornecedor_dto import CriarFornecedorDTO
 from dtos.prestador.prestador_dto import CriarPrestadorDTO
 from util.auth_decorator import obter_usuario_logado, requer_autenticacao
 from util.flash_messages import informar_sucesso
-from util.security import criar_hash_senha, gerar_token_redefinicao, verificar_senha
+from util.security import criar_hash_senha_async, gerar_token_redefinicao, verificar_senha
 from util.template_util import criar_templates
+from util.exceptions import ServicoSobrecarregadoError, UploadRecusadoError
+from util.upload import salvar_upload_por_conteudo
 import os
 import uuid
 
@@ -120,7 +122,7 @@ async def processar_cadastro_prestador(
             )
 
         # Criar hash da senha
-        senha_hash = criar_hash_senha(dados_dto.senha)
+        senha_hash = await criar_hash_senha_async(dados_dto.senha)
 
         # Criar objeto Prestador
         prestador = Prestador(
@@ -193,6 +195,9 @@ async def processar_cadastro_prestador(
             },
         )
 
+    except ServicoSobrecarregadoError:
+        raise  # 503 com Retry-After (handler da aplicação)
+
     except Exception as e:
         # logger.error(f"Erro ao processar cadastro de prestador: {e}")
 
@@ -295,7 +300,7 @@ async def post_cadastro(
             )
 
         # Criar hash da senha
-        senha_hash = criar_hash_senha(dados_dto.senha)
+        senha_hash = await criar_hash_senha_async(dados_dto.senha)
 
         # Criar objeto Cliente
         cliente = Cliente(
@@ -364,6 +369,9 @@ async def post_cadastro(
             },
         )
 
+    except ServicoSobrecarregadoError:
+        raise  # 503 com Retry-After (handler da aplicação)
+
     except Exception as e:
         # logger.error(f"Erro ao processar cadastro de prestador: {e}")
 
@@ -491,7 +499,7 @@ async def processar_cadastro_fornecedor(
             )
 
         # Criar hash da senha (usar senha validada)
-        senha_hash = criar_hash_senha(fornecedor_dto.senha)
+        senha_hash = await criar_hash_senha_async(fornecedor_dto.senha)
 
         # Garante que razao_social nunca seja None ou string vazia (usar DTO)
         razao_social_value = getattr(fornecedor_dto, "razao_social", None)
@@ -514,17 +522,14 @@ async def processar_cadastro_fornecedor(
                         "dados": dados_formulario,
                     },
                 )
-            upload_dir = "static/uploads/fornecedores"
-            os.makedirs(upload_dir, exist_ok=True)
-            import secrets
-
-            extensao = foto.filename.split(".")[-1]
-            nome_arquivo = f"{fornecedor_dto.email}_{secrets.token_hex(8)}.{extensao}"
-            caminho_arquivo = os.path.join(upload_dir, nome_arquivo)
-            conteudo = await foto.read()
-            with open(caminho_arquivo, "wb") as f:
-                f.write(conteudo)
-            caminho_foto = f"/static/uploads/fornecedores/{nome_arquivo}"
+            try:
+                # Nome = hash do conteúdo; a referência é contada ao inserir o usuário
+                caminho_foto = await salvar_upload_por_conteudo(foto)
+            except UploadRecusadoError as e:
+                return templates.TemplateResponse(
+                    "public/cadastro/fornecedor.html",
+                    {"request": request, "erro": e.mensagem, "dados": dados_formulario},
+                )
 
         # Criar objeto Fornecedor
         fornecedor = Fornecedor(
@@ -601,6 +606,9 @@ async def processar_cadastro_fornecedor(
             },
         )
 
+    except ServicoSobrecarregadoError:
+        raise  # 503 com Retry-After (handler da aplicação)
+
     except Exception as e:
         logger.error(f"Erro ao processar cadastro de fornecedor: {e}")
 
@@ -1,8 +1,11 @@
 """
 Rotas públicas da home e páginas principais
 """
+from typing import Optional
 from fastapi import APIRouter, Request
+from data.produto import produto_repo
 from util.auth_decorator import obter_usuario_logado
+from util.db_async import assincrono
 from util.template_util import criar_templates
 
 router = APIRouter(tags=["Home Pública"])
@@ -27,3 +30,60 @@ async def mostrar_escolha_cadastro(request: Request):
         "auth/escolha_cadastro.html",
         {"request": request, "usuario_logado": usuario_logado}
     )
+
+
+PROMOCOES_POR_PAGINA = 20
+
+
+@router.get("/promocoes")
+async def listar_promocoes_ativas(apos: Optional[int] = None):
+    """Promoções ativas de todos os fornecedores (paginação por cursor)"""
+    promocoes = await assincrono(produto_repo).obter_promocoes_ativas(limit=PROMOCOES_POR_PAGINA, apos=apos)
+    proximo = promocoes[-1].id if len(promocoes) == PROMOCOES_POR_PAGINA else None
+    return {
+        "promocoes": [
+            {
+                "id": p.id,
+                "nome": p.nome,
+                "descricao": p.descricao,
+                "preco": p.preco,
+                "desconto": p.desconto,
+                "preco_promocional": round(p.preco * (1 - (p.desconto or 0) / 100), 2),
+                "foto": p.foto,
+                "fornecedor_id": p.fornecedor_id,
+            }
+            for p in promocoes
+        ],
+        "proximo": proximo,
+    }
+
+
+PRODUTOS_POR_PAGINA = 20
+
+
+@router.get("/produtos/buscar")
+async def buscar_produtos_catalogo(q: str = "", pagina: int = 1):
+    """Busca textual no catálogo de produtos de todos os fornecedores"""
+    pagina = max(pagina, 1)
+    total = await assincrono(produto_repo).contar_busca_produtos(q)
+    produtos = await assincrono(produto_repo).buscar_produtos(
+        q, limit=PRODUTOS_POR_PAGINA, offset=(pagina - 1) * PRODUTOS_POR_PAGINA
+    )
+    return {
+        "produtos": [
+            {
+                "id": p.id,
+                "nome": p.nome,
+                "descricao": p.descricao,
+                "preco": p.preco,
+                "em_promocao": p.em_promocao,
+                "desconto": p.desconto,
+                "foto": p.foto,
+                "fornecedor_id": p.fornecedor_id,
+            }
+            for p in produtos
+        ],
+        "total": total,
+        "pagina": pagina,
+        "total_paginas": max(1, -(-total // PRODUTOS_POR_PAGINA)),
+    }
@@ -33,9 +33,16 @@ logger = logging.getLogger(__name__)
 router = APIRouter(tags=["Mensagens"])
 templates = criar_templates("templates")
 
+MENSAGENS_POR_PAGINA = 50
+
 @router.get("/mensagens/conversa/{contato_id}")
 @requer_autenticacao()
-async def exibir_conversa(request: Request, contato_id: int, usuario_logado: Optional[dict] = None):
+async def exibir_conversa(
+    request: Request,
+    contato_id: int,
+    antes_de: Optional[int] = None,
+    usuario_logado: Optional[dict] = None,
+):
     """Exibe uma conversa específica entre o usuário logado e um contato"""
     assert usuario_logado is not None
 
@@ -44,17 +51,15 @@ async def exibir_conversa(request: Request, contato_id: int, usuario_logado: Opt
     if not contato:
         return RedirectResponse("/mensagens", status_code=status.HTTP_303_SEE_OTHER)
 
-    # Obter mensagens da conversa
-    todas_mensagens = mensagem_repo.obter_mensagem(usuario_logado["id"])
-    mensagens_conversa = [
-        msg
-        for msg in todas_mensagens
-        if (msg.id_remetente == usuario_logado["id"] and msg.id_destinatario == contato_id)
-        or (msg.id_remetente == contato_id and msg.id_destinatario == usuario_logado["id"])
-    ]
-
-    # Ordenar por data
-    mensagens_conversa.sort(key=lambda x: x.data_hora)
+    # Obter a página mais recente da conversa (ou a anterior a "antes_de")
+    mensagens_conversa = mensagem_repo.obter_conversa(
+        usuario_logado["id"], contato_id, limite=MENSAGENS_POR_PAGINA, antes_de=antes_de
+    )
+    mais_antigas = (
+        mensagens_conversa[0].id_mensagem
+        if len(mensagens_conversa) == MENSAGENS_POR_PAGINA
+        else None
+    )
 
     return templates.TemplateResponse(
         "public/mensagens/mensagens.html",
@@ -63,6 +68,7 @@ async def exibir_conversa(request: Request, contato_id: int, usuario_logado: Opt
             "usuario": usuario_logado,
             "contato": contato,
             "mensagens": mensagens_conversa,
+            "mais_antigas": mais_antigas,
         },
     )
 
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Build dos assets estáticos: minifica static/css/*.css e static/js/*.js,
+grava cópias com o hash do conteúdo no nome e o manifesto
+static/assets-manifest.json usado pelo filtro static_versioned, e gera as
+versões pré-comprimidas (.gz/.br) dos arquivos de texto.
+
+Executar a cada deploy (e após alterar CSS/JS, se quiser testar localmente
+com os arquivos minificados).
+
+Uso: python scripts/build_assets.py [--static static]
+"""
+
+import argparse
+import os
+import sys
+
+# Adicionar o diretório pai ao sys.path para imports
+script_dir = os.path.dirname(os.path.abspath(__file__))
+projeto_dir = os.path.dirname(script_dir)
+sys.path.insert(0, projeto_dir)
+
+from util.assets import NOME_MANIFESTO, comprimir_estaticos, construir_assets
+from util.compressao import brotli
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--static", default=os.path.join(projeto_dir, "static"),
+                        help="diretório dos arquivos estáticos")
+    args = parser.parse_args()
+
+    print("📦 Gerando assets versionados...")
+    manifesto = construir_assets(args.static)
+
+    tamanho_original = tamanho_final = 0
+    for original, versionado in sorted(manifesto.items()):
+        antes = os.path.getsize(os.path.join(args.static, original))
+        depois = os.path.getsize(os.path.join(args.static, versionado))
+        tamanho_original += antes
+        tamanho_final += depois
+        print(f"   {original:<45} -> {versionado} ({antes:,} -> {depois:,} bytes)")
+
+    reducao = (1 - tamanho_final / tamanho_original) * 100 if tamanho_original else 0
+    print(f"✅ {len(manifesto)} arquivos; {tamanho_original:,} -> {tamanho_final:,} bytes "
+          f"(redução de {reducao:.1f}%)")
+    print(f"   Manifesto: {os.path.join(args.static, NOME_MANIFESTO)}")
+
+    comprimidos = comprimir_estaticos(args.static)
+    formatos = ".gz e .br" if brotli is not None else ".gz (instale 'brotli' para gerar .br)"
+    print(f"🗜️  {len(comprimidos)} versões comprimidas gravadas ({formatos})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Gera as variantes responsivas (miniatura/média/completa, WebP e JPEG) das
+imagens já existentes em static/img e static/uploads.
+
+Novos uploads recebem as variantes automaticamente pela fila de imagens;
+este script cobre os arquivos anteriores. Imagens com variantes em dia são
+puladas, então pode ser executado de novo a qualquer momento.
+
+Uso: python scripts/gerar_variantes.py [--workers N] [--forcar]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Adicionar o diretório pai ao sys.path para imports
+script_dir = os.path.dirname(os.path.abspath(__file__))
+projeto_dir = os.path.dirname(script_dir)
+sys.path.insert(0, projeto_dir)
+
+from util.imagens_responsivas import RAIZ_STATIC, gerar_variantes, imagens_originais
+
+
+def _processar(argumentos):
+    caminho, raiz_static, forcar = argumentos
+    try:
+        return caminho, len(gerar_variantes(caminho, raiz_static, forcar=forcar)), None
+    except Exception as e:
+        return caminho, 0, str(e)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--static", default=RAIZ_STATIC, help="diretório dos arquivos estáticos")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2,
+                        help="processos em paralelo (padrão: núcleos da CPU)")
+    parser.add_argument("--forcar", action="store_true", help="regera mesmo as variantes em dia")
+    args = parser.parse_args()
+
+    imagens = list(imagens_originais(args.static))
+    print(f"🖼️  {len(imagens)} imagens encontradas; processando com {args.workers} processo(s)...")
+
+    inicio = time.perf_counter()
+    processadas = arquivos = falhas = 0
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        tarefas = ((caminho, args.static, args.forcar) for caminho in imagens)
+        for caminho, gravados, erro in executor.map(_processar, tarefas, chunksize=4):
+            relativo = os.path.relpath(caminho, args.static)
+            if erro:
+                falhas += 1
+                print(f"   ❌ {relativo}: {erro}")
+            elif gravados:
+                processadas += 1
+                arquivos += gravados
+                print(f"   {relativo} ({gravados} variantes)")
+
+    duracao = time.perf_counter() - inicio
+    print(f"✅ {processadas} imagens processadas, {arquivos} variantes gravadas, "
+          f"{len(imagens) - processadas - falhas} já em dia, {falhas} falha(s) em {duracao:.1f}s")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
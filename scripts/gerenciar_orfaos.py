@@ -1,7 +1,64 @@
+"""
+Gerencia os uploads que nenhum produto ou usuário usa mais.
+
+Os uploads ficam no armazenamento por conteúdo (util.armazenamento), com a
+contagem de referências no banco: os órfãos saem de uma consulta indexada
+(referencias = 0), sem varrer as pastas.
+
+A opção --legados trata os arquivos de static/uploads/produtos_fornecedor
+gravados antes desse armazenamento (nomes aleatórios), comparando a pasta
+com o banco como antes.
+"""
 import sqlite3
 import os
+import sys
 import argparse
 
+# Adicionar o diretório pai ao sys.path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from util.armazenamento import limpar_arquivos_orfaos as remover_orfaos
+from util.config import ARMAZENAMENTO_CARENCIA_ORFAOS
+
+
+def verificar_arquivos_orfaos():
+    """Lista os uploads sem referências há mais que a carência"""
+    print(f"🔍 Verificando arquivos sem uso há mais de {ARMAZENAMENTO_CARENCIA_ORFAOS // 60} min...")
+    print("-" * 50)
+
+    orfaos = remover_orfaos(simular=True)
+    if not orfaos:
+        print("  ✅ Nenhum arquivo órfão encontrado!")
+        return orfaos
+
+    print(f"🗑️  Arquivos órfãos encontrados: {len(orfaos)}")
+    for arquivo in orfaos:
+        print(f"  - {arquivo.url} ({arquivo.tamanho / 1024:.2f} KB, sem uso desde {arquivo.atualizado_em})")
+    print(f"\n💾 Espaço ocupado por órfãos: {sum(a.tamanho for a in orfaos) / 1024:.2f} KB")
+    return orfaos
+
+
+def limpar_arquivos_orfaos(confirmar=True):
+    """Remove os uploads sem referências há mais que a carência"""
+    print("🧹 Iniciando limpeza de arquivos órfãos...")
+    print("-" * 50)
+
+    orfaos = verificar_arquivos_orfaos()
+    if not orfaos:
+        return
+
+    if confirmar:
+        resposta = input("\n⚠️  Deseja remover estes arquivos? (s/N): ").strip().lower()
+        if resposta not in ['s', 'sim', 'y', 'yes']:
+            print("❌ Operação cancelada pelo usuário")
+            return
+
+    removidos = remover_orfaos()
+    print(f"\n🎉 Limpeza concluída! {len(removidos)} arquivos removidos")
+
+
+# --------- Arquivos anteriores ao armazenamento por conteúdo
+
 def obter_caminhos_projeto():
     """Obtém os caminhos do projeto"""
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -19,7 +76,7 @@ def obter_fotos_banco(banco_path):
     conn.close()
     return fotos_banco
 
-def verificar_arquivos_orfaos():
+def verificar_arquivos_legados():
     """Verifica se há arquivos de imagem órfãos na pasta uploads"""
     projeto_dir, banco_path, pasta_uploads = obter_caminhos_projeto()
     
@@ -68,7 +125,7 @@ def verificar_arquivos_orfaos():
         print("❌ Pasta uploads não encontrada")
         return []
 
-def limpar_arquivos_orfaos(confirmar=True):
+def limpar_arquivos_legados(confirmar=True):
     """Remove arquivos de imagem órfãos da pasta uploads"""
     projeto_dir, banco_path, pasta_uploads = obter_caminhos_projeto()
     
@@ -131,13 +188,18 @@ def main():
                        help='Ação a executar: verificar ou limpar arquivos órfãos')
     parser.add_argument('--force', action='store_true', 
                        help='Limpar sem confirmação (apenas para ação limpar)')
+    parser.add_argument('--legados', action='store_true',
+                       help='Varrer a pasta de uploads anterior ao armazenamento por conteúdo')
     
     args = parser.parse_args()
     
     if args.acao == 'verificar':
-        verificar_arquivos_orfaos()
+        verificar_arquivos_legados() if args.legados else verificar_arquivos_orfaos()
     elif args.acao == 'limpar':
-        limpar_arquivos_orfaos(confirmar=not args.force)
+        if args.legados:
+            limpar_arquivos_legados(confirmar=not args.force)
+        else:
+            limpar_arquivos_orfaos(confirmar=not args.force)
 
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Reconstrói a tabela resumo_avaliacao a partir das avaliações existentes.
+
+O resumo é mantido automaticamente pelo avaliacao_repo; use este script
+apenas se as avaliações forem alteradas fora do repositório (SQL manual,
+restauração de backup etc.).
+
+Uso: python scripts/reconstruir_resumo_avaliacoes.py
+"""
+
+import sys
+import os
+
+# Adicionar o diretório pai ao sys.path para imports
+script_dir = os.path.dirname(os.path.abspath(__file__))
+projeto_dir = os.path.dirname(script_dir)
+sys.path.insert(0, projeto_dir)
+
+from data.avaliacao.avaliacao_repo import reconstruir_resumo_avaliacoes
+
+
+if __name__ == "__main__":
+    total = reconstruir_resumo_avaliacoes()
+    print(f"✅ Resumo de avaliações reconstruído para {total} avaliado(s)")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Teste de carga do acesso ao banco a partir de handlers async.
+
+Simula, em um único event loop (como um worker do uvicorn), vários
+clientes concorrentes: a maioria faz requisições rápidas (busca por id) e
+alguns disparam uma consulta lenta (agregação sem índice). Mede a
+latência das requisições rápidas em dois modos:
+
+- bloqueante: o handler chama o repositório diretamente (como as rotas
+  faziam), então cada consulta lenta congela o loop para todos;
+- executor: o handler usa util.db_async, e o loop segue atendendo.
+
+O banco é criado em um arquivo temporário; o banco da aplicação não é
+tocado.
+
+Uso: python scripts/teste_carga_db.py [--clientes 50] [--requisicoes 40]
+                                      [--lentos 2] [--linhas 200000]
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+# Adicionar o diretório pai ao sys.path para imports
+script_dir = os.path.dirname(os.path.abspath(__file__))
+projeto_dir = os.path.dirname(script_dir)
+sys.path.insert(0, projeto_dir)
+
+
+def preparar_banco(linhas: int) -> str:
+    caminho = os.path.join(tempfile.mkdtemp(prefix="obratto-carga-"), "carga.db")
+    os.environ["TEST_DATABASE_PATH"] = caminho
+    from util.db import open_connection
+
+    with open_connection() as conn:
+        conn.execute("CREATE TABLE item (id INTEGER PRIMARY KEY, grupo INTEGER, valor REAL)")
+        conn.executemany(
+            "INSERT INTO item (grupo, valor) VALUES (?, ?)",
+            ((i % 97, i * 0.5) for i in range(linhas)),
+        )
+        conn.commit()
+    return caminho
+
+
+def consulta_rapida(item_id: int):
+    from util.db import open_connection
+
+    with open_connection() as conn:
+        return conn.execute("SELECT * FROM item WHERE id = ?", (item_id,)).fetchone()
+
+
+def consulta_lenta():
+    from util.db import open_connection
+
+    with open_connection() as conn:
+        return conn.execute(
+            "SELECT grupo, COUNT(*), AVG(valor) FROM item GROUP BY grupo ORDER BY 3 DESC"
+        ).fetchall()
+
+
+async def _cliente_rapido(modo: str, requisicoes: int, intervalo: float, latencias: list):
+    from util.db_async import executar
+
+    # Chegadas em horários fixos: a latência conta desde o horário previsto,
+    # então o tempo em que o loop ficou travado também aparece na medida
+    inicio = time.perf_counter()
+    for i in range(requisicoes):
+        previsto = inicio + i * intervalo
+        await asyncio.sleep(max(0.0, previsto - time.perf_counter()))
+        if modo == "executor":
+            await executar(consulta_rapida, i + 1)
+        else:
+            consulta_rapida(i + 1)
+        latencias.append((time.perf_counter() - previsto) * 1000)
+
+
+async def _cliente_lento(modo: str, requisicoes: int):
+    from util.db_async import executar
+
+    for _ in range(requisicoes):
+        if modo == "executor":
+            await executar(consulta_lenta)
+        else:
+            consulta_lenta()
+        await asyncio.sleep(0.001)
+
+
+async def _rodada(modo: str, clientes: int, requisicoes: int, lentos: int) -> dict:
+    latencias: list = []
+    inicio = time.perf_counter()
+    await asyncio.gather(
+        *(_cliente_rapido(modo, requisicoes, 0.01, latencias) for _ in range(clientes)),
+        *(_cliente_lento(modo, max(1, requisicoes // 10)) for _ in range(lentos)),
+    )
+    duracao = time.perf_counter() - inicio
+    percentis = statistics.quantiles(latencias, n=100)
+    return {
+        "modo": modo,
+        "requisicoes": len(latencias),
+        "p50": percentis[49],
+        "p95": percentis[94],
+        "p99": percentis[98],
+        "max": max(latencias),
+        "vazao": len(latencias) / duracao,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clientes", type=int, default=50, help="clientes com requisições rápidas")
+    parser.add_argument("--requisicoes", type=int, default=40, help="requisições por cliente")
+    parser.add_argument("--lentos", type=int, default=2, help="clientes com a consulta lenta")
+    parser.add_argument("--linhas", type=int, default=200_000, help="linhas da tabela de teste")
+    args = parser.parse_args()
+
+    print(f"Preparando banco temporário com {args.linhas} linhas...")
+    caminho = preparar_banco(args.linhas)
+
+    from util.db import fechar_pools
+    from util.db_async import encerrar_executor
+
+    resultados = []
+    for modo in ("bloqueante", "executor"):
+        resultados.append(asyncio.run(_rodada(modo, args.clientes, args.requisicoes, args.lentos)))
+    encerrar_executor()
+    fechar_pools()
+    shutil.rmtree(os.path.dirname(caminho), ignore_errors=True)
+
+    print(f"\n{args.clientes} clientes rápidos x {args.requisicoes} requisições, "
+          f"{args.lentos} cliente(s) com consulta lenta\n")
+    print(f"{'modo':<12}{'req':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'req/s':>10}")
+    for r in resultados:
+        print(f"{r['modo']:<12}{r['requisicoes']:>7}{r['p50']:>10.2f}{r['p95']:>10.2f}"
+              f"{r['p99']:>10.2f}{r['max']:>10.2f}{r['vazao']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -224,56 +224,7 @@ function mostrarConfirmacao(titulo, texto, callback, precisaMotivo = false) {
 }
 
 function atualizarStatusFornecedor(id, novoStatus) {
-    atualizarEstatisticas();
-}
-
-function atualizarEstatisticas() {
-    const cards = document.querySelectorAll('.fornecedor-card');
-    let total = cards.length;
-    let pendentes = document.querySelectorAll('.fornecedor-card.pendente').length;
-    let aprovados = document.querySelectorAll('.fornecedor-card.aprovado').length;
-    let rejeitados = document.querySelectorAll('.fornecedor-card.rejeitado').length;
-    let advertidos = document.querySelectorAll('.fornecedor-card.advertido').length;
-    let banidos = document.querySelectorAll('.fornecedor-card.banido').length;
-    
-    document.getElementById('totalFornecedores').textContent = total;
-    document.getElementById('pendentes').textContent = pendentes;
-    document.getElementById('aprovados').textContent = aprovados;
-    document.getElementById('rejeitados').textContent = rejeitados;
-    document.getElementById('advertidos').textContent = advertidos;
-    document.getElementById('banidos').textContent = banidos;
-}
-
-function aplicarFiltros() {
-    const busca = document.getElementById('buscarFornecedor').value.toLowerCase();
-    const status = document.getElementById('filtroStatus').value;
-    const denuncias = document.getElementById('filtroDenuncias').value;
-    
-    const cards = document.querySelectorAll('.fornecedor-card');
-    
-    cards.forEach(card => {
-        const nome = card.querySelector('.fornecedor-nome').textContent.toLowerCase();
-        const cardStatus = card.dataset.status;
-        const cardDenuncias = parseInt(card.dataset.denuncias);
-        
-        let mostrar = true;
-        
-        if (busca && !nome.includes(busca)) {
-            mostrar = false;
-        }
-
-        if (status && cardStatus !== status) {
-            mostrar = false;
-        }
-        
-        if (denuncias === 'com_denuncias' && cardDenuncias === 0) {
-            mostrar = false;
-        } else if (denuncias === 'sem_denuncias' && cardDenuncias > 0) {
-            mostrar = false;
-        }
-        
-        card.style.display = mostrar ? 'block' : 'none';
-    });
+    // Totais e filtros vêm do servidor (contados e filtrados no SQL)
 }
 
 function mostrarNotificacao(mensagem, tipo) {
@@ -293,11 +244,3 @@ function mostrarNotificacao(mensagem, tipo) {
         }
     }, 5000);
 }
-
-document.addEventListener('DOMContentLoaded', function() {
-    atualizarEstatisticas();
-    
-    document.getElementById('buscarFornecedor').addEventListener('input', aplicarFiltros);
-    document.getElementById('filtroStatus').addEventListener('change', aplicarFiltros);
-    document.getElementById('filtroDenuncias').addEventListener('change', aplicarFiltros);
-});
\ No newline at end of file
@@ -29,15 +29,18 @@ def test_db():
     # Retorna o caminho do banco de dados temporário
     yield db_path
 
-    # Força fechamento de conexões SQLite
+    # Força fechamento de conexões SQLite (inclusive as mantidas no pool)
+    from util.db import fechar_pools
+    fechar_pools()
     gc.collect()
 
-    # Remove o arquivo temporário ao concluir o teste
-    if os.path.exists(db_path):
-        try:
-            os.unlink(db_path)
-        except PermissionError:
-            pass
+    # Remove o arquivo temporário (e os arquivos -wal/-shm do modo WAL)
+    for caminho in (db_path, db_path + '-wal', db_path + '-shm'):
+        if os.path.exists(caminho):
+            try:
+                os.unlink(caminho)
+            except PermissionError:
+                pass
 
     # Limpa a variável de ambiente
     if 'TEST_DATABASE_PATH' in os.environ:
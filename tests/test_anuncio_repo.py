@@ -405,3 +405,89 @@ class TestAnuncioRepo:
         assert sucesso is True
         anuncio_bd = obter_anuncio_por_id(id_anuncio)
         assert anuncio_bd is None
+
+    def _inserir_anuncios_busca(self, email_unico, cpf_unico):
+        criar_tabela_usuario()
+        criar_tabela_fornecedor()
+        criar_tabela_anuncio()
+        id_fornecedor = inserir_fornecedor(Fornecedor(
+            id=0, nome="Fornecedor Busca", email=email_unico, senha="senha123",
+            cpf_cnpj=cpf_unico, telefone="999999999", data_cadastro="2023-01-01",
+            cep="88888-888", rua="Rua Teste", numero="123", complemento="",
+            bairro="Centro", cidade="Vitória", estado="ES",
+            razao_social="Construções Irmãos", tipo_usuario="Fornecedor",
+        ))
+        ids = []
+        for nome, descricao in [
+            ("Piso Cerâmico", "Porcelanato polido"),
+            ("Tinta Acrílica", "Ótima para cerâmica"),
+            ("Telha Colonial", "Barro"),
+        ]:
+            ids.append(inserir_anuncio(Anuncio(
+                id_anuncio=0, nome_anuncio=nome, id_fornecedor=id_fornecedor,
+                data_criacao="2023-01-01", descricao=descricao, preco=10.0,
+            )))
+        return id_fornecedor, ids
+
+    def test_buscar_anuncios_textual(self, test_db, email_unico, cpf_unico):
+        # Arrange
+        _, ids = self._inserir_anuncios_busca(email_unico, cpf_unico)
+
+        # Act
+        anuncios, total = buscar_anuncios("ceramic", 1, 0)
+        por_fornecedor, total_fornecedor = buscar_anuncios("construcoes irmaos", 10, 0)
+
+        # Assert: sem acento, nome antes da descrição, total além do LIMIT
+        assert total == 2
+        assert [a.id_anuncio for a in anuncios] == [ids[0]]
+        assert anuncios[0].nome_fornecedor == "Construções Irmãos"
+        assert total_fornecedor == 3
+        assert len(por_fornecedor) == 3
+        assert buscar_anuncios("ceramic", 10, 5) == ([], 2)
+
+    def test_buscar_anuncios_por_id_e_sem_termo(self, test_db, email_unico, cpf_unico):
+        # Arrange
+        _, ids = self._inserir_anuncios_busca(email_unico, cpf_unico)
+
+        # Act / Assert
+        anuncios, total = buscar_anuncios(str(ids[2]), 10, 0)
+        assert total == 1 and anuncios[0].nome_anuncio == "Telha Colonial"
+        assert buscar_anuncios("99999", 10, 0) == ([], 0)
+        todos, total = buscar_anuncios("", 2, 0)
+        assert total == 3 and len(todos) == 2
+
+    def test_listar_anuncios_por_cursor(self, test_db, email_unico, cpf_unico):
+        # Arrange
+        _, ids = self._inserir_anuncios_busca(email_unico, cpf_unico)
+
+        # Act
+        primeira = listar_anuncios(2)
+        segunda = listar_anuncios(2, primeira.proximo)
+
+        # Assert
+        assert [a.id_anuncio for a in primeira.itens] == ids[:2]
+        assert primeira.itens[0].nome_fornecedor == "Construções Irmãos"
+        assert [a.id_anuncio for a in segunda.itens] == ids[2:]
+        assert segunda.proximo is None
+        assert [a.id_anuncio for a in listar_anuncios(2, segunda.anterior).itens] == ids[:2]
+        assert contar_anuncios() == 3
+
+    def test_busca_acompanha_alteracoes(self, test_db, email_unico, cpf_unico):
+        # Arrange
+        id_fornecedor, ids = self._inserir_anuncios_busca(email_unico, cpf_unico)
+        telha = obter_anuncio_por_id(ids[2])
+
+        # Act
+        telha.nome_anuncio = "Telha Portuguesa"
+        atualizar_anuncio_por_nome(telha, "Telha Colonial")
+        deletar_anuncio(ids[0])
+
+        # Assert
+        assert buscar_anuncios("colonial", 10, 0) == ([], 0)
+        assert buscar_anuncios("portuguesa", 10, 0)[1] == 1
+        assert buscar_anuncios("piso", 10, 0) == ([], 0)
+
+        # Act: reconstrução mantém o mesmo resultado
+        reconstruir_indice_busca_anuncios()
+        assert buscar_anuncios("portuguesa", 10, 0)[1] == 1
+        assert buscar_anuncios("ceramica", 10, 0)[1] == 1
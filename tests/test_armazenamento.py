@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from data.arquivo import arquivo_repo
+from data.produto import produto_repo
+from data.produto.produto_model import Produto
+import util.armazenamento as armazenamento
+from util.seed import criar_tabelas
+
+
+def _png(cor=(10, 120, 200)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (40, 30), cor).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _armazenar(static_dir, conteudo: bytes) -> str:
+    """Simula um upload já copiado para o temporário."""
+    temporario = static_dir / f"{len(os.listdir(static_dir))}.tmp"
+    temporario.write_bytes(conteudo)
+    return armazenamento.armazenar(str(temporario), hashlib.sha256(conteudo).hexdigest(), ".png", len(conteudo))
+
+
+def _produto(foto):
+    return Produto(id=None, nome="Tijolo", descricao="Cerâmico", preco=1.5, quantidade=10, foto=foto)
+
+
+@pytest.fixture
+def variantes(monkeypatch):
+    agendadas = []
+    monkeypatch.setattr(armazenamento, "enfileirar_variantes", agendadas.append)
+    return agendadas
+
+
+@pytest.fixture
+def static_dir(test_db, tmp_path, monkeypatch, variantes):
+    criar_tabelas()
+    monkeypatch.setattr(armazenamento, "RAIZ_STATIC", str(tmp_path))
+    return tmp_path
+
+
+class TestArmazenar:
+
+    def test_conteudo_repetido_e_gravado_uma_vez(self, static_dir, variantes):
+        # Act
+        url1 = _armazenar(static_dir, _png())
+        url2 = _armazenar(static_dir, _png())
+        # Assert
+        assert url1 == url2
+        assert url1.startswith("/static/uploads/arquivos/")
+        pasta = os.path.dirname(armazenamento.caminho_da_url(url1))
+        assert os.listdir(pasta) == [os.path.basename(url1)]
+        assert [p for p in os.listdir(static_dir) if p.endswith(".tmp")] == []
+        assert len(variantes) == 1
+
+    def test_conteudos_diferentes_tem_urls_diferentes(self, static_dir):
+        assert _armazenar(static_dir, _png((1, 2, 3))) != _armazenar(static_dir, _png((4, 5, 6)))
+
+    def test_upload_usa_extensao_da_assinatura(self, static_dir, monkeypatch):
+        pytest.importorskip("fastapi")
+        from fastapi import UploadFile
+        import util.upload as upload
+        monkeypatch.setattr(upload, "RAIZ_STATIC", str(static_dir))
+        conteudo = _png()
+        # Act: nome e extensão enviados não importam
+        url = asyncio.run(upload.salvar_upload_por_conteudo(
+            UploadFile(io.BytesIO(conteudo), size=len(conteudo), filename="foto.jpeg")
+        ))
+        # Assert
+        assert url.endswith(".png")
+        with open(armazenamento.caminho_da_url(url), "rb") as arquivo:
+            assert arquivo.read() == conteudo
+
+
+class TestReferencias:
+
+    def test_gatilhos_contam_referencias(self, static_dir):
+        # Arrange
+        url = _armazenar(static_dir, _png())
+        assert arquivo_repo.obter_arquivo_por_url(url).referencias == 0
+        # Act / Assert
+        id1 = produto_repo.inserir_produto(_produto(url))
+        id2 = produto_repo.inserir_produto(_produto(url))
+        assert arquivo_repo.obter_arquivo_por_url(url).referencias == 2
+
+        produto = produto_repo.obter_produto_por_id(id1)
+        produto.foto = None
+        produto_repo.atualizar_produto(produto)
+        assert arquivo_repo.obter_arquivo_por_url(url).referencias == 1
+
+        produto_repo.deletar_produto(id2)
+        assert arquivo_repo.obter_arquivo_por_url(url).referencias == 0
+
+    def test_recontar_referencias(self, static_dir):
+        url = _armazenar(static_dir, _png())
+        produto_repo.inserir_produto(_produto(url))
+        arquivo_repo.recontar_referencias()
+        assert arquivo_repo.obter_arquivo_por_url(url).referencias == 1
+
+
+class TestLimparOrfaos:
+
+    def test_remove_apenas_arquivos_sem_referencias(self, static_dir):
+        # Arrange
+        usado = _armazenar(static_dir, _png((1, 1, 1)))
+        orfao = _armazenar(static_dir, _png((2, 2, 2)))
+        produto_repo.inserir_produto(_produto(usado))
+        # Act
+        removidos = armazenamento.limpar_arquivos_orfaos(carencia_segundos=-1)
+        # Assert
+        assert [a.url for a in removidos] == [orfao]
+        assert not os.path.exists(armazenamento.caminho_da_url(orfao))
+        assert arquivo_repo.obter_arquivo_por_url(orfao) is None
+        assert os.path.exists(armazenamento.caminho_da_url(usado))
+
+    def test_respeita_carencia(self, static_dir):
+        # Upload recém-feito, ainda sem o produto gravado
+        url = _armazenar(static_dir, _png())
+        assert armazenamento.limpar_arquivos_orfaos(carencia_segundos=3600) == []
+        assert os.path.exists(armazenamento.caminho_da_url(url))
+
+    def test_reenvio_durante_a_limpeza_mantem_o_arquivo(self, static_dir, monkeypatch):
+        # Arrange: o mesmo conteúdo é reenviado (em outra thread) no meio da
+        # limpeza, entre apagar o registro e remover o arquivo
+        import threading
+        conteudo = _png()
+        url = _armazenar(static_dir, conteudo)
+        reenvios = []
+        reenvio = threading.Thread(target=lambda: reenvios.append(_armazenar(static_dir, conteudo)))
+
+        def reenviar_no_meio(url_removida):
+            reenvio.start()
+            reenvio.join(timeout=0.5)  # o reenvio espera pela trava de escrita da limpeza
+
+        monkeypatch.setattr(armazenamento, "remover_variantes", reenviar_no_meio)
+        # Act
+        removidos = armazenamento.limpar_arquivos_orfaos(carencia_segundos=-1)
+        reenvio.join()
+        # Assert: o reenvio devolveu a URL, então o arquivo e o registro existem
+        assert [a.url for a in removidos] == [url]
+        assert reenvios == [url]
+        assert os.path.exists(armazenamento.caminho_da_url(url))
+        assert arquivo_repo.obter_arquivo_por_url(url) is not None
+
+    def test_simular_nao_apaga(self, static_dir):
+        url = _armazenar(static_dir, _png())
+        assert [a.url for a in armazenamento.limpar_arquivos_orfaos(-1, simular=True)] == [url]
+        assert arquivo_repo.obter_arquivo_por_url(url) is not None
+
+
+class TestCacheImutavel:
+
+    def test_upload_por_conteudo_tem_cache_imutavel(self, tmp_path):
+        pytest.importorskip("fastapi")
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from util.cache_config import ArquivosEstaticos
+
+        pasta = tmp_path / "uploads" / "arquivos" / "ab"
+        pasta.mkdir(parents=True)
+        (pasta / "abcdef.png").write_bytes(_png())
+        (tmp_path / "uploads" / "antiga.png").write_bytes(_png())
+        app = FastAPI()
+        app.mount("/static", ArquivosEstaticos(directory=str(tmp_path)), name="static")
+        cliente = TestClient(app)
+        # Act
+        imutavel = cliente.get("/static/uploads/arquivos/ab/abcdef.png")
+        antiga = cliente.get("/static/uploads/antiga.png")
+        # Assert
+        assert "immutable" in imutavel.headers["cache-control"]
+        assert "immutable" not in antiga.headers.get("cache-control", "")
@@ -0,0 +1,131 @@
+import json
+
+import pytest
+
+from util.assets import NOME_MANIFESTO, construir_assets, minificar_css, minificar_js
+
+
+@pytest.fixture
+def static_temporario(tmp_path):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "js").mkdir()
+    (tmp_path / "css" / "home.css").write_text(
+        "/* topo */\nbody {\n    color : red ;\n}\n", encoding="utf-8"
+    )
+    (tmp_path / "css" / "antigo.min.css").write_text("a{b:c}", encoding="utf-8")
+    (tmp_path / "js" / "app.js").write_text(
+        "// comentário\nfunction ola() {\n    return 1;\n}\n", encoding="utf-8"
+    )
+    return tmp_path
+
+
+@pytest.fixture
+def manifesto(monkeypatch):
+    from util.cache_config import StaticVersioning
+
+    dados = {"css/home.css": "css/home.0123abcd.css"}
+    monkeypatch.setattr(StaticVersioning, "_manifesto", dados)
+    monkeypatch.setattr(StaticVersioning, "_versionados", frozenset(dados.values()))
+    return dados
+
+
+class TestMinificacao:
+
+    def test_css(self):
+        css = "/* remover */\n.a  >  .b {\n  color : red ;\n  margin: 0 !important;\n}\n"
+        assert minificar_css(css) == ".a>.b{color:red;margin:0!important}"
+
+    def test_css_preserva_seletor_descendente_de_pseudo_classe(self):
+        assert minificar_css("nav :hover { color: red; }") == "nav :hover{color:red}"
+
+    def test_css_mantem_comentario_de_licenca(self):
+        assert minificar_css("/*! licença */ a { b: c; }").startswith("/*! licença */")
+
+    def test_js_remove_indentacao_e_comentarios(self):
+        js = "// topo\nfunction f() {\n    // dentro\n    return 1;\n\n}\n"
+        assert minificar_js(js) == "function f() {\nreturn 1;\n}\n"
+
+    def test_js_preserva_template_literal(self):
+        js = "const html = `\n    <div>\n        oi\n    </div>`;\n    f(html);\n"
+        assert minificar_js(js) == "const html = `\n    <div>\n        oi\n    </div>`;\nf(html);\n"
+
+    def test_js_preserva_url_em_string(self):
+        js = "    const u = 'http://x.com'; // fim\n"
+        assert minificar_js(js) == "const u = 'http://x.com'; // fim\n"
+
+    def test_js_nao_analisavel_fica_intacto(self):
+        js = "const a = 'sem fechar\n    b();\n"
+        assert minificar_js(js) == js
+
+
+class TestConstruirAssets:
+
+    def test_gera_arquivos_versionados_e_manifesto(self, static_temporario):
+        # Act
+        manifesto = construir_assets(str(static_temporario))
+        # Assert
+        assert set(manifesto) == {"css/home.css", "js/app.js"}
+        assert json.loads((static_temporario / NOME_MANIFESTO).read_text()) == manifesto
+        css = (static_temporario / manifesto["css/home.css"]).read_text()
+        assert css == "body{color:red}"
+        assert manifesto["css/home.css"].startswith("css/home.")
+
+    def test_rebuild_sem_mudanca_mantem_nome(self, static_temporario):
+        primeiro = construir_assets(str(static_temporario))
+        assert construir_assets(str(static_temporario)) == primeiro
+
+    def test_mudanca_gera_novo_nome_e_remove_antigo(self, static_temporario):
+        # Arrange
+        antigo = construir_assets(str(static_temporario))["css/home.css"]
+        (static_temporario / "css" / "home.css").write_text("body { color: blue; }")
+        # Act
+        novo = construir_assets(str(static_temporario))["css/home.css"]
+        # Assert
+        assert novo != antigo
+        assert (static_temporario / novo).exists()
+        assert not (static_temporario / antigo).exists()
+
+
+class TestStaticVersioned:
+
+    def test_troca_pelo_nome_do_manifesto(self, manifesto):
+        from util.cache_config import static_versioned
+        assert static_versioned("/static/css/home.css") == "/static/css/home.0123abcd.css"
+
+    def test_fora_do_manifesto_devolve_caminho(self, manifesto):
+        from util.cache_config import static_versioned
+        assert static_versioned("/static/css/outro.css") == "/static/css/outro.css"
+
+    def test_filtro_registrado_nos_templates(self, manifesto):
+        pytest.importorskip("fastapi")
+        from util.template_util import criar_templates
+        env = criar_templates("templates").env
+        html = env.from_string("{{ '/static/css/home.css' | static_versioned }}").render()
+        assert html == "/static/css/home.0123abcd.css"
+
+
+class TestArquivosEstaticos:
+
+    @pytest.fixture
+    def cliente(self, tmp_path, manifesto):
+        pytest.importorskip("fastapi")
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from util.cache_config import ArquivosEstaticos
+
+        (tmp_path / "css").mkdir()
+        (tmp_path / "css" / "home.css").write_text("a{}")
+        (tmp_path / "css" / "home.0123abcd.css").write_text("a{}")
+        app = FastAPI()
+        app.mount("/static", ArquivosEstaticos(directory=str(tmp_path)), name="static")
+        return TestClient(app)
+
+    def test_versionado_tem_cache_imutavel(self, cliente):
+        resposta = cliente.get("/static/css/home.0123abcd.css")
+        assert resposta.status_code == 200
+        assert resposta.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+    def test_original_sem_cache_imutavel(self, cliente):
+        resposta = cliente.get("/static/css/home.css")
+        assert resposta.status_code == 200
+        assert "immutable" not in resposta.headers.get("cache-control", "")
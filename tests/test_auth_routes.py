@@ -254,6 +254,84 @@ class TestLoginRoutes:
         # Deve retornar erro de validação
         assert response.status_code in [200, 400]
 
+    def test_login_refaz_hash_com_custo_desatualizado(self, usuario_teste, monkeypatch):
+        """Testa que o login regrava o hash quando BCRYPT_ROUNDS mudou"""
+        import util.security as security
+        usuario_repo.atualizar_senha_usuario(usuario_teste.id, criar_hash_senha("senha123", rounds=4))
+        monkeypatch.setattr(security, "BCRYPT_ROUNDS", 5)
+
+        response = client.post("/login", data={
+            "email": usuario_teste.email,
+            "senha": "senha123"
+        }, follow_redirects=False)
+
+        assert response.status_code == 303
+        novo_hash = usuario_repo.obter_usuario_por_id(usuario_teste.id).senha
+        assert security.custo_do_hash(novo_hash) == 5
+        assert security.verificar_senha("senha123", novo_hash)
+
+    def test_login_pool_de_senhas_cheio(self, usuario_teste, monkeypatch):
+        """Testa que, com a fila de hashing cheia, o login responde 503 sem enfileirar"""
+        import threading
+        import util.security as security
+        vagas = threading.BoundedSemaphore(1)
+        vagas.acquire()
+        monkeypatch.setattr(security, "_vagas", vagas)
+
+        response = client.post("/login", data={
+            "email": usuario_teste.email,
+            "senha": "senha123"
+        }, follow_redirects=False)
+
+        assert response.status_code == 503
+        assert response.headers.get("retry-after") == "1"
+
+
+class TestSobrecargaHashing:
+    """Pool de hashing cheio fora do login: o handler da aplicação responde 503"""
+
+    def test_cadastro_de_fornecedor_pelo_admin_responde_503(self, setup_tabelas_auth, email_unico, cpf_unico, monkeypatch):
+        import threading
+        import util.security as security
+        # Arrange: administrador logado em um cliente próprio (sessão isolada)
+        admin_id = usuario_repo.inserir_usuario(Usuario(
+            id=0, nome="Admin Teste", email=email_unico, senha=criar_hash_senha("admin123"),
+            cpf_cnpj=cpf_unico, telefone="27888888888", cep="29100-000", rua="Rua Admin",
+            numero="1", complemento="", bairro="Centro", cidade="Vitória", estado="ES",
+            tipo_usuario="administrador", data_cadastro=datetime.now().isoformat(),
+            foto=None, token_redefinicao=None, data_token=None,
+        ))
+        administrador_repo.inserir_administrador(Administrador(id_usuario=admin_id))
+        sessao = TestClient(app)
+        login = sessao.post("/login", data={"email": email_unico, "senha": "admin123"},
+                            follow_redirects=False)
+        assert login.status_code == 303
+        vagas = threading.BoundedSemaphore(1)
+        vagas.acquire()
+        monkeypatch.setattr(security, "_vagas", vagas)
+
+        # Act
+        response = sessao.post("/fornecedor/cadastro", data={
+            "nome": "Novo Fornecedor",
+            "razao_social": "Fornecedor Teste",
+            "email": f"novo_{email_unico}",
+            "senha": "Senha@123",
+            "confirmar_senha": "Senha@123",
+            "cpf_cnpj": "11222333000181",
+            "telefone": "27988887777",
+            "cep": "29100-000",
+            "estado": "ES",
+            "cidade": "Vitória",
+            "rua": "Rua Fornecedor",
+            "numero": "2",
+            "bairro": "Centro",
+            "termos": "on",
+        }, follow_redirects=False)
+
+        # Assert: não cai na página de erro genérica do formulário
+        assert response.status_code == 503
+        assert response.headers.get("retry-after") == "1"
+
 
 class TestLogoutRoute:
     """Testes para rota de logout"""
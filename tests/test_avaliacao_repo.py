@@ -18,6 +18,10 @@ from data.avaliacao.avaliacao_repo import (
     obter_avaliacao_por_id,
     atualizar_avaliacao,
     deletar_avaliacao,
+    obter_avaliacoes_recebidas,
+    obter_estatisticas_avaliacoes,
+    obter_resumo_avaliacao,
+    reconstruir_resumo_avaliacoes,
 )
 from data.usuario.usuario_repo import criar_tabela_usuario, inserir_usuario
 from data.usuario.usuario_model import Usuario
@@ -331,3 +335,135 @@ class TestAvaliacaoRepo:
         resultado = deletar_avaliacao(id_avaliacao)
         # Assert
         assert resultado is True
+
+    def _inserir_avaliacoes_recebidas(self, email_unico, cpf_unico):
+        """Insere avaliações com notas 4.5, 1.0, 3.0 e 5.0 para o mesmo avaliado."""
+        criar_tabela_usuario()
+        criar_tabela_avaliacao()
+        criar_tabela_cliente()
+        criar_tabela_fornecedor()
+        criar_tabela_prestador()
+        email_prestador = f"prestador_{uuid.uuid4().hex[:8]}@teste.com"
+        cpf_prestador = f"{uuid.uuid4().int % 100000000000000:014d}"
+        id_avaliacao = self.inserir_avaliacao_para_teste(
+            email_unico, cpf_unico, email_prestador, cpf_prestador
+        )
+        primeira = obter_avaliacao_por_id(id_avaliacao)
+        assert primeira is not None
+        for i, nota in enumerate([1.0, 3.0, 5.0], start=1):
+            inserir_avaliacao(Avaliacao(
+                id_avaliacao=0,
+                id_avaliador=primeira.id_avaliador,
+                id_avaliado=primeira.id_avaliado,
+                nota=nota,
+                data_avaliacao=f"2020-01-0{i} 10:00:00",
+                descricao=f"Avaliação {i}",
+            ))
+        return primeira.id_avaliado
+
+    def test_obter_estatisticas_avaliacoes(self, test_db, email_unico, cpf_unico):
+        # Arrange
+        id_avaliado = self._inserir_avaliacoes_recebidas(email_unico, cpf_unico)
+        # Act
+        estatisticas = obter_estatisticas_avaliacoes(id_avaliado)
+        # Assert
+        assert estatisticas.total == 4
+        assert estatisticas.media == pytest.approx(3.375)
+        assert estatisticas.nota_minima == 1.0
+        assert estatisticas.nota_maxima == 5.0
+        assert estatisticas.histograma == {1: 1, 2: 0, 3: 1, 4: 0, 5: 2}
+
+    def test_obter_estatisticas_sem_avaliacoes(self, test_db):
+        # Arrange
+        criar_tabela_avaliacao()
+        # Act
+        estatisticas = obter_estatisticas_avaliacoes(9999)
+        # Assert
+        assert estatisticas.total == 0
+        assert estatisticas.media == 0.0
+        assert sum(estatisticas.histograma.values()) == 0
+
+    def test_obter_avaliacoes_recebidas_ordenadas_e_paginadas(self, test_db, email_unico, cpf_unico):
+        # Arrange
+        id_avaliado = self._inserir_avaliacoes_recebidas(email_unico, cpf_unico)
+        # Act
+        nota_alta = obter_avaliacoes_recebidas(id_avaliado, ordenar="nota_alta", limit=2)
+        nota_baixa = obter_avaliacoes_recebidas(id_avaliado, ordenar="nota_baixa", limit=2, offset=2)
+        antigas = obter_avaliacoes_recebidas(id_avaliado, ordenar="antiga", limit=1)
+        outro = obter_avaliacoes_recebidas(id_avaliado + 1000)
+        # Assert
+        assert [a.nota for a in nota_alta] == [5.0, 4.5]
+        assert [a.nota for a in nota_baixa] == [4.5, 5.0]
+        assert antigas[0].descricao == "Avaliação 1"
+        assert antigas[0].nome_avaliador == "Avaliador"
+        assert outro == []
+
+    def test_resumo_mantido_ao_inserir_atualizar_e_deletar(self, test_db, email_unico, cpf_unico):
+        # Arrange
+        id_avaliado = self._inserir_avaliacoes_recebidas(email_unico, cpf_unico)
+        # Assert: 4.5 + 1.0 + 3.0 + 5.0
+        resumo = obter_resumo_avaliacao(id_avaliado)
+        assert resumo.quantidade == 4
+        assert resumo.media == pytest.approx(3.375)
+        assert resumo.histograma == {1: 1, 2: 0, 3: 1, 4: 0, 5: 2}
+
+        # Act: nota 1.0 -> 4.0 e exclusão da nota 5.0
+        avaliacoes = {a.nota: a for a in obter_avaliacoes_recebidas(id_avaliado)}
+        alterada = avaliacoes[1.0]
+        alterada.nota = 4.0
+        assert atualizar_avaliacao(alterada) is True
+        assert deletar_avaliacao(avaliacoes[5.0].id_avaliacao) is True
+
+        # Assert
+        resumo = obter_resumo_avaliacao(id_avaliado)
+        assert resumo.quantidade == 3
+        assert resumo.soma_notas == pytest.approx(11.5)
+        assert resumo.histograma == {1: 0, 2: 0, 3: 1, 4: 1, 5: 1}
+
+    def test_reconstruir_resumo_avaliacoes(self, test_db, email_unico, cpf_unico):
+        # Arrange: resumo corrompido por alteração fora do repositório
+        id_avaliado = self._inserir_avaliacoes_recebidas(email_unico, cpf_unico)
+        esperado = obter_resumo_avaliacao(id_avaliado)
+        with open_connection() as conn:
+            conn.execute("UPDATE resumo_avaliacao SET quantidade = 99")
+            conn.commit()
+        # Act
+        total = reconstruir_resumo_avaliacoes()
+        # Assert
+        assert total == 1
+        assert obter_resumo_avaliacao(id_avaliado) == esperado
+
+    def test_resumo_sem_avaliacoes(self, test_db):
+        # Arrange
+        criar_tabela_avaliacao()
+        # Act
+        resumo = obter_resumo_avaliacao(9999)
+        # Assert
+        assert resumo.quantidade == 0
+        assert resumo.media == 0.0
+
+    def test_resumo_consistente_com_edicoes_concorrentes(self, test_db, email_unico, cpf_unico):
+        # Arrange: duas threads editando a mesma avaliação ao mesmo tempo
+        import threading
+        id_avaliado = self._inserir_avaliacoes_recebidas(email_unico, cpf_unico)
+        alvo = obter_avaliacoes_recebidas(id_avaliado, ordenar="nota_baixa", limit=1)[0]
+        inicio = threading.Barrier(2)
+
+        def editar(notas):
+            inicio.wait()
+            for nota in notas:
+                alvo_local = obter_avaliacao_por_id(alvo.id_avaliacao)
+                alvo_local.nota = nota
+                atualizar_avaliacao(alvo_local)
+
+        threads = [threading.Thread(target=editar, args=(notas * 100,))
+                   for notas in ([2.0, 3.0], [4.0, 5.0])]
+        # Act
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # Assert: o resumo incremental bate com o recalculado do zero
+        incremental = obter_resumo_avaliacao(id_avaliado)
+        reconstruir_resumo_avaliacoes()
+        assert incremental == obter_resumo_avaliacao(id_avaliado)
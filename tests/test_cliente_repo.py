@@ -9,8 +9,11 @@ from data.cliente.cliente_repo import (
     atualizar_cliente,
     deletar_cliente,
     obter_cliente_por_pagina,
+    listar_clientes,
+    contar_clientes,
 )
 from data.cliente.cliente_model import Cliente
+from data.usuario.usuario_model import FiltroUsuarios
 from data.usuario.usuario_repo import criar_tabela_usuario
 
 class TestClienteRepo:
@@ -173,4 +176,34 @@ class TestClienteRepo:
         assert resultado is True, "A deleção deveria retornar True"
         assert id_inserido is not None
         cliente_apos_delecao = obter_cliente_por_id(id_inserido)
-        assert cliente_apos_delecao is None, "O cliente deveria ser None após a deleção"
\ No newline at end of file
+        assert cliente_apos_delecao is None, "O cliente deveria ser None após a deleção"
+
+    def test_listar_clientes_filtrados(self, test_db):
+        # Arrange
+        criar_tabela_usuario()
+        criar_tabela_cliente()
+        for i, (nome, cadastro) in enumerate([
+            ("Maria Souza", "2024-05-01T10:00:00"),
+            ("Mario Lima", "2024-06-15T08:00:00"),
+            ("João Alves", "2024-06-30T22:00:00"),
+        ]):
+            inserir_cliente(Cliente(
+                id=0, nome=nome, email=f"cliente{i}_{uuid.uuid4().hex[:6]}@teste.com",
+                senha="senha123", cpf_cnpj=f"{i:011d}", telefone="27999990000",
+                cep="88888-888", rua="Rua Teste", numero="1", complemento="",
+                bairro="Centro", cidade="Serra", estado="ES", tipo_usuario="cliente",
+                data_cadastro=cadastro, genero="feminino", data_nascimento=date(1990, 1, 1),
+            ))
+
+        # Act
+        junho = FiltroUsuarios(cadastro_de=date(2024, 6, 1), cadastro_ate=date(2024, 6, 30))
+        pagina = listar_clientes(FiltroUsuarios(busca="mari"), limite=1)
+
+        # Assert
+        assert [c.nome for c in listar_clientes(junho).itens] == ["João Alves", "Mario Lima"]
+        assert contar_clientes(junho) == 2
+        assert contar_clientes() == 3
+        assert [c.nome for c in pagina.itens] == ["Mario Lima"]
+        assert [c.nome for c in listar_clientes(FiltroUsuarios(busca="mari"), 1, pagina.proximo).itens] == ["Maria Souza"]
+        assert pagina.itens[0].data_nascimento == date(1990, 1, 1)
+
@@ -0,0 +1,176 @@
+import gzip
+import os
+
+import pytest
+
+from util.assets import comprimir_estaticos
+from util.compressao import brotli, codificacoes_aceitas, comprimir_arquivo, escolher_codificacao
+
+CSS = ("body { color: red; margin: 0; padding: 0; }\n" * 100).encode()
+
+
+class TestNegociacao:
+
+    def test_interpreta_accept_encoding(self):
+        aceitas = codificacoes_aceitas("gzip, br;q=0.8, deflate;q=0")
+        assert aceitas == {"gzip": 1.0, "br": 0.8, "deflate": 0.0}
+
+    def test_prefere_ordem_do_servidor_com_mesmo_q(self):
+        assert escolher_codificacao("gzip, br", ["br", "gzip"]) == "br"
+
+    def test_respeita_q_do_cliente(self):
+        assert escolher_codificacao("br;q=0.5, gzip", ["br", "gzip"]) == "gzip"
+
+    def test_q_zero_recusa(self):
+        assert escolher_codificacao("br;q=0, gzip;q=0", ["br", "gzip"]) is None
+
+    def test_curinga(self):
+        assert escolher_codificacao("*", ["gzip"]) == "gzip"
+
+    def test_sem_cabecalho(self):
+        assert escolher_codificacao(None, ["br", "gzip"]) is None
+
+
+class TestComprimirArquivo:
+
+    def test_grava_versoes_com_mesma_data(self, tmp_path):
+        # Arrange
+        caminho = tmp_path / "home.css"
+        caminho.write_bytes(CSS)
+        # Act
+        gravados = comprimir_arquivo(str(caminho))
+        # Assert
+        assert str(caminho) + ".gz" in gravados
+        assert gzip.decompress((tmp_path / "home.css.gz").read_bytes()) == CSS
+        assert os.stat(str(caminho) + ".gz").st_mtime_ns == os.stat(caminho).st_mtime_ns
+
+    def test_arquivo_pequeno_nao_e_comprimido(self, tmp_path):
+        caminho = tmp_path / "mini.css"
+        caminho.write_bytes(b"a{}")
+        assert comprimir_arquivo(str(caminho)) == []
+
+    def test_comprimir_estaticos_ignora_uploads_e_remove_orfaos(self, tmp_path):
+        # Arrange
+        (tmp_path / "css").mkdir()
+        (tmp_path / "uploads").mkdir()
+        (tmp_path / "css" / "home.css").write_bytes(CSS)
+        (tmp_path / "uploads" / "nota.txt").write_bytes(CSS)
+        (tmp_path / "css" / "removido.css.gz").write_bytes(b"x")
+        # Act
+        comprimir_estaticos(str(tmp_path))
+        # Assert
+        assert (tmp_path / "css" / "home.css.gz").exists()
+        assert not (tmp_path / "uploads" / "nota.txt.gz").exists()
+        assert not (tmp_path / "css" / "removido.css.gz").exists()
+
+
+class TestArquivosEstaticosComprimidos:
+
+    @pytest.fixture
+    def static_dir(self, tmp_path):
+        (tmp_path / "css").mkdir()
+        caminho = tmp_path / "css" / "home.css"
+        caminho.write_bytes(CSS)
+        comprimir_arquivo(str(caminho))
+        return tmp_path
+
+    @pytest.fixture
+    def cliente(self, static_dir):
+        pytest.importorskip("fastapi")
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from util.cache_config import ArquivosEstaticos
+
+        app = FastAPI()
+        app.mount("/static", ArquivosEstaticos(directory=str(static_dir)), name="static")
+        return TestClient(app)
+
+    def _get(self, cliente, encoding, **headers):
+        # O TestClient descomprime sozinho; o corpo cru não importa aqui
+        return cliente.get("/static/css/home.css", headers={"Accept-Encoding": encoding, **headers})
+
+    def test_serve_gzip(self, cliente):
+        resposta = self._get(cliente, "gzip")
+        assert resposta.status_code == 200
+        assert resposta.headers["content-encoding"] == "gzip"
+        assert resposta.headers["content-type"].startswith("text/css")
+        assert resposta.headers["vary"] == "Accept-Encoding"
+        assert resposta.content == CSS
+
+    @pytest.mark.skipif(brotli is None, reason="pacote brotli não instalado")
+    def test_prefere_brotli(self, cliente):
+        resposta = self._get(cliente, "gzip, br")
+        assert resposta.headers["content-encoding"] == "br"
+
+    def test_sem_accept_encoding_serve_original(self, cliente):
+        resposta = self._get(cliente, "identity")
+        assert "content-encoding" not in resposta.headers
+        assert resposta.headers["vary"] == "Accept-Encoding"
+        assert resposta.content == CSS
+
+    def test_etag_diferente_por_representacao(self, cliente):
+        gz = self._get(cliente, "gzip").headers["etag"]
+        original = self._get(cliente, "identity").headers["etag"]
+        assert gz != original
+
+    def test_if_none_match_responde_304(self, cliente):
+        etag = self._get(cliente, "gzip").headers["etag"]
+        resposta = self._get(cliente, "gzip", **{"If-None-Match": etag})
+        assert resposta.status_code == 304
+        assert resposta.headers["vary"] == "Accept-Encoding"
+
+    def test_versao_comprimida_desatualizada_e_ignorada(self, cliente, static_dir):
+        # Original editado depois do build: o .gz antigo não pode ser servido
+        novo = CSS.replace(b"red", b"blue")
+        caminho = static_dir / "css" / "home.css"
+        caminho.write_bytes(novo)
+        os.utime(caminho, ns=(0, os.stat(caminho).st_mtime_ns + 10**9))
+        resposta = self._get(cliente, "gzip, br")
+        assert "content-encoding" not in resposta.headers
+        assert resposta.content == novo
+
+
+class TestCompressaoDinamica:
+
+    @pytest.fixture
+    def cliente(self):
+        pytest.importorskip("fastapi")
+        from fastapi import FastAPI
+        from fastapi.responses import HTMLResponse, PlainTextResponse
+        from fastapi.testclient import TestClient
+        from util.compressao import CompressaoDinamicaMiddleware
+
+        app = FastAPI()
+        app.add_middleware(CompressaoDinamicaMiddleware, minimo=100)
+
+        @app.get("/grande", response_class=HTMLResponse)
+        def grande():
+            return "<p>olá</p>" * 100
+
+        @app.get("/pequena", response_class=HTMLResponse)
+        def pequena():
+            return "<p>oi</p>"
+
+        @app.get("/texto", response_class=PlainTextResponse)
+        def texto():
+            return "x" * 1000
+
+        return TestClient(app)
+
+    def test_comprime_html_grande(self, cliente):
+        resposta = cliente.get("/grande", headers={"Accept-Encoding": "gzip"})
+        assert resposta.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in resposta.headers["vary"]
+        assert resposta.text == "<p>olá</p>" * 100
+
+    def test_nao_comprime_sem_accept_encoding(self, cliente):
+        resposta = cliente.get("/grande", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in resposta.headers
+
+    def test_nao_comprime_resposta_pequena(self, cliente):
+        resposta = cliente.get("/pequena", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in resposta.headers
+
+    def test_nao_comprime_outros_tipos(self, cliente):
+        resposta = cliente.get("/texto", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in resposta.headers
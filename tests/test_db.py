@@ -0,0 +1,214 @@
+import sqlite3
+import threading
+import pytest
+from util.config import DB_BUSY_TIMEOUT_MS
+from util.db import (
+    ConnectionPool,
+    executar_manutencao,
+    obter_estatisticas_pool,
+    obter_pool,
+    obter_unidade_atual,
+    open_connection,
+    unit_of_work,
+)
+
+
+class TestConnectionPool:
+
+    def test_open_connection_reutiliza_conexao(self, test_db):
+        # Act
+        with open_connection() as conn1:
+            id1 = id(conn1)
+        with open_connection() as conn2:
+            id2 = id(conn2)
+        # Assert
+        assert id1 == id2, "A conexão devolvida ao pool deveria ser reutilizada"
+        stats = obter_pool().stats()
+        assert stats["checkouts"] == 2
+        assert stats["abertas"] == 1
+
+    def test_conexoes_aninhadas_sao_distintas(self, test_db):
+        with open_connection() as conn1:
+            with open_connection() as conn2:
+                assert conn1 is not conn2
+        assert obter_pool().stats()["ociosas"] == 2
+
+    def test_release_descarta_transacao_pendente(self, test_db):
+        # Arrange
+        with open_connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+        # Act: insere sem commit
+        with open_connection() as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+        # Assert
+        with open_connection() as conn:
+            total = conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+        assert total == 0, "Alterações sem commit não devem sobreviver à devolução"
+
+    def test_release_restaura_row_factory(self, test_db):
+        with open_connection() as conn:
+            conn.row_factory = None
+        with open_connection() as conn:
+            assert conn.row_factory is sqlite3.Row
+
+    def test_pool_esgotado_gera_erro_apos_timeout(self, test_db):
+        # Arrange
+        pool = ConnectionPool(test_db, max_size=1, timeout=0.05)
+        conn = pool.acquire()
+        # Act / Assert
+        with pytest.raises(sqlite3.OperationalError):
+            pool.acquire()
+        pool.release(conn)
+        assert pool.stats()["timeouts"] == 1
+        pool.close()
+
+    def test_pool_espera_devolucao_de_outra_thread(self, test_db):
+        # Arrange
+        pool = ConnectionPool(test_db, max_size=1, timeout=2)
+        conn = pool.acquire()
+        timer = threading.Timer(0.05, pool.release, args=(conn,))
+        # Act
+        timer.start()
+        conn2 = pool.acquire()
+        # Assert
+        assert conn2 is conn
+        stats = pool.stats()
+        assert stats["esperas"] == 1
+        assert stats["tempo_espera_max_ms"] > 0
+        pool.release(conn2)
+        pool.close()
+
+    def test_obter_estatisticas_pool(self, test_db):
+        with open_connection():
+            pass
+        caminhos = [s["database_file"] for s in obter_estatisticas_pool()]
+        assert test_db in caminhos
+
+
+class TestPerfilConexao:
+
+    def test_conexao_usa_wal_e_pragmas_configurados(self, test_db):
+        with open_connection() as conn:
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            busy_timeout = conn.execute("PRAGMA busy_timeout").fetchone()[0]
+            synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+            temp_store = conn.execute("PRAGMA temp_store").fetchone()[0]
+        assert journal_mode == "wal"
+        assert busy_timeout == DB_BUSY_TIMEOUT_MS
+        assert synchronous == 1, "synchronous deveria ser NORMAL"
+        assert temp_store == 2, "temp_store deveria ser MEMORY"
+
+    def test_leitura_nao_bloqueia_durante_escrita(self, test_db):
+        # Arrange
+        with open_connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.execute("INSERT INTO t VALUES (1)")
+            conn.commit()
+        # Act: transação de escrita aberta em outra conexão
+        with open_connection() as escritor:
+            escritor.execute("INSERT INTO t VALUES (2)")
+            with open_connection() as leitor:
+                total = leitor.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+            escritor.commit()
+        # Assert
+        assert total == 1, "O leitor deveria ver o último estado confirmado"
+
+    def test_executar_manutencao(self, test_db):
+        with open_connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.execute("INSERT INTO t VALUES (1)")
+            conn.commit()
+        resultado = executar_manutencao("TRUNCATE")
+        assert resultado["busy"] == 0
+
+    def test_executar_manutencao_modo_invalido(self, test_db):
+        with pytest.raises(ValueError):
+            executar_manutencao("INVALIDO; DROP TABLE t")
+
+
+def _contar(tabela="t"):
+    with open_connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+
+
+class TestUnidadeDeTrabalho:
+
+    @pytest.fixture(autouse=True)
+    def tabela(self, test_db):
+        with open_connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+
+    def _inserir(self, valor):
+        # Simula uma função de repositório: conexão própria e commit
+        with open_connection() as conn:
+            conn.execute("INSERT INTO t VALUES (?)", (valor,))
+            conn.commit()
+
+    def test_repositorios_compartilham_conexao_e_commit(self, test_db):
+        # Act
+        with unit_of_work() as uow:
+            self._inserir(1)
+            self._inserir(2)
+            assert uow.conexao.in_transaction, "O commit fica para o fim da unidade"
+            # Outra conexão ainda não enxerga as escritas
+            outra = sqlite3.connect(test_db)
+            assert outra.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+            outra.close()
+        # Assert
+        assert _contar() == 2
+        assert obter_unidade_atual() is None
+        assert obter_pool().stats()["abertas"] == 1
+
+    def test_excecao_desfaz_todas_as_escritas(self):
+        with pytest.raises(RuntimeError):
+            with unit_of_work():
+                self._inserir(1)
+                self._inserir(2)
+                raise RuntimeError("falha no meio do cadastro")
+        assert _contar() == 0
+
+    def test_rollback_de_um_repositorio_reverte_a_unidade(self):
+        with unit_of_work() as uow:
+            self._inserir(1)
+            with open_connection() as conn:
+                conn.rollback()
+            self._inserir(2)
+        assert uow.revertida
+        assert _contar() == 0
+
+    def test_unidades_aninhadas_fazem_um_unico_commit(self):
+        with unit_of_work() as externa:
+            with unit_of_work() as interna:
+                self._inserir(1)
+            assert interna is externa
+            assert externa.conexao.in_transaction
+        assert _contar() == 1
+
+    def test_unidade_isolada_por_thread(self):
+        vistas = []
+        with unit_of_work():
+            thread = threading.Thread(target=lambda: vistas.append(obter_unidade_atual()))
+            thread.start()
+            thread.join()
+        assert vistas == [None]
+
+    def test_cadastro_de_cliente_atomico(self):
+        from data.cliente.cliente_model import Cliente
+        from data.cliente.cliente_repo import criar_tabela_cliente, inserir_cliente
+        from data.usuario.usuario_repo import criar_tabela_usuario
+        criar_tabela_usuario()
+        criar_tabela_cliente()
+        with open_connection() as conn:
+            # Força a falha do INSERT em cliente depois do INSERT em usuario
+            conn.execute("DROP TABLE cliente")
+            conn.commit()
+
+        resultado = inserir_cliente(Cliente(
+            id=0, nome="Cliente", email="atomico@teste.com", senha="x", cpf_cnpj="1",
+            telefone="1", cep="1", rua="r", numero="1", complemento="", bairro="b",
+            cidade="c", estado="ES", tipo_usuario="Cliente",
+        ))
+
+        assert resultado is None
+        assert _contar("usuario") == 0, "O usuário não deve ficar órfão"
+
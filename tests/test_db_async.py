@@ -0,0 +1,62 @@
+import asyncio
+import threading
+import time
+
+from data.produto import produto_repo
+from data.produto.produto_model import Produto
+from util.config import DB_EXECUTOR_WORKERS
+from util.db import obter_unidade_atual, open_connection, unit_of_work
+from util.db_async import assincrono, encerrar_executor, executar, obter_executor
+
+
+def _consulta_lenta():
+    with open_connection() as conn:
+        conn.execute(
+            "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 600000) "
+            "SELECT SUM(x) FROM n"
+        ).fetchone()
+    return threading.current_thread().name
+
+
+class TestDbAsync:
+
+    def teardown_method(self):
+        encerrar_executor()
+
+    def test_fachada_retorna_resultado_do_repositorio(self, test_db):
+        produto_repo.criar_tabela_produto()
+        produto_repo.inserir_produto(Produto(id=1, nome="Cimento", descricao="CP II",
+                                             preco=30.0, quantidade=5))
+
+        produto = asyncio.run(assincrono(produto_repo).obter_produto_por_id(1))
+
+        assert produto.nome == "Cimento"
+        assert assincrono(produto_repo) is assincrono(produto_repo)
+
+    def test_consulta_roda_fora_da_thread_do_loop(self, test_db):
+        nome = asyncio.run(executar(_consulta_lenta))
+        assert nome.startswith("obratto-db")
+        assert obter_executor()._max_workers == DB_EXECUTOR_WORKERS
+
+    def test_loop_continua_respondendo_durante_consulta_lenta(self, test_db):
+        async def cenario():
+            batidas = 0
+            consulta = asyncio.ensure_future(executar(_consulta_lenta))
+            inicio = time.perf_counter()
+            while not consulta.done():
+                await asyncio.sleep(0.005)
+                batidas += 1
+            await consulta
+            return batidas, time.perf_counter() - inicio
+
+        batidas, duracao = asyncio.run(cenario())
+        # Bloqueando o loop haveria uma única batida ao fim da consulta
+        assert batidas > 1, f"{batidas} batida(s) em {duracao:.3f}s"
+
+    def test_unidade_de_trabalho_acompanha_a_chamada(self, test_db):
+        async def cenario():
+            with unit_of_work() as uow:
+                return uow, await executar(obter_unidade_atual)
+
+        uow, vista = asyncio.run(cenario())
+        assert vista is uow
@@ -0,0 +1,150 @@
+import io
+import os
+import time
+import uuid
+
+import pytest
+from PIL import Image
+
+import util.fila_imagens as fila_imagens
+from data.tarefaimagem import tarefa_imagem_repo
+from util.fila_imagens import encerrar_fila_imagens, enfileirar_imagem, iniciar_fila_imagens
+
+
+def _png(largura=1200, altura=900) -> io.BytesIO:
+    buffer = io.BytesIO()
+    Image.new("RGB", (largura, altura), (200, 80, 40)).save(buffer, "PNG")
+    buffer.seek(0)
+    return buffer
+
+
+def _aguardar_status(id_tarefa: int, status: str, limite: float = 30.0):
+    fim = time.monotonic() + limite
+    while time.monotonic() < fim:
+        tarefa = tarefa_imagem_repo.obter_tarefa_imagem_por_id(id_tarefa)
+        if tarefa.status == status:
+            return tarefa
+        time.sleep(0.05)
+    pytest.fail(f"Tarefa {id_tarefa} não chegou a {status!r} (está {tarefa.status!r})")
+
+
+@pytest.fixture
+def fila(test_db, tmp_path, monkeypatch):
+    tarefa_imagem_repo.criar_tabela_tarefa_imagem()
+    monkeypatch.setattr(fila_imagens, "IMAGENS_FILA_DIR", str(tmp_path / "fila"))
+    monkeypatch.setattr(fila_imagens, "IMAGENS_WORKERS", 1)
+    yield tmp_path
+    encerrar_fila_imagens()
+
+
+class TestFilaImagens:
+
+    def test_enfileirar_retorna_na_hora_com_tarefa_pendente(self, fila):
+        destino = fila / "saida" / "foto.jpg"
+        # Act (fila não iniciada: nada é processado)
+        id_tarefa = enfileirar_imagem(_png(), str(destino))
+        # Assert
+        tarefa = tarefa_imagem_repo.obter_tarefa_imagem_por_id(id_tarefa)
+        assert tarefa.status == "pendente"
+        assert os.path.exists(tarefa.origem)
+        assert not destino.exists()
+
+    def test_arquivo_que_nao_e_imagem_e_recusado(self, fila):
+        assert enfileirar_imagem(io.BytesIO(b"%PDF-1.4 nao sou imagem"), str(fila / "x.jpg")) is None
+
+    def test_processa_em_segundo_plano_e_marca_pronta(self, fila):
+        # Arrange
+        destino = fila / "saida" / "foto.jpg"
+        id_tarefa = enfileirar_imagem(_png(), str(destino))
+        # Act
+        iniciar_fila_imagens()
+        tarefa = _aguardar_status(id_tarefa, "pronta")
+        # Assert
+        with Image.open(destino) as imagem:
+            assert imagem.size == (800, 800)
+            assert imagem.format == "JPEG"
+        assert not os.path.exists(tarefa.origem)
+        assert tarefa.tentativas == 1
+
+    def test_imagem_corrompida_fica_com_erro(self, fila):
+        # Assinatura de PNG válida, conteúdo inválido
+        corrompida = io.BytesIO(b"\x89PNG\r\n\x1a\n" + b"lixo" * 50)
+        id_tarefa = enfileirar_imagem(corrompida, str(fila / "ruim.jpg"))
+        iniciar_fila_imagens()
+        tarefa = _aguardar_status(id_tarefa, "erro")
+        assert tarefa.erro
+        assert not (fila / "ruim.jpg").exists()
+
+    def test_tarefa_interrompida_volta_para_a_fila(self, fila):
+        # Arrange: tarefa reservada por um processo que morreu
+        id_tarefa = enfileirar_imagem(_png(), str(fila / "foto.jpg"))
+        assert tarefa_imagem_repo.reservar_proxima_tarefa_imagem().id_tarefa == id_tarefa
+        # Act
+        recuperadas = tarefa_imagem_repo.recuperar_tarefas_interrompidas(-1)
+        # Assert
+        assert recuperadas == 1
+        assert tarefa_imagem_repo.obter_tarefa_imagem_por_id(id_tarefa).status == "pendente"
+
+    def test_reserva_nao_entrega_a_mesma_tarefa_duas_vezes(self, fila):
+        enfileirar_imagem(_png(), str(fila / "foto.jpg"))
+        assert tarefa_imagem_repo.reservar_proxima_tarefa_imagem() is not None
+        assert tarefa_imagem_repo.reservar_proxima_tarefa_imagem() is None
+
+    def test_foto_do_servico_entra_na_galeria_como_processando(self, fila):
+        from data.servicofoto import servico_foto_repo
+        from util import foto_util
+        servico_foto_repo.criar_tabela_servico_foto()
+        # Act
+        foto_util.enfileirar_nova_foto(7, _png())
+        foto_util.enfileirar_nova_foto(7, _png())
+        # Assert: posições reservadas na hora, sem depender do disco
+        fotos = servico_foto_repo.obter_fotos_por_servico(7)
+        assert [f.posicao for f in fotos] == [1, 2]
+        assert {f.status for f in fotos} == {"processando"}
+        assert fotos[0].chave != fotos[1].chave
+        assert foto_util.obter_todas_fotos(7) == []
+
+    def test_conclusao_marca_foto_do_servico_pronta(self, fila):
+        import shutil
+        from data.servicofoto import servico_foto_repo
+        from util import foto_util
+        from util.imagens_responsivas import remover_variantes
+        servico_foto_repo.criar_tabela_servico_foto()
+        # Serviço inexistente: a pasta em static/ é só deste teste
+        servico_id = 987654
+        try:
+            id_tarefa = foto_util.enfileirar_nova_foto(servico_id, _png())
+            # Act
+            iniciar_fila_imagens()
+            _aguardar_status(id_tarefa, "pronta")
+            # Assert
+            foto = servico_foto_repo.obter_foto_principal(servico_id)
+            assert foto.status == "pronta"
+            assert (foto.largura, foto.altura) == (800, 800)
+            assert len(foto.hash) == 64
+            assert foto_util.obter_todas_fotos(servico_id) == [foto.url]
+        finally:
+            for foto in servico_foto_repo.obter_fotos_por_servico(servico_id):
+                remover_variantes(foto.url)
+            shutil.rmtree(foto_util.obter_diretorio_servico(servico_id), ignore_errors=True)
+
+    def test_variantes_geradas_em_segundo_plano_sem_apagar_original(self, fila):
+        from util.imagens_responsivas import RAIZ_STATIC, possui_variantes, remover_variantes
+
+        # Arrange: imagem já publicada em static/ (o worker roda em outro processo)
+        nome = f"teste_variantes_{uuid.uuid4().hex[:8]}.png"
+        original = os.path.join(RAIZ_STATIC, "uploads", nome)
+        os.makedirs(os.path.dirname(original), exist_ok=True)
+        Image.new("RGB", (900, 600)).save(original)
+        url = f"/static/uploads/{nome}"
+        try:
+            id_tarefa = fila_imagens.enfileirar_variantes(original)
+            # Act
+            iniciar_fila_imagens()
+            _aguardar_status(id_tarefa, "pronta")
+            # Assert
+            assert os.path.exists(original)
+            assert possui_variantes(url)
+        finally:
+            remover_variantes(url)
+            os.remove(original)
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 import sqlite3
 import uuid
 from data.fornecedor.fornecedor_repo import (
@@ -8,9 +8,12 @@ from data.fornecedor.fornecedor_repo import (
     obter_fornecedor_por_id,
     atualizar_fornecedor,
     deletar_fornecedor,
-    obter_fornecedor_por_pagina
+    obter_fornecedor_por_pagina,
+    listar_fornecedores,
+    contar_fornecedores,
 )
 from data.fornecedor.fornecedor_model import Fornecedor
+from data.usuario.usuario_model import FiltroUsuarios
 from data.usuario.usuario_repo import criar_tabela_usuario
 
 
@@ -237,3 +240,62 @@ class TestFornecedorRepo:
         fornecedor_apos = obter_fornecedor_por_id(id_inserido)
         assert fornecedor_apos is None
 
+    def _inserir_fornecedores_filtro(self):
+        criar_tabela_usuario()
+        criar_tabela_fornecedor()
+        dados = [
+            ("Ana Materiais", "ana@obra.com", "Vitória", "ES", "2024-01-10 09:00:00", True),
+            ("Bruno Tintas", "contato@bruno.com", "Vila Velha", "ES", "2024-02-20 18:30:00", False),
+            ("Andre Ferragens", "andre@ferro.com", "Vitória", "ES", "2024-03-05 12:00:00", False),
+            ("Carla 100% Obras", "carla@obras.com", "Rio de Janeiro", "RJ", "2024-03-31 23:59:00", False),
+        ]
+        ids = []
+        for nome, email, cidade, estado, cadastro, selo in dados:
+            ids.append(inserir_fornecedor(Fornecedor(
+                id=0, nome=nome, email=email, senha="senha123",
+                cpf_cnpj=uuid.uuid4().hex[:14], telefone="27999999999", cep="88888-888",
+                rua="Rua Teste", numero="1", complemento="", bairro="Centro",
+                cidade=cidade, estado=estado, tipo_usuario="fornecedor",
+                data_cadastro=cadastro, razao_social=f"{nome} Ltda", selo_confianca=selo,
+            )))
+        return ids
+
+    def test_listar_fornecedores_filtros(self, test_db):
+        # Arrange
+        ids = self._inserir_fornecedores_filtro()
+
+        def nomes(filtro):
+            return [f.nome for f in listar_fornecedores(filtro).itens]
+
+        # Act / Assert: prefixo de nome ou e-mail, sem diferenciar maiúsculas
+        assert nomes(FiltroUsuarios(busca="an")) == ["Andre Ferragens", "Ana Materiais"]
+        assert nomes(FiltroUsuarios(busca="CONTATO")) == ["Bruno Tintas"]
+        assert nomes(FiltroUsuarios(busca="100%")) == []
+        assert nomes(FiltroUsuarios(busca="carla 100%")) == ["Carla 100% Obras"]
+        assert nomes(FiltroUsuarios(cidade="vitória")) == ["Andre Ferragens", "Ana Materiais"]
+        assert nomes(FiltroUsuarios(estado="rj")) == ["Carla 100% Obras"]
+        assert nomes(FiltroUsuarios(selo_confianca=True)) == ["Ana Materiais"]
+        # Período de cadastro com o último dia inclusivo
+        periodo = FiltroUsuarios(cadastro_de=date(2024, 2, 1), cadastro_ate=date(2024, 3, 31))
+        assert nomes(periodo) == ["Carla 100% Obras", "Andre Ferragens", "Bruno Tintas"]
+        assert contar_fornecedores() == 4
+        assert contar_fornecedores(FiltroUsuarios(selo_confianca=False)) == 3
+        assert contar_fornecedores(FiltroUsuarios(cidade="Vitória", selo_confianca=False)) == 1
+        assert contar_fornecedores(periodo) == 3
+        assert listar_fornecedores().itens[0].id == ids[-1]
+
+    def test_listar_fornecedores_paginado(self, test_db):
+        # Arrange
+        ids = self._inserir_fornecedores_filtro()
+        filtro = FiltroUsuarios(estado="ES")
+
+        # Act
+        primeira = listar_fornecedores(filtro, limite=2)
+        segunda = listar_fornecedores(filtro, limite=2, cursor=primeira.proximo)
+
+        # Assert: mais recentes primeiro, filtro mantido entre as páginas
+        assert [f.id for f in primeira.itens] == [ids[2], ids[1]]
+        assert [f.id for f in segunda.itens] == [ids[0]]
+        assert segunda.proximo is None
+        assert [f.id for f in listar_fornecedores(filtro, 2, segunda.anterior).itens] == [ids[2], ids[1]]
+
@@ -0,0 +1,117 @@
+import os
+
+import pytest
+from PIL import Image
+
+from util.imagens_responsivas import (
+    gerar_variantes,
+    imagem_responsiva,
+    imagens_originais,
+    possui_variantes,
+    remover_variantes,
+    srcset,
+    url_variante,
+)
+
+URL = "/static/uploads/produtos_fornecedor/foto.png"
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    pasta = tmp_path / "uploads" / "produtos_fornecedor"
+    pasta.mkdir(parents=True)
+    Image.new("RGBA", (2000, 1000), (10, 120, 200, 128)).save(pasta / "foto.png")
+    (pasta / "leia-me.txt").write_text("x")
+    return tmp_path
+
+
+class TestUrls:
+
+    def test_url_variante_espelha_o_caminho(self):
+        esperado = "/static/variantes/uploads/produtos_fornecedor/foto.miniatura.webp"
+        assert url_variante(URL, "miniatura", "webp") == esperado
+
+    def test_urls_externas_ou_de_variantes_nao_tem_variantes(self):
+        assert url_variante("https://exemplo.com/a.jpg", "media") is None
+        assert url_variante("/static/variantes/uploads/a.media.jpg", "media") is None
+        assert url_variante("/static/uploads/../../segredo.png", "media") is None
+        assert url_variante("/static/css/home.css", "media") is None
+
+    def test_srcset_lista_todas_as_larguras(self):
+        valor = srcset(URL, "jpg")
+        assert valor.count("w, ") == 2
+        assert valor.startswith("/static/variantes/uploads/produtos_fornecedor/foto.miniatura.jpg 160w")
+        assert valor.endswith("foto.completa.jpg 1200w")
+
+
+class TestGerarVariantes:
+
+    def test_gera_tamanhos_e_formatos(self, static_dir):
+        # Act
+        gravados = gerar_variantes(str(static_dir / "uploads/produtos_fornecedor/foto.png"), str(static_dir))
+        # Assert
+        assert len(gravados) == 6
+        pasta = static_dir / "variantes" / "uploads" / "produtos_fornecedor"
+        with Image.open(pasta / "foto.miniatura.webp") as imagem:
+            assert imagem.format == "WEBP"
+            assert imagem.size == (160, 80)
+        with Image.open(pasta / "foto.completa.jpg") as imagem:
+            assert imagem.format == "JPEG"
+            assert imagem.size == (1200, 600)
+        assert possui_variantes(URL, str(static_dir))
+
+    def test_imagem_pequena_nao_e_ampliada(self, static_dir):
+        caminho = static_dir / "uploads" / "pequena.jpg"
+        Image.new("RGB", (100, 50)).save(caminho)
+        gerar_variantes(str(caminho), str(static_dir))
+        with Image.open(static_dir / "variantes" / "uploads" / "pequena.completa.jpg") as imagem:
+            assert imagem.size == (100, 50)
+
+    def test_variantes_em_dia_sao_puladas(self, static_dir):
+        caminho = str(static_dir / "uploads/produtos_fornecedor/foto.png")
+        gerar_variantes(caminho, str(static_dir))
+        assert gerar_variantes(caminho, str(static_dir)) == []
+        assert len(gerar_variantes(caminho, str(static_dir), forcar=True)) == 6
+
+    def test_arquivo_fora_de_static_e_recusado(self, static_dir, tmp_path_factory):
+        fora = tmp_path_factory.mktemp("fora") / "x.png"
+        Image.new("RGB", (10, 10)).save(fora)
+        with pytest.raises(ValueError):
+            gerar_variantes(str(fora), str(static_dir))
+
+    def test_remover_variantes(self, static_dir):
+        gerar_variantes(str(static_dir / "uploads/produtos_fornecedor/foto.png"), str(static_dir))
+        remover_variantes(URL, str(static_dir))
+        assert not possui_variantes(URL, str(static_dir))
+
+    def test_imagens_originais_ignora_outros_arquivos(self, static_dir):
+        encontradas = [os.path.basename(c) for c in imagens_originais(str(static_dir))]
+        assert encontradas == ["foto.png"]
+
+
+class TestImagemResponsiva:
+
+    def test_sem_variantes_gera_img_simples(self):
+        html = imagem_responsiva("/static/uploads/nao_existe.png", alt="Foto <1>", **{"class": "product-img"})
+        assert html == (
+            '<img src="/static/uploads/nao_existe.png" alt="Foto &lt;1&gt;" '
+            'class="product-img" loading="lazy">'
+        )
+
+    def test_com_variantes_gera_picture(self, static_dir, monkeypatch):
+        import util.imagens_responsivas as modulo
+        gerar_variantes(str(static_dir / "uploads/produtos_fornecedor/foto.png"), str(static_dir))
+        monkeypatch.setattr(modulo, "RAIZ_STATIC", str(static_dir))
+        # Act
+        html = imagem_responsiva(URL, alt="Foto", sizes="320px")
+        # Assert
+        assert html.startswith('<picture><source type="image/webp" srcset="')
+        assert 'sizes="320px"' in html
+        assert 'src="/static/variantes/uploads/produtos_fornecedor/foto.completa.jpg"' in html
+
+    def test_disponivel_nos_templates(self):
+        pytest.importorskip("fastapi")
+        from util.template_util import criar_templates
+        env = criar_templates("templates").env
+        html = env.from_string("{{ imagem_responsiva('/static/x.png', alt='a', class='c') }}").render()
+        assert html == '<img src="/static/x.png" alt="a" class="c" loading="lazy">'
@@ -7,6 +7,11 @@ from data.mensagem.mensagem_repo import (
     criar_tabela_mensagem,
     inserir_mensagem,
     obter_mensagem,
+    obter_conversa,
+    obter_caixa_entrada,
+    obter_caixa_saida,
+    contar_nao_lidas,
+    marcar_mensagem_como_lida,
     obter_mensagem_por_id,
     atualizar_mensagem,
     deletar_mensagem
@@ -157,3 +162,97 @@ class TestMensagemRepo:
         resultado = deletar_mensagem(id_mensagem)
         #Assert
         assert resultado is True
+
+    def test_obter_conversa(self, test_db):
+        # Arrange
+        criar_tabela_usuario()
+        criar_tabela_mensagem()
+        base = datetime(2025, 1, 1, 12, 0, 0)
+        for i in range(5):
+            for remetente, destinatario in ((1, 2), (2, 1), (1, 3)):
+                inserir_mensagem(Mensagem(
+                    id_mensagem=0,
+                    id_remetente=remetente,
+                    id_destinatario=destinatario,
+                    conteudo=f"{remetente}->{destinatario} #{i}",
+                    data_hora=base.replace(minute=i),
+                    nome_remetente="A",
+                    nome_destinatario="B",
+                ))
+        # Act
+        conversa = obter_conversa(1, 2)
+        # Assert
+        assert len(conversa) == 10, "Só as mensagens entre os usuários 1 e 2 devem vir"
+        assert all({m.id_remetente, m.id_destinatario} == {1, 2} for m in conversa)
+        chaves = [(m.data_hora, m.id_mensagem) for m in conversa]
+        assert chaves == sorted(chaves), "A conversa deve vir em ordem cronológica"
+
+    def test_obter_conversa_paginada(self, test_db):
+        # Arrange: mesmo data_hora para todas, o desempate é pelo id
+        criar_tabela_usuario()
+        criar_tabela_mensagem()
+        data_hora = datetime(2025, 1, 1, 12, 0, 0)
+        ids = [
+            inserir_mensagem(Mensagem(
+                id_mensagem=0,
+                id_remetente=1 + i % 2,
+                id_destinatario=2 - i % 2,
+                conteudo=f"Mensagem {i}",
+                data_hora=data_hora,
+                nome_remetente="A",
+                nome_destinatario="B",
+            ))
+            for i in range(7)
+        ]
+        # Act
+        pagina_1 = obter_conversa(2, 1, limite=3)
+        pagina_2 = obter_conversa(2, 1, limite=3, antes_de=pagina_1[0].id_mensagem)
+        pagina_3 = obter_conversa(2, 1, limite=3, antes_de=pagina_2[0].id_mensagem)
+        # Assert
+        assert [m.id_mensagem for m in pagina_1] == ids[4:7]
+        assert [m.id_mensagem for m in pagina_2] == ids[1:4]
+        assert [m.id_mensagem for m in pagina_3] == ids[0:1]
+        assert obter_conversa(2, 1, antes_de=9999) == []
+
+    def test_caixa_entrada_e_saida(self, test_db):
+        # Arrange
+        criar_tabela_usuario()
+        criar_tabela_mensagem()
+        base = datetime(2025, 1, 1, 12, 0, 0)
+        for i in range(5):
+            for remetente, destinatario in ((1, 2), (3, 2), (2, 1)):
+                inserir_mensagem(Mensagem(
+                    id_mensagem=0,
+                    id_remetente=remetente,
+                    id_destinatario=destinatario,
+                    conteudo=f"Mensagem {i}",
+                    data_hora=base.replace(minute=i),
+                    nome_remetente="A",
+                    nome_destinatario="B",
+                ))
+        # Act
+        pagina_1 = obter_caixa_entrada(2, limite=6)
+        pagina_2 = obter_caixa_entrada(2, limite=6, antes_de=pagina_1[-1].id_mensagem)
+        enviadas = obter_caixa_saida(2)
+        # Assert
+        recebidas = pagina_1 + pagina_2
+        assert len(pagina_1) == 6 and len(pagina_2) == 4
+        assert all(m.id_destinatario == 2 for m in recebidas)
+        assert len({m.id_mensagem for m in recebidas}) == 10, "As páginas não devem se repetir"
+        chaves = [(m.data_hora, m.id_mensagem) for m in recebidas]
+        assert chaves == sorted(chaves, reverse=True), "Mais recentes primeiro"
+        assert len(enviadas) == 5
+        assert all(m.id_remetente == 2 and m.id_destinatario == 1 for m in enviadas)
+
+    def test_contar_e_marcar_nao_lidas(self, test_db):
+        # Arrange
+        criar_tabela_usuario()
+        criar_tabela_mensagem()
+        id_mensagem = self.inserir_mensagem_para_teste()
+        self.inserir_mensagem_para_teste()
+        # Act / Assert
+        assert contar_nao_lidas(2) == 2
+        assert marcar_mensagem_como_lida(id_mensagem) is True
+        assert marcar_mensagem_como_lida(id_mensagem) is False, "Já estava lida"
+        assert contar_nao_lidas(2) == 1
+        assert obter_mensagem_por_id(id_mensagem).lida is True
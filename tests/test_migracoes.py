@@ -0,0 +1,204 @@
+import glob
+import importlib
+import os
+import re
+import sqlite3
+from datetime import date
+import pytest
+from data.usuario.usuario_model import FiltroUsuarios
+from data.usuario.usuario_repo import montar_filtro_usuarios
+from util.db import open_connection
+from util.migracoes import MIGRACOES, aplicar_migracoes, obter_versao_schema
+from util.seed import criar_tabelas
+
+
+def _parametros(sql):
+    """Parâmetros nulos para EXPLAIN: posicionais (?) ou nomeados (:nome)."""
+    nomeados = re.findall(r"(?<!:):(\w+)", sql)
+    if nomeados:
+        return {nome: None for nome in nomeados}
+    return [None] * sql.count("?")
+
+
+def _constantes_sql():
+    """Retorna (módulo, nome, sql) de todas as constantes SQL em data/*/*_sql.py."""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    constantes = []
+    for caminho in sorted(glob.glob(os.path.join(raiz, "data", "*", "*_sql.py"))):
+        modulo = os.path.relpath(caminho, raiz)[:-3].replace(os.sep, ".")
+        for nome, valor in vars(importlib.import_module(modulo)).items():
+            if nome.isupper() and not nome.startswith("_") and isinstance(valor, str):
+                constantes.append((modulo, nome, valor))
+    return constantes
+
+
+# Fragmentos que não são comandos completos (concatenados em outro lugar)
+FRAGMENTOS = {"ALTER_TABLE_CLIENTE", "UPDATE_CLIENTE"}
+
+# Consultas que referenciam a coluna inexistente pagamento.prestador_id
+CONSULTAS_INVALIDAS = {"OBTER_PAGAMENTOS_PRESTADOR", "ATUALIZAR_PAGAMENTO"}
+
+SCANS_PERMITIDOS = {
+    # Primeira página de listagens paginadas: percorre um índice parcial já
+    # na ordem do ORDER BY e para no LIMIT
+    "OBTER_PROMOCOES_ATIVAS",
+    # Reparo manual: recalcula todas as linhas de arquivo de propósito; as
+    # subconsultas usam idx_produto_foto e idx_usuario_foto
+    "RECONTAR_REFERENCIAS",
+}
+
+CONSULTAS = [
+    pytest.param(sql, id=f"{modulo.split('.')[-1]}.{nome}")
+    for modulo, nome, sql in _constantes_sql()
+    if nome not in FRAGMENTOS | CONSULTAS_INVALIDAS
+    and not sql.strip().upper().startswith(("CREATE", "ALTER", "DROP", "INSERT"))
+]
+
+
+class TestMigracoes:
+
+    def test_aplicar_migracoes_registra_versao(self, test_db):
+        # Arrange / Act
+        criar_tabelas()
+        # Assert
+        assert obter_versao_schema() == MIGRACOES[-1][0]
+        assert aplicar_migracoes() == [], "Migrações já aplicadas não devem rodar de novo"
+
+    def test_migracao_aplicada_por_outro_processo_e_pulada(self, test_db, monkeypatch):
+        # Arrange: outro worker aplicou tudo depois que esta chamada leu as
+        # versões (leitura desatualizada: nenhuma versão registrada)
+        import util.migracoes as migracoes
+        criar_tabelas()
+        monkeypatch.setattr(migracoes, "OBTER_VERSOES_APLICADAS",
+                            "SELECT versao FROM schema_migracao WHERE 0;")
+        # Act / Assert: não tenta registrar a mesma versão de novo
+        assert aplicar_migracoes() == []
+        monkeypatch.undo()
+        assert obter_versao_schema() == MIGRACOES[-1][0]
+
+    def test_indices_criados(self, test_db):
+        criar_tabelas()
+        with open_connection() as conn:
+            indices = {row["name"] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )}
+        for esperado in ("idx_produto_fornecedor", "idx_avaliacao_avaliado",
+                         "idx_orcamento_fornecedor", "idx_mensagem_remetente",
+                         "idx_notificacao_usuario", "idx_pagamento_mp_payment_id",
+                         "idx_inscricao_plano_fornecedor"):
+            assert esperado in indices, f"Índice {esperado} não foi criado"
+
+    def test_indice_removido_e_recriado(self, test_db):
+        # Arrange: índice de migração já aplicada apagado à mão
+        criar_tabelas()
+        with open_connection() as conn:
+            conn.execute("DROP INDEX idx_avaliacao_avaliado")
+            conn.commit()
+        # Act
+        aplicar_migracoes()
+        # Assert
+        with open_connection() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'idx_avaliacao_avaliado'"
+            ).fetchone()
+        assert row is not None
+
+    def test_gatilho_removido_e_recriado(self, test_db):
+        # Arrange: o mesmo vale para gatilhos
+        criar_tabelas()
+        with open_connection() as conn:
+            conn.execute("DROP TRIGGER fornecedor_anuncio_fts_update")
+            conn.commit()
+        # Act
+        aplicar_migracoes()
+        # Assert
+        with open_connection() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'fornecedor_anuncio_fts_update'"
+            ).fetchone()
+        assert row is not None
+
+    def test_criar_tabelas_idempotente(self, test_db):
+        # Rodar criar_tabelas de novo (a cada inicialização) não pode falhar
+        criar_tabelas()
+        criar_tabelas()
+        assert obter_versao_schema() == MIGRACOES[-1][0]
+
+    def test_migracao_adiciona_coluna_em_tabela_antiga(self, test_db):
+        # Arrange: tabela mensagem criada antes da coluna "lida"
+        with open_connection() as conn:
+            conn.execute("""
+                CREATE TABLE mensagem (
+                    id_mensagem INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id_remetente INTEGER, id_destinatario INTEGER, conteudo TEXT,
+                    data_hora TEXT, nome_remetente TEXT, nome_destinatario TEXT
+                )
+            """)
+        # Act
+        criar_tabelas()
+        # Assert
+        with open_connection() as conn:
+            colunas = {row["name"] for row in conn.execute("PRAGMA table_info(mensagem)")}
+        assert "lida" in colunas
+
+    def test_consultas_invalidas_continuam_invalidas(self, test_db):
+        # Se passarem a compilar, remova-as de CONSULTAS_INVALIDAS
+        criar_tabelas()
+        sqls = {nome: sql for _, nome, sql in _constantes_sql()}
+        with open_connection() as conn:
+            for nome in CONSULTAS_INVALIDAS:
+                with pytest.raises(sqlite3.OperationalError):
+                    conn.execute("EXPLAIN QUERY PLAN " + sqls[nome],
+                                 _parametros(sqls[nome]))
+
+
+@pytest.mark.parametrize("sql", CONSULTAS)
+def test_plano_de_consulta_usa_indices(test_db, sql, request):
+    """
+    Consultas com WHERE não podem varrer nenhuma tabela; listagens sem
+    filtro podem varrer apenas a tabela principal (joins via índice).
+    """
+    criar_tabelas()
+    nome = request.node.callspec.id.split(".")[-1]
+    with open_connection() as conn:
+        plano = [row["detail"] for row in conn.execute(
+            "EXPLAIN QUERY PLAN " + sql, _parametros(sql)
+        )]
+
+    # Varreduras de subconsultas/CTEs percorrem só o resultado já filtrado;
+    # tabelas FTS com MATCH (":M" no plano) consultam o índice invertido
+    scans = [passo for passo in plano
+             if passo.startswith("SCAN ")
+             and not passo.startswith(("SCAN CONSTANT", "SCAN (subquery"))
+             and not re.search(r"VIRTUAL TABLE INDEX \d+:M", passo)]
+    if nome in SCANS_PERMITIDOS:
+        return
+    if re.search(r"\bWHERE\b", sql, re.IGNORECASE):
+        assert not scans, f"{nome} varre tabela apesar do filtro: {plano}"
+    else:
+        assert len(scans) <= 1, f"{nome} varre mais de uma tabela: {plano}"
+
+
+FILTROS_ADMIN = {
+    "busca": FiltroUsuarios(busca="ana"),
+    "cidade": FiltroUsuarios(cidade="Vitória"),
+    "estado": FiltroUsuarios(estado="ES"),
+    "selo": FiltroUsuarios(selo_confianca=False),
+    "cadastro": FiltroUsuarios(cadastro_de=date(2024, 1, 1), cadastro_ate=date(2024, 12, 31)),
+    "combinado": FiltroUsuarios(cidade="Vitória", selo_confianca=False),
+}
+
+
+@pytest.mark.parametrize("tabela, alias", [("fornecedor", "f"), ("prestador", "p"), ("cliente", "c")])
+@pytest.mark.parametrize("filtro", FILTROS_ADMIN.values(), ids=FILTROS_ADMIN.keys())
+def test_contagem_filtrada_usa_indices(test_db, tabela, alias, filtro):
+    """Contagens das listagens administrativas de usuários saem dos índices."""
+    criar_tabelas()
+    coluna_selo = None if tabela == "cliente" else f"{alias}.selo_confianca"
+    where, parametros = montar_filtro_usuarios(filtro, coluna_selo)
+    if not where:
+        pytest.skip("cliente não tem selo de confiança")
+    sql = f"SELECT COUNT(*) FROM {tabela} {alias} JOIN usuario u ON {alias}.id = u.id " + where
+    with open_connection() as conn:
+        plano = [row["detail"] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, parametros)]
+    assert not [passo for passo in plano if passo.startswith("SCAN ")], plano
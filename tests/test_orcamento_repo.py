@@ -19,7 +19,9 @@ from data.orcamento.orcamento_repo import (
     obter_orcamento_por_id,
     obter_orcamentos_por_pagina,
     obter_todos_orcamentos,
-    atualizar_orcamento_por_id
+    atualizar_orcamento_por_id,
+    contar_orcamentos_por_status,
+    listar_orcamentos_por_fornecedor,
 )
 
 
@@ -309,5 +311,66 @@ class Test_OrcamentoRepo:
         orc_db = obter_orcamento_por_id(id_orc)
         assert orc_db is None
 
-
-   
\ No newline at end of file
+    def test_orcamentos_do_fornecedor_com_cliente_e_status(self, test_db, email_unico, cpf_unico):
+        # Arrange
+        criar_tabela_usuario()
+        criar_tabela_cliente()
+        criar_tabela_orcamento()
+        id_cliente = inserir_cliente(Cliente(
+            id=0, nome="Cliente Foto", email=email_unico, senha="senha123",
+            cpf_cnpj=cpf_unico, telefone="27988887777",
+            data_cadastro=datetime.now().isoformat(), cep="88888-888",
+            rua="Rua Teste", numero="123", complemento="", bairro="Centro",
+            cidade="Vitória", estado="ES", tipo_usuario="Cliente",
+            genero="feminino", data_nascimento=date(2000, 1, 1),
+            foto="/static/uploads/cliente.jpg",
+        ))
+        inicio = datetime(2024, 1, 1)
+        for i, status in enumerate(["Pendente", "Aprovado", "Pendente", "Pendente"]):
+            inserir_orcamento(Orcamento(
+                id=0, id_fornecedor=10, id_cliente=id_cliente, valor_estimado=100 * i,
+                data_solicitacao=inicio + timedelta(days=i),
+                prazo_entrega=inicio + timedelta(days=30),
+                status=status, descricao=f"Pedido {i}",
+            ))
+        inserir_orcamento(Orcamento(
+            id=0, id_fornecedor=11, id_cliente=id_cliente, valor_estimado=1,
+            data_solicitacao=inicio, prazo_entrega=inicio,
+            status="Pendente", descricao="Outro fornecedor",
+        ))
+
+        # Act
+        primeira = listar_orcamentos_por_fornecedor(10, limite=2)
+
+        # Assert
+        assert [o.descricao for o in primeira.itens] == ["Pedido 3", "Pedido 2"]
+        assert primeira.itens[0].nome_cliente == "Cliente Foto"
+        assert primeira.itens[0].foto_cliente == "/static/uploads/cliente.jpg"
+        assert contar_orcamentos_por_status(10) == {"Aprovado": 1, "Pendente": 3}
+
+    def test_listar_orcamentos_por_fornecedor(self, test_db):
+        # Arrange: duas solicitações com a mesma data (desempate pelo id)
+        criar_tabela_usuario()
+        criar_tabela_orcamento()
+        inicio = datetime(2024, 1, 1)
+        for i, dias in enumerate([0, 1, 1, 2, 3]):
+            inserir_orcamento(Orcamento(
+                id=0, id_fornecedor=10, id_cliente=1, valor_estimado=1,
+                data_solicitacao=inicio + timedelta(days=dias), prazo_entrega=inicio,
+                status="Aprovado" if i == 3 else "Pendente", descricao=f"Pedido {i}",
+            ))
+
+        # Act
+        primeira = listar_orcamentos_por_fornecedor(10, limite=2)
+        segunda = listar_orcamentos_por_fornecedor(10, limite=2, cursor=primeira.proximo)
+        terceira = listar_orcamentos_por_fornecedor(10, limite=2, cursor=segunda.proximo)
+        pendentes = listar_orcamentos_por_fornecedor(10, status="Pendente", limite=10)
+
+        # Assert
+        assert [o.descricao for o in primeira.itens] == ["Pedido 4", "Pedido 3"]
+        assert [o.descricao for o in segunda.itens] == ["Pedido 2", "Pedido 1"]
+        assert [o.descricao for o in terceira.itens] == ["Pedido 0"]
+        assert terceira.proximo is None
+        voltou = listar_orcamentos_por_fornecedor(10, limite=2, cursor=terceira.anterior)
+        assert [o.descricao for o in voltou.itens] == ["Pedido 2", "Pedido 1"]
+        assert [o.descricao for o in pendentes.itens] == ["Pedido 4", "Pedido 2", "Pedido 1", "Pedido 0"]
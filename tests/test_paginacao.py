@@ -0,0 +1,69 @@
+import sqlite3
+
+import pytest
+
+from util.paginacao import codificar_cursor, decodificar_cursor, paginar
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE item (id INTEGER PRIMARY KEY, grupo INTEGER, nota INTEGER)")
+    conn.executemany(
+        "INSERT INTO item (id, grupo, nota) VALUES (?, ?, ?)",
+        [(i, i % 2, i // 3) for i in range(1, 11)],
+    )
+    yield conn
+    conn.close()
+
+
+def _ids(pagina):
+    return [linha["id"] for linha in pagina.itens]
+
+
+class TestPaginacao:
+    def test_cursor_ida_e_volta(self):
+        cursor = codificar_cursor(["2024-01-01", 7])
+        assert decodificar_cursor(cursor) == (["2024-01-01", 7], "p")
+        assert decodificar_cursor(codificar_cursor([1], "a")) == ([1], "a")
+
+    @pytest.mark.parametrize("cursor", [None, "", "###", "bm9wZQ", codificar_cursor([1], "x")])
+    def test_cursor_invalido(self, cursor):
+        assert decodificar_cursor(cursor) is None
+
+    def test_avancar_e_voltar(self, conn):
+        sql = "SELECT id FROM item"
+        primeira = paginar(conn, sql, (), ["id"], 4)
+        assert _ids(primeira) == [1, 2, 3, 4]
+        assert primeira.anterior is None
+
+        segunda = paginar(conn, sql, (), ["id"], 4, primeira.proximo)
+        terceira = paginar(conn, sql, (), ["id"], 4, segunda.proximo)
+        assert _ids(segunda) == [5, 6, 7, 8]
+        assert _ids(terceira) == [9, 10]
+        assert terceira.proximo is None
+
+        voltou = paginar(conn, sql, (), ["id"], 4, terceira.anterior)
+        assert _ids(voltou) == [5, 6, 7, 8]
+        assert voltou.proximo is not None
+        inicio = paginar(conn, sql, (), ["id"], 4, voltou.anterior)
+        assert _ids(inicio) == [1, 2, 3, 4]
+        assert inicio.anterior is None
+
+    def test_filtro_e_chave_composta_decrescente(self, conn):
+        sql = "SELECT id, nota FROM item WHERE grupo = ?"
+        chave = ["nota", "id"]
+        primeira = paginar(conn, sql, (0,), chave, 3, decrescente=True)
+        segunda = paginar(conn, sql, (0,), chave, 3, primeira.proximo, decrescente=True)
+        assert _ids(primeira) == [10, 8, 6]
+        assert _ids(segunda) == [4, 2]
+        assert segunda.proximo is None
+        assert _ids(paginar(conn, sql, (0,), chave, 3, segunda.anterior, decrescente=True)) == [10, 8, 6]
+
+    def test_cursor_adulterado_volta_para_primeira_pagina(self, conn):
+        sql = "SELECT id, nota FROM item"
+        # Quantidade de valores diferente da chave
+        pagina = paginar(conn, sql, (), ["nota", "id"], 2, codificar_cursor([5]))
+        assert _ids(pagina) == [1, 2]
+        assert _ids(paginar(conn, sql, (), ["id"], 2, "lixo")) == [1, 2]
@@ -11,7 +11,10 @@ from data.prestador.prestador_repo import (
     atualizar_prestador,
     deletar_prestador_repo,
     obter_prestador_por_pagina,
+    listar_prestadores,
+    contar_prestadores,
 )
+from data.usuario.usuario_model import FiltroUsuarios
 from data.usuario.usuario_repo import criar_tabela_usuario
 
 @pytest.fixture
@@ -170,3 +173,28 @@ class TestPrestadorRepo:
         # Assert
         assert sucesso is True
         assert prestador_db_depois is None
+
+    def test_listar_prestadores_aguardando_selo(self, test_db, prestador_exemplo):
+        # Arrange
+        criar_tabela_usuario()
+        criar_tabela_prestador()
+        ids = []
+        for i in range(5):
+            prestador_exemplo.email = f"prestador{i}_{uuid.uuid4().hex[:6]}@teste.com"
+            prestador_exemplo.selo_confianca = i == 2
+            ids.append(inserir_prestador(prestador_exemplo))
+        filtro = FiltroUsuarios(selo_confianca=False)
+
+        # Act
+        primeira = listar_prestadores(filtro, limite=3)
+        segunda = listar_prestadores(filtro, limite=3, cursor=primeira.proximo)
+
+        # Assert
+        assert [p.id for p in primeira.itens] == [ids[4], ids[3], ids[1]]
+        assert [p.id for p in segunda.itens] == [ids[0]]
+        assert primeira.itens[0].selo_confianca is False
+        assert primeira.itens[0].area_atuacao == "Tecnologia"
+        assert contar_prestadores(filtro) == 4
+        assert contar_prestadores(FiltroUsuarios(selo_confianca=True)) == 1
+        assert contar_prestadores(FiltroUsuarios(busca="prestador2")) == 1
+
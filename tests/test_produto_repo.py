@@ -3,7 +3,7 @@ import sqlite3
 from datetime import datetime
 from data.produto.produto_model import Produto
 from data.produto import produto_repo
-from data.produto.produto_repo import atualizar_produto, criar_tabela_produto, deletar_produto, inserir_produto, obter_produto_por_id, obter_produto_por_pagina
+from data.produto.produto_repo import atualizar_produto, criar_tabela_produto, deletar_produto, inserir_produto, obter_produto_por_id, obter_produto_por_pagina, obter_promocoes_por_fornecedor, obter_promocoes_ativas, obter_produto_por_nome, buscar_produtos, contar_busca_produtos, listar_produtos_por_fornecedor
 
 
 @pytest.fixture
@@ -50,6 +50,22 @@ class TestProdutoRepo:
         assert produtos_pagina1[0].id == 1
         assert produtos_pagina2[0].id == 4
 
+    def test_listar_produtos_por_fornecedor(self, test_db):
+        criar_tabela_produto()
+        for i in range(5):
+            inserir_produto(Produto(id=i + 1, nome=f"Produto {i}", descricao="Desc", preco=1.0,
+                                    quantidade=1, fornecedor_id=7 if i != 2 else 8))
+
+        primeira = listar_produtos_por_fornecedor(7, limite=3)
+        segunda = listar_produtos_por_fornecedor(7, limite=3, cursor=primeira.proximo)
+
+        assert [p.nome for p in primeira.itens] == ["Produto 0", "Produto 1", "Produto 3"]
+        assert primeira.anterior is None
+        assert [p.nome for p in segunda.itens] == ["Produto 4"]
+        assert segunda.proximo is None
+        voltou = listar_produtos_por_fornecedor(7, limite=3, cursor=segunda.anterior)
+        assert [p.nome for p in voltou.itens] == ["Produto 0", "Produto 1", "Produto 3"]
+
     def test_atualizar_produto(self, test_db, produto_exemplo):
         criar_tabela_produto()
         inserir_produto(produto_exemplo)
@@ -84,3 +100,59 @@ class TestProdutoRepo:
 
 
 
+
+    def test_obter_promocoes_por_fornecedor(self, test_db):
+        criar_tabela_produto()
+        inserir_produto(Produto(id=1, nome="A", descricao="", preco=10, quantidade=1, em_promocao=True, desconto=10, fornecedor_id=1))
+        inserir_produto(Produto(id=2, nome="B", descricao="", preco=10, quantidade=1, em_promocao=False, fornecedor_id=1))
+        inserir_produto(Produto(id=3, nome="C", descricao="", preco=10, quantidade=1, em_promocao=True, desconto=5, fornecedor_id=2))
+        inserir_produto(Produto(id=4, nome="D", descricao="", preco=10, quantidade=1, em_promocao=True, desconto=20, fornecedor_id=1))
+
+        promocoes = obter_promocoes_por_fornecedor(1)
+
+        assert [p.id for p in promocoes] == [4, 1]
+
+    def test_obter_promocoes_ativas_paginadas(self, test_db):
+        criar_tabela_produto()
+        # Descontos repetidos para testar o desempate por id
+        for i, desconto in enumerate([10, 30, 10, 50, 0], start=1):
+            inserir_produto(Produto(
+                id=i, nome=f"Produto {i}", descricao="", preco=100, quantidade=1,
+                em_promocao=desconto > 0, desconto=desconto, fornecedor_id=i,
+            ))
+
+        pagina1 = obter_promocoes_ativas(limit=2)
+        pagina2 = obter_promocoes_ativas(limit=2, apos=pagina1[-1].id)
+        pagina3 = obter_promocoes_ativas(limit=2, apos=pagina2[-1].id)
+
+        assert [p.id for p in pagina1] == [4, 2]
+        assert [p.id for p in pagina2] == [3, 1]
+        assert pagina3 == []
+
+    def test_buscar_produtos(self, test_db):
+        criar_tabela_produto()
+        inserir_produto(Produto(id=None, nome="Cimento Pórtland", descricao="Saco de 50kg", preco=30, quantidade=1, fornecedor_id=1))
+        inserir_produto(Produto(id=None, nome="Areia média", descricao="Ideal para misturar com cimento", preco=80, quantidade=1, fornecedor_id=2))
+        inserir_produto(Produto(id=None, nome="Tijolo", descricao="Cerâmico", preco=1, quantidade=1, fornecedor_id=1))
+
+        # Sem acento, por prefixo, nome pesa mais que descrição
+        resultado = buscar_produtos("cimen")
+        assert [p.nome for p in resultado] == ["Cimento Pórtland", "Areia média"]
+        assert [p.nome for p in buscar_produtos("PORTLAND")] == ["Cimento Pórtland"]
+        assert [p.nome for p in buscar_produtos("cimento", fornecedor_id=2)] == ["Areia média"]
+        assert contar_busca_produtos("ceramico") == 1
+        assert buscar_produtos('"OR -') == []
+        assert len(buscar_produtos("cimento", limit=1, offset=1)) == 1
+
+    def test_busca_sincronizada_com_atualizacao_e_exclusao(self, test_db):
+        criar_tabela_produto()
+        id_produto = inserir_produto(Produto(id=None, nome="Prego", descricao="", preco=1, quantidade=1))
+        produto = obter_produto_por_id(id_produto)
+        produto.nome = "Parafuso"
+        atualizar_produto(produto)
+
+        assert obter_produto_por_nome("prego") == []
+        assert [p.id for p in obter_produto_por_nome("parafu")] == [id_produto]
+
+        deletar_produto(id_produto)
+        assert buscar_produtos("parafuso") == []
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import util.security as security
+from util.exceptions import ServicoSobrecarregadoError
+from util.security import (
+    criar_hash_senha,
+    criar_hash_senha_async,
+    custo_do_hash,
+    encerrar_pool_senhas,
+    precisa_rehash,
+    verificar_senha,
+    verificar_senha_async,
+    verificar_senha_com_rehash,
+    verificar_senha_com_rehash_async,
+)
+
+
+class TestCustoBcrypt:
+
+    def test_hash_usa_bcrypt_rounds(self, monkeypatch):
+        monkeypatch.setattr(security, "BCRYPT_ROUNDS", 5)
+        assert custo_do_hash(criar_hash_senha("Senha@123")) == 5
+        assert custo_do_hash(criar_hash_senha("Senha@123", rounds=4)) == 4
+
+    def test_custo_de_valor_invalido(self):
+        assert custo_do_hash("nao-e-um-hash") is None
+        assert custo_do_hash(None) is None
+
+    def test_precisa_rehash(self, monkeypatch):
+        monkeypatch.setattr(security, "BCRYPT_ROUNDS", 5)
+        assert precisa_rehash(criar_hash_senha("Senha@123", rounds=4))
+        assert not precisa_rehash(criar_hash_senha("Senha@123", rounds=5))
+        assert not precisa_rehash("texto-qualquer")
+
+    def test_verificar_com_rehash(self, monkeypatch):
+        monkeypatch.setattr(security, "BCRYPT_ROUNDS", 5)
+        antigo = criar_hash_senha("Senha@123", rounds=4)
+
+        ok, novo = verificar_senha_com_rehash("Senha@123", antigo)
+        assert ok
+        assert custo_do_hash(novo) == 5
+        assert verificar_senha("Senha@123", novo)
+
+        assert verificar_senha_com_rehash("Senha@123", novo) == (True, None)
+        assert verificar_senha_com_rehash("errada", antigo) == (False, None)
+
+
+class TestPoolDeSenhas:
+
+    def teardown_method(self):
+        encerrar_pool_senhas()
+
+    def test_versoes_async(self, monkeypatch):
+        monkeypatch.setattr(security, "BCRYPT_ROUNDS", 4)
+
+        async def cenario():
+            senha_hash = await criar_hash_senha_async("Senha@123")
+            return (
+                senha_hash,
+                await verificar_senha_async("Senha@123", senha_hash),
+                await verificar_senha_async("errada", senha_hash),
+                await verificar_senha_com_rehash_async("Senha@123", senha_hash),
+            )
+
+        senha_hash, certa, errada, com_rehash = asyncio.run(cenario())
+        assert custo_do_hash(senha_hash) == 4
+        assert certa and not errada
+        assert com_rehash == (True, None)
+
+    def test_hash_roda_fora_do_loop(self):
+        senha_hash = criar_hash_senha("Senha@123", rounds=11)
+
+        async def cenario():
+            batidas = 0
+            verificacao = asyncio.ensure_future(verificar_senha_async("Senha@123", senha_hash))
+            while not verificacao.done():
+                await asyncio.sleep(0.005)
+                batidas += 1
+            return await verificacao, batidas
+
+        ok, batidas = asyncio.run(cenario())
+        assert ok
+        # Rodando no loop, haveria uma única batida ao fim do bcrypt
+        assert batidas > 1
+
+    def test_fila_cheia_recusa_na_hora(self, monkeypatch):
+        vagas = threading.BoundedSemaphore(1)
+        vagas.acquire()
+        monkeypatch.setattr(security, "_vagas", vagas)
+
+        inicio = time.perf_counter()
+        with pytest.raises(ServicoSobrecarregadoError):
+            asyncio.run(verificar_senha_async("Senha@123", "$2b$04$invalido"))
+        assert time.perf_counter() - inicio < 0.5
+
+    def test_vaga_liberada_ao_terminar(self, monkeypatch):
+        monkeypatch.setattr(security, "BCRYPT_ROUNDS", 4)
+        vagas = threading.BoundedSemaphore(1)
+        monkeypatch.setattr(security, "_vagas", vagas)
+
+        async def cenario():
+            await criar_hash_senha_async("Senha@123")
+            await criar_hash_senha_async("Senha@123")
+
+        asyncio.run(cenario())
+        assert vagas.acquire(blocking=False)
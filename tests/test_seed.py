@@ -0,0 +1,135 @@
+import pytest
+
+import util.security as security
+import util.seed as seed
+from data.fornecedor import fornecedor_repo
+from data.fornecedor.fornecedor_model import Fornecedor
+from util.db import open_connection, seed_usuarios_padrao
+from util.seed import (
+    VERSAO_SEED,
+    calcular_versao_schema,
+    criar_tabelas,
+    inicializar_banco,
+    obter_versoes_banco,
+)
+
+
+def _proibir(monkeypatch, modulo, nome):
+    def falhar(*args, **kwargs):
+        raise AssertionError(f"{nome} não deveria ser chamado")
+    monkeypatch.setattr(modulo, nome, falhar)
+
+
+class TestInicializarBanco:
+
+    def test_banco_novo_roda_schema_e_seed(self, test_db):
+        # Act
+        executado = inicializar_banco()
+        # Assert
+        assert executado == {"schema": True, "seed": True}
+        assert obter_versoes_banco() == {
+            "schema": calcular_versao_schema(),
+            "seed": str(VERSAO_SEED),
+        }
+        with open_connection() as conn:
+            total = conn.execute(
+                "SELECT COUNT(*) FROM usuario WHERE email LIKE 'padrao@%'"
+            ).fetchone()[0]
+        assert total == 4
+
+    def test_boot_com_banco_em_dia_nao_roda_ddl_nem_bcrypt(self, test_db, monkeypatch):
+        # Arrange
+        inicializar_banco()
+        _proibir(monkeypatch, seed, "criar_tabelas")
+        _proibir(monkeypatch, seed, "seed_usuarios_padrao")
+        _proibir(monkeypatch, security, "criar_hash_senha")
+        # Act / Assert
+        assert inicializar_banco() == {"schema": False, "seed": False}
+
+    def test_mudanca_de_schema_roda_apenas_ddl(self, test_db, monkeypatch):
+        # Arrange
+        inicializar_banco()
+        monkeypatch.setattr(seed, "MIGRACOES", seed.MIGRACOES + [(999, "Nova migração", [])])
+        _proibir(monkeypatch, seed, "seed_usuarios_padrao")
+        monkeypatch.setattr(seed, "criar_tabelas", lambda: None)
+        # Act
+        executado = inicializar_banco()
+        # Assert
+        assert executado == {"schema": True, "seed": False}
+        assert obter_versoes_banco()["schema"] == calcular_versao_schema()
+
+    def test_mudanca_de_seed_roda_apenas_seed(self, test_db, monkeypatch):
+        # Arrange
+        inicializar_banco()
+        monkeypatch.setattr(seed, "VERSAO_SEED", VERSAO_SEED + 1)
+        _proibir(monkeypatch, seed, "criar_tabelas")
+        # Act
+        executado = inicializar_banco()
+        # Assert
+        assert executado == {"schema": False, "seed": True}
+        assert obter_versoes_banco()["seed"] == str(VERSAO_SEED + 1)
+
+    def test_seed_com_falha_nao_registra_versao(self, test_db, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(seed, "seed_usuarios_padrao", lambda: False)
+        # Act
+        executado = inicializar_banco()
+        # Assert: na próxima subida o seed é tentado de novo
+        assert executado == {"schema": True, "seed": False}
+        assert "seed" not in obter_versoes_banco()
+
+    def test_forcar(self, test_db):
+        inicializar_banco()
+        assert inicializar_banco(forcar=True) == {"schema": True, "seed": True}
+
+    def test_versao_schema_estavel(self):
+        assert calcular_versao_schema() == calcular_versao_schema()
+
+
+class TestSeedUsuariosPadrao:
+
+    def test_nao_calcula_hash_se_usuarios_existem(self, test_db, monkeypatch):
+        # Arrange
+        criar_tabelas()
+        assert seed_usuarios_padrao()
+        _proibir(monkeypatch, security, "criar_hash_senha")
+        # Act / Assert
+        assert seed_usuarios_padrao()
+
+
+class TestCriarTabelas:
+
+    def test_recriar_tabelas_preserva_dados(self, test_db, email_unico, cpf_unico):
+        # Arrange
+        criar_tabelas()
+        fornecedor = Fornecedor(
+            id=0,
+            nome="Fornecedor Teste",
+            email=email_unico,
+            senha="senha123",
+            cpf_cnpj=cpf_unico,
+            telefone="27999999999",
+            cep="88888-888",
+            rua="Rua Teste",
+            numero="123",
+            complemento="",
+            bairro="Bairro Teste",
+            cidade="Cidade Teste",
+            estado="ES",
+            tipo_usuario="fornecedor",
+            data_cadastro="2024-01-01T00:00:00",
+            razao_social="Fornecedor Ltda"
+        )
+        id_fornecedor = fornecedor_repo.inserir_fornecedor(fornecedor)
+        # Act
+        criar_tabelas()
+        # Assert
+        assert fornecedor_repo.obter_fornecedor_por_id(id_fornecedor) is not None
+
+
+def test_lifespan_inicializa_e_encerra(test_db):
+    fastapi_testclient = pytest.importorskip("fastapi.testclient")
+    from main import app
+
+    with fastapi_testclient.TestClient(app):
+        assert obter_versoes_banco()["schema"] == calcular_versao_schema()
@@ -0,0 +1,138 @@
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from data.servicofoto import servico_foto_repo
+from data.tarefaimagem import tarefa_imagem_repo
+from util import foto_util
+from util.db import open_connection
+
+
+def _png() -> io.BytesIO:
+    buffer = io.BytesIO()
+    Image.new("RGB", (1000, 800), (30, 90, 160)).save(buffer, "PNG")
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.fixture
+def tabela(test_db):
+    servico_foto_repo.criar_tabela_servico_foto()
+    tarefa_imagem_repo.criar_tabela_tarefa_imagem()
+
+
+@pytest.fixture
+def static_dir(tabela, tmp_path, monkeypatch):
+    monkeypatch.setattr(foto_util, "RAIZ_STATIC", str(tmp_path))
+    return tmp_path
+
+
+class TestServicoFotoRepo:
+
+    def test_inserir_foto_no_fim(self, tabela):
+        # Act
+        servico_foto_repo.inserir_foto(1, "img/servico/000001/a.jpg")
+        servico_foto_repo.inserir_foto(1, "img/servico/000001/b.jpg")
+        servico_foto_repo.inserir_foto(2, "img/servico/000002/c.jpg")
+        # Assert
+        fotos = servico_foto_repo.obter_fotos_por_servico(1)
+        assert [f.chave for f in fotos] == ["img/servico/000001/a.jpg", "img/servico/000001/b.jpg"]
+        assert [f.posicao for f in fotos] == [1, 2]
+        assert servico_foto_repo.contar_fotos(1) == 2
+
+    def test_inserir_como_principal_nao_altera_as_demais(self, tabela):
+        # Arrange
+        servico_foto_repo.inserir_foto(1, "img/servico/000001/a.jpg")
+        servico_foto_repo.inserir_foto(1, "img/servico/000001/b.jpg")
+        # Act
+        servico_foto_repo.inserir_foto(1, "img/servico/000001/c.jpg", como_principal=True)
+        # Assert
+        fotos = servico_foto_repo.obter_fotos_por_servico(1)
+        assert [f.chave[-5:] for f in fotos] == ["c.jpg", "a.jpg", "b.jpg"]
+        assert [f.posicao for f in fotos[1:]] == [1, 2]
+        assert servico_foto_repo.obter_foto_principal(1).url == "/static/img/servico/000001/c.jpg"
+
+    def test_foto_principal_ignora_fotos_em_processamento(self, tabela):
+        servico_foto_repo.inserir_foto(1, "img/servico/000001/a.jpg", status="processando")
+        assert servico_foto_repo.obter_foto_principal(1) is None
+        servico_foto_repo.marcar_foto_pronta("img/servico/000001/a.jpg", 800, 800, "abc")
+        assert servico_foto_repo.obter_foto_principal(1).largura == 800
+
+    def test_reordenar_fotos(self, tabela):
+        # Arrange
+        ids = [servico_foto_repo.inserir_foto(1, f"img/servico/000001/{n}.jpg") for n in "abc"]
+        # Act
+        ok = servico_foto_repo.reordenar_fotos(1, [ids[2], ids[0], ids[1]])
+        # Assert
+        assert ok
+        assert [f.id_foto for f in servico_foto_repo.obter_fotos_por_servico(1)] == [ids[2], ids[0], ids[1]]
+
+    def test_reordenar_com_foto_de_outro_servico_desfaz_tudo(self, tabela):
+        # Arrange
+        ids = [servico_foto_repo.inserir_foto(1, f"img/servico/000001/{n}.jpg") for n in "ab"]
+        alheia = servico_foto_repo.inserir_foto(2, "img/servico/000002/x.jpg")
+        # Act
+        ok = servico_foto_repo.reordenar_fotos(1, [ids[1], alheia])
+        # Assert
+        assert not ok
+        assert [f.id_foto for f in servico_foto_repo.obter_fotos_por_servico(1)] == ids
+
+    def test_importar_fotos_legadas(self, tabela, tmp_path):
+        # Arrange
+        pasta = tmp_path / "img" / "servico" / "000003"
+        pasta.mkdir(parents=True)
+        for nome in ("000003-002.jpg", "000003-001.jpg"):
+            Image.new("RGB", (800, 800)).save(pasta / nome)
+        (pasta / "000009-001.jpg").write_bytes(b"de outro servico")
+        (tmp_path / "img" / "servico" / "000003-001.jpg").write_bytes(b"")
+        # Act
+        with open_connection() as conn:
+            importadas = servico_foto_repo.importar_fotos_legadas(conn, str(tmp_path))
+            de_novo = servico_foto_repo.importar_fotos_legadas(conn, str(tmp_path))
+            conn.commit()
+        # Assert
+        assert (importadas, de_novo) == (2, 0)
+        fotos = servico_foto_repo.obter_fotos_por_servico(3)
+        assert [f.chave for f in fotos] == ["img/servico/000003/000003-001.jpg", "img/servico/000003/000003-002.jpg"]
+        assert (fotos[0].largura, fotos[0].altura) == (800, 800)
+
+
+class TestGaleriaServico:
+
+    def test_salvar_nova_foto_usa_nome_imutavel(self, static_dir):
+        # Act
+        assert foto_util.salvar_nova_foto(5, _png())
+        assert foto_util.salvar_nova_foto(5, _png(), como_principal=True)
+        # Assert
+        urls = foto_util.obter_todas_fotos(5)
+        assert len(urls) == 2
+        assert foto_util.obter_foto_principal(5) == urls[0]
+        for url in urls:
+            assert url.startswith("/static/img/servico/000005/")
+            assert (static_dir / url[len("/static/"):]).exists()
+        assert foto_util.obter_proximo_numero(5) == 3
+
+    def test_reordenar_nao_renomeia_arquivos(self, static_dir):
+        # Arrange
+        for _ in range(3):
+            foto_util.salvar_nova_foto(5, _png())
+        antes = foto_util.obter_todas_fotos(5)
+        # Act
+        assert foto_util.reordenar_fotos(5, [3, 1, 2])
+        # Assert
+        assert foto_util.obter_todas_fotos(5) == [antes[2], antes[0], antes[1]]
+        assert not foto_util.reordenar_fotos(5, [1, 1, 2])
+
+    def test_excluir_foto_remove_registro_e_arquivo(self, static_dir):
+        # Arrange
+        foto_util.salvar_nova_foto(5, _png())
+        foto_util.salvar_nova_foto(5, _png())
+        primeira, segunda = foto_util.obter_todas_fotos(5)
+        # Act
+        assert foto_util.excluir_foto(5, 2)
+        # Assert
+        assert foto_util.obter_todas_fotos(5) == [primeira]
+        assert not os.path.exists(static_dir / segunda[len("/static/"):])
+        assert not foto_util.excluir_foto(5, 2)
@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+import util.template_util as template_util
+from util.template_util import criar_templates, precompilar_templates
+
+
+@pytest.fixture
+def templates_temporarios(tmp_path, monkeypatch):
+    """Diretório com dois templates e cache de bytecode próprio."""
+    diretorio = tmp_path / "templates"
+    (diretorio / "parcial").mkdir(parents=True)
+    (diretorio / "base.html").write_text("<h1>{{ titulo }}</h1>", encoding="utf-8")
+    (diretorio / "parcial" / "item.html").write_text("{% extends 'base.html' %}", encoding="utf-8")
+    (diretorio / "parcial" / ".~item.html").write_text("{# rascunho", encoding="utf-8")
+    cache = tmp_path / "cache"
+    monkeypatch.setattr(template_util, "TEMPLATES_CACHE_DIR", str(cache))
+    monkeypatch.setattr(template_util, "_templates", {})
+    return str(diretorio), cache
+
+
+class TestTemplateUtil:
+
+    def test_mesma_instancia_para_o_mesmo_diretorio(self, templates_temporarios):
+        diretorio, _ = templates_temporarios
+        assert criar_templates(diretorio) is criar_templates(diretorio + os.sep)
+
+    def test_auto_reload_segue_configuracao(self, templates_temporarios, monkeypatch):
+        diretorio, _ = templates_temporarios
+        monkeypatch.setattr(template_util, "TEMPLATES_AUTO_RELOAD", False)
+        assert criar_templates(diretorio).env.auto_reload is False
+
+    def test_funcoes_globais(self, templates_temporarios):
+        diretorio, _ = templates_temporarios
+        env = criar_templates(diretorio).env
+        assert "get_flashed_messages" in env.globals
+        assert "obter_mensagens" in env.globals
+
+    def test_precompilar_ignora_ocultos_e_grava_bytecode(self, templates_temporarios):
+        diretorio, cache = templates_temporarios
+        # Act
+        compilados = precompilar_templates(diretorio)
+        # Assert
+        assert compilados == 2
+        assert len(os.listdir(cache)) == 2
+
+    def test_bytecode_reaproveitado_em_novo_environment(self, templates_temporarios, monkeypatch):
+        diretorio, cache = templates_temporarios
+        precompilar_templates(diretorio)
+        # Simula o boot de outro worker: Environment novo, mesmo cache em disco
+        monkeypatch.setattr(template_util, "_templates", {})
+        env = criar_templates(diretorio).env
+        chamadas = []
+        original = env.compile
+        monkeypatch.setattr(env, "compile", lambda *a, **k: chamadas.append(a) or original(*a, **k))
+        # Act
+        html = env.get_template("base.html").render(titulo="Olá")
+        # Assert
+        assert html == "<h1>Olá</h1>"
+        assert chamadas == []
+
+    def test_cache_desativado(self, templates_temporarios, monkeypatch):
+        diretorio, _ = templates_temporarios
+        monkeypatch.setattr(template_util, "TEMPLATES_CACHE_DIR", "")
+        assert criar_templates(diretorio).env.bytecode_cache is None
@@ -0,0 +1,93 @@
+import asyncio
+import io
+import os
+
+import pytest
+from PIL import Image
+
+pytest.importorskip("fastapi")
+from fastapi import UploadFile
+
+from util.exceptions import UploadRecusadoError
+from util.upload import TAMANHO_BLOCO, salvar_upload
+
+
+def _upload(conteudo: bytes, informar_tamanho: bool = True) -> UploadFile:
+    return UploadFile(
+        io.BytesIO(conteudo), size=len(conteudo) if informar_tamanho else None, filename="foto.png"
+    )
+
+
+def _png(largura=600, altura=400) -> bytes:
+    buffer = io.BytesIO()
+    # Ruído não comprime: o arquivo passa de um bloco
+    Image.frombytes("RGB", (largura, altura), os.urandom(largura * altura * 3)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class TestSalvarUpload:
+
+    def test_grava_arquivo_completo(self, tmp_path):
+        # Arrange
+        conteudo = _png()
+        assert len(conteudo) > TAMANHO_BLOCO
+        destino = tmp_path / "sub" / "foto.png"
+        # Act
+        gravados = asyncio.run(salvar_upload(_upload(conteudo), str(destino)))
+        # Assert
+        assert gravados == len(conteudo)
+        assert destino.read_bytes() == conteudo
+        assert [p.name for p in destino.parent.iterdir()] == ["foto.png"]
+
+    def test_tamanho_informado_acima_do_limite_e_recusado_sem_gravar(self, tmp_path):
+        destino = tmp_path / "foto.png"
+        with pytest.raises(UploadRecusadoError) as erro:
+            asyncio.run(salvar_upload(_upload(_png()), str(destino), limite_bytes=1000))
+        assert erro.value.motivo == "arquivo_grande"
+        assert list(tmp_path.iterdir()) == []
+
+    def test_limite_vale_mesmo_sem_tamanho_informado(self, tmp_path):
+        # Arrange: corpo sem tamanho conhecido (ex.: chunked)
+        conteudo = _png()
+        destino = tmp_path / "foto.png"
+        # Act
+        with pytest.raises(UploadRecusadoError) as erro:
+            asyncio.run(salvar_upload(
+                _upload(conteudo, informar_tamanho=False), str(destino), limite_bytes=len(conteudo) - 1
+            ))
+        # Assert: nem o destino nem o temporário ficam no disco
+        assert erro.value.motivo == "arquivo_grande"
+        assert list(tmp_path.iterdir()) == []
+
+    def test_arquivo_que_nao_e_imagem_e_recusado(self, tmp_path):
+        with pytest.raises(UploadRecusadoError) as erro:
+            asyncio.run(salvar_upload(_upload(b"%PDF-1.4 " + b"x" * 100), str(tmp_path / "foto.png")))
+        assert erro.value.motivo == "tipo_invalido"
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestLimiteUploadMiddleware:
+
+    @pytest.fixture
+    def cliente(self):
+        from fastapi import FastAPI, File
+        from fastapi.testclient import TestClient
+        from util.upload import LimiteUploadMiddleware
+
+        app = FastAPI()
+        app.add_middleware(LimiteUploadMiddleware, limite=1000)
+
+        @app.post("/upload")
+        async def upload(foto: UploadFile = File(...)):
+            return {"tamanho": foto.size}
+
+        return TestClient(app)
+
+    def test_corpo_grande_recebe_413(self, cliente):
+        resposta = cliente.post("/upload", files={"foto": ("a.png", b"x" * 2000, "image/png")})
+        assert resposta.status_code == 413
+
+    def test_corpo_dentro_do_limite_passa(self, cliente):
+        resposta = cliente.post("/upload", files={"foto": ("a.png", b"x" * 100, "image/png")})
+        assert resposta.status_code == 200
+        assert resposta.json() == {"tamanho": 100}
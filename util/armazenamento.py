@@ -0,0 +1,118 @@
+"""
+Armazenamento de uploads endereçado pelo conteúdo, sem duplicatas.
+
+Antes cada upload ganhava um nome aleatório em
+static/uploads/{fornecedores,produtos_fornecedor,...}: a mesma imagem
+enviada duas vezes ocupava o disco duas vezes, e descobrir o que não era
+mais usado exigia varrer as pastas e comparar com o banco. Agora o arquivo
+recebe o nome do próprio hash SHA-256:
+
+    /static/uploads/arquivos/3f/3f2a9c1b...e07.jpg
+
+- conteúdo repetido reaproveita o arquivo existente;
+- a URL nunca muda de conteúdo, então é servida com cache imutável
+  (util.cache_config.ArquivosEstaticos);
+- a tabela ``arquivo`` guarda quantas linhas de produto.foto e
+  usuario.foto usam cada URL, mantida por gatilhos no próprio banco, de
+  modo que nenhum repositório precisa lembrar de incrementar/decrementar.
+
+Arquivos com zero referências por mais de ARMAZENAMENTO_CARENCIA_ORFAOS
+segundos (a carência cobre o intervalo entre o upload e a gravação do
+produto/usuário que o usa) são removidos por limpar_arquivos_orfaos(),
+uma consulta ao índice parcial idx_arquivo_orfao:
+
+    python scripts/gerenciar_orfaos.py limpar
+"""
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from data.arquivo import arquivo_repo
+from data.arquivo.arquivo_model import Arquivo
+from util.config import ARMAZENAMENTO_CARENCIA_ORFAOS
+from util.db import unit_of_work
+from util.fila_imagens import enfileirar_variantes
+from util.imagens_responsivas import RAIZ_STATIC, remover_variantes
+
+logger = logging.getLogger(__name__)
+
+DIRETORIO_ARQUIVOS = "uploads/arquivos"
+
+
+def url_por_hash(digest: str, extensao: str) -> str:
+    """URL de um conteúdo: a pasta usa os 2 primeiros dígitos do hash para não crescer demais."""
+    return f"/static/{DIRETORIO_ARQUIVOS}/{digest[:2]}/{digest}{extensao}"
+
+
+def eh_enderecado_por_conteudo(url: Optional[str]) -> bool:
+    """Indica se ``url`` é de um arquivo deste armazenamento (e portanto imutável)."""
+    return bool(url) and url.startswith(f"/static/{DIRETORIO_ARQUIVOS}/")
+
+
+def caminho_da_url(url: str, raiz_static: Optional[str] = None) -> str:
+    raiz_static = raiz_static or RAIZ_STATIC
+    return os.path.join(raiz_static, *url[len("/static/"):].split("/"))
+
+
+def armazenar(temporario: str, digest: str, extensao: str, tamanho: int) -> str:
+    """
+    Move ``temporario`` (já com o conteúdo completo) para o endereço do seu
+    hash e o registra.
+
+    Returns:
+        URL do conteúdo
+    """
+    url = url_por_hash(digest, extensao)
+    destino = caminho_da_url(url)
+
+    # Registrar antes de publicar: renova atualizado_em, então uma limpeza que
+    # ainda não apagou o registro não o apaga mais. Se já apagou, o registro
+    # só é gravado depois que ela termina de remover o arquivo (mesma
+    # transação, ver limpar_arquivos_orfaos) e o os.replace abaixo o devolve.
+    arquivo_repo.registrar_arquivo(digest, url, tamanho)
+    novo = not os.path.exists(destino)
+
+    # Substitui mesmo que já exista: o conteúdo é o mesmo
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    os.replace(temporario, destino)
+    if novo:
+        enfileirar_variantes(destino)  # versões reduzidas para listagens
+    return url
+
+
+def limpar_arquivos_orfaos(carencia_segundos: int = ARMAZENAMENTO_CARENCIA_ORFAOS,
+                           simular: bool = False) -> List[Arquivo]:
+    """
+    Remove os arquivos sem nenhuma referência há mais de ``carencia_segundos``.
+
+    Args:
+        carencia_segundos: Tempo mínimo sem referências e sem reenvio
+        simular: Apenas lista, sem apagar nada
+
+    Returns:
+        Arquivos removidos (ou que seriam removidos, se ``simular``)
+    """
+    antes_de = (datetime.now() - timedelta(seconds=carencia_segundos)).strftime("%Y-%m-%d %H:%M:%S")
+    orfaos = arquivo_repo.obter_arquivos_orfaos(antes_de)
+    if simular:
+        return orfaos
+
+    removidos = []
+    for arquivo in orfaos:
+        # O arquivo é removido com a trava de escrita do DELETE ainda ativa:
+        # um reenvio do mesmo conteúdo espera em registrar_arquivo e só
+        # depois publica o arquivo de novo (ver armazenar)
+        with unit_of_work():
+            # Condicional: se o conteúdo voltou a ser usado, o registro fica
+            if not arquivo_repo.excluir_arquivo_orfao(arquivo.hash, antes_de):
+                continue
+            remover_variantes(arquivo.url)
+            try:
+                os.remove(caminho_da_url(arquivo.url))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Registro de {arquivo.url} apagado, mas não o arquivo: {e}")
+        removidos.append(arquivo)
+    return removidos
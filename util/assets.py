@@ -0,0 +1,214 @@
+"""
+Build dos arquivos estáticos (CSS/JS) com nomes versionados por conteúdo.
+
+    python scripts/build_assets.py
+
+Para cada static/css/*.css e static/js/*.js, grava ao lado do original uma
+cópia minificada com o hash do conteúdo no nome (home.css ->
+home.3f2a9c1b.css) e registra o par em static/assets-manifest.json. O
+filtro ``static_versioned`` (util.cache_config) apenas consulta esse
+manifesto, e os arquivos com hash podem ser servidos com cache imutável de
+um ano: qualquer mudança no conteúdo gera um nome novo.
+
+Em seguida, comprimir_estaticos grava ao lado de cada CSS/JS/SVG/HTML as
+versões .gz e .br (se o pacote brotli estiver instalado), que o servidor
+entrega conforme o Accept-Encoding do cliente.
+
+As cópias ficam no mesmo diretório do original para que caminhos
+relativos (``url(../img/...)``) continuem válidos.
+"""
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Optional
+
+from util.compressao import EXTENSOES_COMPRIMIVEIS, SUFIXOS, comprimir_arquivo
+
+NOME_MANIFESTO = "assets-manifest.json"
+DIRETORIOS_ASSETS = {"css": ".css", "js": ".js"}
+
+# nome.<8 hex>.ext — arquivos gerados pelo build
+_NOME_VERSIONADO = re.compile(r"^(?P<nome>.+)\.(?P<hash>[0-9a-f]{8})(?P<ext>\.[a-z]+)$")
+
+
+def minificar_css(css: str) -> str:
+    """
+    Minifica CSS removendo comentários, espaços em branco desnecessários
+    e quebras de linha.
+    """
+    # Remover comentários /* ... */ (mantém /*! ... */ de licença)
+    css = re.sub(r'/\*(?!!).*?\*/', '', css, flags=re.DOTALL)
+
+    # Remover espaços em branco múltiplos
+    css = re.sub(r'\s+', ' ', css)
+
+    # Remover espaços ao redor de { } ; , > (":" só depois de propriedades,
+    # para não juntar seletores como "a :hover")
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r'([{;][\w-]+)\s*:\s*', r'\1:', css)
+
+    # Remover espaço antes de !important
+    css = re.sub(r'\s*!important', '!important', css)
+
+    # Remover último ; antes de }
+    css = re.sub(r';}', '}', css)
+
+    return css.strip()
+
+
+def _fim_de_linha_em_template_literal(js: str) -> Optional[list]:
+    """
+    Para cada linha do JS, indica se ela termina dentro de uma template
+    literal (`...`), onde espaços fazem parte do valor. Retorna None se o
+    arquivo não puder ser analisado com segurança (string ou comentário
+    sem fechamento).
+    """
+    estados = []
+    aspas = None  # ', " ou ` quando dentro de uma string
+    comentario_bloco = False
+    i, tamanho = 0, len(js)
+    while i < tamanho:
+        c = js[i]
+        if c == "\n":
+            if aspas in ("'", '"'):
+                return None
+            estados.append(aspas == "`")
+            i += 1
+            continue
+        if comentario_bloco:
+            if js.startswith("*/", i):
+                comentario_bloco = False
+                i += 2
+                continue
+        elif aspas:
+            if c == "\\":
+                i += 2
+                continue
+            if c == aspas:
+                aspas = None
+        elif js.startswith("//", i):
+            fim = js.find("\n", i)
+            i = tamanho if fim == -1 else fim
+            continue
+        elif js.startswith("/*", i):
+            comentario_bloco = True
+            i += 2
+            continue
+        elif c in "'\"`":
+            aspas = c
+        i += 1
+    if aspas or comentario_bloco:
+        return None
+    estados.append(False)
+    return estados
+
+
+def minificar_js(js: str) -> str:
+    """
+    Minificação conservadora de JS: remove indentação, espaços no fim das
+    linhas, linhas em branco e linhas que são só comentário ``//``. Não
+    junta linhas (a inserção automática de ";" continua valendo) e não mexe
+    no conteúdo de template literals multilinha. Se o arquivo não puder ser
+    analisado com segurança, é devolvido sem alterações.
+    """
+    estados = _fim_de_linha_em_template_literal(js)
+    if estados is None:
+        return js
+
+    linhas = js.split("\n")
+    resultado = []
+    dentro_de_template = False
+    for linha, termina_em_template in zip(linhas, estados):
+        if dentro_de_template:
+            # Continuação de template literal: preservada como está
+            resultado.append(linha)
+        else:
+            compacta = linha.strip()
+            if compacta and not (compacta.startswith("//") and not termina_em_template):
+                resultado.append(compacta if not termina_em_template else linha.lstrip())
+        dentro_de_template = termina_em_template
+    return "\n".join(resultado).strip() + "\n"
+
+
+def _hash_conteudo(conteudo: bytes) -> str:
+    return hashlib.sha256(conteudo).hexdigest()[:8]
+
+
+def _eh_versionado(arquivo: Path) -> bool:
+    return _NOME_VERSIONADO.match(arquivo.name) is not None
+
+
+def construir_assets(raiz_static: str = "static") -> Dict[str, str]:
+    """
+    Minifica e versiona os assets e grava o manifesto.
+
+    Cópias de builds anteriores que não estão no novo manifesto são
+    removidas.
+
+    Returns:
+        Manifesto {caminho original: caminho versionado}, relativos a static/
+    """
+    raiz = Path(raiz_static)
+    manifesto: Dict[str, str] = {}
+    for subdiretorio, extensao in DIRETORIOS_ASSETS.items():
+        pasta = raiz / subdiretorio
+        if not pasta.is_dir():
+            continue
+        gerados = set()
+        for original in sorted(pasta.glob(f"*{extensao}")):
+            if _eh_versionado(original) or original.name.endswith(f".min{extensao}"):
+                continue
+            fonte = original.read_text(encoding="utf-8")
+            minificado = minificar_css(fonte) if extensao == ".css" else minificar_js(fonte)
+            conteudo = minificado.encode("utf-8")
+            destino = original.with_name(f"{original.stem}.{_hash_conteudo(conteudo)}{extensao}")
+            if not destino.exists() or destino.read_bytes() != conteudo:
+                destino.write_bytes(conteudo)
+            gerados.add(destino.name)
+            manifesto[original.relative_to(raiz).as_posix()] = destino.relative_to(raiz).as_posix()
+
+        for antigo in pasta.glob(f"*{extensao}"):
+            if _eh_versionado(antigo) and antigo.name not in gerados:
+                antigo.unlink()
+
+    caminho_manifesto = raiz / NOME_MANIFESTO
+    temporario = caminho_manifesto.with_suffix(".tmp")
+    temporario.write_text(json.dumps(manifesto, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(temporario, caminho_manifesto)
+    return manifesto
+
+
+def comprimir_estaticos(raiz_static: str = "static") -> list:
+    """
+    Gera as versões .gz/.br dos arquivos comprimíveis de static/ (exceto
+    uploads), servidas por util.cache_config.ArquivosEstaticos, e remove as
+    que sobraram de arquivos que não existem mais.
+
+    Returns:
+        Lista dos arquivos comprimidos gravados
+    """
+    gravados = []
+    for pasta, subpastas, arquivos in os.walk(raiz_static):
+        if os.path.abspath(pasta) == os.path.abspath(raiz_static) and "uploads" in subpastas:
+            subpastas.remove("uploads")
+        for nome in arquivos:
+            caminho = os.path.join(pasta, nome)
+            base, sufixo = os.path.splitext(caminho)
+            if sufixo in SUFIXOS.values():
+                if not os.path.exists(base):
+                    os.remove(caminho)
+                continue
+            if sufixo.lower() in EXTENSOES_COMPRIMIVEIS and nome != NOME_MANIFESTO:
+                gravados += comprimir_arquivo(caminho)
+    return gravados
+
+
+def carregar_manifesto(raiz_static: str = "static") -> Dict[str, str]:
+    """Lê o manifesto do build ({} se o build ainda não foi executado)."""
+    try:
+        with open(Path(raiz_static) / NOME_MANIFESTO, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,35 @@
+"""
+Utilitários para as buscas textuais (SQLite FTS5) dos repositórios.
+
+O texto digitado pelo usuário nunca é passado direto para o MATCH: aspas,
+hífens, asteriscos e palavras como AND/OR/NEAR têm significado na sintaxe
+do FTS5 e poderiam gerar erro ou uma consulta diferente da pretendida.
+"""
+import re
+from typing import Optional
+
+_PALAVRA = re.compile(r"\w+", re.UNICODE)
+
+
+def montar_consulta_fts(texto: Optional[str], coluna: Optional[str] = None) -> Optional[str]:
+    """
+    Converte o texto da busca em uma consulta FTS5 segura.
+
+    Cada palavra vira um prefixo entre aspas ("cimen"*), e todas precisam
+    aparecer (AND implícito). Acentos e maiúsculas são tratados pelo
+    tokenizador da tabela FTS.
+
+    Args:
+        texto: Texto digitado pelo usuário
+        coluna: Restringe a busca a uma coluna da tabela FTS
+
+    Returns:
+        Consulta para o MATCH ou None se o texto não tiver palavras
+    """
+    palavras = _PALAVRA.findall(texto or "")
+    if not palavras:
+        return None
+    consulta = " ".join(f'"{palavra}"*' for palavra in palavras)
+    if coluna:
+        return f"{coluna} : ({consulta})"
+    return consulta
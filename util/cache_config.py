@@ -3,9 +3,11 @@ Módulo de Configuração de Cache
 Fornece estratégias de caching para otimização de performance
 """
 
+import os
 from functools import wraps
 from typing import Callable
 from fastapi import Response
+from fastapi.staticfiles import StaticFiles
 from datetime import datetime, timedelta
 
 
@@ -147,55 +149,134 @@ def no_cache(func: Callable):
 class StaticVersioning:
     """
     Sistema de versionamento de arquivos estáticos
-    Adiciona hash aos URLs para cache busting
+    Troca o caminho do asset pelo nome com hash gerado no build
+    (scripts/build_assets.py), permitindo cache imutável
     """
 
-    _version_cache = {}
+    # Manifesto do build: 'css/home.css' -> 'css/home.3f2a9c1b.css'
+    _manifesto = None
+    _versionados = frozenset()
+
+    @classmethod
+    def _obter_manifesto(cls) -> dict:
+        if cls._manifesto is None:
+            from pathlib import Path
+            from util.assets import carregar_manifesto
+
+            manifesto = carregar_manifesto(str(Path(__file__).parent.parent / 'static'))
+            cls._versionados = frozenset(manifesto.values())
+            cls._manifesto = manifesto
+        return cls._manifesto
 
     @classmethod
     def get_static_url(cls, path: str, version: str = None) -> str:
         """
-        Gera URL de arquivo estático com versão
+        Gera URL de arquivo estático versionado
 
         Args:
             path: Caminho do arquivo estático (ex: '/static/css/components.css')
-            version: Versão manual (opcional, usa hash automático se omitido)
+            version: Versão manual (opcional, usa o manifesto do build se omitido)
 
         Returns:
-            URL com parâmetro de versão
+            URL do arquivo com hash no nome, ou o próprio path se o arquivo
+            não estiver no manifesto (ex.: build ainda não executado)
 
         Exemplo:
             get_static_url('/static/css/components.css')
-            # Retorna: '/static/css/components.css?v=abc123'
+            # Retorna: '/static/css/components.3f2a9c1b.css'
         """
         if version:
             return f"{path}?v={version}"
 
-        # Usar hash do arquivo como versão
-        if path not in cls._version_cache:
-            try:
-                import hashlib
-                from pathlib import Path
+        if not path.startswith('/static/'):
+            return path
+        versionado = cls._obter_manifesto().get(path[len('/static/'):])
+        return f"/static/{versionado}" if versionado else path
 
-                # Remover /static/ do início para encontrar o arquivo
-                file_path = path.replace('/static/', '', 1)
-                full_path = Path(__file__).parent.parent / 'static' / file_path
-
-                if full_path.exists():
-                    with open(full_path, 'rb') as f:
-                        file_hash = hashlib.md5(f.read()).hexdigest()[:8]
-                        cls._version_cache[path] = file_hash
-                else:
-                    cls._version_cache[path] = '1'
-            except Exception:
-                cls._version_cache[path] = '1'
-
-        return f"{path}?v={cls._version_cache[path]}"
+    @classmethod
+    def eh_versionado(cls, caminho_relativo: str) -> bool:
+        """Indica se o caminho (relativo a static/) é um arquivo gerado pelo build"""
+        cls._obter_manifesto()
+        return caminho_relativo in cls._versionados
 
     @classmethod
     def clear_cache(cls):
-        """Limpa o cache de versões (útil em desenvolvimento)"""
-        cls._version_cache.clear()
+        """Recarrega o manifesto (após um novo build, em desenvolvimento)"""
+        cls._manifesto = None
+
+
+class ArquivosEstaticos(StaticFiles):
+    """
+    StaticFiles com negociação de compressão e cache imutável
+
+    - Serve a versão .br ou .gz gerada pelo build de assets quando o
+      cliente aceita (Accept-Encoding), com Vary e ETag próprios de cada
+      representação; GET condicional (If-None-Match/If-Modified-Since)
+      responde 304
+    - Arquivos gerados pelo build (nome com hash) e uploads do armazenamento
+      por conteúdo (util.armazenamento, também nomeados pelo hash) saem com
+      cache imutável de um ano; os demais mantêm a validação por
+      ETag/Last-Modified
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        from mimetypes import guess_type
+        from starlette.datastructures import Headers
+        from starlette.responses import FileResponse
+        from starlette.staticfiles import NotModifiedResponse
+        from util.compressao import EXTENSOES_COMPRIMIVEIS, SUFIXOS, escolher_codificacao
+
+        request_headers = Headers(scope=scope)
+        caminho = str(full_path)
+        headers = {}
+        codificacao = None
+
+        if os.path.splitext(caminho)[1].lower() in EXTENSOES_COMPRIMIVEIS:
+            headers["Vary"] = "Accept-Encoding"
+            # Só vale a versão comprimida com a mesma data do original (gravada
+            # pelo build); se o original foi editado depois, ela está desatualizada
+            disponiveis = {}
+            for cod, sufixo in SUFIXOS.items():
+                try:
+                    estado = os.stat(caminho + sufixo)
+                except OSError:
+                    continue
+                if estado.st_mtime_ns == stat_result.st_mtime_ns:
+                    disponiveis[cod] = estado
+            codificacao = escolher_codificacao(request_headers.get("accept-encoding"), disponiveis)
+
+        if codificacao:
+            headers["Content-Encoding"] = codificacao
+            response = FileResponse(
+                caminho + SUFIXOS[codificacao],
+                status_code=status_code,
+                headers=headers,
+                media_type=guess_type(caminho)[0] or "text/plain",
+                stat_result=disponiveis[codificacao],
+            )
+        else:
+            response = FileResponse(
+                full_path, status_code=status_code, headers=headers, stat_result=stat_result
+            )
+
+        relativo = self.get_path(scope).replace(os.sep, "/")
+        if StaticVersioning.eh_versionado(relativo) or _enderecado_por_conteudo(relativo):
+            response.headers["Cache-Control"] = (
+                f"public, max-age={CacheConfig.STATIC_ASSETS}, immutable"
+            )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def _enderecado_por_conteudo(caminho_relativo: str) -> bool:
+    """Upload (ou variante de upload) cujo nome é o hash do conteúdo"""
+    from util.armazenamento import DIRETORIO_ARQUIVOS
+    from util.imagens_responsivas import DIRETORIO_VARIANTES
+
+    return caminho_relativo.startswith((
+        f"{DIRETORIO_ARQUIVOS}/", f"{DIRETORIO_VARIANTES}/{DIRETORIO_ARQUIVOS}/"
+    ))
 
 
 # Jinja2 Filter para uso em templates
@@ -0,0 +1,164 @@
+"""
+Compressão de respostas: arquivos estáticos pré-comprimidos (.gz/.br gerados
+no build de assets) e gzip sob demanda para respostas HTML dinâmicas.
+
+Brotli é opcional: sem o pacote ``brotli`` instalado, o build gera apenas
+.gz e o servidor negocia apenas gzip.
+"""
+import gzip
+import os
+from typing import Dict, Optional
+
+from util.config import COMPRESSAO_MINIMA_BYTES, COMPRESSAO_NIVEL_GZIP
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tipos que valem a pena comprimir (imagens e vídeos já são comprimidos)
+EXTENSOES_COMPRIMIVEIS = {".css", ".js", ".svg", ".html", ".json", ".txt", ".xml", ".map", ".ico"}
+TIPOS_DINAMICOS_COMPRIMIVEIS = ("text/html", "application/json")
+
+# Extensão do arquivo pré-comprimido, por Content-Encoding, em ordem de preferência
+SUFIXOS = {"br": ".br", "gzip": ".gz"}
+
+
+def codificacoes_aceitas(accept_encoding: Optional[str]) -> Dict[str, float]:
+    """
+    Interpreta o cabeçalho Accept-Encoding.
+
+    Exemplo: "gzip, br;q=0.8, deflate;q=0" -> {"gzip": 1.0, "br": 0.8, "deflate": 0.0}
+    """
+    aceitas: Dict[str, float] = {}
+    for parte in (accept_encoding or "").split(","):
+        nome, _, parametros = parte.strip().partition(";")
+        nome = nome.strip().lower()
+        if not nome:
+            continue
+        qualidade = 1.0
+        parametro = parametros.strip()
+        if parametro.startswith("q="):
+            try:
+                qualidade = float(parametro[2:])
+            except ValueError:
+                qualidade = 0.0
+        aceitas[nome] = qualidade
+    return aceitas
+
+
+def escolher_codificacao(accept_encoding: Optional[str], disponiveis) -> Optional[str]:
+    """
+    Escolhe, entre as codificações ``disponiveis`` (em ordem de preferência
+    do servidor), a de maior q aceita pelo cliente. None = sem compressão.
+    """
+    aceitas = codificacoes_aceitas(accept_encoding)
+    melhor, melhor_q = None, 0.0
+    for codificacao in disponiveis:
+        qualidade = aceitas.get(codificacao, aceitas.get("*", 0.0))
+        if qualidade > melhor_q:
+            melhor, melhor_q = codificacao, qualidade
+    return melhor
+
+
+def comprimir_arquivo(caminho: str) -> list:
+    """
+    Grava as versões .gz (e .br, se disponível) de ``caminho``, apenas
+    quando ficam menores que o original.
+
+    Returns:
+        Lista dos arquivos gravados
+    """
+    with open(caminho, "rb") as arquivo:
+        conteudo = arquivo.read()
+    if len(conteudo) < COMPRESSAO_MINIMA_BYTES:
+        return []
+
+    versoes = {".gz": gzip.compress(conteudo, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        versoes[".br"] = brotli.compress(conteudo, quality=11)
+
+    gravados = []
+    for sufixo, comprimido in versoes.items():
+        destino = caminho + sufixo
+        if len(comprimido) >= len(conteudo):
+            continue
+        with open(destino, "wb") as arquivo:
+            arquivo.write(comprimido)
+        # Mesma data do original: o ETag muda sempre que o original muda
+        estado = os.stat(caminho)
+        os.utime(destino, ns=(estado.st_atime_ns, estado.st_mtime_ns))
+        gravados.append(destino)
+    return gravados
+
+
+class CompressaoDinamicaMiddleware:
+    """
+    Middleware ASGI que comprime com gzip respostas HTML/JSON geradas pela
+    aplicação, quando o cliente aceita e o corpo tem ao menos
+    COMPRESSAO_MINIMA_BYTES.
+
+    Respostas já codificadas (estáticos pré-comprimidos), de outros tipos
+    (imagens, arquivos) ou em streaming passam sem alteração.
+    """
+
+    def __init__(self, app, minimo: int = COMPRESSAO_MINIMA_BYTES, nivel: int = COMPRESSAO_NIVEL_GZIP):
+        self.app = app
+        self.minimo = minimo
+        self.nivel = nivel
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cabecalhos = dict(scope.get("headers") or [])
+        aceita = cabecalhos.get(b"accept-encoding", b"").decode("latin-1")
+        if escolher_codificacao(aceita, ("gzip",)) is None:
+            await self.app(scope, receive, send)
+            return
+
+        inicio = None
+        repassar = False
+
+        async def enviar(mensagem):
+            nonlocal inicio, repassar
+            if mensagem["type"] == "http.response.start":
+                # Segura o início até saber o tamanho do corpo
+                inicio = mensagem
+                return
+            if mensagem["type"] != "http.response.body" or repassar or inicio is None:
+                await send(mensagem)
+                return
+
+            corpo = mensagem.get("body", b"")
+            if mensagem.get("more_body", False) or not self._comprimivel(inicio, corpo):
+                repassar = True
+                await send(inicio)
+                await send(mensagem)
+                return
+
+            comprimido = gzip.compress(corpo, compresslevel=self.nivel)
+            headers = [
+                (nome, valor) for nome, valor in inicio["headers"]
+                if nome.lower() not in (b"content-length", b"vary")
+            ]
+            vary = [valor for nome, valor in inicio["headers"] if nome.lower() == b"vary"]
+            headers += [
+                (b"content-encoding", b"gzip"),
+                (b"content-length", str(len(comprimido)).encode()),
+                (b"vary", b", ".join(vary + [b"Accept-Encoding"])),
+            ]
+            await send({**inicio, "headers": headers})
+            await send({"type": "http.response.body", "body": comprimido})
+
+        await self.app(scope, receive, enviar)
+
+    def _comprimivel(self, inicio, corpo: bytes) -> bool:
+        if len(corpo) < self.minimo:
+            return False
+        headers = {nome.lower(): valor for nome, valor in inicio.get("headers", [])}
+        if b"content-encoding" in headers:
+            return False
+        tipo = headers.get(b"content-type", b"").decode("latin-1").lower()
+        return tipo.startswith(TIPOS_DINAMICOS_COMPRIMIVEIS)
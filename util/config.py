@@ -22,11 +22,51 @@ IS_DEVELOPMENT = RUNNING_MODE.lower() == "development"
 # === Configurações do Banco de Dados ===
 DATABASE_PATH = os.getenv("DATABASE_PATH", "obratto.db")
 
+# === Pool de Conexões SQLite ===
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))  # conexões por worker
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # segundos de espera
+DB_STATEMENT_CACHE = int(os.getenv("DB_STATEMENT_CACHE", "256"))  # statements preparados
+# Threads que executam as consultas das rotas async (util/db_async.py)
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", str(DB_POOL_SIZE)))
+
+# === Perfil de Ajuste do SQLite (PRAGMAs aplicados a cada conexão) ===
+DB_JOURNAL_MODE = os.getenv("DB_JOURNAL_MODE", "WAL")
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+DB_CACHE_SIZE = int(os.getenv("DB_CACHE_SIZE", "-20000"))  # negativo = KiB (~20MB)
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(128 * 1024 * 1024)))  # 128MB
+DB_TEMP_STORE = os.getenv("DB_TEMP_STORE", "MEMORY")
+DB_MANUTENCAO_INTERVALO = int(os.getenv("DB_MANUTENCAO_INTERVALO", "300"))  # segundos (0 desativa)
+DB_CHECKPOINT_MODE = os.getenv("DB_CHECKPOINT_MODE", "PASSIVE")
+
 # === Configurações do Servidor ===
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "8000"))
 RELOAD = os.getenv("RELOAD", "False").lower() == "true"
 
+# === Configurações de Templates (Jinja2) ===
+# Em produção os templates só mudam com deploy: sem stat dos arquivos a cada render
+TEMPLATES_AUTO_RELOAD = os.getenv("TEMPLATES_AUTO_RELOAD", str(IS_DEVELOPMENT)).lower() == "true"
+TEMPLATES_CACHE_DIR = os.getenv("TEMPLATES_CACHE_DIR", ".cache/jinja2")  # bytecode (vazio desativa)
+TEMPLATES_PRECOMPILAR = os.getenv("TEMPLATES_PRECOMPILAR", str(not IS_DEVELOPMENT)).lower() == "true"
+
+# === Compressão de respostas ===
+COMPRESSAO_MINIMA_BYTES = int(os.getenv("COMPRESSAO_MINIMA_BYTES", "1024"))  # abaixo disso não comprime
+COMPRESSAO_NIVEL_GZIP = int(os.getenv("COMPRESSAO_NIVEL_GZIP", "6"))  # gzip sob demanda (HTML dinâmico)
+
+# === Processamento de imagens (util/fila_imagens.py) ===
+# Processos que recortam/redimensionam fotos fora das requisições
+IMAGENS_WORKERS = int(os.getenv("IMAGENS_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+IMAGENS_FILA_DIR = os.getenv("IMAGENS_FILA_DIR", "fila_imagens")  # uploads aguardando processamento
+IMAGENS_TENTATIVAS = int(os.getenv("IMAGENS_TENTATIVAS", "3"))  # falhas do worker antes de desistir
+IMAGENS_TIMEOUT = int(os.getenv("IMAGENS_TIMEOUT", "300"))  # "processando" há mais que isso volta à fila
+
+# === Uploads (util/upload.py) ===
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(5 * 1024 * 1024)))  # por arquivo
+UPLOAD_MAX_CORPO_BYTES = int(os.getenv("UPLOAD_MAX_CORPO_BYTES", str(50 * 1024 * 1024)))  # requisição inteira
+# Arquivos sem referência há mais que isso (segundos) são apagados pela limpeza de órfãos
+ARMAZENAMENTO_CARENCIA_ORFAOS = int(os.getenv("ARMAZENAMENTO_CARENCIA_ORFAOS", "3600"))
+
 # === Configurações de Email (Resend.com) ===
 RESEND_API_KEY = os.getenv("RESEND_API_KEY", "")
 RESEND_FROM_EMAIL = os.getenv("RESEND_FROM_EMAIL", "noreply@obratto.com")
@@ -46,6 +86,10 @@ RATE_LIMIT_ESQUECI_SENHA_MINUTOS = int(os.getenv("RATE_LIMIT_ESQUECI_SENHA_MINUT
 # === Configurações de Segurança ===
 SESSION_MAX_AGE = int(os.getenv("SESSION_MAX_AGE", "3600"))  # 1 hora
 TOKEN_EXPIRACAO_HORAS = int(os.getenv("TOKEN_EXPIRACAO_HORAS", "1"))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))  # custo; hashes antigos são refeitos no login
+# Hash/verificação de senha rodam em threads (bcrypt libera o GIL)
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(os.cpu_count() or 2)))
+BCRYPT_FILA_MAX = int(os.getenv("BCRYPT_FILA_MAX", "64"))  # pendentes além disso: 503
 
 # === Mercado Pago ===
 MERCADOPAGO_ACCESS_TOKEN = os.getenv("MERCADOPAGO_ACCESS_TOKEN", "")
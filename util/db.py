@@ -1,16 +1,400 @@
 import sqlite3
 import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
 from datetime import datetime
 import logging
 from contextlib import contextmanager
+from typing import Optional
+
+from util.config import (
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_CACHE,
+    DB_JOURNAL_MODE,
+    DB_SYNCHRONOUS,
+    DB_BUSY_TIMEOUT_MS,
+    DB_CACHE_SIZE,
+    DB_MMAP_SIZE,
+    DB_TEMP_STORE,
+    DB_MANUTENCAO_INTERVALO,
+    DB_CHECKPOINT_MODE,
+)
 
 logger = logging.getLogger(__name__)
 
+# Valores aceitos pelos PRAGMAs textuais (PRAGMA não aceita parâmetros "?")
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORES = {"DEFAULT", "FILE", "MEMORY"}
+_CHECKPOINT_MODES = {"PASSIVE", "FULL", "RESTART", "TRUNCATE"}
+
+
+def _validar_opcao(nome: str, valor: str, permitidos: set) -> str:
+    valor = valor.upper()
+    if valor not in permitidos:
+        raise ValueError(f"{nome} inválido: {valor!r} (use um de {sorted(permitidos)})")
+    return valor
+
+
+def aplicar_perfil_conexao(conn: sqlite3.Connection) -> None:
+    """
+    Aplica o perfil de ajuste definido em util/config.py a uma conexão.
+
+    Chamado uma única vez quando o pool cria a conexão. Com WAL os leitores
+    não são bloqueados pelas escritas e o busy_timeout faz workers
+    concorrentes aguardarem o lock em vez de falharem com
+    "database is locked".
+    """
+    journal_mode = _validar_opcao("DB_JOURNAL_MODE", DB_JOURNAL_MODE, _JOURNAL_MODES)
+    synchronous = _validar_opcao("DB_SYNCHRONOUS", DB_SYNCHRONOUS, _SYNCHRONOUS)
+    temp_store = _validar_opcao("DB_TEMP_STORE", DB_TEMP_STORE, _TEMP_STORES)
+
+    conn.execute(f"PRAGMA busy_timeout = {int(DB_BUSY_TIMEOUT_MS)}")
+    conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+    conn.execute(f"PRAGMA synchronous = {synchronous}")
+    conn.execute(f"PRAGMA cache_size = {int(DB_CACHE_SIZE)}")
+    conn.execute(f"PRAGMA mmap_size = {int(DB_MMAP_SIZE)}")
+    conn.execute(f"PRAGMA temp_store = {temp_store}")
+
+
+class ConnectionPool:
+    """
+    Pool limitado de conexões SQLite para um arquivo de banco.
+
+    As conexões são criadas sob demanda até ``max_size`` e reaproveitadas
+    entre requisições, mantendo o cache de statements preparados do
+    sqlite3 aquecido. Quando todas estão em uso, ``acquire`` espera até
+    ``timeout`` segundos por uma devolução.
+
+    É seguro para uso a partir do threadpool do FastAPI: o estado interno
+    é protegido por uma Condition e as conexões são abertas com
+    ``check_same_thread=False``.
+    """
+
+    def __init__(self, database_path: str, max_size: int = DB_POOL_SIZE,
+                 timeout: float = DB_POOL_TIMEOUT,
+                 cached_statements: int = DB_STATEMENT_CACHE):
+        self.database_path = database_path
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self.pid = os.getpid()
+
+        self._idle = deque()
+        self._criadas = 0
+        self._cond = threading.Condition()
+
+        # Métricas para dimensionamento do pool
+        self._checkouts = 0
+        self._esperas = 0
+        self._timeouts = 0
+        self._tempo_espera_total = 0.0
+        self._tempo_espera_max = 0.0
+
+    def _criar_conexao(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.database_path,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+            timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        )
+        conn.row_factory = sqlite3.Row  # Permite acessar colunas por nome
+        try:
+            aplicar_perfil_conexao(conn)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Retira uma conexão do pool, criando-a se ainda houver espaço."""
+        inicio = time.perf_counter()
+        esperou = False
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._criadas < self.max_size:
+                    self._criadas += 1
+                    conn = None
+                    break
+                restante = self.timeout - (time.perf_counter() - inicio)
+                if restante <= 0:
+                    self._timeouts += 1
+                    raise sqlite3.OperationalError(
+                        f"Pool de conexões esgotado ({self.max_size} em uso) "
+                        f"após {self.timeout:.1f}s de espera"
+                    )
+                esperou = True
+                self._cond.wait(restante)
+
+            espera = time.perf_counter() - inicio
+            self._checkouts += 1
+            if esperou:
+                self._esperas += 1
+            self._tempo_espera_total += espera
+            self._tempo_espera_max = max(self._tempo_espera_max, espera)
+
+        if conn is None:
+            try:
+                conn = self._criar_conexao()
+            except Exception:
+                with self._cond:
+                    self._criadas -= 1
+                    self._cond.notify()
+                raise
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Devolve a conexão ao pool, descartando transações pendentes."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error:
+            # Conexão inutilizada (ex.: fechada pelo chamador): descarta
+            logger.warning("Descartando conexão inválida do pool", exc_info=True)
+            with self._cond:
+                self._criadas -= 1
+                self._cond.notify()
+            return
+
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Fecha todas as conexões ociosas do pool."""
+        with self._cond:
+            while self._idle:
+                self._idle.pop().close()
+                self._criadas -= 1
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                'database_file': self.database_path,
+                'max_size': self.max_size,
+                'abertas': self._criadas,
+                'ociosas': len(self._idle),
+                'em_uso': self._criadas - len(self._idle),
+                'checkouts': self._checkouts,
+                'esperas': self._esperas,
+                'timeouts': self._timeouts,
+                'tempo_espera_total_ms': round(self._tempo_espera_total * 1000, 3),
+                'tempo_espera_max_ms': round(self._tempo_espera_max * 1000, 3),
+            }
+
+
+_pools: dict = {}
+_pools_lock = threading.Lock()
+
+
+def obter_pool(database_path: str = None) -> ConnectionPool:
+    """
+    Retorna o pool do arquivo de banco informado (ou do banco atual).
+
+    Há um pool por processo e por caminho: após um fork (workers do
+    uvicorn/gunicorn) o pool herdado é descartado e recriado no filho.
+    """
+    if database_path is None:
+        database_path = os.environ.get('TEST_DATABASE_PATH', 'obratto.db')
+
+    pool = _pools.get(database_path)
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+
+    with _pools_lock:
+        pool = _pools.get(database_path)
+        if pool is None or pool.pid != os.getpid():
+            pool = ConnectionPool(database_path)
+            _pools[database_path] = pool
+        return pool
+
+
+def fechar_pools() -> None:
+    """Fecha as conexões ociosas de todos os pools (shutdown e testes)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            if pool.pid == os.getpid():
+                pool.close()
+        _pools.clear()
+
+
+def obter_estatisticas_pool() -> list:
+    """Retorna as métricas de uso (checkouts, espera) de cada pool ativo."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.stats() for pool in pools]
+
+
+def executar_manutencao(checkpoint_mode: str = DB_CHECKPOINT_MODE) -> dict:
+    """
+    Executa o checkpoint do WAL e o PRAGMA optimize no banco atual.
+
+    Retorna o resultado do checkpoint: (busy, páginas no log, páginas
+    transferidas para o banco).
+    """
+    modo = _validar_opcao("DB_CHECKPOINT_MODE", checkpoint_mode, _CHECKPOINT_MODES)
+    with open_connection() as conn:
+        busy, log, checkpointed = conn.execute(
+            f"PRAGMA wal_checkpoint({modo})"
+        ).fetchone()
+        conn.execute("PRAGMA optimize")
+    return {'busy': busy, 'log': log, 'checkpointed': checkpointed}
+
+
+_manutencao_thread = None
+_manutencao_parar = threading.Event()
+
+
+def _loop_manutencao(intervalo: int) -> None:
+    while not _manutencao_parar.wait(intervalo):
+        try:
+            resultado = executar_manutencao()
+            logger.debug(f"Manutenção do banco concluída: {resultado}")
+        except Exception as e:
+            logger.error(f"Erro na manutenção periódica do banco: {e}", exc_info=True)
+
+
+def iniciar_manutencao_periodica(intervalo: int = DB_MANUTENCAO_INTERVALO) -> bool:
+    """
+    Inicia (uma vez por processo) a thread que faz checkpoint/optimize
+    periodicamente, evitando que o arquivo -wal cresça sem limite.
+    """
+    global _manutencao_thread
+    if intervalo <= 0:
+        return False
+    if _manutencao_thread is not None and _manutencao_thread.is_alive():
+        return False
+
+    _manutencao_parar.clear()
+    _manutencao_thread = threading.Thread(
+        target=_loop_manutencao,
+        args=(intervalo,),
+        name="obratto-db-manutencao",
+        daemon=True,
+    )
+    _manutencao_thread.start()
+    logger.info(f"Manutenção periódica do banco a cada {intervalo}s")
+    return True
+
+
+def parar_manutencao_periodica() -> None:
+    """Interrompe a thread de manutenção periódica, se estiver ativa."""
+    global _manutencao_thread
+    _manutencao_parar.set()
+    if _manutencao_thread is not None:
+        _manutencao_thread.join(timeout=5)
+        _manutencao_thread = None
+
+
+class UnidadeDeTrabalho:
+    """
+    Transação compartilhada por todas as funções de repositório chamadas
+    dentro de ``with unit_of_work():``.
+
+    Os repositórios continuam chamando open_connection() e conn.commit()
+    normalmente: dentro da unidade eles recebem a mesma conexão, e o commit
+    só acontece (uma vez, com um único flush em disco) ao sair do bloco
+    sem exceção. Uma exceção, ou um conn.rollback() feito por qualquer
+    repositório, desfaz todas as escritas da unidade.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conexao = conn
+        self.revertida = False
+
+    def rollback(self) -> None:
+        """Desfaz tudo o que foi escrito na unidade; nada mais será gravado."""
+        self.revertida = True
+        self.conexao.rollback()
+
+
+class _ConexaoCompartilhada:
+    """
+    Conexão entregue por open_connection() dentro de uma unidade de
+    trabalho: commit é adiado para o fim da unidade e rollback reverte a
+    unidade inteira. O restante é repassado à conexão real.
+    """
+
+    def __init__(self, unidade: UnidadeDeTrabalho):
+        object.__setattr__(self, "_unidade", unidade)
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        self._unidade.rollback()
+
+    def close(self) -> None:
+        pass
+
+    def __getattr__(self, nome):
+        return getattr(self._unidade.conexao, nome)
+
+    def __setattr__(self, nome, valor):
+        setattr(self._unidade.conexao, nome, valor)
+
+
+# ContextVar (e não threading.local): rotas async compartilham a thread do
+# event loop, e cada requisição precisa enxergar apenas a própria unidade
+_unidade_atual: ContextVar[Optional[UnidadeDeTrabalho]] = ContextVar(
+    "obratto_unidade_de_trabalho", default=None
+)
+
+
+def obter_unidade_atual() -> Optional[UnidadeDeTrabalho]:
+    """Retorna a unidade de trabalho ativa no contexto atual, se houver."""
+    return _unidade_atual.get()
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Agrupa as escritas de vários repositórios em uma única transação.
+
+        with unit_of_work() as uow:
+            id_usuario = usuario_repo.inserir_usuario(usuario)
+            if not administrador_repo.inserir_administrador(...):
+                uow.rollback()
+
+    Blocos aninhados participam da unidade mais externa, que é a única a
+    fazer commit.
+    """
+    atual = _unidade_atual.get()
+    if atual is not None:
+        yield atual
+        return
+
+    pool = obter_pool()
+    conn = pool.acquire()
+    unidade = UnidadeDeTrabalho(conn)
+    token = _unidade_atual.set(unidade)
+    try:
+        yield unidade
+        if unidade.revertida:
+            conn.rollback()
+            logger.warning("Unidade de trabalho revertida; nenhuma escrita foi gravada")
+        else:
+            conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        _unidade_atual.reset(token)
+        pool.release(conn)
+
 
 @contextmanager
 def open_connection():
     """
-    Abre uma conexão simples com o banco de dados SQLite.
+    Obtém uma conexão do pool do banco de dados SQLite.
 
     IMPORTANTE: Use sempre com context manager:
         with open_connection() as conn:
@@ -18,17 +402,29 @@ def open_connection():
             cursor.execute("SELECT * FROM usuario")
             # Lembre-se de fazer conn.commit() para salvar alterações
 
-    A conexão é fechada automaticamente ao sair do bloco with.
+    A conexão volta ao pool automaticamente ao sair do bloco with;
+    alterações sem commit são descartadas (rollback), como acontecia
+    quando a conexão era fechada.
+
+    Dentro de ``with unit_of_work():`` a conexão da unidade é reutilizada
+    e o commit fica para o fim da unidade.
     """
-    database_path = os.environ.get('TEST_DATABASE_PATH', 'obratto.db')
+    unidade = _unidade_atual.get()
+    if unidade is not None:
+        try:
+            yield _ConexaoCompartilhada(unidade)
+        finally:
+            # Repositórios trocam o row_factory; o próximo recebe o padrão
+            unidade.conexao.row_factory = sqlite3.Row
+        return
 
-    conn = sqlite3.connect(database_path)
-    conn.row_factory = sqlite3.Row  # Permite acessar colunas por nome
+    pool = obter_pool()
+    conn = pool.acquire()
 
     try:
         yield conn
     finally:
-        conn.close()
+        pool.release(conn)
 
 
 def get_database_info():
@@ -51,26 +447,39 @@ def get_database_info():
         }
 
 
-def seed_usuarios_padrao():
-    """Cria usuários padrão para cada perfil caso ainda não existam."""
-    from util.security import criar_hash_senha
+def seed_usuarios_padrao() -> bool:
+    """
+    Cria usuários padrão para cada perfil caso ainda não existam.
+
+    O hash bcrypt da senha padrão só é calculado se faltar algum usuário.
 
+    Returns:
+        True se o seed terminou sem erro (mesmo sem criar ninguém)
+    """
     perfis = ['administrador', 'cliente', 'fornecedor', 'prestador']
     senha_padrao = '1234aA@#'
-    senha_hash = criar_hash_senha(senha_padrao)
 
     try:
         with open_connection() as conn:
             cursor = conn.cursor()
 
+            emails = [f'padrao@{perfil}.com' for perfil in perfis]
+            cursor.execute(
+                f"SELECT email FROM usuario WHERE email IN ({', '.join('?' * len(emails))})",
+                emails,
+            )
+            existentes = {row[0] for row in cursor.fetchall()}
+            if len(existentes) == len(emails):
+                logger.debug("Usuários padrão já existem")
+                return True
+
+            from util.security import criar_hash_senha
+            senha_hash = criar_hash_senha(senha_padrao)
+
             for perfil in perfis:
                 email = f'padrao@{perfil}.com'
 
-                # Verificar se já existe um usuário com este email
-                cursor.execute("SELECT id FROM usuario WHERE email = ?", (email,))
-                usuario_existente = cursor.fetchone()
-
-                if not usuario_existente:
+                if email not in existentes:
                     # Criar usuário padrão
                     data_cadastro = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                     cursor.execute("""
@@ -126,6 +535,8 @@ def seed_usuarios_padrao():
 
             conn.commit()
             logger.info("Seed de usuários padrão concluído com sucesso!")
+            return True
 
     except Exception as e:
         logger.error(f"Erro ao criar usuários padrão: {e}", exc_info=True)
+        return False
@@ -0,0 +1,99 @@
+"""
+Acesso assíncrono aos repositórios para as rotas ``async def``.
+
+As funções de data/*/*_repo.py usam sqlite3, que é bloqueante: chamadas
+diretamente dentro de uma rota async, seguram o event loop do uvicorn e
+uma consulta lenta atrasa todas as requisições do worker. Aqui elas rodam
+em um executor dedicado e limitado, e a rota apenas aguarda o resultado:
+
+    from util.db_async import assincrono
+    from data.produto import produto_repo
+
+    produtos = await assincrono(produto_repo).obter_promocoes_ativas(limit=20)
+
+O executor tem DB_EXECUTOR_WORKERS threads (por padrão o tamanho do pool
+de conexões), de modo que as threads nunca ficam esperando conexão livre
+e o excedente de requisições aguarda na fila do executor, sem bloquear o
+loop. O contexto (contextvars) é copiado para a thread, então chamadas
+feitas dentro de ``unit_of_work()`` continuam na mesma transação.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from typing import Any, Callable, Optional
+
+from util.config import DB_EXECUTOR_WORKERS
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_executor_lock = threading.Lock()
+
+
+def obter_executor() -> ThreadPoolExecutor:
+    """Retorna o executor do processo atual (recriado após fork)."""
+    global _executor, _executor_pid
+    if _executor is not None and _executor_pid == os.getpid():
+        return _executor
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, DB_EXECUTOR_WORKERS),
+                thread_name_prefix="obratto-db",
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def encerrar_executor(aguardar: bool = True) -> None:
+    """Encerra o executor (shutdown da aplicação e testes)."""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is not None and _executor_pid == os.getpid():
+            _executor.shutdown(wait=aguardar)
+        _executor = None
+        _executor_pid = None
+
+
+async def executar(funcao: Callable[..., Any], *args, **kwargs) -> Any:
+    """Executa ``funcao(*args, **kwargs)`` no executor do banco e aguarda o resultado."""
+    loop = asyncio.get_running_loop()
+    contexto = contextvars.copy_context()
+    chamada = functools.partial(contexto.run, funcao, *args, **kwargs)
+    return await loop.run_in_executor(obter_executor(), chamada)
+
+
+class RepositorioAssincrono:
+    """Expõe as funções de um módulo de repositório como corrotinas."""
+
+    def __init__(self, modulo: ModuleType):
+        self._modulo = modulo
+
+    def __getattr__(self, nome: str):
+        funcao = getattr(self._modulo, nome)
+        if not callable(funcao):
+            return funcao
+
+        @functools.wraps(funcao)
+        async def chamar(*args, **kwargs):
+            return await executar(funcao, *args, **kwargs)
+
+        setattr(self, nome, chamar)
+        return chamar
+
+    def __repr__(self) -> str:
+        return f"<RepositorioAssincrono {self._modulo.__name__}>"
+
+
+_repositorios: dict = {}
+
+
+def assincrono(modulo: ModuleType) -> RepositorioAssincrono:
+    """Fachada assíncrona (em cache) para um módulo data/*/*_repo.py."""
+    repositorio = _repositorios.get(modulo.__name__)
+    if repositorio is None:
+        repositorio = _repositorios.setdefault(modulo.__name__, RepositorioAssincrono(modulo))
+    return repositorio
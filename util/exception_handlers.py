@@ -14,6 +14,7 @@ from util.flash_messages import informar_erro, informar_aviso
 from util.logger_config import logger
 from util.config import IS_DEVELOPMENT
 from util.auth_decorator import obter_usuario_logado
+from util.exceptions import ServicoSobrecarregadoError
 import traceback
 
 # Configurar templates de erro
@@ -150,6 +151,32 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+async def sobrecarga_exception_handler(request: Request, exc: ServicoSobrecarregadoError) -> Response:
+    """
+    Handler para ServicoSobrecarregadoError (fila de um recurso limitado cheia)
+    Responde 503 com Retry-After em vez de enfileirar mais trabalho
+    """
+    logger.warning(
+        f"Sobrecarga: {exc.mensagem} - "
+        f"Path: {request.url.path} - "
+        f"IP: {request.client.host if request.client else 'unknown'}"
+    )
+
+    usuario_logado = obter_usuario_logado(request)
+    context = {
+        "request": request,
+        "usuario_logado": usuario_logado,
+        "error_code": status.HTTP_503_SERVICE_UNAVAILABLE,
+        "error_message": exc.mensagem,
+    }
+    return templates.TemplateResponse(
+        "errors/500.html",
+        context,
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(exc.tentar_em_segundos)},
+    )
+
+
 async def generic_exception_handler(request: Request, exc: Exception) -> Response:
     """
     Handler genérico para todas as exceções não tratadas
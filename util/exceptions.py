@@ -33,4 +33,18 @@ class BancoDadosError(ObrattoError):
     """Erro relacionado ao banco de dados"""
     def __init__(self, mensagem: str, operacao: str, erro_original: Optional[Exception] = None):
         super().__init__(mensagem, erro_original)
-        self.operacao = operacao
\ No newline at end of file
+        self.operacao = operacao
+
+
+class ServicoSobrecarregadoError(ObrattoError):
+    """Erro quando um recurso limitado (ex.: pool de hash de senhas) está com a fila cheia"""
+    def __init__(self, mensagem: str, tentar_em_segundos: int = 1):
+        super().__init__(mensagem)
+        self.tentar_em_segundos = tentar_em_segundos
+
+
+class UploadRecusadoError(ValidacaoError):
+    """Erro quando um arquivo enviado é grande demais ou não é do tipo esperado"""
+    def __init__(self, mensagem: str, motivo: str):
+        super().__init__(mensagem, campo="foto")
+        self.motivo = motivo  # "arquivo_grande" | "tipo_invalido"
@@ -0,0 +1,295 @@
+"""
+Fila de processamento de imagens fora das requisições.
+
+Recortar, redimensionar e codificar uma foto (util.foto_util.processar_imagem)
+leva de dezenas a centenas de milissegundos de CPU; feito dentro da rota,
+um upload com várias fotos segura o event loop por segundos. Aqui a rota
+apenas grava o arquivo enviado em IMAGENS_FILA_DIR e registra uma tarefa
+na tabela tarefa_imagem:
+
+    from util.fila_imagens import enfileirar_imagem
+
+    id_tarefa = enfileirar_imagem(foto.file, caminho_destino, id_servico=id)
+
+Uma thread de despacho reserva as tarefas pendentes e as executa em um pool
+de IMAGENS_WORKERS processos (o trabalho é CPU e não libera o GIL). Ao
+terminar, a imagem é movida para o destino e a tarefa fica "pronta"; até
+lá as telas tratam a foto como pendente.
+
+Como a fila vive no banco, tarefas não processadas sobrevivem a um
+reinício, e as que ficaram em "processando" por mais de IMAGENS_TIMEOUT
+segundos (processo morto no meio do trabalho) voltam para a fila.
+
+A mesma fila gera as variantes responsivas das imagens enviadas
+(enfileirar_variantes, ver util.imagens_responsivas).
+
+Fotos de serviço (``id_servico``) já entram na galeria (tabela servico_foto)
+como "processando"; a conclusão da tarefa as marca prontas, com dimensões e
+hash, ou as remove quando a imagem é recusada.
+"""
+import logging
+import multiprocessing
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Union
+
+from PIL import Image
+
+from data.servicofoto import servico_foto_repo
+from data.tarefaimagem import tarefa_imagem_repo
+from util.config import IMAGENS_FILA_DIR, IMAGENS_TENTATIVAS, IMAGENS_TIMEOUT, IMAGENS_WORKERS
+from util.imagens_responsivas import RAIZ_STATIC
+
+logger = logging.getLogger(__name__)
+
+# Intervalo máximo entre verificações da fila (novas tarefas acordam a thread antes)
+_INTERVALO_VERIFICACAO = 1.0
+
+_executor: Optional[ProcessPoolExecutor] = None
+_thread: Optional[threading.Thread] = None
+_parar = threading.Event()
+_acordar = threading.Event()
+_lock = threading.Lock()
+
+
+def _processar_tarefa(origem: str, destino: str, tipo: str = "foto") -> Union[bool, dict]:
+    """
+    Executada no processo worker: processa ``origem`` e move o resultado
+    para ``destino`` de forma atômica (quem lê o destino nunca vê um JPEG
+    pela metade). Tarefas do tipo "variantes" apenas geram as versões
+    responsivas de ``destino``.
+
+    Returns:
+        False se a imagem foi recusada; para fotos, um dict com largura,
+        altura e hash do arquivo gravado
+    """
+    from util.foto_util import processar_imagem
+    from util.imagens_responsivas import gerar_variantes
+
+    if tipo == "variantes":
+        gerar_variantes(destino)
+        return True
+
+    temporario = f"{destino}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(origem, "rb") as arquivo:
+        processada = processar_imagem(arquivo, temporario)
+    if not processada:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        return False
+    os.replace(temporario, destino)
+
+    with open(destino, "rb") as arquivo:
+        digest = hashlib.sha256(arquivo.read()).hexdigest()
+    with Image.open(destino) as imagem:
+        largura, altura = imagem.size
+    try:
+        # Já que a foto está aberta neste processo, as variantes saem juntas
+        gerar_variantes(destino)
+    except ValueError:
+        pass  # destino fora de static/: não há variantes
+    return {"largura": largura, "altura": altura, "hash": digest}
+
+
+def enfileirar_imagem(arquivo, caminho_destino: str, id_servico: Optional[int] = None) -> Optional[int]:
+    """
+    Grava o upload na pasta da fila e registra a tarefa de processamento.
+
+    A assinatura do arquivo é conferida aqui (leitura de poucos bytes), para
+    que a rota possa recusar na hora o que não é imagem.
+
+    Args:
+        arquivo: Arquivo de upload (file-like object)
+        caminho_destino: Onde o JPEG processado deve ser gravado
+        id_servico: Serviço dono da foto, para exibir as pendentes na galeria
+
+    Returns:
+        ID da tarefa, ou None se o arquivo não for uma imagem
+    """
+    from util.foto_util import validar_tipo_imagem
+
+    if not validar_tipo_imagem(arquivo):
+        logger.error("Arquivo rejeitado: não é uma imagem válida")
+        return None
+
+    os.makedirs(IMAGENS_FILA_DIR, exist_ok=True)
+    origem = os.path.abspath(os.path.join(IMAGENS_FILA_DIR, f"{uuid.uuid4().hex}.upload"))
+    with open(origem, "wb") as copia:
+        shutil.copyfileobj(arquivo, copia)
+
+    id_tarefa = tarefa_imagem_repo.inserir_tarefa_imagem(
+        origem, os.path.abspath(caminho_destino), id_servico
+    )
+    _acordar.set()
+    return id_tarefa
+
+
+def enfileirar_variantes(caminho_imagem: str) -> Optional[int]:
+    """
+    Agenda a geração das variantes responsivas (util.imagens_responsivas)
+    de uma imagem já gravada em static/.
+
+    As variantes são opcionais (os templates usam o original enquanto elas
+    não existem), então uma falha ao agendar é registrada e ignorada.
+
+    Returns:
+        ID da tarefa, ou None se não foi possível agendar
+    """
+    caminho = os.path.abspath(caminho_imagem)
+    try:
+        id_tarefa = tarefa_imagem_repo.inserir_tarefa_imagem(caminho, caminho, tipo="variantes")
+    except sqlite3.Error as e:
+        logger.warning(f"Não foi possível agendar as variantes de {caminho}: {e}")
+        return None
+    _acordar.set()
+    return id_tarefa
+
+
+def _remover_origem(tarefa) -> None:
+    # Em tarefas de variantes a origem é a própria imagem publicada
+    if tarefa.tipo != "foto":
+        return
+    try:
+        os.remove(tarefa.origem)
+    except FileNotFoundError:
+        pass
+
+
+def _chave_static(caminho: str) -> str:
+    return os.path.relpath(caminho, RAIZ_STATIC).replace(os.sep, "/")
+
+
+def _finalizar_foto_servico(tarefa, resultado) -> None:
+    """Reflete o resultado de uma foto de serviço na galeria (servico_foto)."""
+    if tarefa.tipo != "foto" or tarefa.id_servico is None:
+        return
+    chave = _chave_static(tarefa.destino)
+    if isinstance(resultado, dict):
+        servico_foto_repo.marcar_foto_pronta(chave, resultado["largura"], resultado["altura"], resultado["hash"])
+    else:
+        servico_foto_repo.excluir_foto_por_chave(chave)
+
+
+def _concluir(tarefa, futuro) -> bool:
+    """
+    Registra o resultado de uma tarefa.
+
+    Returns:
+        True se o pool de processos quebrou e precisa ser recriado
+    """
+    try:
+        processada = futuro.result()
+    except Exception as e:
+        # Worker morreu ou falhou de forma inesperada: tenta de novo
+        if tarefa.tentativas < IMAGENS_TENTATIVAS:
+            tarefa_imagem_repo.atualizar_status_tarefa_imagem(tarefa.id_tarefa, "pendente", str(e))
+            logger.warning(f"Tarefa de imagem {tarefa.id_tarefa} falhou ({e}); voltando para a fila")
+        else:
+            tarefa_imagem_repo.atualizar_status_tarefa_imagem(tarefa.id_tarefa, "erro", str(e))
+            _finalizar_foto_servico(tarefa, None)
+            _remover_origem(tarefa)
+            logger.error(f"Tarefa de imagem {tarefa.id_tarefa} desistida após {tarefa.tentativas} tentativas")
+        return isinstance(e, BrokenProcessPool)
+
+    if processada:
+        tarefa_imagem_repo.atualizar_status_tarefa_imagem(tarefa.id_tarefa, "pronta")
+    else:
+        # processar_imagem já registrou o motivo; repetir não adianta
+        tarefa_imagem_repo.atualizar_status_tarefa_imagem(
+            tarefa.id_tarefa, "erro", "Imagem inválida ou corrompida"
+        )
+    _finalizar_foto_servico(tarefa, processada)
+    _remover_origem(tarefa)
+    return False
+
+
+def _novo_executor() -> ProcessPoolExecutor:
+    # spawn: o processo da aplicação tem threads (pools, uvicorn) e fork
+    # copiaria locks em estado inconsistente
+    return ProcessPoolExecutor(
+        max_workers=max(1, IMAGENS_WORKERS),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def _laco_despacho() -> None:
+    global _executor
+    em_andamento = {}
+    ultima_recuperacao = 0.0
+
+    while not _parar.is_set() or em_andamento:
+        try:
+            if not _parar.is_set():
+                if time.monotonic() - ultima_recuperacao >= IMAGENS_TIMEOUT:
+                    recuperadas = tarefa_imagem_repo.recuperar_tarefas_interrompidas(IMAGENS_TIMEOUT)
+                    if recuperadas:
+                        logger.warning(f"{recuperadas} tarefa(s) de imagem interrompida(s) voltaram para a fila")
+                    ultima_recuperacao = time.monotonic()
+
+                _acordar.clear()
+                while len(em_andamento) < max(1, IMAGENS_WORKERS):
+                    tarefa = tarefa_imagem_repo.reservar_proxima_tarefa_imagem()
+                    if tarefa is None:
+                        break
+                    futuro = _executor.submit(_processar_tarefa, tarefa.origem, tarefa.destino, tarefa.tipo)
+                    em_andamento[futuro] = tarefa
+
+            if not em_andamento:
+                _acordar.wait(_INTERVALO_VERIFICACAO)
+                continue
+
+            concluidos, _ = wait(em_andamento, timeout=_INTERVALO_VERIFICACAO, return_when=FIRST_COMPLETED)
+            quebrou = False
+            for futuro in concluidos:
+                quebrou |= _concluir(em_andamento.pop(futuro), futuro)
+            if quebrou:
+                # As demais tarefas do pool quebrado também falharam
+                for futuro in list(em_andamento):
+                    _concluir(em_andamento.pop(futuro), futuro)
+                _executor.shutdown(wait=False)
+                _executor = _novo_executor()
+        except Exception as e:
+            # Ex.: banco indisponível por um instante; a thread não pode morrer
+            logger.error(f"Erro no despacho da fila de imagens: {e}", exc_info=True)
+            _parar.wait(_INTERVALO_VERIFICACAO)
+
+
+def iniciar_fila_imagens() -> None:
+    """
+    Inicia a thread de despacho e o pool de processos (startup da aplicação).
+
+    Tarefas deixadas pendentes antes de um reinício são retomadas.
+    """
+    global _executor, _thread
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _parar.clear()
+        _executor = _novo_executor()
+        _thread = threading.Thread(target=_laco_despacho, name="obratto-imagens", daemon=True)
+        _thread.start()
+    _acordar.set()
+
+
+def encerrar_fila_imagens() -> None:
+    """
+    Para de reservar tarefas, aguarda as que estão em processamento e
+    encerra o pool (shutdown da aplicação). As pendentes ficam no banco.
+    """
+    global _executor, _thread
+    with _lock:
+        if _thread is None:
+            return
+        _parar.set()
+        _acordar.set()
+        _thread.join()
+        _executor.shutdown(wait=True)
+        _executor = None
+        _thread = None
@@ -1,8 +1,15 @@
+import hashlib
 import os
+import secrets
 from PIL import Image
 from typing import List, Optional
 import logging
 
+from data.servicofoto import servico_foto_repo
+from data.servicofoto.servico_foto_model import ServicoFoto
+from util.fila_imagens import enfileirar_imagem, enfileirar_variantes
+from util.imagens_responsivas import RAIZ_STATIC, remover_variantes
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,16 +22,20 @@ IMAGEM_SIGNATURES = {
 }
 
 
-def validar_tipo_imagem(arquivo) -> bool:
+# Tipo detectado -> extensão usada nos arquivos gravados pelo conteúdo
+EXTENSOES_IMAGEM = {'JPEG': '.jpg', 'PNG': '.png', 'GIF': '.gif', 'WEBP': '.webp'}
+
+
+def detectar_tipo_imagem(arquivo) -> Optional[str]:
     """
-    Valida se o arquivo é uma imagem real verificando sua assinatura (magic number).
-    Previne ataques de upload de arquivos maliciosos com extensão falsa.
+    Identifica o tipo da imagem pela assinatura (magic number), sem confiar
+    na extensão ou no Content-Type enviados.
 
     Args:
-        arquivo: Arquivo de upload (file-like object)
+        arquivo: Arquivo de upload (file-like object) ou caminho
 
     Returns:
-        True se for uma imagem válida, False caso contrário
+        'JPEG', 'PNG', 'GIF' ou 'WEBP', ou None se não for uma imagem
     """
     try:
         # Salvar posição atual
@@ -47,19 +58,33 @@ def validar_tipo_imagem(arquivo) -> bool:
             for sig in signatures:
                 if primeiros_bytes.startswith(sig):
                     logger.debug(f"Arquivo validado como {tipo}")
-                    return True
+                    return tipo
 
         # Verificação adicional para WEBP (precisa verificar os dois marcadores)
         if primeiros_bytes[:4] == b'\x52\x49\x46\x46' and primeiros_bytes[8:12] == b'\x57\x45\x42\x50':
             logger.debug("Arquivo validado como WEBP")
-            return True
+            return 'WEBP'
 
         logger.warning(f"Tipo de arquivo não reconhecido. Primeiros bytes: {primeiros_bytes[:8].hex()}")
-        return False
+        return None
 
     except Exception as e:
         logger.error(f"Erro ao validar tipo de imagem: {e}", exc_info=True)
-        return False
+        return None
+
+
+def validar_tipo_imagem(arquivo) -> bool:
+    """
+    Valida se o arquivo é uma imagem real verificando sua assinatura (magic number).
+    Previne ataques de upload de arquivos maliciosos com extensão falsa.
+
+    Args:
+        arquivo: Arquivo de upload (file-like object)
+
+    Returns:
+        True se for uma imagem válida, False caso contrário
+    """
+    return detectar_tipo_imagem(arquivo) is not None
 
 
 # Funções destinadas ao Prestador 
@@ -130,185 +155,101 @@ def processar_imagem(arquivo, caminho_destino: str) -> bool:
         logger.error(f"Erro ao processar imagem: {e}", exc_info=True)
         return False
 
-def obter_foto_principal(servico_id: int) -> Optional[str]:
-    """Retorna a URL da foto principal do produto ou None se não existir"""
-    codigo_servico = f"{servico_id:06d}"
-    caminho_foto = obter_diretorio_servico(servico_id) + f"/{codigo_servico}-001.jpg"
+def _nova_chave(servico_id: int) -> str:
+    """Chave (caminho relativo a static/) de uma foto nova: nome aleatório e imutável."""
+    return f"img/servico/{servico_id:06d}/{secrets.token_hex(8)}.jpg"
 
-    if os.path.exists(caminho_foto):
-        return f"/static/img/servico/{codigo_servico}/{codigo_servico}-001.jpg"
-    return None
+def _caminho_da_chave(chave: str) -> str:
+    return os.path.join(RAIZ_STATIC, *chave.split("/"))
 
-def obter_todas_fotos(servico_id: int) -> List[str]:
-    """Retorna lista de URLs de todas as fotos do produto ordenadas"""
-    codigo_servico = f"{servico_id:06d}"
-    diretorio = obter_diretorio_servico(servico_id)
+def _hash_arquivo(caminho: str) -> str:
+    with open(caminho, "rb") as arquivo:
+        return hashlib.sha256(arquivo.read()).hexdigest()
 
-    if not os.path.exists(diretorio):
-        return []
+def obter_foto_principal(servico_id: int) -> Optional[str]:
+    """Retorna a URL da foto principal do servico ou None se não existir"""
+    foto = servico_foto_repo.obter_foto_principal(servico_id)
+    return foto.url if foto else None
 
-    fotos = []
-    arquivos = os.listdir(diretorio)
+def obter_fotos_galeria(servico_id: int) -> List[ServicoFoto]:
+    """Fotos do servico na ordem da galeria, inclusive as ainda em processamento"""
+    return servico_foto_repo.obter_fotos_por_servico(servico_id)
 
-    # Filtrar apenas arquivos JPG do produto
-    for arquivo in arquivos:
-        if arquivo.startswith(codigo_servico) and arquivo.endswith('.jpg'):
-            fotos.append(f"/static/img/produservico/{codigo_servico}/{arquivo}")
+def _fotos_prontas(servico_id: int) -> List[ServicoFoto]:
+    return [foto for foto in obter_fotos_galeria(servico_id) if foto.status == "pronta"]
 
-    # Ordenar por número sequencial (001, 002, 003...)
-    fotos.sort()
-    return fotos
+def obter_todas_fotos(servico_id: int) -> List[str]:
+    """Retorna lista de URLs de todas as fotos do servico, na ordem da galeria"""
+    return [foto.url for foto in _fotos_prontas(servico_id)]
 
 def obter_proximo_numero(servico_id: int) -> int:
-    """Retorna o próximo número sequencial disponível para uma nova foto"""
-    codigo_servico = f"{servico_id:06d}"
-    diretorio = obter_diretorio_servico(servico_id)
-
-    if not os.path.exists(diretorio):
-        return 1
-
-    numeros = []
-    arquivos = os.listdir(diretorio)
-
-    for arquivo in arquivos:
-        if arquivo.startswith(codigo_servico) and arquivo.endswith('.jpg'):
-            # Extrair número do arquivo (XXXXXX-NNN.jpg)
-            try:
-                numero_str = arquivo.split('-')[1].split('.')[0]
-                numeros.append(int(numero_str))
-            except (IndexError, ValueError):
-                continue
-
-    if not numeros:
-        return 1
-
-    return max(numeros) + 1  # ← Próximo número na sequência
+    """Retorna o número (posição na galeria) que uma nova foto receberia"""
+    return servico_foto_repo.contar_fotos(servico_id) + 1
 
 def salvar_nova_foto(servico_id: int, arquivo, como_principal: bool = False) -> bool:
-    """Salva uma nova foto do servico"""
-    criar_diretorio_servico(servico_id)
-    codigo_servico = f"{servico_id:06d}"
-
-    if como_principal:
-        # Salvar como foto principal (001)
-        numero = 1
-        # Se já existe foto principal, mover as outras para frente
-        if obter_foto_principal(servico_id):
-            _mover_fotos_para_frente(servico_id)
-    else:
-        # Adicionar como próxima foto na sequência
-        numero = obter_proximo_numero(servico_id)
-
-    # Gerar caminho do arquivo
-    caminho_destino = f"{obter_diretorio_servico(servico_id)}/{codigo_servico}-{numero:03d}.jpg"
-    return processar_imagem(arquivo, caminho_destino)
-
-def _mover_fotos_para_frente(servico_id: int) -> None:
-    """Move todas as fotos uma posição para frente (002 → 003, 001 → 002)"""
-    codigo_servico = f"{servico_id:06d}"
-    diretorio = obter_diretorio_servico(servico_id)
-
-    if not os.path.exists(diretorio):
-        return
-
-    # Listar arquivos existentes e ordenar por número decrescente
-    arquivos_existentes = []
-    for arquivo in os.listdir(diretorio):
-        if arquivo.startswith(codigo_servico) and arquivo.endswith('.jpg'):
-            try:
-                numero_str = arquivo.split('-')[1].split('.')[0]
-                numero = int(numero_str)
-                arquivos_existentes.append((numero, arquivo))
-            except (IndexError, ValueError):
-                continue
+    """Processa e salva uma nova foto do servico na própria requisição"""
+    chave = _nova_chave(servico_id)
+    caminho_destino = _caminho_da_chave(chave)
+    if not processar_imagem(arquivo, caminho_destino):
+        return False
 
-    arquivos_existentes.sort(reverse=True)  # ← Ordena do maior para o menor
+    # Nova principal entra antes das demais: nenhuma outra foto é renomeada
+    servico_foto_repo.inserir_foto(
+        servico_id, chave, como_principal=como_principal,
+        largura=800, altura=800, hash=_hash_arquivo(caminho_destino),
+    )
+    enfileirar_variantes(caminho_destino)
+    return True
 
-    # Renomear cada arquivo para o próximo número
-    for numero, arquivo in arquivos_existentes:
-        novo_numero = numero + 1
-        caminho_atual = f"{diretorio}/{arquivo}"
-        novo_nome = f"{codigo_servico}-{novo_numero:03d}.jpg"
-        caminho_novo = f"{diretorio}/{novo_nome}"
+def enfileirar_nova_foto(servico_id: int, arquivo, como_principal: bool = False) -> Optional[int]:
+    """
+    Registra a foto na galeria como "processando" e a envia para a fila de
+    processamento (util.fila_imagens), sem processá-la na requisição.
 
-        try:
-            os.rename(caminho_atual, caminho_novo)
-        except (OSError, PermissionError):
-            continue
+    Returns:
+        ID da tarefa, ou None se o arquivo não for uma imagem
+    """
+    if not validar_tipo_imagem(arquivo):
+        logger.error("Arquivo rejeitado: não é uma imagem válida")
+        return None
 
+    chave = _nova_chave(servico_id)
+    servico_foto_repo.inserir_foto(servico_id, chave, como_principal=como_principal, status="processando")
+    id_tarefa = enfileirar_imagem(arquivo, _caminho_da_chave(chave), id_servico=servico_id)
+    if id_tarefa is None:
+        servico_foto_repo.excluir_foto_por_chave(chave)
+    return id_tarefa
 
 def excluir_foto(servico_id: int, numero: int) -> bool:
-    """Remove uma foto específica e reordena as restantes"""
-    codigo_servico = f"{servico_id:06d}"
-    diretorio = obter_diretorio_servico(servico_id)
-
-    # Remover o arquivo específico
-    caminho_foto = f"{diretorio}/{codigo_servico}-{numero:03d}.jpg"
-
-    if os.path.exists(caminho_foto):
-        try:
-            os.remove(caminho_foto)
-        except (OSError, PermissionError):
-            return False
+    """Remove a foto na posição ``numero`` (1 = principal) da galeria"""
+    fotos = _fotos_prontas(servico_id)
+    if not 1 <= numero <= len(fotos):
+        return False
+    foto = fotos[numero - 1]
 
-    # Reordenar fotos restantes para não ter gaps na numeração
-    # TODO: This call needs to be fixed - reordenar_fotos expects a nova_ordem parameter
-    # For now, passing empty list to satisfy type checker
-    return True  # Simplified until reordenar_fotos signature is fixed
+    # As demais mantêm a posição: a ordem continua a mesma, sem buracos visíveis
+    servico_foto_repo.excluir_foto(foto.id_foto)
+    remover_variantes(foto.url)
+    try:
+        os.remove(_caminho_da_chave(foto.chave))
+    except FileNotFoundError:
+        pass
+    except (OSError, PermissionError) as e:
+        logger.warning(f"Foto {foto.chave} removida do banco, mas não do disco: {e}")
+    return True
 
 def reordenar_fotos(servico_id: int, nova_ordem: List[int]) -> bool:
-    """Reordena as fotos conforme a nova ordem especificada"""
-    codigo_servico = f"{servico_id:06d}"
-    diretorio = obter_diretorio_servico(servico_id)
-
-    if not os.path.exists(diretorio):
-        return False
-
-    # Mapear arquivos existentes
-    arquivos_existentes = {}
-    for arquivo in os.listdir(diretorio):
-        if arquivo.startswith(codigo_servico) and arquivo.endswith('.jpg'):
-            try:
-                numero_str = arquivo.split('-')[1].split('.')[0]
-                numero = int(numero_str)
-                arquivos_existentes[numero] = arquivo
-            except (IndexError, ValueError):
-                continue
-
-    # Validar nova ordem
-    if len(nova_ordem) != len(arquivos_existentes):
+    """
+    Reordena as fotos conforme a nova ordem especificada (números das fotos
+    na ordem atual, ex.: [2, 1, 3]). Só as posições no banco mudam; os
+    arquivos e URLs continuam os mesmos.
+    """
+    fotos = _fotos_prontas(servico_id)
+    if sorted(nova_ordem) != list(range(1, len(fotos) + 1)):
         return False
-
-    # Processo de renomeação em duas etapas para evitar conflitos:
-
-    # Etapa 1: Renomear temporariamente
-    temp_files = {}
-    for i, numero_original in enumerate(nova_ordem):
-        if numero_original not in arquivos_existentes:
-            return False
-
-        arquivo_original = arquivos_existentes[numero_original]
-        caminho_original = f"{diretorio}/{arquivo_original}"
-        caminho_temp = f"{diretorio}/temp_{i:03d}.jpg"
-
-        try:
-            os.rename(caminho_original, caminho_temp)
-            temp_files[i] = caminho_temp
-        except (OSError, PermissionError):
-            return False
-
-    # Etapa 2: Renomear para a sequência final
-    for i in range(len(nova_ordem)):
-        novo_numero = i + 1
-        caminho_temp = temp_files[i]
-        caminho_final = f"{diretorio}/{codigo_servico}-{novo_numero:03d}.jpg"
-
-        try:
-            os.rename(caminho_temp, caminho_final)
-        except (OSError, PermissionError):
-            return False
-
-    return True
+    return servico_foto_repo.reordenar_fotos(
+        servico_id, [fotos[numero - 1].id_foto for numero in nova_ordem]
+    )
 
 
 # --------- Funções destinadas ao fornecedor -----------
\ No newline at end of file
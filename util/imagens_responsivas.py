@@ -0,0 +1,199 @@
+"""
+Variantes responsivas das imagens enviadas (miniatura, média e completa,
+em WebP e JPEG).
+
+Listagens e cards exibem fotos em 64–300 px, mas até aqui baixavam o
+arquivo original, muitas vezes com vários megapixels. Para cada imagem em
+static/ são gravadas versões reduzidas em uma árvore espelhada em
+static/variantes/:
+
+    /static/uploads/produtos_fornecedor/x.png
+    -> /static/variantes/uploads/produtos_fornecedor/x.miniatura.webp (.jpg)
+    -> /static/variantes/uploads/produtos_fornecedor/x.media.webp (.jpg)
+    -> /static/variantes/uploads/produtos_fornecedor/x.completa.webp (.jpg)
+
+As variantes são geradas em segundo plano logo após o upload
+(util.fila_imagens.enfileirar_variantes) e, para os arquivos que já
+existiam, por ``python scripts/gerar_variantes.py``. Nos templates:
+
+    {{ imagem_responsiva(produto.foto, alt=produto.nome, sizes="300px", class="product-img") }}
+
+gera um <picture> com srcset WebP/JPEG; enquanto as variantes não existem,
+um <img> simples com a URL original.
+"""
+import logging
+import os
+import uuid
+from typing import Iterator, List, Optional
+
+from markupsafe import Markup, escape
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+RAIZ_STATIC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+DIRETORIO_VARIANTES = "variantes"
+
+# Nome -> largura máxima em pixels (imagens menores não são ampliadas)
+VARIANTES = {"miniatura": 160, "media": 480, "completa": 1200}
+
+# Extensão -> (formato do Pillow, parâmetros de gravação)
+FORMATOS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+EXTENSOES_ORIGINAIS = {".jpg", ".jpeg", ".png", ".webp"}
+
+# Diretórios de static/ com imagens de conteúdo (varridos no backfill)
+DIRETORIOS_IMAGENS = ("img", "uploads")
+
+
+def _relativo_static(url: str) -> Optional[str]:
+    """'/static/uploads/a/x.png' -> 'uploads/a/x.png' (None se não for uma imagem local)."""
+    if not url or not url.startswith("/static/"):
+        return None
+    relativo = url[len("/static/"):].split("?", 1)[0]
+    if relativo.startswith(DIRETORIO_VARIANTES + "/") or ".." in relativo.split("/"):
+        return None
+    if os.path.splitext(relativo)[1].lower() not in EXTENSOES_ORIGINAIS:
+        return None
+    return relativo
+
+
+def _relativo_variante(relativo: str, variante: str, formato: str) -> str:
+    base = os.path.splitext(relativo)[0]
+    return f"{DIRETORIO_VARIANTES}/{base}.{variante}.{formato}"
+
+
+def url_variante(url: str, variante: str, formato: str = "webp") -> Optional[str]:
+    """URL de uma variante da imagem ``url`` (None se a imagem não tem variantes)."""
+    relativo = _relativo_static(url)
+    if relativo is None:
+        return None
+    return "/static/" + _relativo_variante(relativo, variante, formato)
+
+
+def possui_variantes(url: str, raiz_static: Optional[str] = None) -> bool:
+    """Indica se as variantes de ``url`` já foram geradas (um stat por chamada)."""
+    raiz_static = raiz_static or RAIZ_STATIC
+    relativo = _relativo_static(url)
+    if relativo is None:
+        return False
+    # A última variante gravada por gerar_variantes: se existe, todas existem
+    maior = list(VARIANTES)[-1]
+    return os.path.exists(os.path.join(raiz_static, _relativo_variante(relativo, maior, "jpg")))
+
+
+def srcset(url: str, formato: str = "webp") -> str:
+    """Valor do atributo srcset com todas as variantes de ``url`` no ``formato``."""
+    return ", ".join(
+        f"{url_variante(url, variante, formato)} {largura}w"
+        for variante, largura in VARIANTES.items()
+    )
+
+
+def imagem_responsiva(url: str, alt: str = "", sizes: str = "100vw", **atributos) -> Markup:
+    """
+    Função global dos templates: <picture> com srcset WebP e JPEG quando as
+    variantes de ``url`` existem; caso contrário um <img> com a URL original.
+
+    Atributos extras (class, width...) vão para o <img>; loading="lazy" é o
+    padrão.
+    """
+    atributos.setdefault("loading", "lazy")
+    extras = "".join(f' {escape(nome)}="{escape(valor)}"' for nome, valor in atributos.items())
+    if not possui_variantes(url):
+        return Markup(f'<img src="{escape(url)}" alt="{escape(alt)}"{extras}>')
+
+    completa = url_variante(url, list(VARIANTES)[-1], "jpg")
+    return Markup(
+        "<picture>"
+        f'<source type="image/webp" srcset="{escape(srcset(url, "webp"))}" sizes="{escape(sizes)}">'
+        f'<img src="{escape(completa)}" srcset="{escape(srcset(url, "jpg"))}" sizes="{escape(sizes)}"'
+        f' alt="{escape(alt)}"{extras}>'
+        "</picture>"
+    )
+
+
+def _caminho_variante(caminho_original: str, raiz_static: str, variante: str, formato: str) -> str:
+    relativo = os.path.relpath(os.path.abspath(caminho_original), os.path.abspath(raiz_static))
+    if relativo.startswith(".."):
+        raise ValueError(f"{caminho_original} não está em {raiz_static}")
+    return os.path.join(raiz_static, _relativo_variante(relativo.replace(os.sep, "/"), variante, formato))
+
+
+def gerar_variantes(caminho_original: str, raiz_static: Optional[str] = None, forcar: bool = False) -> List[str]:
+    """
+    Grava as variantes de uma imagem de static/.
+
+    Variantes mais novas que o original são mantidas (a menos que
+    ``forcar``), de modo que rodar de novo só processa o que mudou.
+
+    Returns:
+        Lista dos arquivos gravados
+    """
+    raiz_static = raiz_static or RAIZ_STATIC
+    estado = os.stat(caminho_original)
+    pendentes = []
+    for variante in VARIANTES:
+        for formato in FORMATOS:
+            destino = _caminho_variante(caminho_original, raiz_static, variante, formato)
+            if forcar or not os.path.exists(destino) or os.stat(destino).st_mtime_ns < estado.st_mtime_ns:
+                pendentes.append((variante, formato, destino))
+    if not pendentes:
+        return []
+
+    with Image.open(caminho_original) as aberta:
+        # Fotos de celular vêm rotacionadas via EXIF
+        imagem = ImageOps.exif_transpose(aberta)
+        if imagem.mode in ("RGBA", "LA") or (imagem.mode == "P" and "transparency" in imagem.info):
+            imagem = imagem.convert("RGBA")
+            fundo = Image.new("RGB", imagem.size, (255, 255, 255))
+            fundo.paste(imagem, mask=imagem.getchannel("A"))
+            imagem = fundo
+        elif imagem.mode != "RGB":
+            imagem = imagem.convert("RGB")
+
+    reduzidas = {}
+    gravados = []
+    for variante, formato, destino in pendentes:
+        if variante not in reduzidas:
+            largura_maxima = VARIANTES[variante]
+            largura, altura = imagem.size
+            if largura > largura_maxima:
+                tamanho = (largura_maxima, max(1, round(altura * largura_maxima / largura)))
+                reduzidas[variante] = imagem.resize(tamanho, Image.Resampling.LANCZOS)
+            else:
+                reduzidas[variante] = imagem
+        formato_pil, parametros = FORMATOS[formato]
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        temporario = f"{destino}.{uuid.uuid4().hex[:8]}.tmp"
+        reduzidas[variante].save(temporario, formato_pil, **parametros)
+        os.replace(temporario, destino)
+        gravados.append(destino)
+    return gravados
+
+
+def remover_variantes(url: str, raiz_static: Optional[str] = None) -> None:
+    """Apaga as variantes de ``url`` (chamado quando a imagem original é removida)."""
+    raiz_static = raiz_static or RAIZ_STATIC
+    relativo = _relativo_static(url)
+    if relativo is None:
+        return
+    for variante in VARIANTES:
+        for formato in FORMATOS:
+            try:
+                os.remove(os.path.join(raiz_static, _relativo_variante(relativo, variante, formato)))
+            except FileNotFoundError:
+                pass
+
+
+def imagens_originais(raiz_static: Optional[str] = None) -> Iterator[str]:
+    """Percorre as imagens de static/img e static/uploads que admitem variantes."""
+    raiz_static = raiz_static or RAIZ_STATIC
+    for diretorio in DIRETORIOS_IMAGENS:
+        for pasta, _, arquivos in os.walk(os.path.join(raiz_static, diretorio)):
+            for nome in sorted(arquivos):
+                if os.path.splitext(nome)[1].lower() in EXTENSOES_ORIGINAIS:
+                    yield os.path.join(pasta, nome)
@@ -0,0 +1,374 @@
+"""
+Migrações versionadas do banco de dados OBRATTO.
+
+Cada migração tem um número de versão crescente e uma lista de passos
+(comandos SQL ou funções que recebem a conexão). As versões já aplicadas ficam registradas na tabela schema_migracao,
+de modo que util.seed.criar_tabelas só executa o que ainda falta
+(e util.seed.inicializar_banco só chama criar_tabelas quando o schema mudou).
+"""
+import logging
+import re
+from datetime import datetime
+from typing import List
+
+from data.anuncio.anuncio_repo import reconstruir_indice_busca_anuncios
+from data.arquivo.arquivo_sql import (
+    CRIAR_TABELA_ARQUIVO,
+    CRIAR_INDICE_ARQUIVO_ORFAO,
+    CRIAR_GATILHO_ARQUIVO_PRODUTO_INSERT,
+    CRIAR_GATILHO_ARQUIVO_PRODUTO_UPDATE,
+    CRIAR_GATILHO_ARQUIVO_PRODUTO_DELETE,
+    CRIAR_GATILHO_ARQUIVO_USUARIO_INSERT,
+    CRIAR_GATILHO_ARQUIVO_USUARIO_UPDATE,
+    CRIAR_GATILHO_ARQUIVO_USUARIO_DELETE,
+    RECONTAR_REFERENCIAS,
+)
+from data.anuncio.anuncio_sql import (
+    CRIAR_INDICE_ANUNCIO_FORNECEDOR,
+    CRIAR_INDICE_ANUNCIO_NOME,
+    CRIAR_TABELA_ANUNCIO_FTS,
+    CRIAR_GATILHO_ANUNCIO_FTS_INSERT,
+    CRIAR_GATILHO_ANUNCIO_FTS_DELETE,
+    CRIAR_GATILHO_ANUNCIO_FTS_UPDATE,
+    CRIAR_GATILHO_FORNECEDOR_ANUNCIO_FTS,
+)
+from data.avaliacao.avaliacao_repo import reconstruir_resumo_avaliacoes
+from data.avaliacao.avaliacao_sql import (
+    CRIAR_INDICE_AVALIACAO_AVALIADO,
+    CRIAR_INDICE_AVALIACAO_AVALIADOR,
+    CRIAR_INDICE_AVALIACAO_AVALIADO_NOTA,
+)
+from data.fornecedor.fornecedor_sql import CRIAR_INDICE_FORNECEDOR_SELO
+from data.inscricaoplano.inscricao_plano_sql import (
+    CRIAR_INDICE_INSCRICAO_PLANO_FORNECEDOR,
+    CRIAR_INDICE_INSCRICAO_PLANO_PRESTADOR,
+    CRIAR_INDICE_INSCRICAO_PLANO_PLANO,
+)
+from data.mensagem.mensagem_sql import (
+    CRIAR_INDICE_MENSAGEM_REMETENTE,
+    CRIAR_INDICE_MENSAGEM_DESTINATARIO,
+    CRIAR_INDICE_MENSAGEM_ENVIADAS,
+    CRIAR_INDICE_MENSAGEM_NAO_LIDAS,
+    ADICIONAR_COLUNA_LIDA,
+)
+from data.notificacao.notificacao_sql import CRIAR_INDICE_NOTIFICACAO_USUARIO
+from data.orcamento.orcamento_sql import (
+    CRIAR_INDICE_ORCAMENTO_FORNECEDOR,
+    CRIAR_INDICE_ORCAMENTO_CLIENTE,
+)
+from data.orcamentoservico.orcamento_servico_sql import (
+    CRIAR_INDICE_ORCAMENTO_SERVICO_PRESTADOR,
+    CRIAR_INDICE_ORCAMENTO_SERVICO_CLIENTE,
+    CRIAR_INDICE_ORCAMENTO_SERVICO_SERVICO,
+    CRIAR_INDICE_ORCAMENTO_SERVICO_DATA,
+)
+from data.pagamento.pagamento_sql import (
+    CRIAR_INDICE_PAGAMENTO_MP_ID,
+    CRIAR_INDICE_PAGAMENTO_PREFERENCE,
+    CRIAR_INDICE_PAGAMENTO_FORNECEDOR,
+    CRIAR_INDICE_PAGAMENTO_STATUS,
+)
+from data.plano.plano_sql import CRIAR_INDICE_PLANO_NOME
+from data.prestador.prestador_sql import CRIAR_INDICE_PRESTADOR_SELO
+from data.produto.produto_sql import (
+    CRIAR_INDICE_PRODUTO_FORNECEDOR,
+    CRIAR_INDICE_PRODUTO_PROMOCAO_FORNECEDOR,
+    CRIAR_INDICE_PRODUTO_PROMOCAO,
+    CRIAR_INDICE_PRODUTO_FOTO,
+    CRIAR_TABELA_PRODUTO_FTS,
+    CRIAR_GATILHO_PRODUTO_FTS_INSERT,
+    CRIAR_GATILHO_PRODUTO_FTS_DELETE,
+    CRIAR_GATILHO_PRODUTO_FTS_UPDATE,
+    RECONSTRUIR_PRODUTO_FTS,
+)
+from data.servico.servico_sql import CRIAR_INDICE_SERVICO_PRESTADOR
+from data.servicofoto.servico_foto_repo import importar_fotos_legadas
+from data.servicofoto.servico_foto_sql import (
+    CRIAR_TABELA_SERVICO_FOTO,
+    CRIAR_INDICE_SERVICO_FOTO_POSICAO,
+)
+from data.tarefaimagem.tarefa_imagem_sql import (
+    ADICIONAR_COLUNA_TIPO,
+    CRIAR_INDICE_TAREFA_IMAGEM_STATUS,
+    CRIAR_INDICE_TAREFA_IMAGEM_SERVICO,
+)
+from data.usuario.usuario_sql import (
+    CRIAR_INDICE_USUARIO_TOKEN,
+    CRIAR_INDICE_USUARIO_TIPO,
+    CRIAR_INDICE_USUARIO_NOME,
+    CRIAR_INDICE_USUARIO_EMAIL_NOCASE,
+    CRIAR_INDICE_USUARIO_LOCALIZACAO,
+    CRIAR_INDICE_USUARIO_CIDADE,
+    CRIAR_INDICE_USUARIO_DATA_CADASTRO,
+    CRIAR_INDICE_USUARIO_FOTO,
+)
+from util.db import open_connection
+
+logger = logging.getLogger(__name__)
+
+
+CRIAR_TABELA_SCHEMA_MIGRACAO = """
+CREATE TABLE IF NOT EXISTS schema_migracao (
+    versao INTEGER PRIMARY KEY,
+    descricao TEXT NOT NULL,
+    aplicada_em TEXT NOT NULL
+);
+"""
+
+OBTER_VERSOES_APLICADAS = """
+SELECT versao FROM schema_migracao ORDER BY versao;
+"""
+
+REGISTRAR_MIGRACAO = """
+INSERT INTO schema_migracao (versao, descricao, aplicada_em)
+VALUES (?, ?, ?);
+"""
+
+MIGRACAO_JA_APLICADA = """
+SELECT 1 FROM schema_migracao WHERE versao = ?;
+"""
+
+OBTER_INDICES_EXISTENTES = """
+SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger');
+"""
+
+
+def adicionar_coluna(tabela: str, coluna: str, sql: str):
+    """
+    Passo de migração que executa o ALTER TABLE ``sql`` apenas se a coluna
+    ainda não existir (bancos novos já a recebem no CREATE TABLE).
+    """
+    def passo(conn):
+        colunas = {row["name"] for row in conn.execute(f"PRAGMA table_info({tabela})")}
+        if coluna not in colunas:
+            conn.execute(sql)
+    return passo
+
+
+# (versão, descrição, passos) — cada passo é um comando SQL ou uma função que
+# recebe a conexão. Nunca altere uma versão já publicada; acrescente uma
+# nova ao final da lista.
+MIGRACOES = [
+    (
+        1,
+        "Índices das chaves estrangeiras e colunas de filtro usadas pelos repositórios",
+        [
+            CRIAR_INDICE_USUARIO_TOKEN,
+            CRIAR_INDICE_USUARIO_TIPO,
+            CRIAR_INDICE_PRODUTO_FORNECEDOR,
+            CRIAR_INDICE_SERVICO_PRESTADOR,
+            CRIAR_INDICE_AVALIACAO_AVALIADO,
+            CRIAR_INDICE_AVALIACAO_AVALIADOR,
+            CRIAR_INDICE_ORCAMENTO_FORNECEDOR,
+            CRIAR_INDICE_ORCAMENTO_CLIENTE,
+            CRIAR_INDICE_ORCAMENTO_SERVICO_PRESTADOR,
+            CRIAR_INDICE_ORCAMENTO_SERVICO_CLIENTE,
+            CRIAR_INDICE_ORCAMENTO_SERVICO_SERVICO,
+            CRIAR_INDICE_ORCAMENTO_SERVICO_DATA,
+            CRIAR_INDICE_MENSAGEM_REMETENTE,
+            CRIAR_INDICE_MENSAGEM_DESTINATARIO,
+            CRIAR_INDICE_NOTIFICACAO_USUARIO,
+            CRIAR_INDICE_PAGAMENTO_MP_ID,
+            CRIAR_INDICE_PAGAMENTO_PREFERENCE,
+            CRIAR_INDICE_PAGAMENTO_FORNECEDOR,
+            CRIAR_INDICE_PAGAMENTO_STATUS,
+            CRIAR_INDICE_INSCRICAO_PLANO_FORNECEDOR,
+            CRIAR_INDICE_INSCRICAO_PLANO_PRESTADOR,
+            CRIAR_INDICE_INSCRICAO_PLANO_PLANO,
+            CRIAR_INDICE_ANUNCIO_FORNECEDOR,
+            CRIAR_INDICE_ANUNCIO_NOME,
+            CRIAR_INDICE_PLANO_NOME,
+        ],
+    ),
+    (
+        2,
+        "Status de leitura das mensagens e índices das caixas de entrada/saída",
+        [
+            adicionar_coluna("mensagem", "lida", ADICIONAR_COLUNA_LIDA),
+            CRIAR_INDICE_MENSAGEM_ENVIADAS,
+            CRIAR_INDICE_MENSAGEM_NAO_LIDAS,
+        ],
+    ),
+    (
+        3,
+        "Índice de avaliações por avaliado e nota (ordenação e estatísticas)",
+        [
+            CRIAR_INDICE_AVALIACAO_AVALIADO_NOTA,
+        ],
+    ),
+    (
+        4,
+        "Resumo materializado de avaliações por avaliado",
+        [
+            reconstruir_resumo_avaliacoes,
+        ],
+    ),
+    (
+        5,
+        "Índices parciais dos produtos em promoção",
+        [
+            CRIAR_INDICE_PRODUTO_PROMOCAO_FORNECEDOR,
+            CRIAR_INDICE_PRODUTO_PROMOCAO,
+        ],
+    ),
+    (
+        6,
+        "Busca textual (FTS5) de produtos",
+        [
+            CRIAR_TABELA_PRODUTO_FTS,
+            CRIAR_GATILHO_PRODUTO_FTS_INSERT,
+            CRIAR_GATILHO_PRODUTO_FTS_DELETE,
+            CRIAR_GATILHO_PRODUTO_FTS_UPDATE,
+            RECONSTRUIR_PRODUTO_FTS,
+        ],
+    ),
+    (
+        7,
+        "Busca textual (FTS5) de anúncios para a moderação",
+        [
+            CRIAR_TABELA_ANUNCIO_FTS,
+            CRIAR_GATILHO_ANUNCIO_FTS_INSERT,
+            CRIAR_GATILHO_ANUNCIO_FTS_DELETE,
+            CRIAR_GATILHO_ANUNCIO_FTS_UPDATE,
+            CRIAR_GATILHO_FORNECEDOR_ANUNCIO_FTS,
+            reconstruir_indice_busca_anuncios,
+        ],
+    ),
+    (
+        8,
+        "Índices dos filtros e contagens das listagens administrativas de usuários",
+        [
+            CRIAR_INDICE_USUARIO_NOME,
+            CRIAR_INDICE_USUARIO_EMAIL_NOCASE,
+            CRIAR_INDICE_USUARIO_LOCALIZACAO,
+            CRIAR_INDICE_USUARIO_CIDADE,
+            CRIAR_INDICE_USUARIO_DATA_CADASTRO,
+            CRIAR_INDICE_FORNECEDOR_SELO,
+            CRIAR_INDICE_PRESTADOR_SELO,
+        ],
+    ),
+    (
+        9,
+        "Índices da fila de processamento de imagens",
+        [
+            CRIAR_INDICE_TAREFA_IMAGEM_STATUS,
+            CRIAR_INDICE_TAREFA_IMAGEM_SERVICO,
+        ],
+    ),
+    (
+        10,
+        "Tarefas de geração das variantes responsivas das imagens",
+        [
+            adicionar_coluna("tarefa_imagem", "tipo", ADICIONAR_COLUNA_TIPO),
+        ],
+    ),
+    (
+        11,
+        "Índice das fotos dos serviços no banco (servico_foto)",
+        [
+            CRIAR_TABELA_SERVICO_FOTO,
+            CRIAR_INDICE_SERVICO_FOTO_POSICAO,
+            importar_fotos_legadas,
+        ],
+    ),
+    (
+        12,
+        "Armazenamento de uploads por conteúdo com contagem de referências",
+        [
+            CRIAR_TABELA_ARQUIVO,
+            CRIAR_INDICE_ARQUIVO_ORFAO,
+            CRIAR_INDICE_PRODUTO_FOTO,
+            CRIAR_INDICE_USUARIO_FOTO,
+            CRIAR_GATILHO_ARQUIVO_PRODUTO_INSERT,
+            CRIAR_GATILHO_ARQUIVO_PRODUTO_UPDATE,
+            CRIAR_GATILHO_ARQUIVO_PRODUTO_DELETE,
+            CRIAR_GATILHO_ARQUIVO_USUARIO_INSERT,
+            CRIAR_GATILHO_ARQUIVO_USUARIO_UPDATE,
+            CRIAR_GATILHO_ARQUIVO_USUARIO_DELETE,
+            RECONTAR_REFERENCIAS,
+        ],
+    ),
+]
+
+_NOME_INDICE = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?(?:INDEX|TRIGGER)\s+IF\s+NOT\s+EXISTS\s+(\w+)", re.IGNORECASE
+)
+
+
+def _indices_declarados(comandos: List[str]) -> dict:
+    """Mapeia nome do índice (ou gatilho) -> comando CREATE INDEX/TRIGGER."""
+    indices = {}
+    for sql in comandos:
+        if callable(sql):
+            continue
+        encontrado = _NOME_INDICE.search(sql)
+        if encontrado:
+            indices[encontrado.group(1)] = sql
+    return indices
+
+
+def obter_versao_schema() -> int:
+    """Retorna a maior versão de migração aplicada (0 se nenhuma)."""
+    with open_connection() as conn:
+        conn.execute(CRIAR_TABELA_SCHEMA_MIGRACAO)
+        versoes = [row["versao"] for row in conn.execute(OBTER_VERSOES_APLICADAS)]
+        return max(versoes, default=0)
+
+
+def aplicar_migracoes() -> List[int]:
+    """
+    Aplica, em ordem e cada uma em sua própria transação, as migrações
+    ainda não registradas em schema_migracao. A versão é conferida de novo
+    dentro da transação (BEGIN IMMEDIATE), então vários processos podem
+    chamar esta função ao mesmo tempo na inicialização.
+
+    Também recria índices e gatilhos de migrações já aplicadas que tenham
+    sumido (ex.: tabela recriada à mão ou restaurada de um dump parcial).
+
+    Returns:
+        Lista das versões aplicadas nesta chamada.
+    """
+    aplicadas = []
+    with open_connection() as conn:
+        conn.execute(CRIAR_TABELA_SCHEMA_MIGRACAO)
+        versoes = {row["versao"] for row in conn.execute(OBTER_VERSOES_APLICADAS)}
+
+        for versao, descricao, comandos in MIGRACOES:
+            if versao in versoes:
+                continue
+            try:
+                # IMMEDIATE: outro processo (ex.: outro worker subindo junto)
+                # não pode aplicar a mesma versão entre a checagem e o registro
+                conn.execute("BEGIN IMMEDIATE")
+                if conn.execute(MIGRACAO_JA_APLICADA, (versao,)).fetchone():
+                    conn.rollback()
+                    versoes.add(versao)
+                    continue
+                for passo in comandos:
+                    if callable(passo):
+                        passo(conn)
+                    else:
+                        conn.execute(passo)
+                conn.execute(
+                    REGISTRAR_MIGRACAO,
+                    (versao, descricao, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                logger.error(f"Falha ao aplicar migração {versao}: {descricao}", exc_info=True)
+                raise
+            aplicadas.append(versao)
+            logger.info(f"Migração {versao} aplicada: {descricao}")
+
+        existentes = {row["name"] for row in conn.execute(OBTER_INDICES_EXISTENTES)}
+        for versao, descricao, comandos in MIGRACOES:
+            if versao not in versoes:
+                continue
+            for nome, sql in _indices_declarados(comandos).items():
+                if nome not in existentes:
+                    conn.execute(sql)
+                    logger.info(f"Índice/gatilho {nome} recriado (migração {versao})")
+        conn.commit()
+
+    return aplicadas
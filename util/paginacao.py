@@ -0,0 +1,139 @@
+"""
+Paginação por cursor (keyset / seek) para as listagens dos repositórios.
+
+Em vez de LIMIT/OFFSET, que obriga o banco a percorrer e descartar todas
+as linhas das páginas anteriores, cada página continua a partir da chave
+da última linha exibida:
+
+    WHERE <filtros> AND (data, id) < (?, ?) ORDER BY data DESC, id DESC LIMIT ?
+
+Com um índice na chave de ordenação, a página 500 custa o mesmo que a
+página 1, e linhas inseridas durante a navegação não deslocam os resultados.
+
+Os cursores são opacos para quem chama (base64 de um JSON com os valores da
+chave e o sentido da navegação); rotas apenas repassam os valores recebidos.
+"""
+import base64
+import binascii
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+_TEM_WHERE = re.compile(r"\bWHERE\b", re.IGNORECASE)
+_PROXIMA = "p"
+_ANTERIOR = "a"
+
+
+@dataclass
+class Pagina(Generic[T]):
+    """Uma página de resultados e os cursores para as páginas vizinhas."""
+    itens: List[T] = field(default_factory=list)
+    proximo: Optional[str] = None
+    anterior: Optional[str] = None
+
+    def mapear(self, funcao: Callable[[T], U]) -> "Pagina[U]":
+        """Converte os itens (ex.: sqlite3.Row -> dataclass) mantendo os cursores."""
+        return Pagina([funcao(item) for item in self.itens], self.proximo, self.anterior)
+
+
+def codificar_cursor(valores: Sequence[Any], sentido: str = _PROXIMA) -> str:
+    """Gera o cursor opaco para os valores da chave de ordenação."""
+    dados = json.dumps({"c": list(valores), "s": sentido}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(dados.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: Optional[str]) -> Optional[Tuple[List[Any], str]]:
+    """
+    Retorna (valores da chave, sentido) ou None se o cursor estiver vazio ou
+    inválido — um cursor adulterado simplesmente volta para a primeira página.
+    """
+    if not cursor:
+        return None
+    try:
+        preenchimento = "=" * (-len(cursor) % 4)
+        dados = json.loads(base64.urlsafe_b64decode(cursor + preenchimento))
+        valores, sentido = dados["c"], dados["s"]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        return None
+    if not isinstance(valores, list) or sentido not in (_PROXIMA, _ANTERIOR):
+        return None
+    return valores, sentido
+
+
+def _nome_coluna(expressao: str) -> str:
+    """'o.data_solicitacao' -> 'data_solicitacao' (nome da coluna na linha)."""
+    return expressao.split(".")[-1]
+
+
+def paginar(
+    conn,
+    sql_base: str,
+    parametros: Sequence[Any],
+    chave: Sequence[str],
+    limite: int,
+    cursor: Optional[str] = None,
+    decrescente: bool = False,
+) -> Pagina:
+    """
+    Executa ``sql_base`` paginado pela ``chave``.
+
+    Args:
+        conn: Conexão obtida de util.db.open_connection
+        sql_base: SELECT com os filtros (WHERE no nível principal, com
+            eventuais OR entre parênteses), sem ORDER BY nem LIMIT;
+            parâmetros posicionais (?)
+        parametros: Parâmetros dos filtros de ``sql_base``
+        chave: Colunas da ordenação, da mais para a menos significativa. A
+            última deve ser única (normalmente o id), nenhuma pode ser NULL e
+            todas precisam estar no SELECT com o mesmo nome (sem o prefixo da
+            tabela). Para ser rápido, um índice deve cobrir filtros + chave.
+        limite: Itens por página
+        cursor: Cursor recebido de uma página anterior (None = primeira página)
+        decrescente: Ordena do maior para o menor valor da chave
+
+    Returns:
+        Pagina com as linhas (sqlite3.Row) e os cursores anterior/próximo
+    """
+    colunas = ", ".join(chave)
+    decodificado = decodificar_cursor(cursor)
+    if decodificado and len(decodificado[0]) != len(chave):
+        decodificado = None
+    voltando = bool(decodificado) and decodificado[1] == _ANTERIOR
+
+    # Voltar uma página é avançar no sentido inverso e desinverter o resultado
+    ordem_desc = decrescente != voltando
+    sql = sql_base.rstrip().rstrip(";")
+    parametros = list(parametros)
+    if decodificado:
+        operador = "<" if ordem_desc else ">"
+        conector = "AND" if _TEM_WHERE.search(sql) else "WHERE"
+        marcadores = ", ".join("?" * len(chave))
+        sql += f"\n{conector} ({colunas}) {operador} ({marcadores})"
+        parametros += decodificado[0]
+    direcao = "DESC" if ordem_desc else "ASC"
+    sql += "\nORDER BY " + ", ".join(f"{coluna} {direcao}" for coluna in chave)
+    sql += "\nLIMIT ?"
+    parametros.append(limite + 1)
+
+    linhas = conn.execute(sql, parametros).fetchall()
+    tem_mais = len(linhas) > limite
+    linhas = linhas[:limite]
+    if voltando:
+        linhas.reverse()
+
+    def valores(linha):
+        return [linha[_nome_coluna(coluna)] for coluna in chave]
+
+    pagina = Pagina(itens=linhas)
+    if linhas:
+        # Há próxima página se avançamos e sobrou linha, ou sempre que voltamos
+        if voltando or tem_mais:
+            pagina.proximo = codificar_cursor(valores(linhas[-1]), _PROXIMA)
+        # Há página anterior se viemos de um cursor de avanço, ou se voltamos e sobrou linha
+        if (decodificado and not voltando) or (voltando and tem_mais):
+            pagina.anterior = codificar_cursor(valores(linhas[0]), _ANTERIOR)
+    return pagina
@@ -1,18 +1,33 @@
 """
 Módulo de segurança para gerenciar senhas e tokens
+
+O bcrypt custa de 100 a 300 ms de CPU por chamada. Rotas ``async`` devem usar
+as versões ``*_async`` (criar_hash_senha_async, verificar_senha_async,
+verificar_senha_com_rehash_async), que rodam em um pool de threads próprio
+em vez de travar o event loop; as versões síncronas ficam para scripts e seed.
 """
+import asyncio
+import os
 import secrets
 import string
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
 import bcrypt
 
+from util.config import BCRYPT_FILA_MAX, BCRYPT_ROUNDS, BCRYPT_WORKERS
+from util.exceptions import ServicoSobrecarregadoError
 
-def criar_hash_senha(senha: str) -> str:
+
+def criar_hash_senha(senha: str, rounds: Optional[int] = None) -> str:
     """
     Cria um hash seguro da senha usando bcrypt
 
     Args:
         senha: Senha em texto plano
+        rounds: Fator de custo (padrão: BCRYPT_ROUNDS)
 
     Returns:
         Hash da senha
@@ -22,7 +37,7 @@ def criar_hash_senha(senha: str) -> str:
     """
     # Bcrypt tem limite de 72 bytes - truncar se necessário
     senha_bytes = senha.encode('utf-8')[:72]
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
     hash_bytes = bcrypt.hashpw(senha_bytes, salt)
     return hash_bytes.decode('utf-8')
 
@@ -51,6 +66,107 @@ def verificar_senha(senha_plana: str, senha_hash: str) -> bool:
         return False
 
 
+def custo_do_hash(senha_hash: str) -> Optional[int]:
+    """
+    Extrai o fator de custo de um hash bcrypt ("$2b$12$..." -> 12)
+
+    Returns:
+        O custo, ou None se o valor não for um hash bcrypt
+    """
+    try:
+        return int(senha_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def precisa_rehash(senha_hash: str) -> bool:
+    """Indica se o hash foi gerado com um custo diferente de BCRYPT_ROUNDS"""
+    custo = custo_do_hash(senha_hash)
+    return custo is not None and custo != BCRYPT_ROUNDS
+
+
+def verificar_senha_com_rehash(senha_plana: str, senha_hash: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica a senha e, se o hash usa um custo desatualizado, gera um novo
+
+    Usado no login: como a senha em texto plano só está disponível nesse
+    momento, é aí que os hashes migram para o BCRYPT_ROUNDS atual.
+
+    Returns:
+        Tupla (senha correta, novo hash a salvar ou None)
+    """
+    if not verificar_senha(senha_plana, senha_hash):
+        return False, None
+    if precisa_rehash(senha_hash):
+        return True, criar_hash_senha(senha_plana)
+    return True, None
+
+
+# === Pool de hashing ===
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+# Vagas = em execução + na fila; sem vaga, a chamada falha na hora (back-pressure)
+_vagas = threading.BoundedSemaphore(max(1, BCRYPT_WORKERS) + max(0, BCRYPT_FILA_MAX))
+
+
+def _obter_pool() -> ThreadPoolExecutor:
+    global _pool, _pool_pid
+    if _pool is not None and _pool_pid == os.getpid():
+        return _pool
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ThreadPoolExecutor(
+                max_workers=max(1, BCRYPT_WORKERS),
+                thread_name_prefix="obratto-senha",
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def encerrar_pool_senhas(aguardar: bool = True) -> None:
+    """Encerra o pool de hashing (shutdown da aplicação e testes)."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown(wait=aguardar)
+        _pool = None
+        _pool_pid = None
+
+
+async def _no_pool(funcao, *args):
+    if not _vagas.acquire(blocking=False):
+        raise ServicoSobrecarregadoError(
+            "Muitas operações de senha em andamento. Tente novamente em instantes."
+        )
+    try:
+        futuro = _obter_pool().submit(funcao, *args)
+    except BaseException:
+        _vagas.release()
+        raise
+    # A vaga só é liberada quando o bcrypt termina, mesmo se a requisição for cancelada
+    futuro.add_done_callback(lambda _: _vagas.release())
+    return await asyncio.wrap_future(futuro)
+
+
+async def criar_hash_senha_async(senha: str) -> str:
+    """criar_hash_senha no pool de hashing; levanta ServicoSobrecarregadoError com a fila cheia"""
+    return await _no_pool(criar_hash_senha, senha)
+
+
+async def verificar_senha_async(senha_plana: str, senha_hash: str) -> bool:
+    """verificar_senha no pool de hashing; levanta ServicoSobrecarregadoError com a fila cheia"""
+    return await _no_pool(verificar_senha, senha_plana, senha_hash)
+
+
+async def verificar_senha_com_rehash_async(
+    senha_plana: str, senha_hash: str
+) -> Tuple[bool, Optional[str]]:
+    """verificar_senha_com_rehash no pool de hashing (verificação e rehash na mesma tarefa)"""
+    return await _no_pool(verificar_senha_com_rehash, senha_plana, senha_hash)
+
+
 def gerar_token_redefinicao(tamanho: int = 32) -> str:
     """
     Gera um token aleatório seguro para redefinição de senha
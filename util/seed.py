@@ -1,3 +1,11 @@
+import glob
+import hashlib
+import importlib
+import logging
+import os
+import sqlite3
+from datetime import datetime
+
 from data.administrador.administrador_repo import criar_tabela_administrador
 from data.anuncio.anuncio_repo import criar_tabela_anuncio
 from data.avaliacao.avaliacao_repo import criar_tabela_avaliacao
@@ -11,9 +19,112 @@ from data.plano.plano_repo import criar_tabela_plano
 from data.prestador.prestador_repo import criar_tabela_prestador
 from data.produto.produto_repo import criar_tabela_produto
 from data.servico.servico_repo import criar_tabela_servico
+from data.tarefaimagem.tarefa_imagem_repo import criar_tabela_tarefa_imagem
+from data.servicofoto.servico_foto_repo import criar_tabela_servico_foto
+from data.arquivo.arquivo_repo import criar_tabela_arquivo
 from data.usuario.usuario_repo import criar_tabela_usuario
 from data.orcamento.orcamento_repo import criar_tabela_orcamento
-from util.db import open_connection
+from data.pagamento.pagamento_repo import PagamentoRepository
+from util.db import open_connection, seed_usuarios_padrao
+from util.migracoes import MIGRACOES, aplicar_migracoes
+
+logger = logging.getLogger(__name__)
+
+# Incrementar sempre que os dados de seed_usuarios_padrao/garantir_fornecedor_teste mudarem
+VERSAO_SEED = 1
+
+CRIAR_TABELA_VERSAO_BANCO = """
+CREATE TABLE IF NOT EXISTS versao_banco (
+    chave TEXT PRIMARY KEY,
+    versao TEXT NOT NULL,
+    atualizada_em TEXT NOT NULL
+);
+"""
+
+OBTER_VERSOES_BANCO = """
+SELECT chave, versao FROM versao_banco;
+"""
+
+REGISTRAR_VERSAO_BANCO = """
+INSERT INTO versao_banco (chave, versao, atualizada_em) VALUES (?, ?, ?)
+ON CONFLICT(chave) DO UPDATE SET versao = excluded.versao, atualizada_em = excluded.atualizada_em;
+"""
+
+
+def calcular_versao_schema() -> str:
+    """
+    Impressão digital do schema esperado pelo código: hash dos comandos
+    CREATE de data/*/*_sql.py e da lista de migrações. Qualquer alteração
+    em uma tabela, índice ou migração muda o valor, sem versão manual.
+    """
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha256()
+    for caminho in sorted(glob.glob(os.path.join(raiz, "data", "*", "*_sql.py"))):
+        modulo = os.path.relpath(caminho, raiz)[:-3].replace(os.sep, ".")
+        for nome, valor in sorted(vars(importlib.import_module(modulo)).items()):
+            if nome.startswith("CRIAR_") and isinstance(valor, str):
+                digest.update(f"{modulo}.{nome}\n{valor}\n".encode())
+    for versao, descricao, _ in MIGRACOES:
+        digest.update(f"migracao {versao}: {descricao}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def obter_versoes_banco() -> dict:
+    """Versões registradas em versao_banco ({} em um banco novo)."""
+    try:
+        with open_connection() as conn:
+            return {row["chave"]: row["versao"] for row in conn.execute(OBTER_VERSOES_BANCO)}
+    except sqlite3.OperationalError:
+        # Tabela ainda não existe
+        return {}
+
+
+def registrar_versao_banco(chave: str, versao: str) -> None:
+    with open_connection() as conn:
+        conn.execute(CRIAR_TABELA_VERSAO_BANCO)
+        conn.execute(
+            REGISTRAR_VERSAO_BANCO,
+            (chave, versao, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+        )
+        conn.commit()
+
+
+def inicializar_banco(forcar: bool = False) -> dict:
+    """
+    Prepara o banco na subida da aplicação.
+
+    Faz uma única leitura de versao_banco e só roda a DDL (criar_tabelas)
+    quando o schema do código mudou, e o seed (usuários padrão, com o hash
+    bcrypt da senha) quando VERSAO_SEED mudou. Em um boot comum nada além
+    dessa leitura é executado.
+
+    Args:
+        forcar: Roda DDL e seed mesmo com as versões em dia
+
+    Returns:
+        {"schema": bool, "seed": bool} indicando o que foi executado
+    """
+    versoes = obter_versoes_banco()
+    executado = {"schema": False, "seed": False}
+
+    versao_schema = calcular_versao_schema()
+    if forcar or versoes.get("schema") != versao_schema:
+        criar_tabelas()
+        registrar_versao_banco("schema", versao_schema)
+        executado["schema"] = True
+        logger.info(f"Schema atualizado para a versão {versao_schema}")
+
+    if forcar or versoes.get("seed") != str(VERSAO_SEED):
+        if seed_usuarios_padrao():
+            garantir_fornecedor_teste()
+            registrar_versao_banco("seed", str(VERSAO_SEED))
+            executado["seed"] = True
+            logger.info(f"Seed atualizado para a versão {VERSAO_SEED}")
+
+    if not any(executado.values()):
+        logger.info("Banco em dia: DDL e seed ignorados")
+    return executado
+
 
 def criar_tabelas():
     criar_tabela_usuario()
@@ -30,11 +141,14 @@ def criar_tabelas():
     criar_tabela_avaliacao()
     criar_tabela_mensagem()
     criar_tabela_notificacao()
-    criar_tabela_orcamento()
     criar_tabela_orcamento_servico()
-    
-    # Garantir que o fornecedor de teste sempre exista
-    garantir_fornecedor_teste()
+    PagamentoRepository().criar_tabela_pagamento()
+    criar_tabela_tarefa_imagem()
+    criar_tabela_servico_foto()
+    criar_tabela_arquivo()
+
+    # Índices e demais alterações versionadas do schema
+    aplicar_migracoes()
 
 
 def garantir_fornecedor_teste():
@@ -1,9 +1,5 @@
 from fastapi import Request
-from fastapi.templating import Jinja2Templates
-from util.flash_messages import get_flashed_messages
+from util.template_util import criar_templates
 
-# Template global context
-templates = Jinja2Templates(directory="templates")
-
-# Adicionar funções globais aos templates
-templates.env.globals["get_flashed_messages"] = get_flashed_messages
\ No newline at end of file
+# Template global context (mesmo Environment das rotas, já com as funções globais)
+templates = criar_templates("templates")
\ No newline at end of file
@@ -1,13 +1,62 @@
 """
 Utilidades para trabalhar com templates Jinja2.
 Centraliza a criação e configuração de templates.
+
+Todas as rotas compartilham um único Environment por diretório e processo:
+cada template é compilado uma vez por worker (e o bytecode fica salvo em
+TEMPLATES_CACHE_DIR para os próximos boots), não uma vez por módulo de rota.
 """
 
 from fastapi.templating import Jinja2Templates
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, TemplateError
 from typing import Optional, Any
+import logging
 import os
+import threading
+from util.cache_config import static_versioned
+from util.config import TEMPLATES_AUTO_RELOAD, TEMPLATES_CACHE_DIR
 from util.flash_messages import get_flashed_messages
+from util.imagens_responsivas import imagem_responsiva
+
+logger = logging.getLogger(__name__)
+
+# Diretório (caminho absoluto) -> Jinja2Templates compartilhado
+_templates: dict[str, Jinja2Templates] = {}
+_templates_lock = threading.Lock()
+
+
+def _criar_cache_bytecode() -> Optional[FileSystemBytecodeCache]:
+    """Cache de bytecode em disco, ou None se desativado/sem permissão de escrita."""
+    if not TEMPLATES_CACHE_DIR:
+        return None
+    try:
+        os.makedirs(TEMPLATES_CACHE_DIR, exist_ok=True)
+    except OSError as e:
+        logger.warning(f"Cache de bytecode dos templates desativado ({TEMPLATES_CACHE_DIR}): {e}")
+        return None
+    return FileSystemBytecodeCache(TEMPLATES_CACHE_DIR)
+
+
+def _criar_ambiente(directory: str) -> Environment:
+    env = Environment(
+        loader=FileSystemLoader(directory),
+        autoescape=True,
+        auto_reload=TEMPLATES_AUTO_RELOAD,
+        bytecode_cache=_criar_cache_bytecode(),
+        # Comporta todos os templates do projeto sem descartar compilados
+        cache_size=1000,
+    )
+
+    # Injetar funções globais
+    env.globals["get_flashed_messages"] = get_flashed_messages
+    env.globals["obter_mensagens"] = get_flashed_messages  # Alias em português
+
+    # '/static/css/home.css' | static_versioned -> nome com hash do build de assets
+    env.filters["static_versioned"] = static_versioned
+
+    # <picture> com as variantes WebP/JPEG geradas após o upload
+    env.globals["imagem_responsiva"] = imagem_responsiva
+    return env
 
 
 def criar_templates(directory: str = "templates", **kwargs) -> Jinja2Templates:
@@ -19,7 +68,8 @@ def criar_templates(directory: str = "templates", **kwargs) -> Jinja2Templates:
         **kwargs: Argumentos adicionais para Jinja2Templates
 
     Returns:
-        Instância configurada de Jinja2Templates
+        Instância configurada de Jinja2Templates, compartilhada por todas as
+        chamadas com o mesmo diretório
 
     Exemplo:
         ```python
@@ -39,19 +89,44 @@ def criar_templates(directory: str = "templates", **kwargs) -> Jinja2Templates:
     if not os.path.exists(directory):
         raise ValueError(f"Diretório de templates não encontrado: {directory}")
 
-    # Criar environment Jinja2 customizado
-    env = Environment(
-        loader=FileSystemLoader(directory), autoescape=True, auto_reload=True
-    )
+    chave = os.path.abspath(directory)
+    templates = _templates.get(chave)
+    if templates is None:
+        with _templates_lock:
+            templates = _templates.get(chave)
+            if templates is None:
+                templates = Jinja2Templates(env=_criar_ambiente(directory))
+                _templates[chave] = templates
+    return templates
 
-    # Injetar funções globais
-    env.globals["get_flashed_messages"] = get_flashed_messages
-    env.globals["obter_mensagens"] = get_flashed_messages  # Alias em português
 
-    # Criar instância de Jinja2Templates com environment customizado
-    templates = Jinja2Templates(env=env)
+def precompilar_templates(directory: str = "templates") -> int:
+    """
+    Compila todos os templates .html do diretório no Environment compartilhado.
 
-    return templates
+    Chamado na subida da aplicação (TEMPLATES_PRECOMPILAR) para que a
+    primeira requisição após o deploy não pague a compilação. Com o cache de
+    bytecode em disco, os boots seguintes apenas carregam o bytecode salvo.
+
+    Returns:
+        Quantidade de templates compilados
+    """
+    env = criar_templates(directory).env
+    compilados = 0
+    # Ignora arquivos ocultos (temporários de editores ao lado dos templates)
+    nomes = env.list_templates(
+        filter_func=lambda nome: nome.endswith(".html")
+        and not os.path.basename(nome).startswith(".")
+    )
+    for nome in nomes:
+        try:
+            env.get_template(nome)
+            compilados += 1
+        except (TemplateError, UnicodeDecodeError) as e:
+            # Um template quebrado não deve impedir a subida; a rota que o usa falhará
+            logger.error(f"Erro ao pré-compilar template {nome}: {e}")
+    logger.info(f"{compilados} templates pré-compilados")
+    return compilados
 
 
 def criar_templates_multi(directories: list[str], **kwargs) -> Jinja2Templates:
@@ -83,7 +158,7 @@ def criar_templates_multi(directories: list[str], **kwargs) -> Jinja2Templates:
     # Configurações padrão
     config: dict[str, Any] = {
         "autoescape": True,
-        "auto_reload": True,
+        "auto_reload": TEMPLATES_AUTO_RELOAD,
     }
 
     # Sobrescrever com kwargs fornecidos
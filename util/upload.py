@@ -0,0 +1,163 @@
+"""
+Gravação de uploads em disco sem carregar o arquivo inteiro na memória.
+
+As rotas de foto faziam ``conteudo = await foto.read()`` e gravavam o
+buffer de uma vez: cada upload grande ocupava seu tamanho inteiro na
+memória do worker, e alguns simultâneos bastavam para um pico. Aqui o
+arquivo é copiado em blocos de TAMANHO_BLOCO para um temporário ao lado
+do destino, com limite rígido de bytes:
+
+    from util.upload import salvar_upload
+    from util.exceptions import UploadRecusadoError
+
+    try:
+        await salvar_upload(foto, caminho_arquivo)
+    except UploadRecusadoError as e:
+        ...  # e.motivo: "arquivo_grande" | "tipo_invalido"
+
+A assinatura (magic number) é conferida no primeiro bloco, antes de
+gravar qualquer coisa, e o temporário só vira o destino (os.replace) depois
+de completo: quem lê o destino nunca vê um arquivo pela metade.
+
+As fotos de perfil e de produto usam salvar_upload_por_conteudo(), que
+grava no armazenamento endereçado pelo hash (util.armazenamento) e devolve
+a URL a guardar no banco.
+
+LimiteUploadMiddleware recusa com 413, antes de o corpo ser lido, as
+requisições multipart cujo Content-Length passa de UPLOAD_MAX_CORPO_BYTES.
+"""
+import hashlib
+import io
+import os
+import uuid
+from typing import Tuple
+
+from fastapi import UploadFile
+from starlette.responses import PlainTextResponse
+
+from util import armazenamento
+from util.config import UPLOAD_MAX_BYTES, UPLOAD_MAX_CORPO_BYTES
+from util.exceptions import UploadRecusadoError
+from util.foto_util import EXTENSOES_IMAGEM, detectar_tipo_imagem
+from util.imagens_responsivas import RAIZ_STATIC
+
+TAMANHO_BLOCO = 64 * 1024
+
+
+def _recusar_tamanho(limite_bytes: int) -> UploadRecusadoError:
+    return UploadRecusadoError(
+        f"Arquivo maior que o limite de {limite_bytes // (1024 * 1024)} MB", "arquivo_grande"
+    )
+
+
+async def _copiar_em_blocos(arquivo: UploadFile, pasta: str,
+                            limite_bytes: int) -> Tuple[str, int, str, str]:
+    """
+    Copia o upload para um temporário em ``pasta``, conferindo tipo e tamanho.
+
+    Returns:
+        (caminho do temporário, bytes gravados, sha256 do conteúdo, tipo da imagem)
+    """
+    # Tamanho já conhecido (corpo multipart lido pelo Starlette): recusa sem copiar nada
+    if arquivo.size is not None and arquivo.size > limite_bytes:
+        raise _recusar_tamanho(limite_bytes)
+
+    bloco = await arquivo.read(TAMANHO_BLOCO)
+    tipo = detectar_tipo_imagem(io.BytesIO(bloco))
+    if tipo is None:
+        raise UploadRecusadoError("O arquivo enviado não é uma imagem válida", "tipo_invalido")
+
+    os.makedirs(pasta, exist_ok=True)
+    temporario = os.path.join(pasta, f".{uuid.uuid4().hex}.tmp")
+    digest = hashlib.sha256()
+    total = 0
+    try:
+        with open(temporario, "wb") as saida:
+            while bloco:
+                total += len(bloco)
+                if total > limite_bytes:
+                    raise _recusar_tamanho(limite_bytes)
+                digest.update(bloco)
+                saida.write(bloco)
+                bloco = await arquivo.read(TAMANHO_BLOCO)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+    return temporario, total, digest.hexdigest(), tipo
+
+
+async def salvar_upload(arquivo: UploadFile, caminho_destino: str,
+                        limite_bytes: int = UPLOAD_MAX_BYTES) -> int:
+    """
+    Grava o upload em ``caminho_destino`` em blocos, conferindo tipo e tamanho.
+
+    Args:
+        arquivo: Arquivo recebido pela rota
+        caminho_destino: Caminho final do arquivo (a pasta é criada se preciso)
+        limite_bytes: Tamanho máximo aceito
+
+    Returns:
+        Quantidade de bytes gravados
+
+    Raises:
+        UploadRecusadoError: arquivo acima do limite ou que não é uma imagem
+    """
+    temporario, total, _, _ = await _copiar_em_blocos(
+        arquivo, os.path.dirname(os.path.abspath(caminho_destino)), limite_bytes
+    )
+    os.replace(temporario, caminho_destino)
+    return total
+
+
+async def salvar_upload_por_conteudo(arquivo: UploadFile,
+                                     limite_bytes: int = UPLOAD_MAX_BYTES) -> str:
+    """
+    Grava o upload no armazenamento endereçado pelo conteúdo
+    (util.armazenamento): a extensão vem da assinatura da imagem e o nome,
+    do hash. Conteúdo repetido continua ocupando um único arquivo.
+
+    Returns:
+        URL imutável do arquivo, a ser guardada em produto.foto/usuario.foto
+
+    Raises:
+        UploadRecusadoError: arquivo acima do limite ou que não é uma imagem
+    """
+    pasta = os.path.join(RAIZ_STATIC, *armazenamento.DIRETORIO_ARQUIVOS.split("/"))
+    temporario, total, digest, tipo = await _copiar_em_blocos(arquivo, pasta, limite_bytes)
+    try:
+        return armazenamento.armazenar(temporario, digest, EXTENSOES_IMAGEM[tipo], total)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+class LimiteUploadMiddleware:
+    """
+    Middleware ASGI que responde 413 às requisições multipart/form-data com
+    Content-Length acima de ``limite``, sem ler o corpo.
+
+    O limite por arquivo continua sendo aplicado por salvar_upload.
+    """
+
+    def __init__(self, app, limite: int = UPLOAD_MAX_CORPO_BYTES):
+        self.app = app
+        self.limite = limite
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            cabecalhos = dict(scope.get("headers") or [])
+            if cabecalhos.get(b"content-type", b"").startswith(b"multipart/form-data"):
+                try:
+                    tamanho = int(cabecalhos.get(b"content-length", b"0"))
+                except ValueError:
+                    tamanho = 0
+                if tamanho > self.limite:
+                    resposta = PlainTextResponse(
+                        "Arquivo enviado é grande demais", status_code=413,
+                        headers={"Connection": "close"},
+                    )
+                    await resposta(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)